@@ -4,11 +4,15 @@ import os
 os.environ["GRPC_DNS_RESOLVER"] = "native"
 import re
 from io import BytesIO
-from typing import Tuple, List, Dict, Any, Optional
+from typing import Tuple, List, Dict, Any
 
 from google.cloud import texttospeech
 from pydub import AudioSegment
 
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from audio_common.script_segment import join_by_label
+
 # ===== 설정 =====
 # 항상 en-US 보이스 사용 (필요 시 프로젝트에 맞는 이름으로 교체 가능)
 EN_VOICE = texttospeech.VoiceSelectionParams(
@@ -55,58 +59,13 @@ def split_english_korean(script_text: str) -> Tuple[str, str]:
     (english_text, korean_text)로 반환.
     - 연속 구간을 합쳐 각 언어별 하나의 큰 문장으로 만듦
     - 공백 정리 포함
+    (script_segment 'en_ko' 프로필)
     """
     if not script_text:
         return "", ""
 
-    def is_hangul(ch: str) -> bool:
-        code = ord(ch)
-        return (
-            0xAC00 <= code <= 0xD7AF or   # Hangul Syllables
-            0x1100 <= code <= 0x11FF or   # Hangul Jamo
-            0x3130 <= code <= 0x318F      # Hangul Compatibility Jamo
-        )
-
-    def is_english_letter(ch: str) -> bool:
-        return "a" <= ch.lower() <= "z"
-
-    segments: List[Tuple[str, str]] = []  # [(lang, text)], lang ∈ {"en","ko"}
-    current_lang: Optional[str] = None
-    buf: List[str] = []
-
-    def flush():
-        nonlocal buf, current_lang
-        if buf and current_lang:
-            text = "".join(buf)
-            segments.append((current_lang, text))
-        buf = []
-
-    for ch in script_text:
-        if is_hangul(ch):
-            lang = "ko"
-        elif is_english_letter(ch):
-            lang = "en"
-        elif ch.isspace():
-            lang = current_lang  # 현재 언어 유지
-        else:
-            lang = current_lang  # 구두점 등은 현재 언어에 붙임
-
-        if lang != current_lang and buf:
-            flush()
-        buf.append(ch)
-        current_lang = lang or current_lang
-
-    flush()
-
-    english_text = " ".join(t for lang, t in segments if lang == "en")
-    korean_text  = " ".join(t for lang, t in segments if lang == "ko")
-
-    # 공백 정리
-    def normalize_spaces(s: str) -> str:
-        s = re.sub(r"\s+", " ", s or "").strip()
-        return s
-
-    return normalize_spaces(english_text), normalize_spaces(korean_text)
+    joined = join_by_label("en_ko", script_text)
+    return joined.get("en", ""), joined.get("ko", "")
 
 # ===== JSON 로더: 배열/단일/NDJSON 지원 =====
 def load_items(json_file_path: str) -> List[Dict[str, Any]]:
@@ -8,6 +8,10 @@ from io import BytesIO
 from google.cloud import texttospeech
 from pydub import AudioSegment
 
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from audio_common.script_segment import segment
+
 
 def sanitize_filename(name):
     """파일 이름으로 사용할 수 없는 문자를 제거하고 소문자로 변환합니다."""
@@ -19,31 +23,9 @@ def split_script_by_language(script_text):
     """
     한글과 영어가 섞인 텍스트를 언어별로 분리합니다.
     반환: [(lang_code, text_segment), ...]
+    (script_segment 'en_ko_voice' 프로필)
     """
-    segments = []
-    current_lang = None
-    buffer = ""
-
-    for char in script_text:
-        if '\uac00' <= char <= '\ud7af':  # 한글
-            lang = 'ko-KR'
-        elif 'a' <= char.lower() <= 'z':
-            lang = 'en-US'
-        elif char.isspace():
-            lang = current_lang  # 공백은 이전 언어 유지
-        else:
-            lang = current_lang  # 문장부호 등
-
-        if lang != current_lang and buffer:
-            segments.append((current_lang, buffer))
-            buffer = ""
-        buffer += char
-        current_lang = lang
-
-    if buffer:
-        segments.append((current_lang, buffer))
-
-    return segments
+    return segment("en_ko_voice", script_text)
 
 
 # 언어별 음성 설정
@@ -3,44 +3,45 @@ import json
 import os
 os.environ["GRPC_DNS_RESOLVER"] = "native"
 import re
+import shutil
+import threading
+import time
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 import difflib  # ✅ 추가: 유사도 계산
 
 from google.cloud import texttospeech
 from google.cloud import speech  # ✅ 추가: STT
 from pydub import AudioSegment
 
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from audio_common.duration_model import DurationModel
+from audio_common.hash_cache import HashCache, content_key
+from audio_common.script_segment import segment
+from audio_common.voice_assign import VOICE_ASSIGN, assign_males, item_key, voice_table_path
+
 # ✅ 추가: STT 임계치 (환경변수로 조정 가능)
 STT_ACCURACY_THRESHOLD = float(os.getenv("STT_ACCURACY_THRESHOLD", "0.82"))
 
+# ✅ STT 게이트 비동기 스테이지 (합성과 병렬 실행)
+STT_WORKERS = int(os.getenv("STT_WORKERS", "4"))              # STT 요청 스레드 수
+STT_MAX_PENDING = int(os.getenv("STT_MAX_PENDING", str(STT_WORKERS * 4)))  # 대기열 상한(메모리 보호)
+STT_SAMPLE_RATE = 16000                                       # STT 전송용 16kHz 모노
+STT_CACHE_FILE = os.getenv("STT_CACHE_FILE", ".stt_cache.jsonl")  # 오디오 해시 → 인식 결과
+STT_RETRIES = int(os.getenv("STT_RETRIES", "2"))               # STT 요청 실패 시 재시도 횟수
+QUARANTINE_DIR = "_quarantine"
+PENDING_SUFFIX = ".pending.mp3"  # STT 판정 전 임시 파일 (PASS면 최종 경로로 교체)
+# ✅ 길이 분류(triage_audio.py 모델): 지정하면 기대 길이에서 벗어난 파일만 STT 확인
+DURATION_MODEL = os.getenv("DURATION_MODEL", "")
+
 def sanitize_filename(name):
     name = re.sub(r'[\\/*?:"<>|]', "", name)
     return name.lower()
 
 def split_script_by_language(script_text):
-    """한글/영어 혼합 텍스트를 언어별로 분리."""
-    segments = []
-    current_lang, buf = None, ""
-
-    for ch in script_text:
-        if '\uac00' <= ch <= '\ud7af':  # 한글
-            lang = 'en-US'
-        elif 'a' <= ch.lower() <= 'z':
-            lang = 'en-US'
-        elif ch.isspace():
-            lang = current_lang
-        else:
-            lang = current_lang
-
-        if lang != current_lang and buf:
-            segments.append((current_lang, buf))
-            buf = ""
-        buf += ch
-        current_lang = lang
-
-    if buf:
-        segments.append((current_lang, buf))
-    return segments
+    """한글/영어 혼합 텍스트를 언어별로 분리. (script_segment 'en_voice' 프로필)"""
+    return segment("en_voice", script_text)
 
 # ✅ 성별에 따라 보이스 묶음 정의 (필요 시 이름을 환경에 맞게 조정)
 VOICE_SETS = {
@@ -63,6 +64,7 @@ VOICE_SETS = {
 }
 
 # 첫 항목 성별 설정: 'male'이면 1번째 남/2번째 여…, 'female'이면 반대로 시작
+# (VOICE_ASSIGN=hash|table이면 순번 대신 lemma 기준 - 항목 추가/삭제 시 다른 항목 보이스 유지)
 START_GENDER = "male"
 
 def gender_for_index(idx: int, start: str = "male") -> str:
@@ -85,26 +87,21 @@ def _similarity(a: str, b: str) -> float:
         return 0.0
     return difflib.SequenceMatcher(None, a_norm, b_norm).ratio()
 
-# ✅ 추가: STT로 품질 확인
-def _stt_passes(audio: AudioSegment, reference_text: str, speech_client: "speech.SpeechClient") -> tuple[bool, float, float | None, str]:
-    """
-    반환: (통과여부, 유사도[0..1], 평균 confidence 또는 None, transcript)
-    """
-    # wav(PCM LINEAR16)로 메모리 내 인코딩
+def _stt_wav_bytes(audio: AudioSegment) -> bytes:
+    """STT 전송용 16kHz 모노 16bit WAV (전체 레이트 대비 요청 크기 축소)"""
     buf = BytesIO()
-    audio.export(buf, format="wav")
-    content = buf.getvalue()
-
-    audio_rate = audio.frame_rate
-    channels = audio.channels
+    audio.set_frame_rate(STT_SAMPLE_RATE).set_channels(1).set_sample_width(2).export(buf, format="wav")
+    return buf.getvalue()
 
+def _stt_recognize(content: bytes, speech_client: "speech.SpeechClient") -> tuple[str, float | None] | None:
+    """16kHz 모노 WAV → (transcript, 평균 confidence), 요청 실패 시 None"""
     config = speech.RecognitionConfig(
         encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-        sample_rate_hertz=audio_rate,
+        sample_rate_hertz=STT_SAMPLE_RATE,
         language_code="ko-KR",  # 기본 한국어
         alternative_language_codes=["en-US"],  # 영어 보조
         enable_automatic_punctuation=True,
-        audio_channel_count=channels,
+        audio_channel_count=1,
     )
     audio_in = speech.RecognitionAudio(content=content)
 
@@ -112,10 +109,10 @@ def _stt_passes(audio: AudioSegment, reference_text: str, speech_client: "speech
         resp = speech.SpeechClient.recognize(speech_client, config=config, audio=audio_in)
     except Exception as e:
         print(f"⚠️ STT 인식 실패: {e}")
-        return (False, 0.0, None, "")
+        return None
 
     if not resp.results:
-        return (False, 0.0, None, "")
+        return ("", None)
 
     transcript_parts = []
     confidences = []
@@ -128,11 +125,142 @@ def _stt_passes(audio: AudioSegment, reference_text: str, speech_client: "speech
                 confidences.append(top.confidence)
 
     transcript = " ".join(transcript_parts).strip()
-    sim = _similarity(reference_text, transcript)
     avg_conf = sum(confidences) / len(confidences) if confidences else None
+    return (transcript, avg_conf)
 
+# ✅ 추가: STT로 품질 확인
+def _stt_passes(
+    audio: AudioSegment,
+    reference_text: str,
+    speech_client: "speech.SpeechClient",
+    cache: HashCache | None = None,
+) -> tuple[bool, float, float | None, str] | None:
+    """
+    반환: (통과여부, 유사도[0..1], 평균 confidence 또는 None, transcript), STT 요청 실패면 None (판정 불가)
+    인식 결과는 16kHz WAV 해시로 캐시 → 같은 오디오는 다시 요청하지 않음 (임계치는 매번 적용)
+    """
+    content = _stt_wav_bytes(audio)
+    key = content_key(content, "stt", "ko-KR+en-US")
+    hit = cache.get(key) if cache is not None else None
+    if hit is not None:
+        transcript, avg_conf = hit
+    else:
+        recognized = _stt_recognize(content, speech_client)
+        if recognized is None:
+            return None
+        transcript, avg_conf = recognized
+        if cache is not None:
+            cache.put(key, [transcript, avg_conf])
+
+    if not transcript:
+        return (False, 0.0, avg_conf, "")
+    sim = _similarity(reference_text, transcript)
     return (sim >= STT_ACCURACY_THRESHOLD, sim, avg_conf, transcript)
 
+def pending_path(out_path: str) -> str:
+    """<이름>.mp3 → <이름>.pending.mp3"""
+    return os.path.splitext(out_path)[0] + PENDING_SUFFIX
+
+class SttGate:
+    """
+    STT 품질 게이트 비동기 스테이지
+      - 합성 스레드는 claim() → <이름>.pending.mp3 임시 저장 → submit()만 호출 → 다음 항목 합성 계속
+        (claim과 판정 후 파일 이동은 같은 lock 안 - 이전 항목의 판정이 새로 저장한 같은 이름 파일을 옮기지 않음)
+      - 워커 풀이 16kHz 모노로 STT 확인
+        PASS면 임시 파일을 최종 경로(<이름>.mp3)로 교체 → 최종 경로에는 확인된 파일만 생김
+        FAIL이면 _quarantine/ 으로 이동 + quarantine.jsonl 기록
+        STT 요청이 STT_RETRIES번 재시도 후에도 실패하면 판정 불가(unchecked): 격리하지 않고
+        임시 파일을 그대로 둠 (다음 실행에서 다시 생성·확인)
+      - 대기열이 STT_MAX_PENDING을 넘으면 submit()이 잠시 대기 (메모리 보호)
+      - DURATION_MODEL이 있으면 길이가 기대치 안인 파일은 STT 없이 통과 (이상치만 STT)
+    """
+
+    def __init__(self, speech_client, output_dir: str, workers: int = STT_WORKERS, max_pending: int = STT_MAX_PENDING):
+        self.speech_client = speech_client
+        self.output_dir = output_dir
+        self.quarantine_dir = os.path.join(output_dir, QUARANTINE_DIR)
+        self.cache = HashCache(os.path.join(output_dir, STT_CACHE_FILE))
+        self.pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="stt")
+        self.slots = threading.BoundedSemaphore(max(1, max_pending))
+        self.lock = threading.Lock()
+        self.latest: dict[str, int] = {}  # 경로 → 마지막으로 임시 저장한 항목 번호 (같은 이름 덮어쓰기 대비)
+        self.stats = {"pass": 0, "fail": 0, "stale": 0, "triaged": 0, "unchecked": 0}
+        self.triage = DurationModel.load(DURATION_MODEL) if DURATION_MODEL and os.path.exists(DURATION_MODEL) else None
+
+    def claim(self, seq: int, out_path: str) -> str:
+        """임시 저장(export) 직전 호출: out_path의 최신 항목을 seq로 기록 → 임시 저장 경로"""
+        with self.lock:
+            self.latest[out_path] = seq
+        return pending_path(out_path)
+
+    def _promote(self, seq: int, out_path: str) -> bool:
+        """(lock 안에서) 임시 파일 → 최종 경로. 같은 이름이 이후 항목으로 다시 저장됐으면 그 항목에 맡김"""
+        if self.latest.get(out_path) != seq:
+            self.stats["stale"] += 1
+            return False
+        os.replace(pending_path(out_path), out_path)
+        return True
+
+    def submit(self, seq: int, lemma: str, out_path: str, audio: AudioSegment, reference_text: str,
+               parts: list | None = None) -> None:
+        if self.triage is not None and parts:
+            r = self.triage.score(parts, 0, len(audio), "A2")
+            if not r["anomaly"]:
+                with self.lock:
+                    self.stats["triaged"] += 1
+                    self._promote(seq, out_path)
+                print(f"⏩ SKIP  '{lemma}' 길이 정상 ({len(audio)}ms / 기대 {r['expected_ms']:.0f}ms) → STT 생략")
+                return
+        self.slots.acquire()
+        fut = self.pool.submit(self._check, seq, lemma, out_path, audio, reference_text)
+        fut.add_done_callback(lambda _: self.slots.release())
+
+    def _check(self, seq: int, lemma: str, out_path: str, audio: AudioSegment, reference_text: str) -> None:
+        result, error = None, ""
+        for attempt in range(STT_RETRIES + 1):
+            try:
+                result = _stt_passes(audio, reference_text, self.speech_client, self.cache)
+            except Exception as e:
+                result, error = None, str(e)
+            if result is not None or attempt >= STT_RETRIES:
+                break
+            time.sleep(min(30.0, 0.5 * (2 ** attempt)))
+        with self.lock:
+            if result is None:
+                # STT 요청 실패는 오디오 품질 판정이 아님 → 격리하지 않고 임시 파일로 남김
+                if self.latest.get(out_path) != seq:
+                    self.stats["stale"] += 1
+                    return
+                self.stats["unchecked"] += 1
+                print(f"⚠️ UNCHECKED '{lemma}' STT 요청 실패{f' ({error})' if error else ''} "
+                      f"→ 임시 파일 유지: {pending_path(out_path)}")
+                return
+            ok, sim, avg_conf, transcript = result
+            conf_str = f"{avg_conf:.2f}" if avg_conf is not None else "n/a"
+            if ok:
+                if self._promote(seq, out_path):
+                    self.stats["pass"] += 1
+                    print(f"✅ PASS  '{lemma}' sim={sim:.2%}, stt_conf={conf_str} → {out_path}")
+                return
+            if self.latest.get(out_path) != seq:
+                # 같은 파일명이 이후 항목으로 다시 저장됨 → 그 항목의 판정에 맡김
+                self.stats["stale"] += 1
+                return
+            self.stats["fail"] += 1
+            os.makedirs(self.quarantine_dir, exist_ok=True)
+            q_path = os.path.join(self.quarantine_dir, os.path.basename(out_path))
+            if os.path.exists(pending_path(out_path)):
+                shutil.move(pending_path(out_path), q_path)
+            with open(os.path.join(self.quarantine_dir, "quarantine.jsonl"), "a", encoding="utf-8") as f:
+                f.write(json.dumps({"lemma": lemma, "file": q_path, "similarity": round(sim, 4),
+                                    "confidence": avg_conf, "transcript": transcript}, ensure_ascii=False) + "\n")
+            print(f"🗑️ FAIL  '{lemma}' sim={sim:.2%}, stt_conf={conf_str} → 격리: {q_path}")
+
+    def close(self) -> dict:
+        self.pool.shutdown(wait=True)
+        self.cache.close()
+        return self.stats
+
 def synthesize_vocab_audio(json_file_path):
     try:
         tts_client = texttospeech.TextToSpeechClient()
@@ -158,11 +286,22 @@ def synthesize_vocab_audio(json_file_path):
         print(f"JSON 파일 열기 실패: {e}")
         return
 
+    # ✅ 항목별 성별 (VOICE_ASSIGN=index면 gender_for_index와 같음)
+    try:
+        males = assign_males([item_key(it.get("lemma")) for it in vocab_list],
+                             table_path=voice_table_path(json_file_path), start_male=(START_GENDER == "male"))
+    except Exception as e:
+        print(f"보이스 배정 실패(VOICE_ASSIGN={VOICE_ASSIGN}): {e}")
+        return
+
     output_dir = "A1_1_audio_generated_duo"  # 충돌 방지용 새 폴더
     os.makedirs(output_dir, exist_ok=True)
 
-    print(f"🎧 '{output_dir}' 폴더에 음성 파일 생성을 시작합니다...\n")
     total = len(vocab_list)
+    gate = SttGate(stt_client, output_dir)
+    print(f"🎧 '{output_dir}' 폴더에 음성 파일 생성을 시작합니다...")
+    print(f"    STT 게이트: workers={STT_WORKERS}, 16kHz mono, 실패 시 '{os.path.join(output_dir, QUARANTINE_DIR)}' 격리, "
+          f"길이 분류={'on' if gate.triage is not None else 'off'}\n")
 
     for i, item in enumerate(vocab_list):
         lemma = item.get("lemma")
@@ -172,12 +311,13 @@ def synthesize_vocab_audio(json_file_path):
             print(f"[{i+1}/{total}] 건너뜀: lemma 또는 koChirpScript 없음.")
             continue
 
-        # ✅ 이 항목 전체에 적용할 성별 결정 (교대)
-        gender = gender_for_index(i, START_GENDER)
+        # ✅ 이 항목 전체에 적용할 성별 결정 (교대 또는 VOICE_ASSIGN)
+        gender = "male" if males[i] else "female"
         voice_map = VOICE_SETS[gender]
         print(f"[{i+1}/{total}] '{lemma}' → {gender} 보이스")
 
         merged_audio = AudioSegment.empty()
+        spoken = []  # (보이스, 언어, 텍스트) - 길이 분류용
         for lang_code, seg_text in split_script_by_language(script_text):
             if not seg_text or not lang_code:
                 continue
@@ -194,23 +334,27 @@ def synthesize_vocab_audio(json_file_path):
                 )
                 audio_part = AudioSegment.from_file(BytesIO(resp.audio_content), format="mp3")
                 merged_audio += audio_part
+                spoken.append((voice.name, lang_code, seg_text))
             except Exception as e:
                 print(f"❌ 합성 오류: '{seg_text}' ({gender}/{lang_code}) → {e}")
 
         if len(merged_audio) > 0:
-            # ✅ STT 품질 게이트: 통과 시에만 저장
-            ok, sim, avg_conf, transcript = _stt_passes(merged_audio, script_text, stt_client)
-            if ok:
-                out_path = os.path.join(output_dir, f"{sanitize_filename(lemma)}.mp3")
-                merged_audio.export(out_path, format="mp3")
-                conf_str = f"{avg_conf:.2f}" if avg_conf is not None else "n/a"
-                print(f"✅ PASS  sim={sim:.2%}, stt_conf={conf_str} → 저장: {out_path}")
-            else:
-                conf_str = f"{avg_conf:.2f}" if avg_conf is not None else "n/a"
-                print(f"🗑️ FAIL  sim={sim:.2%}, stt_conf={conf_str} → 미저장: '{lemma}'")
+            # ✅ 임시 파일로 저장 후 STT 품질 게이트는 비동기로 (PASS면 최종 경로로, FAIL이면 격리 폴더로 이동)
+            out_path = os.path.join(output_dir, f"{sanitize_filename(lemma)}.mp3")
+            tmp_path = gate.claim(i, out_path)
+            merged_audio.export(tmp_path, format="mp3")
+            gate.submit(i, lemma, out_path, merged_audio, script_text, spoken)
+            print(f"💾 임시 저장: {tmp_path} (STT 확인 대기)")
         else:
             print(f"⚠️ '{lemma}'에 대해 유효한 음성이 없음.")
 
+    print("\n⏳ STT 게이트 결과 대기...")
+    stats = gate.close()
+    print(f"📊 STT: PASS {stats['pass']}, FAIL(격리) {stats['fail']}, 덮어쓰기로 생략 {stats['stale']}, "
+          f"길이 정상으로 생략 {stats['triaged']}, 판정 불가 {stats['unchecked']}, 캐시 적중 {gate.cache.hits}")
+    if stats["unchecked"]:
+        print(f"⚠️ STT 요청 실패로 확인하지 못한 파일 {stats['unchecked']}개는 '*{PENDING_SUFFIX}'로 남아 있습니다 "
+              f"(다시 실행하면 재생성·재확인)")
     print(f"\n✅ 완료: '{output_dir}' 확인")
 
 if __name__ == "__main__":
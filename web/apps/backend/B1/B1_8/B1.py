@@ -8,6 +8,10 @@ from io import BytesIO
 from google.cloud import texttospeech
 from pydub import AudioSegment
 
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from audio_common.script_segment import segment
+
 
 def sanitize_filename(name):
     name = re.sub(r'[\\/*?:"<>|]', "", name)
@@ -15,29 +19,8 @@ def sanitize_filename(name):
 
 
 def split_script_by_language(script_text):
-    """한글/영어 혼합 텍스트를 언어별로 분리."""
-    segments = []
-    current_lang, buf = None, ""
-
-    for ch in script_text:
-        if '\uac00' <= ch <= '\ud7af':  # 한글
-            lang = 'en-US'
-        elif 'a' <= ch.lower() <= 'z':
-            lang = 'en-US'
-        elif ch.isspace():
-            lang = current_lang
-        else:
-            lang = current_lang
-
-        if lang != current_lang and buf:
-            segments.append((current_lang, buf))
-            buf = ""
-        buf += ch
-        current_lang = lang
-
-    if buf:
-        segments.append((current_lang, buf))
-    return segments
+    """한글/영어 혼합 텍스트를 언어별로 분리. (script_segment 'en_voice' 프로필)"""
+    return segment("en_voice", script_text)
 
 
 # ✅ 성별에 따라 보이스 묶음 정의 (필요 시 이름을 환경에 맞게 조정)
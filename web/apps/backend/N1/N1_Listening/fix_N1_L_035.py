@@ -11,6 +11,7 @@ import os
 os.environ["GRPC_DNS_RESOLVER"] = "native"
 
 import re
+import sys
 import json
 import argparse
 from io import BytesIO
@@ -19,6 +20,10 @@ from typing import List, Tuple, Any, Dict
 from google.cloud import texttospeech
 from pydub import AudioSegment
 
+# 공용 모듈(audio_common) 경로 등록
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from audio_common.text_normalize import normalize
+
 # ----------------------
 # 공용 오디오 설정
 # ----------------------
@@ -30,29 +35,10 @@ AUDIO_CONFIG = texttospeech.AudioConfig(
 # 한국어 제거 함수 (강화버전)
 # ----------------------
 def remove_korean_translation(text: str) -> str:
-    """한국어 번역 부분을 더 정확하게 제거하는 함수"""
-    if not text:
-        return text
-
-    # 1. 소괄호와 그 안의 한국어 번역 완전 제거
-    result = re.sub(r'[（(][^）)]*[）)]', '', text)
-
-    # 2. 대괄호, 중괄호는 괄호만 제거하고 내용 유지
-    result = re.sub(r'[［\[]', '', result)
-    result = re.sub(r'[］\]]', '', result)
-    result = re.sub(r'[｛\{]', '', result)
-    result = re.sub(r'[｝\}]', '', result)
-
-    # 3. 한글 문자 완전 제거 (가-힣, ㄱ-ㅎ, ㅏ-ㅣ)
-    result = re.sub(r'[가-힣ㄱ-ㅎㅏ-ㅣ]', '', result)
-
-    # 4. 연속된 공백을 하나로 정리
-    result = re.sub(r'\s+', ' ', result)
-
-    # 5. 문장 끝의 불필요한 공백이나 구두점 정리
-    result = result.strip()
-
-    return result
+    """한국어 번역 부분을 더 정확하게 제거하는 함수
+    소괄호+내용 제거, 대/중괄호 문자 제거, 한글 제거, 공백 정리 (text_normalize 'ja_only' 프로필)
+    """
+    return normalize("ja_only", text)
 
 def sanitize_filename(name: str) -> str:
     return re.sub(r'[\\/*?:"<>| ]+', "_", str(name)).strip("_")
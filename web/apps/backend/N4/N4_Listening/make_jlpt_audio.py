@@ -12,7 +12,17 @@ make_jlpt_audio.py
   * options가 list[dict]이고 길이가 질문 수와 같으면 문항별 개별 옵션 적용
 - 보이스: 항목 인덱스 기준 ja-JP 사용, A=Charon, B=Laomedeia, Q=Aoede
 - 출력 속도: 기본 0.8배속(피치 유지, ffmpeg atempo), --tempo로 조정 가능
-- 안전장치: 항목당 export 1회 강제, --purge-out 로 출력 폴더의 기존 .mp3 삭제
+- 합성: 같은 보이스 연속 구간(프리픽스→질문→옵션, 같은 화자 연속 턴)은 SSML <break>로 병합해
+          요청 1회, SSML 미지원 보이스는 짧은 반복 문구(라벨/프리픽스)만 재사용 (--no-coalesce로 끄기)
+- 인덱스: 항목마다 {id}.json 구간 오프셋(턴/질문/옵션 시작·끝 ms, 배속 반영) 저장,
+          --vtt 면 {id}.vtt 도 저장 (--no-index로 끄기)
+- 안전장치: 항목당 export 1회 강제, --purge-out 로 출력 폴더의 기존 .mp3(+ 구간 인덱스 사이드카) 삭제
+- 스트리밍: --stream 이면 구간이 준비되는 대로 ffmpeg 파이프로 바로 인코딩
+          (항목 전체를 메모리에 이어 붙이지 않고 임시 WAV도 없음, 긴 항목 병렬 생성용)
+- 분산: --shard i/N 이면 항목 id 키 해시로 나눈 i번째 몫만 생성 (audio_common/sharding.py)
+          모든 샤드가 끝나면 이 폴더에서 python ../../merge_shards.py 로 보고서 병합 (_shards/는 실행 폴더 기준)
+          --queue 면 고정 분할 대신 작업 큐에서 항목을 하나씩 임대 (audio_common/work_queue.py,
+          워커를 실행 중에 더 띄우거나 끄면 되고, 죽은 워커의 항목은 임대 만료 뒤 다른 워커가 처리)
 
 필수:
   pip install google-cloud-texttospeech pydub
@@ -27,6 +37,7 @@ import os
 os.environ["GRPC_DNS_RESOLVER"] = "native"
 
 import re
+import sys
 import json
 import argparse
 from io import BytesIO
@@ -35,6 +46,15 @@ from typing import List, Tuple, Any, Dict
 from google.cloud import texttospeech
 from pydub import AudioSegment
 
+# 공용 모듈(audio_common) 경로 등록
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from audio_common.text_normalize import normalize
+from audio_common.listening_plan import ListeningPlan, narrator_override, purge_outputs, render_to_file
+from audio_common.cue_index import write_sidecars
+from audio_common.output_ladder import OutputLadder
+from audio_common.sharding import item_cost, parse_shard, text_chars
+from audio_common.work_queue import WORK_QUEUE, open_run
+
 # ----------------------
 # 공용 오디오 설정
 # ----------------------
@@ -54,19 +74,7 @@ def remove_parentheses(text: str) -> str:
     """소괄호() 및 그 내부 텍스트만 제거, 다른 괄호[]{}는 괄호만 제거하고 내용은 유지
     예: "こんにちは (안녕하세요) [test] {日本語}" -> "こんにちは test 日本語"
     """
-    if not text:
-        return text
-    # 소괄호와 내부 내용 제거 (전각/반각)
-    result = re.sub(r'[（(][^）)]*[）)]', '', text)
-    # 대괄호는 괄호만 제거하고 내용 유지 (전각/반각)
-    result = re.sub(r'[［\[]', '', result)
-    result = re.sub(r'[］\]]', '', result)
-    # 중괄호는 괄호만 제거하고 내용 유지 (전각/반각)
-    result = re.sub(r'[｛\{]', '', result)
-    result = re.sub(r'[｝\}]', '', result)
-    # 여러 공백을 하나로 정리
-    result = re.sub(r'\s+', ' ', result)
-    return result.strip()
+    return normalize("listening", text)
 
 def parse_script_ordered(script: str) -> List[Tuple[str, str]]:
     """'A: ... B: ...' -> [('A','...'), ('B','...'), ...]
@@ -168,32 +176,22 @@ def synthesize(
     client: texttospeech.TextToSpeechClient,
     text: str,
     voice: texttospeech.VoiceSelectionParams,
+    ssml: bool = False,
 ) -> AudioSegment:
-    # 소괄호 내용 제거, 다른 괄호는 괄호만 제거
-    text = remove_parentheses(text)
+    # 소괄호 내용 제거, 다른 괄호는 괄호만 제거 (SSML은 ListeningPlan에서 파트별로 이미 처리)
+    if not ssml:
+        text = remove_parentheses(text)
     if not text:
         return AudioSegment.silent(duration=0)
-    synthesis_input = texttospeech.SynthesisInput(text=text)
+    synthesis_input = (
+        texttospeech.SynthesisInput(ssml=text) if ssml else texttospeech.SynthesisInput(text=text)
+    )
     resp = client.synthesize_speech(
         input=synthesis_input, voice=voice, audio_config=AUDIO_CONFIG
     )
     return AudioSegment.from_file(BytesIO(resp.audio_content), format="mp3")
 
 
-def purge_dir_mp3(out_dir: str):
-    if not os.path.isdir(out_dir):
-        return
-    removed = 0
-    for name in os.listdir(out_dir):
-        if name.lower().endswith(".mp3"):
-            try:
-                os.remove(os.path.join(out_dir, name))
-                removed += 1
-            except Exception:
-                pass
-    print(f"[PURGE] {out_dir} 내 기존 MP3 {removed}개 삭제")
-
-
 # ----------------------
 # 보이스 로테이션
 # ----------------------
@@ -264,7 +262,7 @@ def main():
     )
     parser.add_argument("--prefix-single", dest="prefix_single", default="もんだいばんごういち。", help="단일 질문 프리픽스")
     parser.add_argument("--prefix-format", dest="prefix_format", default="もんだいばんごう{n}。", help="다수 질문 프리픽스 포맷")
-    parser.add_argument("--purge-out", dest="purge_out", action="store_true", help="시작 전 출력 폴더의 기존 MP3 삭제")
+    parser.add_argument("--purge-out", dest="purge_out", action="store_true", help="시작 전 출력 폴더의 기존 MP3와 구간 인덱스 사이드카 삭제")
     parser.add_argument(
         "--rotate",
         dest="rotate",
@@ -279,11 +277,22 @@ def main():
         help="전체 출력 배속(피치 유지). 예: 0.8=느리게, 1.0=기본, 1.25=빠르게",
     )
 
+    parser.add_argument("--no-coalesce", dest="coalesce", action="store_false",
+                        help="같은 보이스 구간 SSML 병합 끄기(스텝마다 개별 요청)")
+    parser.add_argument("--no-index", dest="index", action="store_false",
+                        help="구간 오프셋 인덱스({id}.json) 저장 안 함")
+    parser.add_argument("--vtt", dest="vtt", action="store_true",
+                        help="WebVTT 사이드카({id}.vtt)도 저장")
+    parser.add_argument("--stream", dest="stream", action="store_true",
+                        help="구간을 ffmpeg 파이프로 바로 인코딩(메모리 = 가장 큰 구간 1개, 임시 WAV 없음)")
+    parser.add_argument("--shard", dest="shard", type=parse_shard, default=None,
+                        help="i/N: 여러 머신에 나눠 생성할 때 이 머신의 몫 (예: 2/4)")
+    parser.add_argument("--queue", dest="queue", nargs="?", const=WORK_QUEUE, default=None,
+                        help=f"작업 큐에서 항목 임대 (기본 {WORK_QUEUE}, --queue=<url>로 지정)")
+
     args = parser.parse_args()
 
     os.makedirs(args.out_dir, exist_ok=True)
-    if args.purge_out:
-        purge_dir_mp3(args.out_dir)
 
     try:
         client = texttospeech.TextToSpeechClient()
@@ -299,17 +308,30 @@ def main():
     if not isinstance(items, list):
         raise SystemExit("입력 JSON 루트는 list 여야 합니다.")
 
-    gap_turn = AudioSegment.silent(duration=max(0, args.gap_turn_ms))
-    gap_q = AudioSegment.silent(duration=max(0, args.gap_q_ms))
-    gap_qprefix = AudioSegment.silent(duration=max(0, args.gap_qprefix_ms))
-    gap_opt = AudioSegment.silent(duration=max(0, args.gap_opt_ms))
+    # 샤드 분할: 키=항목 id(출력 파일 이름), 비용=합성할 텍스트 글자 수
+    item_ids = [sanitize_filename(it.get("id") or f"item_{idx:03d}") for idx, it in enumerate(items, 1)]
+    try:
+        run = open_run("listening", args.input_json, item_ids, [item_cost(text_chars(it)) for it in items],
+                       shard=args.shard, queue=args.queue)
+    except ValueError as e:
+        raise SystemExit(f"작업 큐/샤드 준비 실패: {e}")
+    if args.purge_out:
+        # 샤드/큐 모드: 다른 워커의 출력은 두고 데이터셋에 없는 id의 MP3/사이드카만 삭제
+        purge_outputs(args.out_dir, keep=set(item_ids) if run.label else ())
+
+    gap_turn = max(0, args.gap_turn_ms)
+    gap_q = max(0, args.gap_q_ms)
+    gap_qprefix = max(0, args.gap_qprefix_ms)
+    gap_opt = max(0, args.gap_opt_ms)
     # gap_* 만들던 곳에 추가
-    gap_q2opt = AudioSegment.silent(duration=max(0, args.gap_q2opt_ms))
-    gap_opt_hold = AudioSegment.silent(duration=max(0, args.gap_opt_hold_ms))  # 라벨→본문 대기(기본 2초)
+    gap_q2opt = max(0, args.gap_q2opt_ms)
+    gap_opt_hold = max(0, args.gap_opt_hold_ms)  # 라벨→본문 대기(기본 2초)
 
     # 로테이션 코드 목록 준비
     rotation_codes = parse_rotation_list(args.rotate)
     voice_cache = {}  # language_code -> built voices
+    ladder = OutputLadder(level_depth=1)  # AUDIO_LADDER 설정 시 out_dir에 Opus/AAC 등 변형 추가
+    synth_memo = {}  # (보이스, 짧은 문구) → 오디오: 옵션 라벨/문항 프리픽스 재사용
 
     # atempo 파라미터 구성
     tempo = float(args.tempo)
@@ -323,8 +345,10 @@ def main():
     print(f"총 {total}건 처리 → 출력: {args.out_dir}")
     print(f"보이스 로테이션: {rotation_codes}")
     print(f"출력 배속(피치 유지): {tempo}")
+    print(f"샤드: {run.banner()}")
 
-    for idx, it in enumerate(items, 1):
+    for i0 in run.indices():
+        idx, it = i0 + 1, items[i0]
         item_id = sanitize_filename(it.get("id") or f"item_{idx:03d}")
 
         # 이미 생성된 오디오 파일이 있는지 확인
@@ -340,46 +364,41 @@ def main():
         # 이번 항목의 언어코드/보이스 세트 결정 (라운드 로빈)
         lang = rotation_codes[(idx - 1) % len(rotation_codes)]
         if lang not in voice_cache:
-            voice_cache[lang] = build_voice_set(lang)
+            voice_cache[lang] = narrator_override(build_voice_set(lang))
         VOICES = voice_cache[lang]  # {"A":..., "B":..., "Q":...}
 
         print(f"[{idx}/{total}] id={item_id}  |  voice={lang}")
 
-        audio_mix = AudioSegment.silent(duration=0)
+        cues = []  # 구간 오프셋 (배속 적용 전 ms)
+        plan = ListeningPlan(prepare=remove_parentheses)  # 오디오 대신 스텝을 쌓고 마지막에 한 번 렌더
         export_count = 0  # 항목당 export 1회만 허용
 
         # (1) 대화부
         seq = parse_script_ordered(script)
         if seq:
-            for spk, text in seq:
-                voice = VOICES["A"] if spk == "A" else VOICES["B"]
-                try:
-                    seg = synthesize(client, text, voice)
-                except Exception as e:
-                    print(f"  ! 합성 실패({spk}): {e}")
-                    continue
-                audio_mix += seg
-                audio_mix += gap_turn
+            for n, (spk, text) in enumerate(seq, start=1):
+                plan.say(spk, text, soft=True, kind="turn", ref=f"turn.{n}")  # 실패 시 경고 후 건너뜀(기존 동작)
+                plan.gap(gap_turn)
         else:
             print("  - 대화부 스킵(라벨 A:/B: 미검출)")
 
         # (2) 질문부 + 옵션부
         # (2) 질문부 + 옵션부
         if questions:
-            audio_mix += gap_q
+            plan.gap(gap_q)
             opt_mode = options_norm["mode"]
             opt_sets = options_norm["sets"]  # list of list of pairs
 
             if len(questions) == 1:
                 # 질문 프리픽스
-                audio_mix += synthesize(client, args.prefix_single, VOICES["Q"])
-                audio_mix += gap_qprefix
+                plan.say("Q", args.prefix_single, kind="prefix", ref="q1.prefix")
+                plan.gap(gap_qprefix)
                 # 질문 본문
-                audio_mix += synthesize(client, questions[0], VOICES["Q"])
+                plan.say("Q", questions[0], kind="question", ref="q1")
                 print("  - question ▶ 'Question number one.' + question")
 
                 # ▼ 추가: 질문 → 옵션 사이 1.5초 대기
-                audio_mix += gap_q2opt
+                plan.gap(gap_q2opt)
 
                 # 옵션 읽기
                 opts = []
@@ -390,11 +409,11 @@ def main():
                 if opts:
                     for lab, txt in opts:
                         # 보기 사이 간격
-                        audio_mix += gap_opt
+                        plan.gap(gap_opt)
                         # 라벨 → 2초 대기 → 본문
-                        audio_mix += synthesize(client, f"{lab}", VOICES["Q"])
-                        audio_mix += gap_opt_hold
-                        audio_mix += synthesize(client, txt, VOICES["Q"])
+                        plan.say("Q", f"{lab}", kind="option_label", ref=f"q1.{lab}.label")
+                        plan.gap(gap_opt_hold)
+                        plan.say("Q", txt, kind="option", ref=f"q1.{lab}")
                     print(
                         f"  - options ▶ {len(opts)}개 낭독(질문→{args.gap_q2opt_ms}ms→옵션 | 라벨→{args.gap_opt_hold_ms}ms→본문)"
                     )
@@ -404,12 +423,12 @@ def main():
                 # 여러 질문
                 for i, qtext in enumerate(questions, start=1):
                     # 질문 프리픽스 + 본문
-                    audio_mix += synthesize(client, args.prefix_format.replace("{n}", japanese_number(i)), VOICES["Q"])
-                    audio_mix += gap_qprefix
-                    audio_mix += synthesize(client, qtext, VOICES["Q"])
+                    plan.say("Q", args.prefix_format.replace("{n}", japanese_number(i)), kind="prefix", ref=f"q{i}.prefix")
+                    plan.gap(gap_qprefix)
+                    plan.say("Q", qtext, kind="question", ref=f"q{i}")
 
                     # ▼ 추가: 질문 → 옵션 사이 1.5초 대기
-                    audio_mix += gap_q2opt
+                    plan.gap(gap_q2opt)
 
                     # 해당 질문의 옵션 선택
                     opts = []
@@ -420,28 +439,52 @@ def main():
                     # 옵션 읽기
                     if opts:
                         for lab, txt in opts:
-                            audio_mix += gap_opt
-                            audio_mix += synthesize(client, f"{lab}", VOICES["Q"])
-                            audio_mix += gap_opt_hold
-                            audio_mix += synthesize(client, txt, VOICES["Q"])
+                            plan.gap(gap_opt)
+                            plan.say("Q", f"{lab}", kind="option_label", ref=f"q{i}.{lab}.label")
+                            plan.gap(gap_opt_hold)
+                            plan.say("Q", txt, kind="option", ref=f"q{i}.{lab}")
                         print(
                             f"  - question {i} options ▶ {len(opts)}개 낭독(질문→{args.gap_q2opt_ms}ms→옵션 | 라벨→{args.gap_opt_hold_ms}ms→본문)"
                         )
                     else:
                         print(f"  - question {i} options 없음/미정규화")
                     # 문항 간 아주 짧은 간격
-                    audio_mix += gap_qprefix
+                    plan.gap(gap_qprefix)
                 print(f"  - questions ▶ {len(questions)}개 처리 완료")
         else:
             print("  - question 없음")
 
-        # (3) 저장: 항목당 '정확히 한 번' export
+        # (3) 합성: 같은 보이스 연속 구간은 SSML <break>로 병합해 요청 1회
+        #     --stream 이면 렌더하면서 바로 인코더 파이프에 기록((4) 저장까지 한 번에)
         if export_count >= 1:
             raise RuntimeError(f"[BUG] export가 2회 이상 시도되었습니다: id={item_id}")
-        audio_mix.export(out_path, format="mp3", parameters=export_params)
+        synth = lambda text, voice, ssml: synthesize(client, text, voice, ssml=ssml)
+        # (4) 저장: 항목당 '정확히 한 번' export
+        n_requests, duration_ms = render_to_file(
+            plan,
+            VOICES,
+            synth,
+            AudioSegment.silent,
+            out_path,
+            export_params,
+            ladder,
+            stream=args.stream,
+            memo=synth_memo,
+            coalesce_voices=args.coalesce,
+            cues=cues,
+        )
+        print(f"  - TTS 요청 {n_requests}회 (스텝 {len(plan)}개)")
+        run.count("items")
+        run.count("requests", n_requests)
+        run.count("duration_ms", duration_ms)
         export_count += 1
-        print(f"  => 저장(1/1): {out_path}  ({len(audio_mix)} ms)\n")
+        if args.index:
+            for p in write_sidecars(out_path, item_id, cues, duration_ms, tempo, vtt=args.vtt):
+                print(f"  => 인덱스: {p}")
+        print(f"  => 저장(1/1): {out_path}  ({duration_ms} ms)\n")
 
+    ladder.close()
+    run.finish()
     print("완료.")
 
 
@@ -1,64 +1,138 @@
 # analyze_vocabs.py
-import json, re, unicodedata, collections, csv, argparse
-
-def nfkc(s): return unicodedata.normalize("NFKC", s) if isinstance(s,str) else ""
-def squash(s): 
-    import re; return re.sub(r"\s+"," ", s).strip()
-def norm_lemma(s): return squash(nfkc(s).lower())
-def norm_pos(s): 
-    m = {"n":"noun","n.":"noun","noun":"noun","v":"verb","v.":"verb","verb":"verb",
-         "a":"adjective","adj":"adjective","adj.":"adjective","adjective":"adjective",
-         "adv":"adverb","adv.":"adverb","adverb":"adverb"}
-    x = squash(nfkc(s).lower())
-    return m.get(x,x)
-def strip_punct(s):
-    import re; return squash(re.sub(r"[^\w\s가-힣·]", " ", s))
-def norm_kox(s): return strip_punct(nfkc(s).lower())
+"""
+어휘 데이터셋 중복/겹침 분석 (역색인 1회 순회)
+
+여러 데이터셋(CEFR, IELTS 레벨 파일, N1~N5, idiom …)을 한 번씩만 읽으면서
+lemma, lemma+pos, romaji, kana, koExample, koGloss 정규화 값 → 항목 id 역색인을 만들고,
+그 색인에서 바로 중복 클러스터 / 데이터셋 간 겹침 / 필드별 카디널리티를 뽑습니다.
+(전체 시간 = 항목 수에 선형, 클러스터마다 전체 목록을 다시 훑지 않음)
+
+사용:
+  python analyze_vocabs.py -i cefr_vocabs_updated.json           # 기존 사용법 그대로
+  python analyze_vocabs.py -i cefr ielts jlpt idiom --out-dir vocab_report
+  python analyze_vocabs.py -i "A1/*/ielts_*.json" --by file
+
+출력 (--out-dir):
+  cardinality.csv     field, items, unique, dup_keys, dup_items, max_cluster
+  clusters.jsonl      {"field", "key", "size", "datasets", "items": [{"id", "lemma", "pos"}]}
+  cross_dataset.csv   field, dataset_a, dataset_b, shared_keys
+  (--dump-koexample-csv) koExample 중복 클러스터 CSV (기존 형식)
+"""
+import os, json, csv, argparse, collections, itertools
+
+from audio_common.vocab_datasets import (
+    dataset_group, dataset_name, field, iter_items, nfkc, norm_lemma, norm_pos, norm_text, resolve_sources, squash,
+)
+
+INDEX_FIELDS = ["lemma", "lemma+pos", "romaji", "kana", "koExample", "koGloss"]
+
+
+def index_keys(item):
+    """항목 → {색인 필드: 정규화 키} (빈 값은 제외)"""
+    ln = norm_lemma(field(item, "lemma"))
+    keys = {
+        "lemma": ln,
+        "lemma+pos": f"{ln}\t{norm_pos(field(item, 'pos'))}" if ln else "",
+        "romaji": norm_lemma(field(item, "romaji")),
+        "kana": squash(nfkc(field(item, "kana"))),
+        "koExample": norm_text(field(item, "koExample")),
+        "koGloss": norm_text(field(item, "koGloss")),
+    }
+    return {k: v for k, v in keys.items() if v}
+
 
 ap = argparse.ArgumentParser()
-ap.add_argument("-i","--input",required=True)
+ap.add_argument("-i", "--input", nargs="+", required=True, help="파일 / glob / 그룹(cefr, total, ielts, jlpt, idiom)")
+ap.add_argument("--by", choices=["group", "file"], default="group", help="데이터셋 간 겹침 집계 단위")
+ap.add_argument("--out-dir", default=None, help="CSV/JSONL 리포트 폴더")
 ap.add_argument("--dump-koexample-csv", default="koexample_dups.csv")
 args = ap.parse_args()
 
-data = json.load(open(args.input,"r",encoding="utf-8"))
-L = len(data)
+paths = resolve_sources(args.input)
+if not paths:
+    raise SystemExit(f"[ERROR] no dataset files for: {args.input}")
+label_of = {dataset_name(p): (dataset_group(p) if args.by == "group" else dataset_name(p)) for p in paths}
 
-by_lemma = collections.Counter()
-by_lempos = collections.Counter()
-by_koex = collections.Counter()
+# ===== 1회 순회: 역색인 =====
+refs = []    # id → (ItemRef, lemma, pos, definition, koGloss)
+index = {f: collections.defaultdict(list) for f in INDEX_FIELDS}
+for ref, it in iter_items(paths):
+    iid = len(refs)
+    refs.append((ref, field(it, "lemma"), field(it, "pos"), field(it, "definition"), field(it, "koGloss")))
+    for f, key in index_keys(it).items():
+        index[f][key].append(iid)
 
-normed = []
-for it in data:
-    ln = norm_lemma(it.get("lemma",""))
-    pn = norm_pos(it.get("pos",""))
-    kx = norm_kox(it.get("koExample",""))
-    normed.append((ln,pn,kx,it))
-    by_lemma[ln]+=1
-    by_lempos[(ln,pn)]+=1
-    if kx: by_koex[kx]+=1
+L = len(refs)
+print(f"[INFO] files: {len(paths)}  total items: {L}")
 
-print(f"[INFO] total items: {L}")
-print(f"[INFO] unique lemma: {len(by_lemma)}  (dups over lemma: {L-len(by_lemma)})")
-print(f"[INFO] unique lemma+pos: {len(by_lempos)}  (dups over lemma+pos: {L-len(by_lempos)})")
-print(f"[INFO] koExample non-empty unique: {len(by_koex)}  (dups over koExample: {sum(c-1 for c in by_koex.values() if c>1)})")
+# ===== 카디널리티 =====
+card_rows = []
+for f in INDEX_FIELDS:
+    idx = index[f]
+    n_items = sum(len(v) for v in idx.values())
+    dup_sizes = [len(v) for v in idx.values() if len(v) > 1]
+    card_rows.append([f, n_items, len(idx), len(dup_sizes), sum(dup_sizes) - len(dup_sizes), max(dup_sizes, default=1)])
+    print(f"[INFO] {f}: non-empty {n_items}, unique {len(idx)}  (dups over {f}: {n_items - len(idx)})")
 
 print("\n[TOP] lemmas with most entries:")
-for ln,c in by_lemma.most_common(15):
-    if c>1: print(f"  {ln}: {c}")
-
-# dump clusters where koExample identical appears >=2
-rows=[]
-for kx,c in by_koex.items():
-    if c>=2:
-        # collect a few examples
-        items=[it for (ln,pn,kx2,it) in normed if kx2==kx][:8]
-        for it in items:
-            rows.append([kx, it.get("lemma",""), it.get("pos",""), (it.get("definition","") or "")[:120], it.get("koGloss","")])
+for ln, ids in sorted(index["lemma"].items(), key=lambda kv: -len(kv[1]))[:15]:
+    if len(ids) > 1:
+        print(f"  {ln}: {len(ids)}")
+
+# ===== 데이터셋 간 겹침 (키별 데이터셋 집합에서 바로 집계) =====
+cross = collections.Counter()
+for f in INDEX_FIELDS:
+    for ids in index[f].values():
+        if len(ids) < 2:
+            continue
+        ds = sorted({label_of[refs[i][0].dataset] for i in ids})
+        for a, b in itertools.combinations(ds, 2):
+            cross[(f, a, b)] += 1
+if cross:
+    print("\n[CROSS] shared keys between datasets (top 10):")
+    for (f, a, b), n in cross.most_common(10):
+        print(f"  {f}: {a} ∩ {b} = {n}")
+
+# ===== 리포트 =====
+if args.out_dir:
+    os.makedirs(args.out_dir, exist_ok=True)
+    with open(os.path.join(args.out_dir, "cardinality.csv"), "w", newline="", encoding="utf-8") as fo:
+        w = csv.writer(fo)
+        w.writerow(["field", "items", "unique", "dup_keys", "dup_items", "max_cluster"])
+        w.writerows(card_rows)
+    n_clusters = 0
+    with open(os.path.join(args.out_dir, "clusters.jsonl"), "w", encoding="utf-8") as fo:
+        for f in INDEX_FIELDS:
+            for key, ids in sorted(index[f].items(), key=lambda kv: -len(kv[1])):
+                if len(ids) < 2:
+                    break
+                n_clusters += 1
+                fo.write(json.dumps({
+                    "field": f,
+                    "key": key,
+                    "size": len(ids),
+                    "datasets": sorted({label_of[refs[i][0].dataset] for i in ids}),
+                    "items": [{"id": refs[i][0].id, "lemma": refs[i][1], "pos": refs[i][2]} for i in ids],
+                }, ensure_ascii=False) + "\n")
+    with open(os.path.join(args.out_dir, "cross_dataset.csv"), "w", newline="", encoding="utf-8") as fo:
+        w = csv.writer(fo)
+        w.writerow(["field", "dataset_a", "dataset_b", "shared_keys"])
+        for (f, a, b), n in sorted(cross.items(), key=lambda kv: (kv[0][0], -kv[1])):
+            w.writerow([f, a, b, n])
+    print(f"\n[INFO] Reports → {args.out_dir}/ (cardinality.csv, clusters.jsonl {n_clusters} clusters, cross_dataset.csv)")
+
+# dump clusters where koExample identical appears >=2 (역색인에서 바로 조회)
+rows = []
+for kx, ids in index["koExample"].items():
+    if len(ids) >= 2:
+        for i in ids[:8]:
+            _, lemma, pos, definition, ko_gloss = refs[i]
+            rows.append([kx, lemma, pos, (definition or "")[:120], ko_gloss])
 
 if rows:
     with open(args.dump_koexample_csv, "w", newline="", encoding="utf-8") as f:
-        w=csv.writer(f)
-        w.writerow(["koExample_norm","lemma","pos","definition_head","koGloss"])
+        w = csv.writer(f)
+        w.writerow(["koExample_norm", "lemma", "pos", "definition_head", "koGloss"])
         w.writerows(rows)
     print(f"\n[INFO] Dumped koExample duplicate clusters → {args.dump_koexample_csv}")
 else:
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""
+audio_common: 오디오 생성기(jlpt/, A1~C1/, N1~N5/, make_word_gloss.py 등) 공용 모듈
+
+각 생성기 스크립트는 독립 실행형이므로, 스크립트 위치에서 backend 루트를
+sys.path에 추가한 뒤 import 합니다.
+
+  sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+  from audio_common.text_normalize import normalize
+
+무거운 의존성(google-cloud-texttospeech, pydub 등)은 이 패키지 import 시점에
+로드하지 않습니다.
+"""
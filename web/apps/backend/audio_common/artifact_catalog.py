@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+오디오 산출물 카탈로그 (SQLite 1개 파일)
+
+"N3에서 example.mp3가 없는 단어", "300ms 미만 파일", "-14 dBFS보다 큰 gloss" 같은
+질문을 파일 트리를 걷거나 전부 디코드하지 않고 SQL 한 번으로 답하기 위한 색인입니다.
+파일마다 1행:
+
+  artifacts(path, level, item, kind, size, mtime, duration_ms, sample_rate, channels,
+            dbfs, peak_dbfs, md5, voice, input_key)
+    path       jlpt/n3/ishi2/example.mp3  (backend 기준 상대 경로, '/' 구분)
+    level      jlpt/n3 / item  ishi2 / kind  example
+    md5        audio_manifest.json과 같은 base64 MD5
+    voice, input_key   생성기가 기록 (audio_manifest.json의 "voice", "key")
+    dbfs/peak_dbfs     PCM 기준 RMS/피크 (pydub dBFS/max_dBFS와 같은 정의, 무음은 -inf)
+
+채우는 경로 두 가지:
+  - 생성기: AudioManifest가 파일을 저장할 때 같은 바이트의 MP3 헤더와 세그먼트 음량으로
+    바로 기록 (추가 디코드 없음)
+  - catalog_audio.py build: 레벨 폴더를 병렬 os.scandir로 걷고, 새 파일/바뀐 파일
+    (size/mtime)만 프로세스 풀에서 헤더 + PCM 측정
+
+환경변수(옵션):
+  AUDIO_CATALOG=audio_catalog.sqlite   # 카탈로그 경로, 0/off면 생성기 기록 끔
+"""
+
+import base64
+import hashlib
+import os
+import sqlite3
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .mp3_frames import scan as scan_mp3
+from .output_ladder import is_variant_file
+
+_ENV_CATALOG = os.getenv("AUDIO_CATALOG", "audio_catalog.sqlite").strip()
+AUDIO_CATALOG = "" if _ENV_CATALOG.lower() in ("0", "false", "off", "") else _ENV_CATALOG
+
+# 생성기 출력 레벨 폴더 (make_word_gloss.py LEVEL_MAP, jlpt/make_jlpt_audio.py)
+DEFAULT_LEVELS = ["starter", "elementary", "intermediate", "upper", "advanced",
+                  "jlpt/n1", "jlpt/n2", "jlpt/n3", "jlpt/n4", "jlpt/n5"]
+
+COLUMNS = ("path", "level", "item", "kind", "size", "mtime", "duration_ms", "sample_rate", "channels",
+           "dbfs", "peak_dbfs", "md5", "voice", "input_key")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    path        TEXT PRIMARY KEY,
+    level       TEXT NOT NULL,
+    item        TEXT NOT NULL,
+    kind        TEXT NOT NULL,
+    size        INTEGER,
+    mtime       REAL,
+    duration_ms REAL,
+    sample_rate INTEGER,
+    channels    INTEGER,
+    dbfs        REAL,
+    peak_dbfs   REAL,
+    md5         TEXT,
+    voice       TEXT,
+    input_key   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_level_item ON artifacts(level, item);
+CREATE INDEX IF NOT EXISTS idx_artifacts_kind_duration ON artifacts(kind, duration_ms);
+CREATE INDEX IF NOT EXISTS idx_artifacts_kind_dbfs ON artifacts(kind, dbfs);
+CREATE INDEX IF NOT EXISTS idx_artifacts_md5 ON artifacts(md5);
+CREATE INDEX IF NOT EXISTS idx_artifacts_input_key ON artifacts(input_key);
+"""
+
+_UPSERT = (f"INSERT OR REPLACE INTO artifacts ({', '.join(COLUMNS)}) "
+           f"VALUES ({', '.join('?' for _ in COLUMNS)})")
+
+
+# ===== 행 구성 =====
+def split_path(path: str, level: str) -> Dict[str, str]:
+    """경로 → {"path", "level", "item", "kind"} (item = 레벨 폴더 아래 디렉터리)"""
+    path = os.path.normpath(path)
+    level = os.path.normpath(level)
+    rel = os.path.relpath(path, level)
+    item = os.path.dirname(rel)
+    return {
+        "path": path.replace(os.sep, "/"),
+        "level": level.replace(os.sep, "/"),
+        "item": item.replace(os.sep, "/") or ".",
+        "kind": os.path.splitext(os.path.basename(path))[0],
+    }
+
+
+def header_info(data: bytes) -> Dict[str, Any]:
+    """MP3 바이트 → {"duration_ms", "sample_rate", "channels"} (프레임이 없으면 빈 dict)"""
+    try:
+        info = scan_mp3(data)
+    except ValueError:
+        return {}
+    return {"duration_ms": round(info.duration_ms, 1), "sample_rate": info.sample_rate, "channels": info.channels}
+
+
+def md5_b64(data: bytes) -> str:
+    return base64.b64encode(hashlib.md5(data).digest()).decode("ascii")
+
+
+def probe_file(path: str, level: str, pcm: bool = True) -> Dict[str, Any]:
+    """
+    파일 1개 측정 (프로세스 풀 워커) → 카탈로그 행
+    pcm=False면 헤더만 (dbfs/peak_dbfs는 None)
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    st = os.stat(path)
+    row: Dict[str, Any] = dict(split_path(path, level), size=len(data), mtime=st.st_mtime, md5=md5_b64(data))
+    row.update(header_info(data))
+    if pcm and data:
+        from .pcm_probe import decode_pcm, loudness  # 지연 import (numpy)
+
+        samples, _, _ = decode_pcm(path)
+        row["dbfs"], row["peak_dbfs"] = loudness(samples)
+    return row
+
+
+# ===== 병렬 디렉터리 순회 =====
+def _scan_dir(path: str) -> Tuple[List[Tuple[str, int, float]], List[str]]:
+    """디렉터리 1개 → (MP3 [(경로, size, mtime)], 하위 디렉터리)"""
+    files, dirs = [], []
+    with os.scandir(path) as it:
+        for e in it:
+            if e.is_dir(follow_symlinks=False):
+                if not e.name.startswith((".", "_")):  # .disambig_staging, _orphans 등 작업 폴더 제외
+                    dirs.append(e.path)
+            elif e.name.endswith(".mp3") and not is_variant_file(e.name):
+                st = e.stat()
+                files.append((e.path, st.st_size, st.st_mtime))
+    return files, dirs
+
+
+def walk_mp3(root: str, threads: int = 16) -> Iterator[Tuple[str, int, float]]:
+    """root 아래 MP3 (경로, size, mtime) - 디렉터리마다 scandir를 스레드 풀에서 실행"""
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        pending = {pool.submit(_scan_dir, root)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                files, dirs = fut.result()
+                yield from files
+                pending.update(pool.submit(_scan_dir, d) for d in dirs)
+
+
+# ===== 카탈로그 =====
+def connect(path: str = AUDIO_CATALOG) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")  # 생성기 여러 개가 동시에 기록해도 읽기 차단 없음
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def upsert(conn: sqlite3.Connection, rows: Iterable[Dict[str, Any]]) -> int:
+    values = [tuple(r.get(c) for c in COLUMNS) for r in rows]
+    with conn:
+        conn.executemany(_UPSERT, values)
+    return len(values)
+
+
+def delete_paths(conn: sqlite3.Connection, paths: Iterable[str]) -> int:
+    values = [(p,) for p in paths]
+    with conn:
+        conn.executemany("DELETE FROM artifacts WHERE path = ?", values)
+    return len(values)
+
+
+def stat_index(conn: sqlite3.Connection, level: str) -> Dict[str, tuple]:
+    """레벨의 기존 행 → {path: (size, mtime)} (증분 갱신 비교용)"""
+    cur = conn.execute("SELECT path, size, mtime FROM artifacts WHERE level = ?", (level.replace(os.sep, "/"),))
+    return {r["path"]: (r["size"], r["mtime"]) for r in cur}
+
+
+class CatalogWriter:
+    """
+    생성기용 증분 기록기 (AudioManifest가 저장할 때마다 add → batch 단위 커밋)
+    여러 스레드에서 호출해도 됨. path=""이면 no-op.
+    """
+
+    def __init__(self, path: str = AUDIO_CATALOG, batch: int = 200):
+        self.path = path
+        self.batch = batch
+        self._rows: List[Dict[str, Any]] = []
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.written = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def add(self, row: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._rows.append(row)
+            if len(self._rows) >= self.batch:
+                self._flush()
+
+    def _flush(self) -> None:
+        if not self._rows:
+            return
+        try:
+            if self._conn is None:
+                self._conn = connect(self.path)
+            self.written += upsert(self._conn, self._rows)
+        except sqlite3.Error as e:
+            # 카탈로그는 보조 색인 - 실패해도 생성은 계속 (catalog_audio.py build로 다시 채움)
+            print(f"  ⚠️ 카탈로그 기록 실패 ({self.path}): {e}")
+        self._rows = []
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
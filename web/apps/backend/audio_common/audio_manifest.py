@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+해시-온-라이트 오디오 매니페스트 (MD5 / CRC32C)
+
+생성기가 MP3를 저장할 때 메모리 버퍼로 먼저 인코딩하고, 같은 바이트에서
+MD5/CRC32C를 계산한 뒤 파일로 씁니다. 그래서 업로드 전에 파일을 다시 읽을
+필요가 없고, sync_audio.py가 이 매니페스트와 버킷 목록을 비교해 새 파일/바뀐
+파일만 업로드합니다. (다시 생성했지만 바이트가 같은 파일은 업로드하지 않음)
+
+레벨 폴더마다 1개:  <레벨 폴더>/audio_manifest.json
+  {"v": 1, "files": {"aisatsu/word.mp3": {"size": 8064, "md5": "<base64>",
+                                          "crc32c": "<base64>", "mtime": 1760000000.0,
+                                          "key": "<sha1>", "voice": "ja-JP-..."}, ...}}
+  - md5/crc32c는 GCS 객체 메타데이터(md5Hash, crc32c)와 같은 base64 형식
+  - key(선택)는 생성에 쓰인 유효 입력의 해시 (audio_reuse.py - 같은 키면 하드링크로 재사용)
+  - voice(선택)는 합성에 쓴 보이스 (여러 개면 '+'로 연결)
+  - 저장할 때마다 같은 바이트의 MP3 헤더/음량을 SQLite 카탈로그에도 기록
+    (artifact_catalog.py - AUDIO_CATALOG=0이면 끔)
+  - mtime/size가 파일과 다르면(생성기 밖에서 수정됨) sync 시 그 파일만 다시 해시
+  - --shard i/N 실행(sharding.py)은 이번 실행에서 저장한 항목만
+    <레벨 폴더>/audio_manifest.shard-<실행>.json 에 쓰고, merge_shards.py가 병합
+
+환경변수(옵션):
+  AUDIO_MANIFEST=0     # 매니페스트 기록 끔 (기본 켬)
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+from .artifact_catalog import CatalogWriter, header_info, split_path
+
+AUDIO_MANIFEST = os.getenv("AUDIO_MANIFEST", "1").strip().lower() not in ("0", "false", "off", "")
+MANIFEST_FILE = "audio_manifest.json"
+MANIFEST_VERSION = 1
+SHARD_MANIFEST_RE = re.compile(r"^audio_manifest\.shard-.+\.json$")
+
+# ===== CRC32C (Castagnoli) =====
+try:  # google-cloud-storage 설치 시 함께 설치되는 C 구현 우선
+    import google_crc32c as _gcrc  # type: ignore
+except Exception:  # pragma: no cover - 선택 의존성
+    _gcrc = None
+
+
+def _make_crc32c_table():
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x82F63B78 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC32C_TABLE = _make_crc32c_table()
+
+
+def crc32c(data: bytes, crc: int = 0) -> int:
+    if _gcrc is not None:
+        return _gcrc.extend(crc, data)
+    crc ^= 0xFFFFFFFF
+    table = _CRC32C_TABLE
+    for b in data:
+        crc = table[(crc ^ b) & 0xFF] ^ (crc >> 8)
+    return crc ^ 0xFFFFFFFF
+
+
+# ===== 다이제스트 =====
+def digest_bytes(data: bytes) -> Dict[str, Any]:
+    """바이트 → {"size", "md5", "crc32c"} (GCS 메타데이터 형식 base64)"""
+    return {
+        "size": len(data),
+        "md5": base64.b64encode(hashlib.md5(data).digest()).decode("ascii"),
+        "crc32c": base64.b64encode(crc32c(data).to_bytes(4, "big")).decode("ascii"),
+    }
+
+
+def digest_file(path: str) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        return digest_bytes(f.read())
+
+
+def same_content(a: Optional[Dict[str, Any]], b: Optional[Dict[str, Any]]) -> bool:
+    """두 다이제스트가 같은 내용인지 (crc32c 우선, 없으면 md5 - 컴포짓 객체는 md5가 없음)"""
+    if not a or not b or a.get("size") != b.get("size"):
+        return False
+    if a.get("crc32c") and b.get("crc32c"):
+        return a["crc32c"] == b["crc32c"]
+    return bool(a.get("md5")) and a.get("md5") == b.get("md5")
+
+
+# ===== 매니페스트 파일 =====
+def shard_manifest_file(tag: str) -> str:
+    return f"audio_manifest.shard-{tag}.json"
+
+
+def is_manifest_file(name: str) -> bool:
+    """매니페스트(병합 전 샤드 매니페스트 포함) 파일 이름인지 - 업로드/스캔 제외용"""
+    return name == MANIFEST_FILE or bool(SHARD_MANIFEST_RE.match(name))
+
+
+def load_manifest(level_dir: str, name: str = MANIFEST_FILE) -> Dict[str, Dict[str, Any]]:
+    path = os.path.join(level_dir, name)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("files", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(level_dir: str, files: Dict[str, Dict[str, Any]], name: str = MANIFEST_FILE) -> str:
+    path = os.path.join(level_dir, name)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"v": MANIFEST_VERSION, "files": dict(sorted(files.items()))}, f,
+                  ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    return path
+
+
+def is_fresh(entry: Optional[Dict[str, Any]], path: str) -> bool:
+    """매니페스트 항목이 현재 파일과 일치하는지 (size + mtime)"""
+    if not entry:
+        return False
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return st.st_size == entry.get("size") and abs(st.st_mtime - entry.get("mtime", -1)) < 1e-3
+
+
+class AudioManifest:
+    """
+    생성기용 매니페스트 기록기
+      manifest = AudioManifest(level_depth=2)
+      manifest.export(word_seg, paths["word"])   # seg.export(path, format="mp3") 대신
+      ...
+      manifest.close()                           # 레벨별 audio_manifest.json 저장
+    비활성(AUDIO_MANIFEST=0)이면 export는 seg.export와 같고 기록만 하지 않습니다.
+    shard="<실행 tag>"이면 이번 실행에서 기록한 항목만 audio_manifest.shard-<tag>.json 에 저장합니다.
+    """
+
+    def __init__(self, level_depth: int = 2, enabled: bool = AUDIO_MANIFEST,
+                 catalog: Optional[CatalogWriter] = None, shard: str = ""):
+        # level_depth: 파일 경로에서 몇 단계 위가 레벨 폴더인지 (jlpt/n5/<romaji>/word.mp3 → 2)
+        self.level_depth = level_depth
+        self.enabled = enabled
+        self.catalog = catalog if catalog is not None else CatalogWriter() if enabled else CatalogWriter("")
+        self.shard = shard
+        self._levels: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._touched: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        self.saved: List[str] = []
+
+    def _level_of(self, path: str) -> str:
+        d = os.path.dirname(os.path.normpath(path))
+        for _ in range(self.level_depth - 1):
+            d = os.path.dirname(d)
+        return d or "."
+
+    def export(self, seg: Any, path: str, format: str = "mp3", key: Optional[str] = None,
+               voice: Optional[str] = None, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        """seg를 메모리로 인코딩 → 해시 → 파일 저장 (같은 바이트를 한 번만 다룸)"""
+        if not self.enabled:
+            seg.export(path, format=format, **kwargs)
+            return None
+        buf = io.BytesIO()
+        seg.export(buf, format=format, **kwargs)
+        probe = {"dbfs": seg.dBFS, "peak_dbfs": seg.max_dBFS} if self.catalog.enabled else None
+        return self.write_bytes(path, buf.getvalue(), key=key, voice=voice, probe=probe)
+
+    def write_bytes(self, path: str, data: bytes, key: Optional[str] = None, voice: Optional[str] = None,
+                    probe: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        tmp = path + ".part"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        entry = digest_bytes(data)
+        entry["mtime"] = os.stat(path).st_mtime
+        if key:
+            entry["key"] = key
+        if voice:
+            entry["voice"] = voice
+        if self.enabled:
+            if self.catalog.enabled:
+                probe = dict(probe or {}, **header_info(data))
+            self.record(path, entry, probe)
+        return entry
+
+    def record(self, path: str, entry: Dict[str, Any], probe: Optional[Dict[str, Any]] = None) -> None:
+        """
+        매니페스트 항목 기록 + 카탈로그 행 추가
+        probe: 이미 아는 헤더/음량 값 (없으면 파일 헤더만 읽음 - 링크/이동된 파일)
+        """
+        level = self._level_of(path)
+        rel = os.path.relpath(os.path.normpath(path), level).replace(os.sep, "/")
+        with self._lock:
+            files = self._levels.get(level)
+            if files is None:
+                files = self._levels[level] = load_manifest(level)
+            files[rel] = entry
+            self._touched.setdefault(level, set()).add(rel)
+        if self.catalog.enabled:
+            if probe is None:
+                with open(path, "rb") as f:
+                    probe = header_info(f.read())
+            self.catalog.add(dict(split_path(path, level), size=entry.get("size"), mtime=entry.get("mtime"),
+                                  md5=entry.get("md5"), voice=entry.get("voice"), input_key=entry.get("key"),
+                                  **probe))
+
+    def close(self) -> List[str]:
+        """레벨별 매니페스트 저장 → 저장한 파일 경로"""
+        with self._lock:
+            for level, files in self._levels.items():
+                if self.shard:
+                    mine = {rel: files[rel] for rel in self._touched.get(level, ())}
+                    path = save_manifest(level, mine, shard_manifest_file(self.shard))
+                    print(f"🧾 샤드 매니페스트 저장: {path} ({len(mine)}개)")
+                else:
+                    path = save_manifest(level, files)
+                    print(f"🧾 매니페스트 저장: {path} ({len(files)}개)")
+                self.saved.append(path)
+            self._levels.clear()
+            self._touched.clear()
+        self.catalog.close()
+        if self.catalog.written:
+            print(f"🗂️ 카탈로그 기록: {self.catalog.path} ({self.catalog.written}행)")
+        return self.saved
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+데이터셋 간 오디오 재사용 (유효 입력 키 → 하드링크)
+
+같은 영어 lemma가 CEFR/IELTS 여러 레벨 파일에, 같은 kana가 여러 JLPT 레벨에
+나옵니다. 생성기는 항목마다 word/gloss(/example)를 따로 합성하지만 결과는
+'정리된 텍스트 + 보이스 + 간격/음량 설정'(유효 입력)만으로 정해집니다.
+유효 입력의 해시(키)를 매니페스트 항목("key")에 함께 기록해 두면 키가 같은
+산출물은 한 번만 합성하고 나머지는 하드링크로 만들 수 있습니다.
+
+  wkey = word_key("en-US", v["en"], lemma, TARGET_DBFS)
+  gkey = gloss_key(wkey, v["ko"], ko_gloss, GLOSS_GAP_MS, COMMA_GAP_MS, TARGET_DBFS)
+  reuse = ReuseIndex.scan(["starter", "elementary", ...])   # 레벨별 audio_manifest.json
+  if reuse.link_all(manifest, {paths["word"]: wkey, paths["gloss"]: gkey}):
+      continue                                              # 전부 기존 파일로 연결됨 → 합성 생략
+
+- 기존 파일은 매니페스트의 size/mtime이 현재 파일과 같을 때만 출처로 인정
+- 생성기의 저장은 임시 파일 + os.replace 이므로, 링크된 파일을 다시 생성해도
+  다른 경로의 파일(같은 inode)은 바뀌지 않음
+- 다른 파일시스템 등으로 os.link가 안 되면 복사
+
+전체 데이터셋 기준 계획/일괄 링크: python plan_audio_reuse.py
+
+환경변수(옵션):
+  AUDIO_REUSE=0    # 생성기에서 키 재사용(링크) 끔 (키 기록은 매니페스트가 켜져 있으면 항상)
+"""
+
+import json
+import os
+import shutil
+from typing import Any, Dict, List, Optional, Tuple
+
+from .audio_manifest import is_fresh, load_manifest
+from .hash_cache import text_key
+from .ssml import GLOSS_SSML, SSML_UNSUPPORTED_VOICES
+
+AUDIO_REUSE = os.getenv("AUDIO_REUSE", "1").strip().lower() not in ("0", "false", "off", "")
+
+# 생성 규칙(무음 길이 상수, 세그먼트 결합 방식 등)이 바뀌면 올려서 기존 키를 무효화
+KEY_VERSION = 1
+
+
+# ===== 유효 입력 키 =====
+def _squash(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def ssml_mode(voice_name: str) -> bool:
+    """설정 기준 SSML 사용 여부 (런타임 실패 기록은 반영하지 않음 - 키가 실행 중에 바뀌지 않도록)"""
+    return GLOSS_SSML and bool(voice_name) and not any(p in voice_name for p in SSML_UNSUPPORTED_VOICES)
+
+
+def input_key(kind: str, **inputs: Any) -> str:
+    """산출물 종류 + 유효 입력 → sha1 hex 키"""
+    return text_key(kind, str(KEY_VERSION), json.dumps(inputs, sort_keys=True, ensure_ascii=False))
+
+
+def word_key(lang: str, voice: str, text: str, target_dbfs: float) -> str:
+    """word.mp3: 단일 언어 1회 합성"""
+    return input_key("word", lang=lang, voice=voice, text=_squash(text), dbfs=target_dbfs)
+
+
+def gloss_key(word: str, ko_voice: str, ko_text: str, gloss_gap_ms: int, comma_gap_ms: int,
+              target_dbfs: float) -> str:
+    """gloss.mp3: word 오디오 + 무음 + 한국어 뜻(쉼표마다 무음)"""
+    return input_key("gloss", word=word, voice=ko_voice, text=_squash(ko_text), gap=gloss_gap_ms,
+                     comma=comma_gap_ms, ssml=ssml_mode(ko_voice), dbfs=target_dbfs)
+
+
+def example_key(ja_voice: str, ko_voice: str, script: str, comma_gap_ms: int, target_dbfs: float) -> str:
+    """example.mp3: 일본어/한국어 혼합 스크립트 (JLPT koChirpScript)"""
+    return input_key("example", ja=ja_voice, ko=ko_voice, text=_squash(script), comma=comma_gap_ms,
+                     ssml=ssml_mode(ko_voice), dbfs=target_dbfs)
+
+
+def jlpt_keys(v: Dict[str, str], kana: str, ko_gloss: str, script: str, target_dbfs: float,
+              gloss_gap_ms: int, comma_gap_ms: int) -> Dict[str, Optional[str]]:
+    """JLPT 항목 → {"word", "gloss", "example"} 키 (v = voices_for_index 결과, 생성 대상이 아니면 None)"""
+    wkey = word_key("ja-JP", v["ja"], kana, target_dbfs)
+    return {
+        "word": wkey,
+        "gloss": gloss_key(wkey, v["ko_neural"], ko_gloss, gloss_gap_ms, comma_gap_ms, target_dbfs) if ko_gloss else None,
+        "example": example_key(v["ja"], v["ko_chirp"], script, comma_gap_ms, target_dbfs) if script else None,
+    }
+
+
+# ===== 파일 연결 =====
+def link_file(src: str, dst: str) -> str:
+    """dst를 src의 하드링크로 교체 → "same" / "link" / "copy" """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return "same"
+    d = os.path.dirname(dst)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    tmp = dst + ".link"
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    try:
+        os.link(src, tmp)
+        how = "link"
+    except OSError:
+        shutil.copy2(src, tmp)
+        how = "copy"
+    os.replace(tmp, dst)
+    return how
+
+
+class ReuseIndex:
+    """키 → 기존 파일 (레벨별 audio_manifest.json의 "key"에서 구성)"""
+
+    def __init__(self) -> None:
+        self._by_key: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        self.links = 0
+
+    @classmethod
+    def scan(cls, level_dirs: List[str]) -> "ReuseIndex":
+        idx = cls()
+        for level in level_dirs:
+            for rel, entry in load_manifest(level).items():
+                idx.add(entry.get("key"), os.path.join(level, rel), entry)
+        return idx
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def add(self, key: Optional[str], path: str, entry: Optional[Dict[str, Any]]) -> None:
+        if key and entry:
+            self._by_key.setdefault(key, []).append((os.path.normpath(path), entry))
+
+    def find(self, key: Optional[str], prefer: Optional[str] = None) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """키가 같고 아직 매니페스트와 일치하는 파일 (path, entry) - prefer 경로가 후보면 그 파일"""
+        found = None
+        prefer = os.path.normpath(prefer) if prefer else None
+        for path, entry in self._by_key.get(key or "", []):
+            if is_fresh(entry, path):
+                if prefer is None or path == prefer:
+                    return path, entry
+                found = found or (path, entry)
+        return found
+
+    def link(self, manifest: Any, src: Tuple[str, Dict[str, Any]], dst: str, key: str) -> str:
+        """src → dst 연결 + dst 매니페스트 기록 (manifest=None이면 기록 생략)"""
+        path, entry = src
+        how = link_file(path, dst)
+        if how != "same":
+            self.links += 1
+        new = dict(entry, key=key, mtime=os.stat(dst).st_mtime)
+        if manifest is not None:
+            manifest.record(dst, new)
+        self.add(key, dst, new)
+        return how
+
+    def link_all(self, manifest: Any, targets: Dict[str, Optional[str]],
+                 extra: Optional[Dict[str, Optional[str]]] = None) -> bool:
+        """
+        targets {경로: 키}의 모든 키에 출처가 있을 때만 전부 연결하고 True
+        (키가 None인 경로는 생성 대상이 아님 → 무시, extra 경로는 매니페스트 기록 없이 연결)
+        """
+        plan = []
+        for dst, key in targets.items():
+            if key is None:
+                continue
+            src = self.find(key, prefer=dst)
+            if src is None:
+                return False
+            plan.append((dst, key, src, manifest))
+        for dst, key in (extra or {}).items():
+            src = self.find(key) if key else None
+            if src is not None:
+                plan.append((dst, key, src, None))
+        if not plan:
+            return False
+        for dst, key, src, man in plan:
+            self.link(man, src, dst, key)
+        return True
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+데이터셋 항목 → 생성기 산출물 목록 (TTS/pydub 없이 생성기 규칙만 재현)
+
+plan_audio_reuse.py(재사용 계획), triage_audio.py(길이 기반 분류)가 씁니다.
+산출물마다 출력 경로, 유효 입력 키(audio_reuse.py), 예상 TTS 요청 수와 함께
+'말하는 부분'(보이스, 언어, 텍스트)과 생성기가 넣는 고정 무음 길이를 담습니다.
+
+규칙(생성기와 같은 환경변수/기본값 - generator_config.py):
+  CEFR/IELTS/숙어  make_word_gloss.py  <레벨>/<lemma>/{word,gloss}.mp3
+                   레벨 태그(입문/기초/중급/중상급/고급)가 없으면 levelCEFR(A1→starter …)
+                   gloss = word + GLOSS_GAP_MS + 한국어 뜻(쉼표마다 COMMA_GAP_MS)
+  JLPT            jlpt/make_jlpt_audio.py  jlpt/<nX>/<romaji>[2,3…]/{word,gloss,example}.mp3
+                   폴더는 romaji_slugs.py 등록부 (읽기만 함, 없으면 파일 순서 규칙)
+                   example = 일본어/한국어 구간마다 합성 + 구간 뒤 200ms
+  보이스 남/여는 생성기와 같은 VOICE_ASSIGN 규칙 (voice_assign.py, 표는 읽기만 함)
+"""
+
+import os
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .audio_reuse import gloss_key, jlpt_keys, ssml_mode, word_key
+from .generator_config import COMMA_GAP_MS, GLOSS_GAP_MS, TARGET_DBFS, jlpt_voices, word_gloss_voices
+from .romaji_slugs import assign_slugs, registry_path
+from .script_segment import segment
+from .text_normalize import PAREN_RE, normalize
+from .voice_assign import assign_males, item_key, voice_table_path
+
+LEVEL_MAP = [("고급", "advanced"), ("중상급", "upper"), ("중급", "intermediate"), ("기초", "elementary"), ("입문", "starter")]
+CEFR_FOLDERS = {"A1": "starter", "A2": "elementary", "B1": "intermediate", "B2": "upper", "C1": "advanced"}
+JLPT_FILE_RE = re.compile(r"(?:jlpt_?)?[nN][1-5](?:_\w+)?\.json$", re.IGNORECASE)
+_COMMA_RE = re.compile(r"[,，]")
+
+EXAMPLE_SEGMENT_GAP_MS = 200  # make_jlpt_audio.py::synthesize_mixed_script 구간 뒤 무음
+
+Spoken = Tuple[str, str, str]  # (보이스, 언어 en/ko/ja, 텍스트)
+
+
+class Artifact(NamedTuple):
+    path: str
+    key: str
+    calls: int     # 생성기가 이 산출물에 쓰는 TTS 요청 수 (추정)
+    source: str    # 데이터셋#순번
+    parts: Tuple[Spoken, ...] = ()
+    fixed_ms: int = 0  # 생성기가 넣는 무음 합계
+
+
+# ===== 생성기 규칙 =====
+def sanitize_filename(name: str) -> str:
+    name = re.sub(r'[\\/*?:"<>|]', "", str(name or ""))
+    return name.strip().lower() or "unnamed"
+
+
+def _first(obj: Any, keys: List[str]) -> Any:
+    """make_word_gloss.py::extract_field_anywhere와 같은 순서 (최상위 → 중첩)"""
+    aliases = {k.lower() for k in keys}
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if str(k).strip().lower() in aliases and isinstance(v, str) and v.strip():
+                return v.strip()
+        children = list(obj.values())
+    elif isinstance(obj, list):
+        children = obj
+    else:
+        return ""
+    for v in children:
+        found = _first(v, keys)
+        if found:
+            return found
+    return ""
+
+
+def word_gloss_level(item: Dict[str, Any]) -> Optional[str]:
+    cats = ""
+    for key in ["categories", "category", "levels", "level", "tags", "tag"]:
+        if item.get(key):
+            cats = item[key]
+            break
+    cat_str = ",".join(map(str, cats)) if isinstance(cats, list) else str(cats or "")
+    for kr, folder in LEVEL_MAP:
+        if kr in cat_str:
+            return folder
+    return CEFR_FOLDERS.get(str(item.get("levelCEFR") or "").split(",")[0].strip().upper())
+
+
+def comma_parts(text: str) -> List[str]:
+    return [p.strip() for p in _COMMA_RE.split(text) if p.strip()]
+
+
+def comma_calls(text: str, voice: str) -> int:
+    parts = comma_parts(text)
+    return 1 if len(parts) > 1 and ssml_mode(voice) else max(len(parts), 1)
+
+
+def _comma_spoken(voice: str, lang: str, text: str) -> Tuple[List[Spoken], int]:
+    """쉼표 분할 합성 → (말하는 부분, 쉼표 무음 합계)"""
+    parts = comma_parts(text)
+    return [(voice, lang, p) for p in parts], COMMA_GAP_MS * max(len(parts) - 1, 0)
+
+
+# ===== 데이터셋별 산출물 =====
+def word_gloss_artifacts(name: str, items: List[Dict[str, Any]], profile: str,
+                         males: Optional[List[bool]] = None) -> List[Artifact]:
+    out: List[Artifact] = []
+    for i, it in enumerate(items):
+        lemma = _first(it, ["idiom", "lemma", "term", "word", "expression", "phrase", "headword", "title"])
+        level = word_gloss_level(it)
+        if not lemma or not level:
+            continue
+        v = word_gloss_voices(i, males[i] if males else None)
+        base = os.path.join(level, sanitize_filename(lemma))
+        ref = f"{name}#{i}"
+        wkey = word_key("en-US", v["en"], lemma, TARGET_DBFS)
+        word = ((v["en"], "en", lemma),)
+        out.append(Artifact(os.path.join(base, "word.mp3"), wkey, 1, ref, word))
+        ko_gloss = normalize(profile, _first(it, ["koChirpScript", "korean_meaning", "koGloss", "usage_context_korean"]))
+        if ko_gloss:
+            gkey = gloss_key(wkey, v["ko"], ko_gloss, GLOSS_GAP_MS, COMMA_GAP_MS, TARGET_DBFS)
+            ko, gaps = _comma_spoken(v["ko"], "ko", ko_gloss)
+            out.append(Artifact(os.path.join(base, "gloss.mp3"), gkey, comma_calls(ko_gloss, v["ko"]), ref,
+                                word + tuple(ko), GLOSS_GAP_MS + gaps))
+    return out
+
+
+def jlpt_level(name: str) -> str:
+    m = re.search(r"(?:jlpt_?)?([nN][1-5])", os.path.basename(name), re.IGNORECASE)
+    return m.group(1).lower() if m else "n5"
+
+
+def jlpt_artifacts(name: str, items: List[Dict[str, Any]], males: Optional[List[bool]] = None,
+                   slugs: Optional[List[Optional[str]]] = None) -> List[Artifact]:
+    level = jlpt_level(name)
+    out: List[Artifact] = []
+    if slugs is None:
+        slugs = assign_slugs(items, None, enabled=False)
+    for i, it in enumerate(items):
+        kana = it.get("kana", "")
+        if not slugs[i]:
+            continue
+        base = os.path.join("jlpt", level, slugs[i])
+        v = jlpt_voices(i, males[i] if males else None)
+        ref = f"{name}#{i}"
+        ko_gloss = normalize("jlpt_gloss", it.get("koGloss", "") or it.get("koChirpScript", ""))
+        script = it.get("koChirpScript", "")
+        keys = jlpt_keys(v, kana, ko_gloss, script, TARGET_DBFS, GLOSS_GAP_MS, COMMA_GAP_MS)
+        word = ((v["ja"], "ja", kana),)
+        out.append(Artifact(os.path.join(base, "word.mp3"), keys["word"], 1, ref, word))
+        if keys["gloss"]:
+            ko, gaps = _comma_spoken(v["ko_neural"], "ko", ko_gloss)
+            out.append(Artifact(os.path.join(base, "gloss.mp3"), keys["gloss"], comma_calls(ko_gloss, v["ko_neural"]),
+                                ref, word + tuple(ko), GLOSS_GAP_MS + gaps))
+        if keys["example"]:
+            calls, parts, fixed = 0, [], 0
+            for lang, t in segment("ja_ko", PAREN_RE.sub("", script)):
+                fixed += EXAMPLE_SEGMENT_GAP_MS
+                if lang == "ja":
+                    calls += 1
+                    parts.append((v["ja"], "ja", normalize("ja_text", t)))
+                else:
+                    calls += comma_calls(t, v["ko_chirp"])
+                    ko, gaps = _comma_spoken(v["ko_chirp"], "ko", normalize("jlpt_gloss", t))
+                    parts += ko
+                    fixed += gaps
+            out.append(Artifact(os.path.join(base, "example.mp3"), keys["example"], max(calls, 1), ref,
+                                tuple(parts), fixed))
+    return out
+
+
+def dataset_artifacts(path: str, name: str, items: List[Dict[str, Any]], gloss_profile: str = "word_gloss",
+                      group: str = "") -> List[Artifact]:
+    """데이터셋 파일 1개 → 산출물 (JLPT 파일명이면 JLPT 규칙, 아니면 make_word_gloss 규칙)"""
+    table = voice_table_path(path)
+    if group == "jlpt" or JLPT_FILE_RE.match(os.path.basename(path)):
+        keys = [item_key(it.get("lemma", ""), it.get("kana", "")) for it in items]
+        slugs = assign_slugs(items, registry_path(path, jlpt_level(path)), save=False)
+        return jlpt_artifacts(name, items, assign_males(keys, table_path=table, save=False), slugs)
+    lemmas = [_first(it, ["idiom", "lemma", "term", "word", "expression", "phrase", "headword", "title"]) for it in items]
+    return word_gloss_artifacts(name, items, gloss_profile, assign_males([item_key(x) for x in lemmas], table_path=table, save=False))
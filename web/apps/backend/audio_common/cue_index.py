@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+리스닝 MP3 구간 오프셋 인덱스(JSON) / WebVTT 사이드카
+
+listening_plan.render(cues=[...])가 기록한 구간(배속 적용 전 ms)을 출력 배속(atempo)에 맞게
+환산해 MP3 옆에 저장합니다. 프론트엔드는 이 인덱스로 "2번 문제 다시 듣기" 구간 재생,
+스크립트 하이라이트를 클라이언트 정렬 없이 처리할 수 있습니다.
+
+{item_id}.json (compact):
+  {"v": 1, "id": "N5_L_001", "audio": "N5_L_001.mp3", "duration_ms": 53210, "tempo": 0.8,
+   "segments": [{"type": "turn", "speaker": "A", "id": "turn.1", "start": 0, "end": 2310}, ...]}
+  - type: turn / prefix / question / option_label / option
+  - id:   turn.{n} / q{i}.prefix / q{i} / q{i}.{라벨}.label / q{i}.{라벨}
+  - approx: SSML 병합 구간 안에서 추정한 시각이면 true
+
+{item_id}.vtt (옵션): 같은 구간을 WebVTT 큐로 (큐 id = 구간 id, 본문 = 텍스트)
+"""
+
+import json
+import os
+from typing import Any, Dict, List
+
+INDEX_VERSION = 1
+
+
+def scale_cues(cues: List[Dict[str, Any]], tempo: float) -> List[Dict[str, Any]]:
+    """배속 적용: atempo는 길이를 1/tempo 배로 바꾸므로 시각도 같은 비율로 환산 (ms 정수)"""
+    k = 1.0 / tempo if tempo > 0 else 1.0
+    out = []
+    for c in cues:
+        sc = dict(c)
+        sc["start"] = int(round(c["start"] * k))
+        sc["end"] = int(round(c["end"] * k))
+        out.append(sc)
+    return out
+
+
+def build_index(
+    item_id: str,
+    audio_name: str,
+    cues: List[Dict[str, Any]],
+    duration_ms: int,
+    tempo: float = 1.0,
+) -> Dict[str, Any]:
+    """배속 적용 전 cues → 인덱스 dict (텍스트 본문은 제외, id로 원본 JSON 참조)"""
+    segments = []
+    for c in scale_cues(cues, tempo):
+        seg = {"type": c["type"], "speaker": c["speaker"], "id": c["id"], "start": c["start"], "end": c["end"]}
+        if c.get("approx"):
+            seg["approx"] = True
+        segments.append(seg)
+    return {
+        "v": INDEX_VERSION,
+        "id": item_id,
+        "audio": audio_name,
+        "duration_ms": int(round(duration_ms / tempo)) if tempo > 0 else int(duration_ms),
+        "tempo": tempo,
+        "segments": segments,
+    }
+
+
+def _vtt_time(ms: int) -> str:
+    h, rem = divmod(max(0, int(ms)), 3600000)
+    m, rem = divmod(rem, 60000)
+    s, ms = divmod(rem, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d}.{ms:03d}"
+
+
+def _vtt_text(text: str) -> str:
+    # 큐 본문에서 '-->' / 빈 줄 / &,< 는 허용되지 않음
+    text = (text or "").replace("&", "&amp;").replace("<", "&lt;").replace("-->", "→")
+    return " ".join(text.split())
+
+
+def build_vtt(cues: List[Dict[str, Any]], tempo: float = 1.0) -> str:
+    lines = ["WEBVTT", ""]
+    for c in scale_cues(cues, tempo):
+        if c.get("id"):
+            lines.append(c["id"])
+        lines.append(f"{_vtt_time(c['start'])} --> {_vtt_time(c['end'])}")
+        text = _vtt_text(c.get("text", ""))
+        lines.append(f"<v {c['speaker']}>{text}" if c.get("speaker") else text)
+        lines.append("")
+    return "\n".join(lines)
+
+
+def write_sidecars(
+    mp3_path: str,
+    item_id: str,
+    cues: List[Dict[str, Any]],
+    duration_ms: int,
+    tempo: float = 1.0,
+    vtt: bool = False,
+) -> List[str]:
+    """mp3_path 옆에 {이름}.json (+ {이름}.vtt) 저장, 저장한 경로 목록 반환"""
+    base, _ = os.path.splitext(mp3_path)
+    written = []
+    index = build_index(item_id, os.path.basename(mp3_path), cues, duration_ms, tempo)
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    written.append(base + ".json")
+    if vtt:
+        with open(base + ".vtt", "w", encoding="utf-8") as f:
+            f.write(build_vtt(cues, tempo))
+        written.append(base + ".vtt")
+    return written
+
+
+def is_sidecar(path: str) -> bool:
+    """write_sidecars가 저장한 파일인지 ({이름}.vtt, 또는 인덱스 형식의 {이름}.json)"""
+    if path.endswith(".vtt"):
+        return True
+    if not path.endswith(".json"):
+        return False
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return isinstance(data, dict) and "segments" in data and "audio" in data
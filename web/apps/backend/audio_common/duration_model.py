@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+길이 기반 오디오 분류(triage) 모델: 보이스·문자 체계별 단위당 ms
+
+STT(A2_1.py 게이트)나 Whisper+LLM 검증(validate-audio-with-claude.py)은 느리고
+비용이 듭니다. 대부분의 불량(잘림, 무음, 다른 문장, 반복)은 길이가 기대치에서
+크게 벗어나므로, 기존 코퍼스에서 기대 길이를 학습해 이상한 파일만 비싼 검증으로
+보냅니다.
+
+  단위: ja-JP 모라(가나 1자 = 1, 작은 ゃゅょ 등 0, 한자 ≈ 2), ko-KR 음절(한글 1자),
+        en-US 음절(모음 묶음 수, 끝 묵음 e 제외), 숫자 1자 ≈ 2
+  특징: 보이스|문자체계별 단위 수 + 보이스별 요청(구간) 수(앞뒤 무음 등 고정 비용)
+  기대 길이 = Σ 계수 × 특징 + 생성기가 넣는 고정 무음(fixed_ms)
+  학습: 최소제곱 → 잔차가 3×MAD를 넘는 행 제외 → 재적합 (몇 회 반복, 불량 파일 영향 제거)
+  점수: log(실제/기대)를 종류별 잔차 분포(MAD)로 나눈 z, 또는 비율 자체가 범위를 벗어나면 이상
+
+  model = DurationModel.fit(rows)            # rows: [(parts, fixed_ms, actual_ms, kind), ...]
+  model.save("duration_model.json")
+  r = DurationModel.load(path).score(parts, fixed_ms, actual_ms, "gloss")
+  r["anomaly"], r["expected_ms"], r["ratio"], r["z"]
+
+parts는 [(보이스, 언어, 텍스트), ...] (corpus_artifacts.Artifact.parts와 같은 형식).
+"""
+
+import json
+import math
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+MODEL_VERSION = 1
+
+_SMALL_KANA = set("ゃゅょぁぃぅぇぉゎャュョァィゥェォヮ・")  # 앞 글자와 한 모라 / 가운뎃점
+_KANA_RE = re.compile("[\u3040-\u309F\u30A0-\u30FF]")
+_KANJI_RE = re.compile("[\u3400-\u4DBF\u4E00-\u9FAF]")
+_HANGUL_RE = re.compile("[\uAC00-\uD7AF]")
+_EN_WORD_RE = re.compile(r"[A-Za-z]+")
+_VOWELS_RE = re.compile(r"[aeiouy]+")
+_DIGIT_RE = re.compile("[0-9\uFF10-\uFF19]")
+
+
+# ===== 단위 수 =====
+def en_syllables(word: str) -> int:
+    w = word.lower()
+    n = len(_VOWELS_RE.findall(w))
+    if n > 1 and w.endswith("e") and not w.endswith(("le", "ee")):
+        n -= 1
+    return max(n, 1)
+
+
+def count_units(text: str) -> Dict[str, int]:
+    """텍스트 → 문자 체계별 단위 수 {"ja": 모라, "ko": 음절, "en": 음절, "num": 숫자 자리}"""
+    out: Dict[str, int] = {}
+    kana = [c for c in _KANA_RE.findall(text) if c not in _SMALL_KANA]
+    mora = len(kana) + 2 * len(_KANJI_RE.findall(text))
+    if mora:
+        out["ja"] = mora
+    ko = len(_HANGUL_RE.findall(text))
+    if ko:
+        out["ko"] = ko
+    en = sum(en_syllables(w) for w in _EN_WORD_RE.findall(text))
+    if en:
+        out["en"] = en
+    digits = len(_DIGIT_RE.findall(text))
+    if digits:
+        out["num"] = 2 * digits
+    return out
+
+
+def features(parts: Iterable[Tuple[str, str, str]]) -> Dict[str, float]:
+    """말하는 부분 → 특징 {"<보이스>|<체계>": 단위 수, "<보이스>|req": 요청 수}"""
+    f: Dict[str, float] = {}
+    for voice, _, text in parts:
+        if not text or not text.strip():
+            continue
+        f[f"{voice}|req"] = f.get(f"{voice}|req", 0.0) + 1
+        for script, n in count_units(text).items():
+            key = f"{voice}|{script}"
+            f[key] = f.get(key, 0.0) + n
+    return f
+
+
+def _mad(x: Any) -> float:
+    import numpy as np  # 지연 import
+
+    if len(x) == 0:
+        return 0.0
+    return float(np.median(np.abs(x - np.median(x))) * 1.4826)
+
+
+# ===== 모델 =====
+class DurationModel:
+    def __init__(self, coef: Dict[str, float], spread: Dict[str, float], meta: Optional[Dict[str, Any]] = None,
+                 z_limit: float = 3.5, min_ratio: float = 0.5, max_ratio: float = 2.0):
+        self.coef = coef
+        self.spread = spread            # 종류별 log 비율의 robust 표준편차
+        self.meta = meta or {}
+        self.z_limit = z_limit
+        self.min_ratio = min_ratio
+        self.max_ratio = max_ratio
+
+    # --- 학습 ---
+    @classmethod
+    def fit(cls, rows: Sequence[Tuple[Sequence[Tuple[str, str, str]], float, float, str]],
+            rounds: int = 4, min_rows: int = 5, **kwargs: Any) -> "DurationModel":
+        """rows: (parts, fixed_ms, actual_ms, kind) - 실제 길이가 있는 산출물"""
+        import numpy as np  # 지연 import
+
+        feats = [features(p) for p, _, _, _ in rows]
+        counts: Dict[str, int] = {}
+        for f in feats:
+            for k in f:
+                counts[k] = counts.get(k, 0) + 1
+        names = sorted(k for k, n in counts.items() if n >= min_rows)
+        col = {k: j for j, k in enumerate(names)}
+        usable = [i for i, f in enumerate(feats) if f and all(k in col for k in f)]
+        X = np.zeros((len(usable), len(names)))
+        y = np.zeros(len(usable))
+        for r, i in enumerate(usable):
+            for k, v in feats[i].items():
+                X[r, col[k]] = v
+            y[r] = rows[i][2] - rows[i][1]
+
+        keep = np.ones(len(usable), dtype=bool)
+        beta = np.zeros(len(names))
+        for _ in range(max(1, rounds)):
+            if keep.sum() < len(names):
+                break
+            beta = np.linalg.lstsq(X[keep], y[keep], rcond=None)[0]
+            resid = y - X @ beta
+            s = _mad(resid[keep])
+            if s <= 0:
+                break
+            new_keep = np.abs(resid - np.median(resid[keep])) <= 3 * s
+            if (new_keep == keep).all():
+                break
+            keep = new_keep
+
+        coef = {k: round(float(b), 3) for k, b in zip(names, beta)}
+        model = cls(coef, {}, **kwargs)
+        # 종류별 잔차 분포 (log 비율)
+        logs: Dict[str, List[float]] = {}
+        for r, i in enumerate(usable):
+            if not keep[r]:
+                continue
+            exp = model.expected_from(feats[i], rows[i][1])
+            if exp and rows[i][2] > 0:
+                logs.setdefault(rows[i][3], []).append(math.log(rows[i][2] / exp))
+        model.spread = {k: round(max(_mad(np.array(v)), 0.02), 4) for k, v in logs.items()}
+        model.meta = {"version": MODEL_VERSION, "rows": len(rows), "fitted": int(keep.sum()),
+                      "unfitted": len(rows) - len(usable), "fitted_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        return model
+
+    # --- 예측/점수 ---
+    def expected_from(self, feats: Dict[str, float], fixed_ms: float) -> Optional[float]:
+        """특징 → 기대 길이(ms), 학습에 없던 보이스/체계가 있으면 None"""
+        if not feats or any(k not in self.coef for k in feats):
+            return None
+        ms = fixed_ms + sum(self.coef[k] * v for k, v in feats.items())
+        return ms if ms > 0 else None
+
+    def expected(self, parts: Sequence[Tuple[str, str, str]], fixed_ms: float = 0) -> Optional[float]:
+        return self.expected_from(features(parts), fixed_ms)
+
+    def score(self, parts: Sequence[Tuple[str, str, str]], fixed_ms: float, actual_ms: Optional[float],
+              kind: str) -> Dict[str, Any]:
+        """
+        → {"expected_ms", "ratio", "z", "anomaly", "reason"}
+        기대 길이를 못 구하거나(미학습 보이스) 실제 길이가 없으면 anomaly=True (검증으로 보냄)
+        """
+        exp = self.expected(parts, fixed_ms)
+        if exp is None:
+            return {"expected_ms": None, "ratio": None, "z": None, "anomaly": True, "reason": "unmodeled"}
+        if not actual_ms or actual_ms <= 0:
+            return {"expected_ms": round(exp, 1), "ratio": None, "z": None, "anomaly": True, "reason": "no_audio"}
+        ratio = actual_ms / exp
+        spread = self.spread.get(kind) or (max(self.spread.values()) if self.spread else 0.15)
+        z = math.log(ratio) / spread
+        reason = ""
+        if ratio < self.min_ratio or z < -self.z_limit:
+            reason = "too_short"
+        elif ratio > self.max_ratio or z > self.z_limit:
+            reason = "too_long"
+        return {"expected_ms": round(exp, 1), "ratio": round(ratio, 3), "z": round(z, 2),
+                "anomaly": bool(reason), "reason": reason}
+
+    # --- 저장 ---
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"meta": self.meta, "coef": self.coef, "spread": self.spread,
+                       "limits": {"z": self.z_limit, "min_ratio": self.min_ratio, "max_ratio": self.max_ratio}},
+                      f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str, **overrides: Any) -> "DurationModel":
+        with open(path, "r", encoding="utf-8") as f:
+            d = json.load(f)
+        limits = d.get("limits", {})
+        kwargs = {"z_limit": limits.get("z", 3.5), "min_ratio": limits.get("min_ratio", 0.5),
+                  "max_ratio": limits.get("max_ratio", 2.0)}
+        kwargs.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(d["coef"], d.get("spread", {}), d.get("meta"), **kwargs)
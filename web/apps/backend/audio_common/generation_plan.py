@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+생성기 --plan 모드 공용: 산출물 목록 → 기존 출력과 비교 → (재)생성 목록 / 글자 수 / 예상 시간
+
+make_word_gloss.py, jlpt/make_jlpt_audio.py 의 --plan 은 google-cloud-texttospeech와 pydub를
+import하지 않고(인증·네트워크 불필요) 데이터셋 로드 → 정리 → 보이스 배정 → 경로 생성을
+생성기 함수 그대로 실행한 뒤, 항목별 산출물(corpus_artifacts.Artifact)을 여기에 넘깁니다.
+
+  상태  ok     같은 경로에 같은 유효 입력 키의 파일이 이미 있음 (생성기도 합성하지 않음)
+        link   다른 경로(다른 레벨/데이터셋)에 같은 키의 파일이 있음 → 하드링크
+        synth  합성 필요 (새 파일, 입력이 바뀐 파일, 키 기록이 없는 파일)
+        skip   생성기 자체 규칙으로 건너뜀 (필수 필드 없음, 이미 있는 폴더 등)
+
+  항목 단위 판정은 ReuseIndex.link_all과 같습니다: 항목의 모든 키에 출처가 있어야 ok/link,
+  하나라도 없으면 그 항목의 산출물을 모두 합성합니다. 앞 항목에서 합성할 키는 뒤 항목의
+  출처로 칩니다(실행 중 reuse.add와 같음). 재사용이 꺼져 있으면(reuse=None) 전부 synth.
+
+  plan = GenerationPlan(reuse)
+  plan.add("12/aisatsu", [Artifact(...), ...])
+  plan.skip("12/aisatsu", "exists")
+  plan.report()
+
+글자 수는 합성할 텍스트 기준(SSML 태그 제외)으로 보이스 등급(Chirp3-HD, Neural2 …)별로
+집계합니다. 항목 안에서 같은 (보이스, 텍스트)는 한 번만 셉니다 (gloss의 word 부분).
+
+환경변수(옵션, 예상 시간):
+  PLAN_REQUEST_SEC=0.5     # TTS 요청 1회 고정 비용(초)
+  PLAN_CHAR_SEC=0.01       # 글자당 추가 시간(초)
+"""
+
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from .corpus_artifacts import Artifact
+
+PLAN_REQUEST_SEC = float(os.getenv("PLAN_REQUEST_SEC", "0.5"))
+PLAN_CHAR_SEC = float(os.getenv("PLAN_CHAR_SEC", "0.01"))
+
+# 이름에 '-<등급>-'이 들어간 순서대로 판정
+VOICE_TIERS = ("Chirp3-HD", "Chirp-HD", "Studio", "Neural2", "Wavenet", "Polyglot", "News", "Standard")
+
+
+def voice_tier(name: str) -> str:
+    for tier in VOICE_TIERS:
+        if f"-{tier}-" in name:
+            return tier
+    return "other"
+
+
+def format_seconds(sec: float) -> str:
+    sec = int(round(sec))
+    if sec < 60:
+        return f"{sec}s"
+    if sec < 3600:
+        return f"{sec // 60}m {sec % 60:02d}s"
+    return f"{sec // 3600}h {sec % 3600 // 60:02d}m"
+
+
+class GenerationPlan:
+    def __init__(self, reuse: Any = None):
+        # reuse: audio_reuse.ReuseIndex (None이면 재사용 꺼짐 → 전부 합성)
+        self.reuse = reuse
+        self.rows: List[Dict[str, Any]] = []
+        self.skips: Counter = Counter()
+        self.stopped = ""
+        self._pending: Set[str] = set()  # 이번 실행에서 합성될 키
+
+    # --- 항목 추가 ---
+    def skip(self, ref: str, reason: str) -> None:
+        self.skips[reason] += 1
+
+    def stop(self, message: str) -> None:
+        """생성기가 이 항목에서 실행을 중단함 (이후 항목은 계획에 없음)"""
+        self.stopped = message
+
+    def _source(self, key: Optional[str], path: str) -> Optional[str]:
+        """키의 출처 → "ok" / "link" / None"""
+        if key in self._pending:
+            return "link"
+        found = self.reuse.find(key, prefer=path)
+        if found is None:
+            return None
+        return "ok" if found[0] == os.path.normpath(path) else "link"
+
+    def add(self, ref: str, artifacts: Sequence[Artifact]) -> None:
+        targets = [a for a in artifacts if a.key]
+        status: Dict[str, Optional[str]] = {}
+        if self.reuse is not None and targets:
+            status = {a.path: self._source(a.key, a.path) for a in targets}
+        if not status or any(s is None for s in status.values()):
+            status = {a.path: "synth" for a in artifacts}
+            self._pending.update(a.key for a in targets)
+
+        seen: Set[tuple] = set()
+        for a in artifacts:
+            st = status.get(a.path, "synth")
+            chars: Dict[str, int] = {}
+            if st == "synth":
+                for voice, _, text in a.parts:
+                    if (voice, text) in seen:
+                        continue
+                    seen.add((voice, text))
+                    chars[voice] = chars.get(voice, 0) + len(text)
+            self.rows.append({"ref": ref, "path": os.path.normpath(a.path), "status": st,
+                              "requests": a.calls if st == "synth" else 0, "chars": chars})
+
+    # --- 요약 ---
+    def summary(self) -> Dict[str, Any]:
+        by_status = Counter(r["status"] for r in self.rows)
+        tiers: Dict[str, Dict[str, int]] = {}
+        voices: Dict[str, int] = {}
+        requests = 0
+        for r in self.rows:
+            requests += r["requests"]
+            for voice, n in r["chars"].items():
+                voices[voice] = voices.get(voice, 0) + n
+                t = tiers.setdefault(voice_tier(voice), {"chars": 0, "artifacts": 0})
+                t["chars"] += n
+        for r in self.rows:
+            for tier in {voice_tier(v) for v in r["chars"]}:
+                tiers[tier]["artifacts"] += 1
+        chars = sum(voices.values())
+        return {
+            "artifacts": len(self.rows),
+            "by_status": dict(by_status),
+            "skipped_items": dict(self.skips),
+            "requests": requests,
+            "chars": chars,
+            "by_tier": tiers,
+            "by_voice": voices,
+            "estimated_sec": round(requests * PLAN_REQUEST_SEC + chars * PLAN_CHAR_SEC, 1),
+        }
+
+    def report(self, started: Optional[float] = None, show: Sequence[str] = ("synth", "link")) -> Dict[str, Any]:
+        """(재)생성될 산출물 목록 + 요약 출력"""
+        for r in self.rows:
+            if r["status"] in show:
+                detail = f"  (요청 {r['requests']}회, {sum(r['chars'].values())}자)" if r["status"] == "synth" else ""
+                print(f"  {r['status']:<5} {r['path']}{detail}")
+        s = self.summary()
+        st = s["by_status"]
+        print(f"\n📋 계획: 산출물 {s['artifacts']}개 → 합성 {st.get('synth', 0)}, 링크 {st.get('link', 0)}, "
+              f"최신 {st.get('ok', 0)}" + (f", 건너뜀 항목 {sum(self.skips.values())}" if self.skips else ""))
+        for reason, n in self.skips.most_common():
+            print(f"   건너뜀 {reason}: {n}")
+        if self.reuse is None:
+            print("   (재사용 꺼짐: AUDIO_REUSE=0 또는 AUDIO_MANIFEST=0 → 키가 같아도 다시 합성)")
+        for tier, t in sorted(s["by_tier"].items(), key=lambda x: -x[1]["chars"]):
+            print(f"   {tier:<10} {t['chars']:>9,}자  (산출물 {t['artifacts']}개)")
+        print(f"   TTS 요청 {s['requests']:,}회, 예상 {format_seconds(s['estimated_sec'])} "
+              f"(요청당 {PLAN_REQUEST_SEC}s + 글자당 {PLAN_CHAR_SEC}s)")
+        if self.stopped:
+            print(f"   ⚠️ {self.stopped}")
+        if started is not None:
+            print(f"   계획 시간 {time.time() - started:.2f}s")
+        return s
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+생성기 파라미터 사본 (TTS/pydub 없이 계획·정리 도구가 쓰는 값)
+
+make_word_gloss.py, jlpt/make_jlpt_audio.py와 같은 환경변수/기본값을 읽습니다.
+생성기 스크립트는 import 시 sys.path를 바꾸고 TTS 설정을 읽으므로, 유효 입력 키
+(audio_reuse.py)만 계산하면 되는 도구(plan_audio_reuse.py, jlpt/disambiguate_romaji.py)는
+생성기 대신 이 모듈을 씁니다 (생성기 자체의 계획은 --plan). 생성기의 보이스 규칙을 바꾸면
+여기도 같이 바꿔야 합니다.
+"""
+
+import os
+from typing import Dict, Optional
+
+TARGET_DBFS = float(os.getenv("TARGET_DBFS", "-16.0"))
+GLOSS_GAP_MS = int(os.getenv("GLOSS_GAP_MS", "1000"))
+COMMA_GAP_MS = int(os.getenv("COMMA_GAP_MS", "500"))
+
+# ===== make_word_gloss.py / dedupe_vocabs.py =====
+EN_MALE = os.getenv("EN_MALE", "en-US-Chirp3-HD-Charon")
+EN_FEMALE = os.getenv("EN_FEMALE", "en-US-Chirp3-HD-Laomedeia")
+KO_MALE_NEURAL = os.getenv("KO_MALE_NEURAL", "ko-KR-Neural2-C")
+KO_FEMALE_NEURAL = os.getenv("KO_FEMALE_NEURAL", "ko-KR-Neural2-B")
+KO_NEURAL_FOR_CHARON = os.getenv("KO_NEURAL_FOR_CHARON", "ko-KR-Neural2-C")
+KO_NEURAL_FOR_LAOMEDEIA = os.getenv("KO_NEURAL_FOR_LAOMEDEIA", "ko-KR-Neural2-B")
+
+# ===== jlpt/make_jlpt_audio.py =====
+JA_MALE = os.getenv("JA_MALE", "ja-JP-Chirp3-HD-Orus")
+JA_FEMALE = os.getenv("JA_FEMALE", "ja-JP-Chirp3-HD-Achernar")
+KO_NEURAL_MALE = os.getenv("KO_NEURAL_MALE", "ko-KR-Neural2-C")
+KO_NEURAL_FEMALE = os.getenv("KO_NEURAL_FEMALE", "ko-KR-Neural2-B")
+KO_CHIRP_MALE = os.getenv("KO_CHIRP_MALE", "ko-KR-Chirp3-HD-Orus")
+KO_CHIRP_FEMALE = os.getenv("KO_CHIRP_FEMALE", "ko-KR-Chirp3-HD-Achernar")
+
+
+def word_gloss_voices(idx0: int, male: Optional[bool] = None) -> Dict[str, str]:
+    """make_word_gloss.py::voices_for_index (male: voice_assign.assign_males 결과, 없으면 순번 홀짝)"""
+    if male is None:
+        male = idx0 % 2 == 0
+    en = EN_MALE if male else EN_FEMALE
+    if "Charon" in en:
+        return {"en": en, "ko": KO_NEURAL_FOR_CHARON, "gender": "male"}
+    if "Laomedeia" in en:
+        return {"en": en, "ko": KO_NEURAL_FOR_LAOMEDEIA, "gender": "female"}
+    gender = "male" if male else "female"
+    return {"en": en, "ko": KO_MALE_NEURAL if gender == "male" else KO_FEMALE_NEURAL, "gender": gender}
+
+
+def jlpt_voices(idx0: int, male: Optional[bool] = None) -> Dict[str, str]:
+    """jlpt/make_jlpt_audio.py::voices_for_index"""
+    if idx0 % 2 == 0 if male is None else male:
+        return {"ja": JA_MALE, "ko_neural": KO_NEURAL_MALE, "ko_chirp": KO_CHIRP_MALE, "gender": "male"}
+    return {"ja": JA_FEMALE, "ko_neural": KO_NEURAL_FEMALE, "ko_chirp": KO_CHIRP_FEMALE, "gender": "female"}
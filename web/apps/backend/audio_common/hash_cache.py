@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+내용 해시 기반 결과 캐시 (append-only JSONL)
+
+같은 오디오/텍스트를 다시 처리하지 않도록 결과를 키(내용 해시)별로 저장합니다.
+한 줄에 {"k": <키>, "v": <값>} 하나씩 추가만 하므로 중간에 죽어도 이미 쓴
+줄은 남고, 같은 키가 여러 번 나오면 마지막 줄이 이깁니다.
+
+  cache = HashCache(".whisper_cache.jsonl")
+  key = content_key(audio_bytes, "whisper-base")
+  text = cache.get(key)
+  if text is None:
+      text = transcribe(...)
+      cache.put(key, text)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+def content_key(data: bytes, *salt: str) -> str:
+    """바이트 + 구분값(모델명/설정 등) → sha1 hex 키"""
+    h = hashlib.sha1()
+    for s in salt:
+        h.update(s.encode("utf-8"))
+        h.update(b"\0")
+    h.update(data)
+    return h.hexdigest()
+
+
+def text_key(*parts: str) -> str:
+    """문자열 조합 → sha1 hex 키 (예: (단어, 전사문))"""
+    return content_key(b"", *parts)
+
+
+def file_key(path: str, *salt: str) -> str:
+    with open(path, "rb") as f:
+        return content_key(f.read(), *salt)
+
+
+class HashCache:
+    """JSONL 파일에 저장되는 키-값 캐시 (스레드 안전, path=None이면 메모리 전용)"""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._data: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        continue  # 비정상 종료로 잘린 마지막 줄
+                    self._data[row["k"]] = row["v"]
+        self._fh = open(path, "a", encoding="utf-8") if path else None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            if self._fh:
+                self._fh.write(json.dumps({"k": key, "v": value}, ensure_ascii=False) + "\n")
+                self._fh.flush()
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return iter(list(self._data.items()))
+
+    def close(self) -> None:
+        if self._fh:
+            self._fh.close()
+            self._fh = None
@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+"""
+리스닝 믹스 합성 계획(plan) → 같은 보이스 구간 병합(coalesce) → 렌더
+
+make_listening_audio_combined.py / N*_Listening/make_jlpt_audio.py 의 main()은
+synthesize()를 프리픽스, 질문, 옵션 라벨("A"), 옵션 본문마다 따로 호출했습니다
+(4지선다 1문항 = Q 보이스 요청 10회 이상). 여기서는:
+
+⚠️ 기본 보이스 세트(A/B/Q 모두 Chirp3-HD)는 SSML을 받지 않으므로 기본 설정에서는
+   2)의 병합이 일어나지 않고 3)의 memo만 적용됩니다 (요청 수 -40.6%, 아래 표).
+   병합까지 쓰려면 LISTENING_NARRATOR_VOICES로 SSML 지원 낭독 보이스를 지정해야 합니다
+   (보이스 음색이 바뀌므로 기본값은 그대로 둠).
+
+1) main()이 오디오 대신 스텝 목록을 쌓음:  Say(보이스 키, 텍스트) / Gap(ms)
+2) coalesce(): 같은 보이스의 Say 사이에 Gap만 있으면 한 그룹으로 병합
+   → '<speak>프리픽스<break time="220ms"/>질문<break time="1500ms"/>A<break .../>본문...</speak>'
+   (gap_qprefix, gap_q2opt, gap_opt, gap_opt_hold, 같은 화자 연속 턴의 gap_turn 모두 <break>)
+3) render(): 그룹은 SSML 요청 1회, 나머지는 기존처럼 텍스트 요청 + 무음
+   - SSML 미지원 보이스(audio_common.ssml 설정)는 병합하지 않음
+   - SSML 요청이 실패하면 그룹을 원래 스텝대로 다시 렌더 (거부(INVALID_ARGUMENT)면 해당 보이스도
+     기록해 이후 그룹은 바로 스텝별로)
+   - 짧은 반복 문구(옵션 라벨, 문항 프리픽스)는 memo로 항목 간 재사용
+
+Gap은 그룹 밖(화자 전환, 대화→질문)에서는 지금처럼 무음 구간으로 붙습니다.
+render(cues=[...])는 렌더하면서 구간별 시작/끝 ms를 기록합니다 (audio_common.cue_index 참고).
+render(sink=EncoderPipe(...))는 항목 전체를 메모리에 이어 붙이지 않고 세그먼트가 준비되는
+대로 인코더 파이프에 씁니다 (audio_common.pcm_stream 참고).
+
+render_to_file()은 빌더 공통의 렌더 → MP3 저장(→ 래더 변형) 단계를 한 번에 처리합니다.
+purge_outputs()는 --purge-out: 출력 폴더의 MP3와 구간 인덱스 사이드카({id}.json/.vtt)를 지웁니다.
+
+리스닝 데이터셋 10개 기준 TTS 요청 수 (Say 스텝 19,007개):
+  - 기본 보이스 (기본값): 11,290회 (-40.6%, memo만 - 병합 0건)
+  - 낭독(Q) 보이스만 SSML 지원(Neural2)으로 바꿀 때: 7,169회 (-62.3%, 병합 + memo)
+  - A/B/C/Q 모두 SSML 지원일 때: 6,147회 (-67.7%) - 참고용, 대화 보이스 교체 설정은 없음
+낭독 보이스를 바꾸려면 LISTENING_NARRATOR_VOICES 를 지정합니다 (대화 A/B/C 보이스는 그대로).
+
+환경변수(옵션):
+  LISTENING_SSML_MAX_BYTES=4800    # SSML 문서 1개의 최대 바이트(Cloud TTS 입력 한도 5000 이하)
+  LISTENING_MEMO_MAX_CHARS=40      # memo 대상 텍스트 최대 길이(0이면 memo 끔)
+  LISTENING_NARRATOR_VOICES=ja-JP=ja-JP-Neural2-C,en-US=en-US-Neural2-J
+                                   # 언어코드=보이스 이름: 해당 언어의 Q(낭독) 보이스 교체 (기본 없음)
+"""
+
+import os
+from typing import Any, Callable, Collection, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from audio_common.cue_index import is_sidecar
+from audio_common.pcm_stream import EncoderPipe
+from audio_common.ssml import (
+    MAX_BREAK_MS,
+    break_tag,
+    escape_text,
+    is_ssml_rejection,
+    mark_ssml_failed,
+    voice_supports_ssml,
+)
+
+LISTENING_SSML_MAX_BYTES = int(os.getenv("LISTENING_SSML_MAX_BYTES", "4800"))
+LISTENING_MEMO_MAX_CHARS = int(os.getenv("LISTENING_MEMO_MAX_CHARS", "40"))
+LISTENING_NARRATOR_VOICES: Dict[str, str] = dict(
+    x.strip().split("=", 1)
+    for x in os.getenv("LISTENING_NARRATOR_VOICES", "").split(",")
+    if "=" in x
+)
+
+
+class Say(NamedTuple):
+    voice: str          # 보이스 키 ("A", "B", "C", "Q")
+    text: str
+    soft: bool = False  # True면 실패 시 경고만 출력하고 건너뜀(직후 Gap도 생략) - 대화부 동작
+    kind: str = ""      # 오프셋 인덱스용 구간 종류 (turn / prefix / question / option_label / option)
+    ref: str = ""       # 오프셋 인덱스용 텍스트 id (예: "turn.3", "q2", "q2.B")
+
+
+class Gap(NamedTuple):
+    ms: int
+
+
+class Group(NamedTuple):
+    voice: str
+    steps: Tuple[Union[Say, Gap], ...]  # Say로 시작/끝, 사이에 Gap
+
+
+Step = Union[Say, Gap, Group]
+
+
+class ListeningPlan:
+    """main()에서 audio_mix += ... 대신 쌓는 스텝 목록"""
+
+    def __init__(self, prepare: Optional[Callable[[str], str]] = None):
+        # prepare: 텍스트 전처리 (SSML 조립 전에 파트별로 적용해야 하는 정리 함수)
+        self.steps: List[Union[Say, Gap]] = []
+        self.prepare = prepare
+
+    def say(self, voice: str, text: str, soft: bool = False, kind: str = "", ref: str = "") -> None:
+        if text and self.prepare is not None:
+            text = self.prepare(text)
+        if text:
+            self.steps.append(Say(voice, text, soft, kind, ref))
+
+    def gap(self, ms: int) -> None:
+        self.steps.append(Gap(max(0, ms)))
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+
+# ===== 병합 =====
+def group_ssml(group: Group) -> str:
+    parts = []
+    for st in group.steps:
+        parts.append(escape_text(st.text) if isinstance(st, Say) else break_tag(st.ms))
+    return "<speak>" + "".join(parts) + "</speak>"
+
+
+def _ssml_bytes(steps: List[Union[Say, Gap]]) -> int:
+    return len(group_ssml(Group("", tuple(steps))).encode("utf-8"))
+
+
+def coalesce(
+    steps: List[Union[Say, Gap]],
+    can_merge: Callable[[str], bool],
+    max_bytes: int = LISTENING_SSML_MAX_BYTES,
+) -> List[Step]:
+    """같은 보이스 Say 사이에 Gap만 있는 구간을 Group으로 병합"""
+    out: List[Step] = []
+    run: List[Union[Say, Gap]] = []  # 현재 병합 후보 (Say로 시작)
+
+    def flush():
+        # 끝에 붙은 Gap은 그룹 밖으로
+        tail: List[Gap] = []
+        while run and isinstance(run[-1], Gap):
+            tail.insert(0, run.pop())
+        says = sum(1 for st in run if isinstance(st, Say))
+        if says > 1:
+            out.append(Group(run[0].voice, tuple(run)))
+        else:
+            out.extend(run)
+        out.extend(tail)
+        run.clear()
+
+    for st in steps:
+        if isinstance(st, Gap):
+            if run and st.ms <= MAX_BREAK_MS:
+                run.append(st)
+            else:
+                flush()
+                out.append(st)
+            continue
+        if not can_merge(st.voice):
+            flush()
+            out.append(st)
+            continue
+        if run and run[0].voice == st.voice and _ssml_bytes(run + [st]) <= max_bytes:
+            run.append(st)
+        else:
+            flush()
+            run.append(st)
+    flush()
+    return out
+
+
+# ===== 렌더 =====
+class _AudioBuffer:
+    """기본 싱크: 세그먼트를 AudioSegment 하나로 이어 붙임 (기존 audio_mix += ...)"""
+
+    def __init__(self, silence: Callable[[int], Any]):
+        self.silence = silence
+        self.audio = silence(0)
+
+    @property
+    def ms(self) -> int:
+        return len(self.audio)
+
+    def add(self, seg: Any) -> None:
+        self.audio += seg
+
+    def add_silence(self, ms: int) -> None:
+        self.audio += self.silence(ms)
+
+
+def render(
+    plan: ListeningPlan,
+    voices: Dict[str, Any],
+    synth: Callable[[str, Any, bool], Any],
+    silence: Callable[[int], Any],
+    memo: Optional[Dict[Tuple[str, str], Any]] = None,
+    coalesce_voices: bool = True,
+    cues: Optional[List[Dict[str, Any]]] = None,
+    sink: Any = None,
+) -> Tuple[Any, int]:
+    """
+    plan → (오디오, TTS 요청 횟수)
+    voices: 보이스 키 → VoiceSelectionParams (.name 사용)
+    synth(text, voice, ssml) → 오디오 세그먼트 (len() = ms, 예외는 그대로 전파)
+    silence(ms) → 무음 세그먼트
+    cues: 리스트를 넘기면 kind가 있는 Say마다 렌더 위치(배속 적용 전 ms)를 추가
+      - SSML 그룹 안의 구간은 <break> 길이는 정확히, 발화 길이는 글자 수 비례로 나눈
+        추정값이며 "approx": True 로 표시
+    sink: add(seg) / add_silence(ms) / ms 를 가진 출력 (예: pcm_stream.EncoderPipe)
+      - 주면 오디오를 이어 붙이지 않고 순서대로 sink에 쓰며 (sink, 요청 횟수)를 반환
+    """
+
+    def can_merge(key: str) -> bool:
+        return coalesce_voices and voice_supports_ssml(getattr(voices[key], "name", ""))
+
+    requests = 0
+    out = sink if sink is not None else _AudioBuffer(silence)
+
+    def say(st: Say):
+        nonlocal requests
+        voice = voices[st.voice]
+        key = (getattr(voice, "name", st.voice), st.text)
+        use_memo = memo is not None and len(st.text) <= LISTENING_MEMO_MAX_CHARS
+        if use_memo and key in memo:
+            return memo[key]
+        requests += 1
+        seg = synth(st.text, voice, False)
+        if use_memo:
+            memo[key] = seg
+        return seg
+
+    def add_cue(st: Say, start: float, end: float, approx: bool = False) -> None:
+        if cues is None or not st.kind:
+            return
+        cue = {"type": st.kind, "speaker": st.voice, "id": st.ref, "start": start, "end": end, "text": st.text}
+        if approx:
+            cue["approx"] = True
+        cues.append(cue)
+
+    def add_group_cues(group: Group, start: int, total: int) -> None:
+        if cues is None:
+            return
+        breaks = sum(st.ms for st in group.steps if isinstance(st, Gap))
+        chars = sum(len(st.text) for st in group.steps if isinstance(st, Say)) or 1
+        per_char = max(0, total - breaks) / chars
+        t = float(start)
+        for st in group.steps:
+            if isinstance(st, Gap):
+                t += st.ms
+                continue
+            d = per_char * len(st.text)
+            add_cue(st, t, t + d, approx=True)
+            t += d
+
+    def render_steps(steps) -> None:
+        nonlocal requests
+        skip_gap = False
+        for st in steps:
+            if isinstance(st, Gap):
+                if not skip_gap:
+                    out.add_silence(st.ms)
+                skip_gap = False
+                continue
+            skip_gap = False
+            if isinstance(st, Group):
+                voice = voices[st.voice]
+                if not can_merge(st.voice):
+                    # 같은 plan 앞쪽 그룹에서 SSML 실패가 기록된 보이스
+                    render_steps(st.steps)
+                    continue
+                try:
+                    requests += 1
+                    seg = synth(group_ssml(st), voice, True)
+                except Exception as e:
+                    name = getattr(voice, "name", st.voice)
+                    if is_ssml_rejection(e):
+                        mark_ssml_failed(name)
+                    print(f"  ↪︎ SSML 합성 실패({name}), 스텝별 합성으로 폴백: {e}")
+                    render_steps(st.steps)
+                    continue
+                # 합성만 SSML 실패로 보고, 출력(sink) 오류는 그대로 올려보냄
+                add_group_cues(st, out.ms, len(seg))
+                out.add(seg)
+                continue
+            try:
+                seg = say(st)
+            except Exception as e:
+                if not st.soft:
+                    raise
+                print(f"  ! 합성 실패({st.voice}): {e}")
+                skip_gap = True
+                continue
+            start = out.ms
+            out.add(seg)
+            add_cue(st, start, out.ms)
+
+    render_steps(coalesce(plan.steps, can_merge))
+    return (out if sink is not None else out.audio), requests
+
+
+# ===== 항목 출력 =====
+def purge_outputs(out_dir: str, keep: Collection[str] = ()) -> None:
+    """출력 폴더의 MP3와 그 사이드카 삭제 (keep에 있는 항목 id는 남김 - 샤드/큐 모드)"""
+    if not os.path.isdir(out_dir):
+        return
+    removed = 0
+    for name in os.listdir(out_dir):
+        path = os.path.join(out_dir, name)
+        stem, ext = os.path.splitext(name)
+        if stem in keep or not (ext.lower() == ".mp3" or is_sidecar(path)):
+            continue
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    print(f"[PURGE] {out_dir} 내 기존 MP3/사이드카 {removed}개 삭제")
+
+
+def narrator_override(voices: Dict[str, Any]) -> Dict[str, Any]:
+    """LISTENING_NARRATOR_VOICES에 Q 보이스의 언어코드가 있으면 Q만 그 보이스로 바꾼 세트"""
+    q = voices.get("Q")
+    name = LISTENING_NARRATOR_VOICES.get(getattr(q, "language_code", ""))
+    if not name:
+        return voices
+    return {**voices, "Q": type(q)(language_code=q.language_code, name=name)}
+
+
+def render_to_file(
+    plan: ListeningPlan,
+    voices: Dict[str, Any],
+    synth: Callable[[str, Any, bool], Any],
+    silence: Callable[[int], Any],
+    out_path: str,
+    export_params: List[str],
+    ladder: Any,
+    stream: bool = False,
+    memo: Optional[Dict[Tuple[str, str], Any]] = None,
+    coalesce_voices: bool = True,
+    cues: Optional[List[Dict[str, Any]]] = None,
+) -> Tuple[int, int]:
+    """
+    plan을 렌더해 out_path에 MP3로 한 번 저장 → (TTS 요청 횟수, 길이 ms)
+    stream: pcm_stream.EncoderPipe로 렌더하면서 바로 인코딩
+      (래더가 켜져 있으면 같은 파이프에서 PCM 마스터도 기록해 변형 원본으로 넘김)
+    아니면 항목 전체를 이어 붙인 뒤 export + ladder.add (기존 동작)
+    """
+    if stream:
+        master = ladder.master_for(out_path)
+        with EncoderPipe(out_path, export_params, master=master) as pipe:
+            _, requests = render(plan, voices, synth, silence, memo=memo,
+                                 coalesce_voices=coalesce_voices, cues=cues, sink=pipe)
+        if master:
+            ladder.add_source(master, out_path)
+        return requests, pipe.ms
+    audio, requests = render(plan, voices, synth, silence, memo=memo,
+                             coalesce_voices=coalesce_voices, cues=cues)
+    audio.export(out_path, format="mp3", parameters=export_params)
+    ladder.add(audio, out_path, export_params)
+    return requests, len(audio)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+문자 n-gram MinHash + LSH 밴딩 (numpy 벡터화)
+
+쌍별 비교(O(n²)) 없이 근접 중복 문장을 묶습니다. 모든 문서를 하나의 코드포인트
+배열로 이어 붙여 n-gram 해시, 순열별 최소값(np.minimum.reduceat)을 한 번에 계산하고,
+밴드별로 서명 조각이 같은 문서끼리만 후보로 삼아 추정 유사도(서명 일치 비율)로
+확인한 뒤 union-find로 클러스터를 만듭니다. 문서 수에 대해 선형입니다.
+
+  sig = minhash_signatures(texts, k=3, num_perm=64)
+  clusters = lsh_clusters(sig, bands=16, threshold=0.8)  # [(문서 id 배열, 최소 유사도, 평균 유사도)]
+
+밴드 b개 × 행 r개일 때 후보가 될 확률 ≈ 1 - (1 - s^r)^b  (64 = 16×4 → s≈0.5부터 후보)
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+_POLY = np.uint64(0x01000193)      # n-gram 롤링 곱수 (FNV prime)
+_MIX = np.uint64(0x9E3779B1)       # 최종 섞기 (golden ratio)
+
+
+def shingle_hashes(texts: Sequence[str], k: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    문서별 문자 k-gram 해시(uint32) → (hashes, offsets)
+    문서 i의 해시는 hashes[offsets[i]:offsets[i+1]] (k보다 짧은 문서는 NUL로 채워 1개)
+    """
+    padded = [t if len(t) >= k else t + "\0" * (k - len(t)) for t in texts]
+    lens = np.fromiter((len(t) for t in padded), dtype=np.int64, count=len(padded))
+    cps = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+
+    total = cps.size
+    n_pos = total - k + 1
+    h = np.zeros(max(n_pos, 0), dtype=np.uint64)
+    for j in range(k):
+        h = (h * _POLY + cps[j:j + n_pos]) & _MASK32
+    h = (h * _MIX) & _MASK32
+
+    # 문서 경계를 넘는 n-gram 제외
+    counts = lens - k + 1
+    starts = np.concatenate(([0], np.cumsum(lens)[:-1]))
+    idx = np.repeat(starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts) + np.arange(counts.sum())
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    return h[idx], offsets
+
+
+def minhash_signatures(texts: Sequence[str], k: int = 3, num_perm: int = 64, seed: int = 1) -> np.ndarray:
+    """문서별 MinHash 서명 (n_docs × num_perm, uint32)"""
+    if not texts:
+        return np.zeros((0, num_perm), dtype=np.uint32)
+    hashes, offsets = shingle_hashes(texts, k)
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+    sig = np.empty((len(texts), num_perm), dtype=np.uint32)
+    starts = offsets[:-1]
+    shift = np.uint64(32)
+    with np.errstate(over="ignore"):
+        for p in range(num_perm):
+            # multiply-shift 해싱 (uint64 오버플로는 의도된 mod 2^64)
+            v = (hashes * a[p] + b[p]) >> shift
+            sig[:, p] = np.minimum.reduceat(v, starts)
+    return sig
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def lsh_clusters(
+    sig: np.ndarray, bands: int = 16, threshold: float = 0.8
+) -> List[Tuple[np.ndarray, float, float]]:
+    """
+    서명 → 근접 중복 클러스터 [(문서 id 배열, 최소 유사도, 평균 유사도)] (크기 2 이상만)
+    같은 밴드 버킷의 문서는 버킷 첫 문서와 서명 일치 비율이 threshold 이상일 때만 연결
+    """
+    n, num_perm = sig.shape
+    rows = num_perm // bands
+    if n < 2 or rows == 0:
+        return []
+    uf = _UnionFind(n)
+    for band in range(bands):
+        block = np.ascontiguousarray(sig[:, band * rows:(band + 1) * rows])
+        keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows))).ravel()
+        order = np.argsort(keys, kind="stable")
+        sk = keys[order]
+        change = np.flatnonzero(sk[1:] != sk[:-1]) + 1
+        bounds = np.concatenate(([0], change, [n]))
+        sizes = np.diff(bounds)
+        for g in np.flatnonzero(sizes > 1):
+            members = order[bounds[g]:bounds[g + 1]]
+            anchor = members[0]
+            sims = (sig[members[1:]] == sig[anchor]).mean(axis=1)
+            for m in members[1:][sims >= threshold]:
+                uf.union(int(anchor), int(m))
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(n):
+        groups.setdefault(uf.find(i), []).append(i)
+    out = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        ids = np.array(members)
+        sims = (sig[ids[1:]] == sig[ids[0]]).mean(axis=1)
+        out.append((ids, float(sims.min()), float(sims.mean())))
+    return out
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+MP3(MPEG-1/2/2.5 Layer III) 프레임 스캐너 (외부 의존성 없음)
+
+스프라이트 패킹(pack_sprites.py)에서 클립을 '프레임 단위로' 이어 붙이기 위해 사용합니다.
+- 앞쪽 ID3v2 태그, 끝쪽 ID3v1("TAG") 태그 제외
+- 첫 프레임이 Xing/Info(LAME) 헤더 프레임이면 오디오 프레임에서 제외하고
+  인코더 지연(delay)/패딩(padding) 샘플 수를 읽음 (갭리스 재생용)
+- 프레임 수 × 프레임당 샘플 수 / 샘플레이트 로 정확한 길이(ms) 계산
+"""
+
+from typing import NamedTuple, Optional, Tuple
+
+# [version_bits] → 샘플레이트 테이블 (index 0~2)
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG-1
+    2: (22050, 24000, 16000),  # MPEG-2
+    0: (11025, 12000, 8000),   # MPEG-2.5
+}
+# Layer III 비트레이트(kbps) - MPEG-1 / MPEG-2,2.5
+_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+
+
+class FrameHeader(NamedTuple):
+    version: int        # 3=MPEG-1, 2=MPEG-2, 0=MPEG-2.5
+    sample_rate: int
+    bitrate_kbps: int
+    channels: int
+    length: int         # 프레임 바이트 수
+    samples: int        # 프레임당 샘플 수 (1152 / 576)
+
+
+class Mp3Info(NamedTuple):
+    audio_start: int    # 첫 오디오 프레임 오프셋 (Xing/Info 프레임 다음)
+    audio_end: int      # 마지막 오디오 프레임 끝
+    frames: int
+    sample_rate: int
+    channels: int
+    samples_per_frame: int
+    enc_delay: int      # LAME 태그의 인코더 지연 샘플 (없으면 0)
+    enc_padding: int
+
+    @property
+    def duration_ms(self) -> float:
+        return self.frames * self.samples_per_frame * 1000.0 / self.sample_rate
+
+    @property
+    def format_key(self) -> Tuple[int, int, int]:
+        """이어 붙일 수 있는지 판단하는 키 (샘플레이트, 채널, 프레임당 샘플)"""
+        return (self.sample_rate, self.channels, self.samples_per_frame)
+
+
+def parse_header(b: bytes, pos: int) -> Optional[FrameHeader]:
+    if pos + 4 > len(b) or b[pos] != 0xFF or (b[pos + 1] & 0xE0) != 0xE0:
+        return None
+    h1, h2, h3 = b[pos + 1], b[pos + 2], b[pos + 3]
+    version = (h1 >> 3) & 0x03
+    layer = (h1 >> 1) & 0x03
+    if version == 1 or layer != 1:  # reserved / Layer III 아님
+        return None
+    br_idx = (h2 >> 4) & 0x0F
+    sr_idx = (h2 >> 2) & 0x03
+    if br_idx in (0, 15) or sr_idx == 3:  # free-format / bad
+        return None
+    padding = (h2 >> 1) & 0x01
+    sample_rate = _SAMPLE_RATES[version][sr_idx]
+    if version == 3:
+        bitrate = _BITRATES_V1[br_idx]
+        samples = 1152
+        length = 144000 * bitrate // sample_rate + padding
+    else:
+        bitrate = _BITRATES_V2[br_idx]
+        samples = 576
+        length = 72000 * bitrate // sample_rate + padding
+    channels = 1 if ((h3 >> 6) & 0x03) == 3 else 2
+    return FrameHeader(version, sample_rate, bitrate, channels, length, samples)
+
+
+def _id3v2_size(b: bytes) -> int:
+    if len(b) >= 10 and b[:3] == b"ID3":
+        size = (b[6] << 21) | (b[7] << 14) | (b[8] << 7) | b[9]
+        footer = 10 if b[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def _xing_offset(h: FrameHeader) -> int:
+    # 프레임 헤더(4) + side info 크기
+    if h.version == 3:
+        return 4 + (17 if h.channels == 1 else 32)
+    return 4 + (9 if h.channels == 1 else 17)
+
+
+def _read_lame_gapless(b: bytes, pos: int, h: FrameHeader) -> Optional[Tuple[int, int]]:
+    """pos 프레임이 Xing/Info 프레임이면 (delay, padding) 반환, 아니면 None"""
+    x = pos + _xing_offset(h)
+    tag = b[x:x + 4]
+    if tag not in (b"Xing", b"Info"):
+        return None
+    flags = int.from_bytes(b[x + 4:x + 8], "big")
+    off = x + 8
+    off += 4 if flags & 0x1 else 0     # frames
+    off += 4 if flags & 0x2 else 0     # bytes
+    off += 100 if flags & 0x4 else 0   # TOC
+    off += 4 if flags & 0x8 else 0     # quality
+    delay = padding = 0
+    if b[off:off + 4] in (b"LAME", b"Lavf", b"Lavc") and off + 24 <= pos + h.length:
+        d = b[off + 21:off + 24]
+        delay = (d[0] << 4) | (d[1] >> 4)
+        padding = ((d[1] & 0x0F) << 8) | d[2]
+    return delay, padding
+
+
+def scan(data: bytes) -> Mp3Info:
+    """MP3 바이트 → 오디오 프레임 범위/길이 정보 (Layer III 프레임이 없으면 ValueError)"""
+    end = len(data)
+    if end >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128
+    pos = _id3v2_size(data)
+
+    # 첫 프레임 동기 (연속 2프레임 확인)
+    first: Optional[FrameHeader] = None
+    while pos < end - 4:
+        h = parse_header(data, pos)
+        if h and (pos + h.length >= end or parse_header(data, pos + h.length)):
+            first = h
+            break
+        pos += 1
+    if first is None:
+        raise ValueError("no MPEG Layer III frames")
+
+    delay = padding = 0
+    gapless = _read_lame_gapless(data, pos, first)
+    if gapless is not None:
+        delay, padding = gapless
+        pos += first.length
+    audio_start = pos
+
+    frames = 0
+    sr, ch, spf = first.sample_rate, first.channels, first.samples
+    while pos < end:
+        h = parse_header(data, pos)
+        if h is None or pos + h.length > end:
+            break
+        if (h.sample_rate, h.samples) != (sr, spf):
+            break
+        frames += 1
+        pos += h.length
+    return Mp3Info(audio_start, pos, frames, sr, ch, spf, delay, padding)
+
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+멀티 코덱 출력 래더 (PCM 마스터 1회 렌더 → 변형 인코딩)
+
+생성기는 지금처럼 기본 MP3를 저장하고, 래더가 켜져 있으면 같은 오디오를
+PCM(WAV) 마스터로 1회 저장한 뒤 설정된 변형(Opus/AAC/저비트레이트 MP3)을
+프로세스 풀에서 ffmpeg로 인코딩합니다. 포맷을 바꾸거나 추가할 때는
+마스터에서 다시 인코딩하면 되므로 TTS 재합성이 필요 없습니다 (encode_ladder.py).
+
+변형 파일은 MP3 옆에 저장:  word.mp3 → word.opus, word.m4a, word.48k.mp3 ...
+마스터는 별도 트리:        word.mp3 → {AUDIO_MASTER_ROOT}/<같은 상대 경로>/word.wav
+레벨 요약:                 <레벨 폴더>/ladder_summary.json (변형별 파일 수/바이트, MP3 대비 비율)
+
+환경변수(옵션):
+  AUDIO_LADDER=opus24,aac48,mp3_48   # 비어 있으면 래더 끔(기본)
+  AUDIO_LADDER_WORKERS=4             # 인코딩 프로세스 수(기본 CPU 수)
+  AUDIO_MASTER_ROOT=_masters         # PCM 마스터 저장 루트
+  FFMPEG_BIN=ffmpeg
+"""
+
+import json
+import os
+import subprocess
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+AUDIO_LADDER = os.getenv("AUDIO_LADDER", "")
+AUDIO_LADDER_WORKERS = int(os.getenv("AUDIO_LADDER_WORKERS", str(os.cpu_count() or 2)))
+AUDIO_MASTER_ROOT = os.getenv("AUDIO_MASTER_ROOT", "_masters")
+FFMPEG_BIN = os.getenv("FFMPEG_BIN", "ffmpeg")
+
+SUMMARY_FILE = "ladder_summary.json"
+
+# 이름 → (파일 접미사, ffmpeg 인코딩 인자)  (음성 전용: 모노)
+PRESETS: Dict[str, Tuple[str, List[str]]] = {
+    "opus24": (".opus", ["-c:a", "libopus", "-b:a", "24k", "-ac", "1", "-application", "voip"]),
+    "opus32": (".32k.opus", ["-c:a", "libopus", "-b:a", "32k", "-ac", "1", "-application", "voip"]),
+    "aac48": (".m4a", ["-c:a", "aac", "-b:a", "48k", "-ac", "1", "-movflags", "+faststart"]),
+    "aac64": (".64k.m4a", ["-c:a", "aac", "-b:a", "64k", "-ac", "1", "-movflags", "+faststart"]),
+    "mp3_48": (".48k.mp3", ["-c:a", "libmp3lame", "-b:a", "48k", "-ac", "1"]),
+    "mp3_64": (".64k.mp3", ["-c:a", "libmp3lame", "-b:a", "64k", "-ac", "1"]),
+}
+
+
+def parse_variants(spec: Optional[str]) -> List[str]:
+    names = [x.strip() for x in (spec or "").split(",") if x.strip()]
+    unknown = [n for n in names if n not in PRESETS]
+    if unknown:
+        raise ValueError(f"unknown ladder variant: {', '.join(unknown)} (available: {', '.join(PRESETS)})")
+    return names
+
+
+def variant_path(mp3_path: str, name: str) -> str:
+    return os.path.splitext(mp3_path)[0] + PRESETS[name][0]
+
+
+def master_path(mp3_path: str, master_root: str = AUDIO_MASTER_ROOT) -> str:
+    rel = os.path.splitdrive(os.path.normpath(mp3_path))[1].lstrip(os.sep)
+    return os.path.join(master_root, os.path.splitext(rel)[0] + ".wav")
+
+
+def is_variant_file(name: str) -> bool:
+    """기본 MP3가 아닌 래더 변형 파일인지 (요약 시 MP3 기준 집계에서 제외)"""
+    return any(name.endswith(suffix) for suffix, _ in PRESETS.values())
+
+
+def encode_variant(src: str, dst: str, codec_args: Sequence[str]) -> int:
+    """ffmpeg로 src → dst 인코딩 (프로세스 풀 워커), 출력 바이트 수 반환"""
+    tmp = dst + ".part"
+    cmd = [FFMPEG_BIN, "-y", "-loglevel", "error", "-i", src, *codec_args, "-f", _muxer(dst), tmp]
+    proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise RuntimeError(proc.stderr.decode("utf-8", "replace").strip() or f"ffmpeg exit {proc.returncode}")
+    os.replace(tmp, dst)
+    return os.path.getsize(dst)
+
+
+def _muxer(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    return {".opus": "ogg", ".m4a": "ipod", ".mp3": "mp3"}.get(ext, ext.lstrip("."))
+
+
+def summarize_level(level_dir: str, variants: Sequence[str]) -> Dict[str, Any]:
+    """레벨 폴더 스캔 → 변형별 파일 수/바이트 (+ MP3 대비 비율)"""
+    stats: Dict[str, Dict[str, int]] = {"mp3": {"files": 0, "bytes": 0}}
+    for name in variants:
+        stats[name] = {"files": 0, "bytes": 0}
+    suffixes = sorted(((PRESETS[n][0], n) for n in variants), key=lambda x: -len(x[0]))
+    for root, _, files in os.walk(level_dir):
+        for fn in files:
+            if fn == SUMMARY_FILE:
+                continue
+            key = next((n for suffix, n in suffixes if fn.endswith(suffix)), None)
+            if key is None:
+                if not fn.endswith(".mp3") or is_variant_file(fn):
+                    continue
+                key = "mp3"
+            st = stats[key]
+            st["files"] += 1
+            st["bytes"] += os.path.getsize(os.path.join(root, fn))
+    base = stats["mp3"]["bytes"]
+    for name in variants:
+        stats[name]["ratio_vs_mp3"] = round(stats[name]["bytes"] / base, 3) if base else None
+    return {"level": level_dir, "variants": stats}
+
+
+def write_summary(level_dir: str, variants: Sequence[str]) -> Dict[str, Any]:
+    summary = summarize_level(level_dir, variants)
+    with open(os.path.join(level_dir, SUMMARY_FILE), "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return summary
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    print(f"📦 래더 요약: {summary['level']}")
+    for name, st in summary["variants"].items():
+        mb = st["bytes"] / (1024 * 1024)
+        ratio = st.get("ratio_vs_mp3")
+        extra = f"  ({ratio * 100:.0f}% of mp3)" if ratio is not None else ""
+        print(f"    {name:<8} files={st['files']:<6} {mb:8.2f} MB{extra}")
+
+
+class OutputLadder:
+    """
+    생성기용 래더 스테이지
+      ladder = OutputLadder(level_depth=2)
+      seg.export(mp3_path, format="mp3"); ladder.add(seg, mp3_path)
+      ...
+      ladder.close()   # 인코딩 완료 대기 + 레벨 요약 저장/출력
+    스트리밍 인코더(pcm_stream.EncoderPipe)는 master_for()에 마스터를 직접 쓰고 add_source()로 예약합니다.
+    variants가 비어 있으면(기본) 모든 메서드가 no-op 입니다.
+    """
+
+    def __init__(
+        self,
+        variants: Optional[Sequence[str]] = None,
+        workers: int = AUDIO_LADDER_WORKERS,
+        master_root: str = AUDIO_MASTER_ROOT,
+        level_depth: int = 2,
+    ):
+        # level_depth: MP3 경로에서 몇 단계 위가 레벨 폴더인지 (jlpt/n5/<romaji>/word.mp3 → 2)
+        self.variants = list(variants) if variants is not None else parse_variants(AUDIO_LADDER)
+        self.master_root = master_root
+        self.level_depth = level_depth
+        self.levels: Dict[str, None] = {}
+        self._jobs: List[Tuple[str, Future]] = []
+        self._pool = ProcessPoolExecutor(max_workers=max(1, workers)) if self.variants else None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.variants)
+
+    def _level_of(self, mp3_path: str) -> str:
+        d = os.path.dirname(os.path.normpath(mp3_path))
+        for _ in range(self.level_depth - 1):
+            d = os.path.dirname(d)
+        return d or "."
+
+    def master_for(self, mp3_path: str) -> Optional[str]:
+        """래더가 켜져 있으면 mp3_path의 마스터 경로 (스트리밍 인코더가 직접 기록할 때)"""
+        return master_path(mp3_path, self.master_root) if self.enabled else None
+
+    def add(self, seg: Any, mp3_path: str, export_params: Optional[List[str]] = None) -> None:
+        """
+        seg(AudioSegment)를 PCM 마스터로 저장하고 변형 인코딩 예약
+        export_params: MP3 export와 같은 ffmpeg 인자(예: atempo) - 마스터에 미리 적용해
+                       마스터 = 배포 MP3와 같은 타이밍이 되도록 함
+        """
+        if not self.enabled:
+            return
+        master = master_path(mp3_path, self.master_root)
+        os.makedirs(os.path.dirname(master) or ".", exist_ok=True)
+        seg.export(master, format="wav", parameters=export_params or None)
+        self.add_source(master, mp3_path)
+
+    def add_source(
+        self,
+        src: str,
+        mp3_path: str,
+        variants: Optional[Sequence[str]] = None,
+        level: Optional[str] = None,
+    ) -> None:
+        """이미 있는 마스터(또는 MP3)에서 변형 인코딩 예약 (variants: 일부 변형만)"""
+        if not self.enabled:
+            return
+        self.levels[level or self._level_of(mp3_path)] = None
+        for name in variants if variants is not None else self.variants:
+            dst = variant_path(mp3_path, name)
+            fut = self._pool.submit(encode_variant, src, dst, PRESETS[name][1])
+            self._jobs.append((dst, fut))
+
+    def close(self) -> List[Dict[str, Any]]:
+        if not self.enabled:
+            return []
+        failed = 0
+        for dst, fut in self._jobs:
+            try:
+                fut.result()
+            except Exception as e:
+                failed += 1
+                print(f"  ⚠️ 래더 인코딩 실패: {dst} ({e})")
+        self._pool.shutdown()
+        self._jobs.clear()
+        print(f"🎚️ 래더 인코딩 완료 (variants={','.join(self.variants)}, 실패 {failed}건)")
+        summaries = []
+        for level in self.levels:
+            summary = write_summary(level, self.variants)
+            print_summary(summary)
+            summaries.append(summary)
+        return summaries
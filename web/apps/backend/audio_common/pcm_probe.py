@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+MP3 → PCM 디코드 + 음량 측정 (ffmpeg 서브프로세스 + numpy)
+
+pydub(AudioSegment.from_file)도 내부적으로 ffmpeg를 부르지만 WAV 파싱과
+파이썬 객체 생성 비용이 있어, 코퍼스 전체를 훑는 도구(catalog_audio.py 등)는
+ffmpeg의 s16le 출력을 numpy 배열로 바로 읽습니다. 프로세스 풀 워커에서 쓰는
+순수 함수들이며, 음량 값은 pydub의 dBFS/max_dBFS와 같은 정의입니다.
+
+QA 지표(qa_stats)는 10ms 창 RMS를 한 번에 계산한 뒤 무음 구간을 벡터 연산으로
+찾습니다 (앞/뒤 무음, 내부 최장 무음, 클리핑 비율, 마지막 창 음량).
+"""
+
+import math
+import subprocess
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .output_ladder import FFMPEG_BIN
+
+FULL_SCALE = 32768.0
+
+
+def decode_pcm(path: str, sample_rate: Optional[int] = None, mono: bool = False) -> Tuple[np.ndarray, int, int]:
+    """
+    파일 → (int16 샘플 [프레임, 채널], 샘플레이트, 채널 수)
+    sample_rate/mono를 주면 ffmpeg에서 리샘플/다운믹스 (분석용)
+    """
+    rate, channels = sample_rate, 1 if mono else None
+    if rate is None or channels is None:
+        rate, channels = _stream_format(path, rate, channels)
+    cmd = [FFMPEG_BIN, "-v", "error", "-i", path, "-f", "s16le", "-acodec", "pcm_s16le",
+           "-ar", str(rate), "-ac", str(channels), "-"]
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.decode("utf-8", "replace").strip() or f"ffmpeg exit {proc.returncode}")
+    data = np.frombuffer(proc.stdout, dtype="<i2")
+    data = data[: len(data) - len(data) % channels]
+    return data.reshape(-1, channels), rate, channels
+
+
+def _stream_format(path: str, rate: Optional[int], channels: Optional[int]) -> Tuple[int, int]:
+    """원본 샘플레이트/채널 (MP3는 헤더에서, 그 외는 기본값 24000/1)"""
+    if path.lower().endswith(".mp3"):
+        from .mp3_frames import scan  # 지연 import
+
+        try:
+            with open(path, "rb") as f:
+                info = scan(f.read())
+            return rate or info.sample_rate, channels or info.channels
+        except (OSError, ValueError):
+            pass
+    return rate or 24000, channels or 1
+
+
+def to_dbfs(value: float) -> float:
+    """선형 진폭(0~1) → dBFS (무음은 -inf, pydub와 같음)"""
+    return 20 * math.log10(value) if value > 0 else float("-inf")
+
+
+def loudness(samples: np.ndarray) -> Tuple[float, float]:
+    """int16 샘플 → (RMS dBFS, 피크 dBFS)  (= AudioSegment.dBFS, max_dBFS)"""
+    if samples.size == 0:
+        return float("-inf"), float("-inf")
+    x = samples.astype(np.float64).ravel()
+    rms = math.sqrt(float(np.dot(x, x)) / x.size)
+    peak = float(np.abs(x).max())
+    return to_dbfs(rms / FULL_SCALE), to_dbfs(peak / FULL_SCALE)
+
+
+# ===== QA 측정 (qa_scan_audio.py) =====
+def window_db(samples: np.ndarray, rate: int, win_ms: int = 10) -> np.ndarray:
+    """모노 int16 → win_ms 창별 RMS dBFS 배열 (남는 꼬리 샘플은 버림)"""
+    n = max(1, rate * win_ms // 1000)
+    frames = len(samples) // n
+    if frames == 0:
+        return np.empty(0, dtype=np.float32)
+    x = samples[: frames * n].astype(np.float32).reshape(frames, n)
+    rms = np.sqrt(np.mean(x * x, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-3) / FULL_SCALE)
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """bool 배열의 True 구간 (시작, 끝) 인덱스"""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.view(np.int8), [0]))))
+    return edges[0::2], edges[1::2]
+
+
+def qa_stats(samples: np.ndarray, rate: int, silence_db: float = -50.0, win_ms: int = 10,
+             clip_level: int = 32700) -> dict:
+    """
+    모노 int16 → 품질 지표
+      duration_ms, dbfs/peak_dbfs, lead_ms/trail_ms(앞뒤 무음), max_gap_ms(내부 최장 무음),
+      clip_ratio(|x| >= clip_level 샘플 비율), end_dbfs(마지막 창 음량 - 잘린 끝 판단)
+    """
+    x = samples.ravel()
+    dbfs, peak = loudness(x)
+    db = window_db(x, rate, win_ms)
+    quiet = db < silence_db
+    out = {
+        "duration_ms": round(len(x) * 1000.0 / rate, 1) if rate else 0.0,
+        "dbfs": dbfs,
+        "peak_dbfs": peak,
+        "clip_ratio": float(np.count_nonzero(np.abs(x.astype(np.int32)) >= clip_level)) / x.size if x.size else 0.0,
+        "end_dbfs": float(db[-1]) if db.size else float("-inf"),
+        "lead_ms": 0.0, "trail_ms": 0.0, "max_gap_ms": 0.0,
+    }
+    if not db.size:
+        return out
+    if quiet.all():
+        out["lead_ms"] = out["trail_ms"] = float(db.size * win_ms)
+        return out
+    starts, ends = _runs(quiet)
+    if starts.size and starts[0] == 0:
+        out["lead_ms"] = float(ends[0] * win_ms)
+    if ends.size and ends[-1] == db.size:
+        out["trail_ms"] = float((ends[-1] - starts[-1]) * win_ms)
+    inner = (starts > 0) & (ends < db.size)
+    if inner.any():
+        out["max_gap_ms"] = float((ends[inner] - starts[inner]).max() * win_ms)
+    return out
+
+
+def qa_file(path: str, silence_db: float = -50.0, clip_level: int = 32700) -> dict:
+    """파일 1개 디코드(모노, 원본 샘플레이트) → qa_stats (프로세스 풀 워커, 실패 시 {"error"})"""
+    try:
+        samples, rate, _ = decode_pcm(path, mono=True)
+    except (OSError, RuntimeError) as e:
+        return {"error": str(e)}
+    return qa_stats(samples, rate, silence_db=silence_db, clip_level=clip_level)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+리스닝 믹스 스트리밍 인코딩 (세그먼트 → ffmpeg stdin → MP3)
+
+make_listening_audio_combined.py / N*_Listening/make_jlpt_audio.py는 항목 전체
+(대화 + 모든 질문 + 모든 보기)를 AudioSegment 하나로 이어 붙인 뒤 export합니다.
+pydub의 += 는 매번 전체 raw 바이트를 새로 만들고, export는 임시 WAV를 쓴 뒤
+ffmpeg를 부르므로 긴 N1/C1 항목은 메모리와 디스크 왕복이 항목 길이만큼 커집니다.
+
+EncoderPipe는 항목마다 ffmpeg를 하나 띄워 두고, listening_plan.render(sink=pipe)가
+만드는 세그먼트/무음을 순서대로 PCM(s16le)으로 stdin에 씁니다.
+  - 메모리: 가장 큰 세그먼트 1개 + 파이프 버퍼 (항목 길이와 무관)
+  - 임시 WAV 없음, 출력은 <파일>.part에 쓰고 정상 종료 시 교체 (실패 시 기존 파일 유지)
+  - master=경로를 주면 같은 ffmpeg에서 PCM 마스터 WAV도 함께 기록 (output_ladder)
+
+  with EncoderPipe(out_path, export_params) as pipe:
+      render(plan, voices, synth, AudioSegment.silent, sink=pipe)
+  pipe.ms   # 총 길이 (배속 적용 전 ms, len(audio_mix)와 같음)
+
+환경변수(옵션):
+  LISTENING_STREAM_RATE=24000   # 파이프 PCM 샘플레이트 (Chirp3 HD / Neural2 MP3 출력과 같게)
+"""
+
+import os
+import subprocess
+from typing import Any, List, Optional, Sequence
+
+from .output_ladder import FFMPEG_BIN
+
+LISTENING_STREAM_RATE = int(os.getenv("LISTENING_STREAM_RATE", "24000"))
+
+SAMPLE_WIDTH = 2            # s16le
+SILENCE_CHUNK_FRAMES = 24000  # 무음은 이 크기 단위로 나눠 기록
+
+
+class EncoderPipe:
+    """세그먼트를 순서대로 받아 ffmpeg로 바로 인코딩하는 렌더 싱크"""
+
+    def __init__(
+        self,
+        out_path: str,
+        export_params: Optional[Sequence[str]] = None,
+        master: Optional[str] = None,
+        sample_rate: int = LISTENING_STREAM_RATE,
+        channels: int = 1,
+    ):
+        self.out_path = out_path
+        self.master = master
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames = 0
+        self._outputs = [(out_path, "mp3")] + ([(master, "wav")] if master else [])
+        cmd: List[str] = [FFMPEG_BIN, "-y", "-loglevel", "error",
+                          "-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels), "-i", "-"]
+        for path, fmt in self._outputs:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            # pydub export와 같은 순서: 사용자 인자(atempo 등) → 포맷 → 출력
+            cmd += [*(export_params or []), "-f", fmt, path + ".part"]
+        self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    # --- 렌더 싱크 (listening_plan.render) ---
+    @property
+    def ms(self) -> int:
+        return int(round(self.frames * 1000.0 / self.sample_rate))
+
+    def add(self, seg: Any) -> None:
+        """AudioSegment → 파이프 형식(샘플레이트/채널/16bit)으로 맞춰 기록"""
+        if seg.frame_rate != self.sample_rate:
+            seg = seg.set_frame_rate(self.sample_rate)
+        if seg.channels != self.channels:
+            seg = seg.set_channels(self.channels)
+        if seg.sample_width != SAMPLE_WIDTH:
+            seg = seg.set_sample_width(SAMPLE_WIDTH)
+        self._write(seg.raw_data)
+
+    def add_silence(self, ms: int) -> None:
+        frames = int(self.sample_rate * max(0, ms) / 1000.0)
+        step = SILENCE_CHUNK_FRAMES
+        for start in range(0, frames, step):
+            self._write(bytes(min(step, frames - start) * SAMPLE_WIDTH * self.channels))
+
+    def _write(self, data: bytes) -> None:
+        if not data:
+            return
+        try:
+            self._proc.stdin.write(data)
+        except (BrokenPipeError, OSError) as e:
+            self.abort()
+            raise RuntimeError(f"ffmpeg 파이프 종료: {self._stderr() or e}")
+        self.frames += len(data) // (SAMPLE_WIDTH * self.channels)
+
+    # --- 종료 ---
+    def _stderr(self) -> str:
+        try:
+            return self._proc.stderr.read().decode("utf-8", "replace").strip()
+        except (OSError, ValueError):
+            return ""
+
+    def _remove_parts(self) -> None:
+        for path, _ in self._outputs:
+            try:
+                os.remove(path + ".part")
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        """입력 종료 → 인코딩 완료 대기 → .part 교체 (실패 시 RuntimeError)"""
+        if self._proc.stdin.closed:
+            return
+        self._proc.stdin.close()
+        err = self._stderr()
+        if self._proc.wait() != 0:
+            self._remove_parts()
+            raise RuntimeError(err or f"ffmpeg exit {self._proc.returncode}")
+        for path, _ in self._outputs:
+            os.replace(path + ".part", path)
+
+    def abort(self) -> None:
+        """렌더 실패 시: ffmpeg 종료 + .part 삭제 (기존 출력은 그대로)"""
+        if not self._proc.stdin.closed:
+            try:
+                self._proc.stdin.close()
+            except OSError:
+                pass
+        self._proc.kill()
+        self._proc.wait()
+        self._remove_parts()
+
+    def __enter__(self) -> "EncoderPipe":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
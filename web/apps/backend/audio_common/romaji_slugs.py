@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+JLPT 항목 → 오디오 폴더(romaji 슬러그) 등록부 (순서와 무관한 동음이의어 접미사)
+
+make_jlpt_audio.py / fix_n1_duplicates.py는 같은 romaji가 다시 나올 때마다 파일 순서대로
+romaji2, romaji3 …을 붙였습니다. 항목 순서를 바꾸거나 중간에 동음이의어를 넣으면
+뒤쪽 동음이의어들의 폴더가 서로 바뀌어, 저장된 오디오 URL이 다른 단어를 가리키고
+바뀐 폴더를 전부 다시 합성해야 했습니다.
+
+등록부는 레벨마다 1개(<데이터셋 폴더>/<레벨>_romaji_slugs.json, 예: jlpt/n1_romaji_slugs.json)로,
+항목 식별자(lemma + kana + pos) → 폴더 이름을 저장합니다. N1.json과 N1_fixed.json은 같은
+등록부(같은 jlpt/n1 폴더)를 씁니다.
+  - 등록된 항목은 romaji가 바뀌어도 폴더 그대로 (한 번 정해진 폴더는 영구)
+  - 새 항목: romaji 폴더가 비어 있으면 그대로, 이미 쓰였으면 쓰이지 않은 다음 접미사(2, 3 …)
+  - 삭제된 항목의 폴더는 예약된 채로 남음 (다른 항목에 다시 배정하지 않음)
+  - 등록부가 없을 때 처음 만들면 기존 파일 순서 규칙으로 채움 → 지금 폴더 배치 그대로
+  - 같은 식별자가 파일에 여러 번 있으면 #2, #3 … 으로 구분 (기존 규칙처럼 각자 폴더)
+
+  slugs = assign_slugs(items, registry_path(json_path, level))   # 생성기 (등록부 저장)
+  slugs = assign_slugs(items, path, save=False)                  # 계획/정리 도구 (계산만)
+  slugs[i] → "ishi2" (필수 필드 lemma/kana/romaji가 없으면 None)
+
+등록부 파일은 데이터셋과 함께 커밋합니다.
+
+환경변수(옵션):
+  ROMAJI_REGISTRY=1     # 0이면 예전 파일 순서 규칙 (등록부를 읽지도 쓰지도 않음)
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+from .voice_assign import item_key, unique_keys
+
+ROMAJI_REGISTRY = os.getenv("ROMAJI_REGISTRY", "1") != "0"
+REGISTRY_SUFFIX = "_romaji_slugs.json"
+REGISTRY_VERSION = 1
+
+
+def sanitize_filename(name: str) -> str:
+    name = re.sub(r'[\\/*?:"<>|]', "", str(name or ""))
+    return name.strip().lower() or "unnamed"
+
+
+def registry_path(dataset_path: str, level: str) -> str:
+    return os.path.join(os.path.dirname(dataset_path), f"{level}{REGISTRY_SUFFIX}")
+
+
+def has_required(item: Dict[str, Any]) -> bool:
+    """생성기가 처리하는 항목인지 (lemma, kana, romaji 모두 있음)"""
+    return bool(item.get("lemma") and item.get("kana") and item.get("romaji"))
+
+
+def item_identities(items: Sequence[Dict[str, Any]]) -> List[str]:
+    """항목 식별자 lemma|kana|pos (파일 안에서 같은 식별자가 반복되면 #2, #3 …)"""
+    return unique_keys([item_key(it.get("lemma", ""), it.get("kana", ""), it.get("pos", "")) for it in items])
+
+
+def counter_slugs(items: Sequence[Dict[str, Any]]) -> List[Optional[str]]:
+    """예전 규칙: 파일 순서대로 같은 romaji가 다시 나오면 접미사 2, 3 …"""
+    counter: Dict[str, int] = {}
+    out: List[Optional[str]] = []
+    for it in items:
+        if not has_required(it):
+            out.append(None)
+            continue
+        base = it["romaji"].lower().strip()
+        counter[base] = counter.get(base, 0) + 1
+        suffix = str(counter[base]) if counter[base] > 1 else ""
+        out.append(sanitize_filename(it["romaji"]) + suffix)
+    return out
+
+
+def load_registry(path: str) -> Optional[Dict[str, str]]:
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return dict(data.get("slugs", {}))
+
+
+def save_registry(path: str, slugs: Dict[str, str]) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"  # 샤드들이 같은 표를 동시에 저장해도 안전 (내용은 같음)
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"v": REGISTRY_VERSION, "slugs": dict(sorted(slugs.items()))}, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+
+def _free_slug(base: str, taken: set) -> str:
+    if base not in taken:
+        return base
+    n = 2
+    while f"{base}{n}" in taken:
+        n += 1
+    return f"{base}{n}"
+
+
+def assign_slugs(
+    items: Sequence[Dict[str, Any]],
+    path: Optional[str],
+    enabled: bool = ROMAJI_REGISTRY,
+    save: bool = True,
+) -> List[Optional[str]]:
+    """항목별 폴더 이름 (데이터셋 순서, 처리 대상이 아니면 None)"""
+    if not enabled:
+        return counter_slugs(items)
+    ids = item_identities(items)
+    registry = load_registry(path or "")
+    if registry is None:
+        # 첫 생성: 지금 파일 순서 배치를 고정 → 기존 폴더가 움직이지 않음
+        registry = {k: s for k, s in zip(ids, counter_slugs(items)) if s is not None}
+        changed = True
+    else:
+        taken = set(registry.values())
+        changed = False
+        for k, it in zip(ids, items):
+            if k in registry or not has_required(it):
+                continue
+            registry[k] = _free_slug(sanitize_filename(it["romaji"]), taken)
+            taken.add(registry[k])
+            changed = True
+    if changed and save and path:
+        save_registry(path, registry)
+    return [registry.get(k) if has_required(it) else None for k, it in zip(ids, items)]
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+다중 스크립트(한글/가나/한자/라틴/숫자) 구간 분할 엔진
+
+koChirpScript, 리스닝 스크립트처럼 언어가 섞인 문자열을 (라벨, 시작, 끝) 구간으로 나눕니다.
+- 코드포인트 범위 테이블 → 프로필마다 정규식 1개로 컴파일, finditer로 '문자열 런' 단위 분류
+  (문자마다 ord() 비교 + current_text += char 누적하던 루프 대체)
+- 라벨이 None인 규칙(공백/구두점 등)은 직전 구간에 붙음(attach)
+- 결과는 원본 문자열 인덱스 구간(Span)이므로 필요한 시점에만 슬라이스
+
+프로필(원본 함수와 출력 동일):
+  ja_ko         jlpt/make_jlpt_audio.py::split_mixed_text        ("ja" / "ko")
+  en_ko         A1/A1_1/A1_1.py::split_english_korean            ("en" / "ko")
+  en_ko_voice   A1_2~A1_9 ::split_script_by_language             ("en-US" / "ko-KR")
+  en_voice      A2_*, B1_*, A1_9/A1_1_w ::split_script_by_language (한글도 "en-US")
+
+사용:
+  from audio_common.script_segment import segment, get_segmenter
+  segment("ja_ko", text)                   # [("ja", "..."), ("ko", "...")]
+  get_segmenter("en_ko").spans(text)       # [Span(label, start, end), ...]
+
+벤치마크: python bench_script_segment.py
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+Range = Tuple[int, int]
+
+# ===== 코드포인트 범위 테이블 =====
+HANGUL_SYLLABLES: List[Range] = [(0xAC00, 0xD7AF)]
+HANGUL_JAMO: List[Range] = [(0x1100, 0x11FF)]
+HANGUL_COMPAT_JAMO: List[Range] = [(0x3130, 0x318F)]
+HANGUL: List[Range] = HANGUL_SYLLABLES + HANGUL_JAMO + HANGUL_COMPAT_JAMO
+
+HIRAGANA: List[Range] = [(0x3040, 0x309F)]
+KATAKANA: List[Range] = [(0x30A0, 0x30FF)]
+KANA: List[Range] = HIRAGANA + KATAKANA
+# 원본 is_japanese_char 기준(0x9FAF까지)
+CJK_IDEOGRAPHS: List[Range] = [(0x4E00, 0x9FAF), (0x3400, 0x4DBF)]
+
+LATIN_BASIC: List[Range] = [(0x41, 0x5A), (0x61, 0x7A)]
+# 원본의 'a' <= ch.lower() <= 'z' 판정과 동일: İ(U+0130), K(KELVIN SIGN, U+212A) 포함
+LATIN_LOWER_AZ: List[Range] = LATIN_BASIC + [(0x130, 0x130), (0x212A, 0x212A)]
+
+WHITESPACE = r"\s"
+
+
+def char_class(ranges: Iterable[Range]) -> str:
+    """범위 테이블 → 정규식 문자 클래스 본문"""
+    parts = []
+    for lo, hi in ranges:
+        parts.append(f"\\U{lo:08x}" if lo == hi else f"\\U{lo:08x}-\\U{hi:08x}")
+    return "".join(parts)
+
+
+class Span(NamedTuple):
+    label: Optional[str]
+    start: int
+    end: int
+
+
+class Segmenter:
+    """
+    rules: [(라벨 또는 None, 문자 클래스 본문), ...]  (클래스끼리는 겹치지 않게 구성)
+    default: 어느 규칙에도 없는 문자의 라벨 (None이면 부착)
+    leading: 첫 라벨 이전의 부착 문자 처리
+      - "drop": 버림
+      - "own":  (None, 0, n) 구간으로 따로 반환
+    trim: 구간 양끝 공백 제외, 공백만 남는 구간은 버림 (원본의 .strip() 후 필터)
+
+    라벨별 패턴은 '라벨런(부착런 라벨런)*' 형태라서, 같은 라벨 사이에 낀 공백·구두점까지
+    매치 한 번으로 묶입니다. 매치 사이의 나머지는 모두 부착 문자이므로
+    구간 끝 = 다음 매치 시작(마지막은 문자열 끝)입니다.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[Tuple[Optional[str], str]],
+        default: Optional[str] = None,
+        leading: str = "drop",
+        trim: bool = False,
+    ):
+        if leading not in ("drop", "own"):
+            raise ValueError(f"leading must be drop|own: {leading}")
+        union = "".join(cls for _, cls in rules)
+        rest = f"[^{union}]" if union else r"[\s\S]"
+
+        classes: Dict[str, str] = {}
+        attach: List[str] = []
+        for label, cls in list(rules) + [(default, None)]:
+            cls_expr = f"[{cls}]" if cls is not None else rest
+            if label is None:
+                attach.append(cls_expr)
+            elif label in classes:
+                classes[label] += "|" + cls_expr
+            else:
+                classes[label] = cls_expr
+
+        att = "(?:" + "|".join(attach) + ")+" if attach else None
+        parts = []
+        self._labels: List[str] = []
+        for label, cls_expr in classes.items():
+            run = f"(?:{cls_expr})+"
+            parts.append(f"({run}(?:{att}{run})*)" if att else f"({run})")
+            self._labels.append(label)
+        self._re = re.compile("|".join(parts)) if parts else None
+        self.leading = leading
+        self.trim = trim
+
+    def spans(self, text: str) -> List[Span]:
+        if not text or self._re is None:
+            return [Span(None, 0, len(text))] if text and self.leading == "own" else []
+        labels = self._labels
+        matches = [(labels[m.lastindex - 1], m.start(), m.end()) for m in self._re.finditer(text)]
+        out: List[Span] = []
+        if not matches:
+            if self.leading == "own":
+                out.append(Span(None, 0, len(text)))
+            return out
+
+        first_start = matches[0][1]
+        if first_start and self.leading == "own":
+            out.append(Span(None, 0, first_start))
+
+        if self.trim:
+            n = len(matches)
+            for i, (label, start, end) in enumerate(matches):
+                stop = matches[i + 1][1] if i + 1 < n else len(text)
+                sp = _trim(text, Span(label, start, stop))
+                if sp.end > sp.start:
+                    out.append(sp)
+        else:
+            stops = [m[1] for m in matches[1:]] + [len(text)]
+            out.extend(Span(label, start, stop) for (label, start, _), stop in zip(matches, stops))
+        return out
+
+    def segments(self, text: str) -> List[Tuple[Optional[str], str]]:
+        """(라벨, 텍스트) 목록 - 원본 split_* 함수와 같은 형태"""
+        return [(sp.label, text[sp.start:sp.end]) for sp in self.spans(text)]
+
+
+def _trim(text: str, sp: Span) -> Span:
+    start, end = sp.start, sp.end
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return Span(sp.label, start, end)
+
+
+# ===== 프로필 =====
+_JA = char_class(KANA + CJK_IDEOGRAPHS)
+
+SEGMENTERS: Dict[str, Segmenter] = {
+    "ja_ko": Segmenter(
+        [("ja", _JA), (None, WHITESPACE)], default="ko", leading="drop", trim=True
+    ),
+    "en_ko": Segmenter(
+        [("ko", char_class(HANGUL)), ("en", char_class(LATIN_LOWER_AZ))],
+        default=None,
+        leading="drop",
+    ),
+    "en_ko_voice": Segmenter(
+        [("ko-KR", char_class(HANGUL_SYLLABLES)), ("en-US", char_class(LATIN_LOWER_AZ))],
+        default=None,
+        leading="own",
+    ),
+    "en_voice": Segmenter(
+        [("en-US", char_class(HANGUL_SYLLABLES + LATIN_LOWER_AZ))],
+        default=None,
+        leading="own",
+    ),
+}
+
+
+def get_segmenter(name: str) -> Segmenter:
+    try:
+        return SEGMENTERS[name]
+    except KeyError:
+        raise ValueError(f"unknown segment profile: {name} (available: {', '.join(SEGMENTERS)})")
+
+
+def segment(profile: str, text: str) -> List[Tuple[Optional[str], str]]:
+    """프로필로 text를 (라벨, 텍스트) 구간 목록으로 분할"""
+    return get_segmenter(profile).segments(text)
+
+
+def join_by_label(profile: str, text: str) -> Dict[str, str]:
+    """라벨별로 구간을 공백으로 이어 붙이고 공백 정리 (split_english_korean 방식)"""
+    seg = get_segmenter(profile)
+    grouped: Dict[str, List[str]] = {}
+    for sp in seg.spans(text):
+        if sp.label is not None:
+            grouped.setdefault(sp.label, []).append(text[sp.start:sp.end])
+    return {label: " ".join(" ".join(parts).split()) for label, parts in grouped.items()}
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+데이터셋을 여러 머신에 나눠 생성 (--shard i/N)
+
+생성기(make_word_gloss.py, dedupe_vocabs.py, jlpt/make_jlpt_audio.py,
+A1~C1 make_listening_audio_combined.py, N1~N5_Listening/make_jlpt_audio.py)는
+--shard i/N 을 받으면 데이터셋 전체를 읽은 뒤 i번째 몫의 항목만 합성합니다.
+  - 분할은 항목 키(lemma, lemma+kana, 리스닝 id)만으로 결정: sha1(키) % N
+    → 파일 순서, 머신, 실행 시각과 무관하게 모든 샤드가 같은 분할을 계산 (샤드끼리 통신 없음)
+    → 데이터셋에 항목을 추가/삭제/수정해도 다른 항목의 샤드는 그대로 (샤드별 출력/재실행이 안정적)
+    (파이썬 hash()는 프로세스마다 값이 달라서 쓰지 않음)
+  - SHARD_BALANCE=1 이면 예상 비용 균형 분할 (옵션):
+    예상 비용 = 합성 글자 수 + 요청당 고정 비용(generation_plan.py의 PLAN_REQUEST_SEC/PLAN_CHAR_SEC)
+    비용이 큰 항목부터, 같은 비용은 키 해시 순으로 지금 가장 가벼운 샤드에 배정 (LPT)
+    → 샤드 간 예상 비용 차이는 가장 큰 항목 1개 이하
+    ⚠️ 항목 하나만 바뀌어도 다른 항목들이 샤드를 옮겨 다님 - 데이터셋이 고정된 1회성 실행에만
+  - 모든 샤드는 같은 SHARD_BALANCE로 실행해야 함 (보고서의 partition 값, merge_shards.py가 확인)
+  - 항목마다 샤드가 하나라서 출력 경로가 겹치지 않음
+  - 보이스 표/romaji 등록부처럼 데이터셋 전체로 정하는 값은 분할 전에 전체 항목으로 계산
+    (모든 샤드가 같은 값을 계산하므로 누가 저장해도 같은 내용)
+
+샤드마다 기록:
+  _shards/<생성기>.<데이터셋>/<i>of<N>.json   샤드 보고서 (항목 수, 예상 비용, 처리/실패 수,
+                                              실패 목록, 경과 시간, 샤드 매니페스트 경로, 분할 지문)
+  <레벨 폴더>/audio_manifest.shard-<생성기>.<데이터셋>.<i>of<N>.json
+                                              이 샤드가 저장한 파일만 (audio_manifest.py)
+  <로컬 파일>.shard-<생성기>.<데이터셋>.<i>of<N>.txt   실패 목록 등 (run.local_name)
+모든 샤드가 끝나면 (각 머신의 _shards/와 출력 폴더를 한곳에 모은 뒤):
+  python merge_shards.py            → 샤드 매니페스트를 audio_manifest.json에 병합,
+                                      실패 목록/지표를 하나의 보고서로 (merge_shards.py)
+
+  shard = parse_shard("2/4")
+  run = ShardRun(shard, "make_jlpt_audio", json_path, keys, costs)
+  manifest = AudioManifest(level_depth=2, shard=run.tag)
+  for i in run.indices(fails): ...         # 이 샤드 몫 항목(0부터)
+  run.count("synth"); run.finish(fails, manifest.close())
+
+고정 분할 대신 작업 큐(--queue)로 워커를 늘리고 줄이려면 audio_common/work_queue.py
+(QueueRun은 같은 인터페이스 - 보고서는 _shards/<생성기>.<데이터셋>/w-<워커>.json).
+
+환경변수(옵션):
+  SHARD_DIR=_shards        # 샤드 보고서 폴더
+  SHARD_BALANCE=0          # 1이면 키 해시 대신 예상 비용 균형 분할(LPT)
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .generation_plan import PLAN_CHAR_SEC, PLAN_REQUEST_SEC
+
+SHARD_DIR = os.getenv("SHARD_DIR", "_shards")
+SHARD_BALANCE = os.getenv("SHARD_BALANCE", "0").strip().lower() not in ("0", "false", "off", "")
+REPORT_VERSION = 1
+
+_SHARD_RE = re.compile(r"^\s*(\d+)\s*/\s*(\d+)\s*$")
+
+
+class Shard(NamedTuple):
+    index: int  # 1부터
+    count: int
+
+    @property
+    def tag(self) -> str:
+        return f"{self.index}of{self.count}"
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def parse_shard(text: str) -> Shard:
+    """"2/4" → Shard(2, 4)  (argparse type으로도 사용)"""
+    m = _SHARD_RE.match(str(text or ""))
+    if not m:
+        raise ValueError(f"--shard 형식은 i/N 입니다: {text!r}")
+    index, count = int(m.group(1)), int(m.group(2))
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"--shard {text}: 1 <= i <= N 이어야 합니다")
+    return Shard(index, count)
+
+
+def pop_shard(argv: Sequence[str]) -> Tuple[Optional[Shard], List[str]]:
+    """sys.argv에서 --shard i/N (또는 --shard=i/N)을 꺼냄 → (샤드, 나머지 인자)"""
+    shard, rest = None, []
+    it = iter(argv)
+    for a in it:
+        if a == "--shard":
+            shard = parse_shard(next(it, ""))
+        elif a.startswith("--shard="):
+            shard = parse_shard(a.split("=", 1)[1])
+        else:
+            rest.append(a)
+    return shard, rest
+
+
+# ===== 분할 =====
+def item_cost(chars: int, requests: int = 1) -> float:
+    """예상 비용 (글자 단위: 요청 1회 = PLAN_REQUEST_SEC / PLAN_CHAR_SEC 글자)"""
+    per_request = PLAN_REQUEST_SEC / PLAN_CHAR_SEC if PLAN_CHAR_SEC > 0 else 0.0
+    return chars + requests * per_request
+
+
+def text_chars(obj: Any, skip: Sequence[str] = ("id", "audio")) -> int:
+    """항목 안 모든 문자열 길이 합 (리스닝 항목처럼 합성할 텍스트가 여러 필드에 흩어진 경우)"""
+    if isinstance(obj, str):
+        return len(obj)
+    if isinstance(obj, dict):
+        return sum(text_chars(v, skip) for k, v in obj.items() if k not in skip)
+    if isinstance(obj, (list, tuple)):
+        return sum(text_chars(v, skip) for v in obj)
+    return 0
+
+
+def unique_keys(keys: Sequence[str]) -> List[str]:
+    seen: Counter = Counter()
+    out = []
+    for k in keys:
+        seen[k] += 1
+        out.append(k if seen[k] == 1 else f"{k}#{seen[k]}")
+    return out
+
+
+def _digest(key: str) -> str:
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def partition(keys: Sequence[str], costs: Sequence[float], count: int,
+              balance: Optional[bool] = None) -> List[int]:
+    """
+    항목별 샤드 번호(1부터) - 파일 순서와 무관
+    기본: sha1(키) % N (항목마다 독립 - 데이터셋이 바뀌어도 다른 항목은 제자리)
+    balance(기본 SHARD_BALANCE): 예상 비용 균형 분할 (LPT - 키/비용 집합 전체에 따라 배정이 바뀜)
+    """
+    ids = [_digest(k) for k in unique_keys(keys)]
+    if not (SHARD_BALANCE if balance is None else balance):
+        return [int(d, 16) % count + 1 for d in ids]
+    order = sorted(range(len(ids)), key=lambda i: (-costs[i], ids[i]))
+    heap = [(0.0, s) for s in range(1, count + 1)]
+    out = [0] * len(ids)
+    for i in order:
+        load, s = heapq.heappop(heap)
+        out[i] = s
+        heapq.heappush(heap, (load + costs[i], s))
+    return out
+
+
+def select(keys: Sequence[str], costs: Sequence[float], shard: Optional[Shard]) -> List[bool]:
+    """항목별 이 샤드 몫인지 (shard=None이면 전부)"""
+    if shard is None:
+        return [True] * len(keys)
+    return [s == shard.index for s in partition(keys, costs, shard.count)]
+
+
+def fingerprint(keys: Sequence[str], costs: Sequence[float]) -> str:
+    """분할 입력 지문 - 샤드들이 같은 데이터셋 버전으로 실행됐는지 병합 때 확인"""
+    h = hashlib.sha1()
+    for k, c in sorted(zip(unique_keys(keys), costs)):
+        h.update(f"{k}\t{c:.1f}\n".encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+# ===== 샤드 보고서 =====
+def run_dir(recipe: str, dataset: str) -> str:
+    stem = os.path.splitext(os.path.basename(dataset))[0]
+    return os.path.join(SHARD_DIR, f"{recipe}.{stem}")
+
+
+class ShardRun:
+    """샤드 1개 실행 기록 (--shard가 없으면 아무것도 쓰지 않음)"""
+
+    def __init__(self, shard: Optional[Shard], recipe: str, dataset: str,
+                 keys: Sequence[str], costs: Sequence[float]):
+        self.shard = shard
+        self.recipe = recipe
+        self.dataset = dataset
+        self.mask = select(keys, costs, shard)
+        self.items_total = len(keys)
+        self.items = sum(self.mask)
+        self.cost = round(sum(c for c, m in zip(costs, self.mask) if m), 1)
+        self.cost_total = round(sum(costs), 1)
+        self.fingerprint = fingerprint(keys, costs) if shard else ""
+        self.label = shard.tag if shard else ""  # 보고서/매니페스트 이름 (QueueRun은 w-<워커>)
+        self.report_extra: Dict[str, Any] = {}
+        self.metrics: Counter = Counter()
+        self.started = time.time()
+
+    def __contains__(self, idx0: int) -> bool:
+        return self.mask[idx0]
+
+    def indices(self, fails: Optional[List[str]] = None) -> Iterator[int]:
+        """처리할 항목 번호(0부터, 데이터셋 순서) - fails는 QueueRun이 항목별 성공/실패 판정에 사용"""
+        return (i for i, m in enumerate(self.mask) if m)
+
+    @property
+    def tag(self) -> str:
+        """실행 식별자 (<생성기>.<데이터셋>.<i>of<N>, --shard 없으면 "") - 샤드 매니페스트/로컬 파일 이름"""
+        if not self.label:
+            return ""
+        return f"{os.path.basename(run_dir(self.recipe, self.dataset))}.{self.label}"
+
+    def local_name(self, filename: str) -> str:
+        """샤드별 로컬 파일 이름 ("생성 실패 목록.txt" → "생성 실패 목록.shard-<tag>.txt")"""
+        if not self.label:
+            return filename
+        base, ext = os.path.splitext(filename)
+        return f"{base}.shard-{self.tag}{ext}"
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.metrics[name] += n
+
+    def banner(self) -> str:
+        if self.shard is None:
+            return "off"
+        return (f"{self.shard} → 항목 {self.items}/{self.items_total}, "
+                f"예상 비용 {self.cost:,.0f}/{self.cost_total:,.0f}")
+
+    def finish(self, fails: Sequence[str] = (), manifests: Sequence[str] = ()) -> Optional[str]:
+        """샤드 보고서 저장 → 경로 (--shard 없으면 None)"""
+        if not self.label:
+            return None
+        d = run_dir(self.recipe, self.dataset)
+        os.makedirs(d, exist_ok=True)
+        path = os.path.join(d, f"{self.label}.json")
+        report = {
+            "v": REPORT_VERSION,
+            "recipe": self.recipe,
+            "dataset": os.path.normpath(self.dataset),
+            "shard": str(self.shard) if self.shard else self.label,
+            "index": self.shard.index if self.shard else None,
+            "count": self.shard.count if self.shard else None,
+            "fingerprint": self.fingerprint,
+            "partition": ("balance" if SHARD_BALANCE else "hash") if self.shard else None,
+            "items": self.items,
+            "items_total": self.items_total,
+            "cost": self.cost,
+            "cost_total": self.cost_total,
+            "elapsed_sec": round(time.time() - self.started, 1),
+            "finished": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "metrics": dict(self.metrics),
+            "fails": list(fails),
+            "manifests": [os.path.normpath(p) for p in manifests],
+            **self.report_extra,
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, path)
+        print(f"🧩 샤드 보고서: {path}  (모든 샤드가 끝나면 python merge_shards.py)")
+        return path
+
+
+def load_reports(directory: str) -> List[Dict[str, Any]]:
+    """샤드 보고서(<i>of<N>.json)와 큐 워커 보고서(w-<워커>.json)"""
+    out = []
+    for fn in sorted(os.listdir(directory)):
+        if re.match(r"^(\d+of\d+|w-[\w.-]+)\.json$", fn):
+            with open(os.path.join(directory, fn), "r", encoding="utf-8") as f:
+                out.append(json.load(f))
+    return sorted(out, key=lambda r: (r.get("index") or 0, r["shard"]))
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+SSML 조립 헬퍼 (google-cloud-texttospeech 의존 없음)
+
+koGloss 쉼표 분할 합성을 '파트마다 synthesize_speech 1회' 대신
+'<speak>파트<break time="500ms"/>파트...</speak>' 요청 1회로 보내기 위한 함수들입니다.
+
+- 텍스트는 XML 이스케이프(&, <, >, ", ')
+- SSML 미지원 보이스(Chirp3 HD 등)는 이름 패턴으로 걸러서 기존 파트별 경로로 보냄
+- 런타임에 SSML 요청이 거부된(INVALID_ARGUMENT) 보이스는 기억해 두고 이후 호출에서 바로 파트별 경로 사용
+  (타임아웃/할당량 같은 일시 오류는 기록하지 않고 그 호출만 파트별로 합성)
+
+환경변수(옵션):
+  GLOSS_SSML=1                              # 0이면 SSML 모드 끄기(항상 파트별 합성)
+  SSML_UNSUPPORTED_VOICES=Chirp3-HD,Chirp-HD  # 보이스 이름에 포함되면 SSML 미사용(쉼표 구분)
+"""
+
+import os
+import re
+from typing import Any, Callable, List, Optional, Sequence, Set
+from xml.sax.saxutils import escape
+
+GLOSS_SSML = os.getenv("GLOSS_SSML", "1").strip().lower() not in ("0", "false", "no", "off")
+SSML_UNSUPPORTED_VOICES: List[str] = [
+    x.strip()
+    for x in os.getenv("SSML_UNSUPPORTED_VOICES", "Chirp3-HD,Chirp-HD").split(",")
+    if x.strip()
+]
+
+# 표준 SSML <break time>의 상한 (Cloud TTS 기준 10초)
+MAX_BREAK_MS = 10000
+
+_XML_ENTITIES = {'"': "&quot;", "'": "&apos;"}
+
+# 런타임에 SSML 요청이 실패한 보이스
+_ssml_failed: Set[str] = set()
+
+
+def escape_text(text: str) -> str:
+    """SSML 본문용 XML 이스케이프"""
+    return escape(text or "", _XML_ENTITIES)
+
+
+def break_tag(gap_ms: int) -> str:
+    gap_ms = max(0, min(int(gap_ms), MAX_BREAK_MS))
+    return f'<break time="{gap_ms}ms"/>'
+
+
+def join_with_breaks(parts: Sequence[str], gap_ms: int) -> str:
+    """파트 사이에 <break>를 넣은 <speak> 문서"""
+    brk = break_tag(gap_ms)
+    return "<speak>" + brk.join(escape_text(p) for p in parts) + "</speak>"
+
+
+def voice_supports_ssml(voice_name: str) -> bool:
+    """보이스 이름 기준 SSML 사용 가능 여부 (설정 + 런타임 실패 기록 반영)"""
+    if not GLOSS_SSML or not voice_name or voice_name in _ssml_failed:
+        return False
+    return not any(pat in voice_name for pat in SSML_UNSUPPORTED_VOICES)
+
+
+def mark_ssml_failed(voice_name: str) -> None:
+    """SSML 요청이 실패한 보이스를 기록 (이후 파트별 경로로 바로 폴백)"""
+    if voice_name:
+        _ssml_failed.add(voice_name)
+
+
+def is_ssml_rejection(err: BaseException) -> bool:
+    """SSML 요청 거부(INVALID_ARGUMENT: 문서/보이스 미지원)인지 - 일시 오류(타임아웃, 할당량 등)는 False"""
+    status = getattr(err, "grpc_status_code", None)  # google.api_core.exceptions.GoogleAPICallError
+    if status is not None:
+        return getattr(status, "name", str(status)) == "INVALID_ARGUMENT"
+    return type(err).__name__ == "InvalidArgument"
+
+
+def synthesize_comma_parts(
+    text: str,
+    voices: Sequence[str],
+    synth: Callable[[str, str, bool], Any],
+    silence: Callable[[int], Any],
+    comma_gap_ms: int,
+    finish: Callable[[Any], Any] = lambda seg: seg,
+    switch_note: str = "대체 보이스 사용",
+    split_pattern: str = r"[,\uFF0C]",
+) -> Optional[Any]:
+    """
+    쉼표(, ，)로 나눈 파트를 보이스 후보 순서대로 합성 → 세그먼트 (모든 후보 실패면 None)
+    synth(text, voice_name, ssml) → 세그먼트, 실패면 None
+      - ssml=True 요청이 거부되면 그 예외를 그대로 올려야 함 (is_ssml_rejection으로 판별)
+    silence(ms) → 무음 세그먼트
+    finish: 파트별로 이어 붙인 결과 후처리 (예: 라우드니스 정규화)
+    switch_note: 첫 후보가 아닌 보이스로 성공했을 때 로그 문구 (생성기마다 기존 문구 유지)
+    split_pattern: 파트 구분 정규식
+    """
+    parts = [p.strip() for p in re.split(split_pattern, text or "") if p.strip()]
+    if not parts:
+        return silence(0)
+
+    for idx_voice, vname in enumerate([v for v in voices if v]):
+        # SSML 모드: 파트 전체를 <break>로 이어 요청 1회 (미지원/실패 시 파트별 합성)
+        if len(parts) > 1 and voice_supports_ssml(vname):
+            try:
+                seg = synth(join_with_breaks(parts, comma_gap_ms), vname, True)
+            except Exception as e:
+                if is_ssml_rejection(e):
+                    mark_ssml_failed(vname)  # 이후 호출은 바로 파트별 경로
+                seg = None
+            if seg is not None and len(seg) > 0:
+                if idx_voice > 0:
+                    print(f"  ↪︎ {switch_note}: {vname}")
+                return seg
+            print(f"  ↪︎ SSML 합성 실패, 파트별 합성으로 폴백: {vname}")
+
+        merged = silence(0)
+        for idx, part in enumerate(parts):
+            seg = synth(part, vname, False)
+            if seg is None or len(seg) == 0:
+                break
+            merged += seg
+            if idx != len(parts) - 1:
+                merged += silence(comma_gap_ms)
+        else:
+            if idx_voice > 0:
+                print(f"  ↪︎ {switch_note}: {vname}")
+            return finish(merged)
+    return None
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+텍스트 정규화 엔진
+
+생성기마다 따로 구현돼 있던 전처리 함수를 '프로필'로 통합합니다.
+- 정규식은 모듈 로드 시 1회 컴파일 (호출마다 rf-string 패턴을 만들지 않음)
+- 문자 단위 삭제/치환은 str.translate 단일 패스
+- 공백 정리는 str.split() 기반 (re.sub(r"\\s+", " ", s.strip())와 동일 결과)
+- 프로필별 LRU 메모 (같은 gloss/콤마 파트/리스닝 문장이 반복 입력되는 경우)
+
+프로필(원본 함수와 출력 동일):
+  jlpt_gloss    jlpt/make_jlpt_audio.py::clean_ko_gloss
+  word_gloss    make_word_gloss.py::clean_ko_gloss
+  dedupe_gloss  dedupe_vocabs.py::clean_ko_gloss
+  ja_text       jlpt/make_jlpt_audio.py::clean_japanese_text
+  listening     N*_Listening/make_jlpt_audio.py::remove_parentheses
+  ja_only       N1_Listening/fix_N1_L_035.py::remove_korean_translation
+
+사용:
+  from audio_common.text_normalize import normalize
+  ko_gloss = normalize("jlpt_gloss", raw)
+
+환경변수(옵션):
+  TEXT_NORMALIZE_CACHE_SIZE=65536   # 프로필별 LRU 메모 크기(0이면 메모 비활성)
+
+검증/벤치마크: python bench_text_normalize.py
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+TEXT_NORMALIZE_CACHE_SIZE = int(os.getenv("TEXT_NORMALIZE_CACHE_SIZE", "65536"))
+
+# ===== 공용 패턴 / 변환 테이블 =====
+# 소괄호(전각/반각) 및 내부 텍스트
+PAREN_RE = re.compile(r"[（(][^）)]*[）)]")
+
+# 한글 음절/자모 (remove_korean_translation)
+HANGUL_RE = re.compile(r"[가-힣ㄱ-ㅎㅏ-ㅣ]")
+
+# [/\\|<>"'] → 공백
+_SPECIAL_TO_SPACE = str.maketrans({c: " " for c in "/\\|<>\"'"})
+
+# 대괄호·중괄호(전각/반각)는 괄호 문자만 삭제하고 내용 유지
+_BRACKET_DROP = str.maketrans("", "", "［[］]｛{｝}")
+
+# jlpt_gloss: 품사 약어 (영문 / 국문)
+_JLPT_POS_EN_RE = re.compile(
+    r"\b(?:pron|n|v|adj|adv|prep|conj|int|interj|aux|det|num)\.\s*", re.I
+)
+_JLPT_POS_KO_RE = re.compile(
+    r"\b(?:명사|동사|형용사|부사|감탄사|대명사|전치사|접속사|조동사|관사|수사)\.\s*"
+)
+
+# word_gloss: make_word_gloss.py 원본은 패턴이 이중 이스케이프(r"\\s+", r"\\b...\\.")되어
+# 실제로는 리터럴 '\s', '\b' 를 찾습니다. 출력 동일성을 위해 그대로 재현합니다.
+_WORD_LITERAL_SPACE_RE = re.compile(r"\\s+")
+_WORD_POS_RE = re.compile(
+    r"\\b(?:adj|adv|n|v|vt|vi|prep|conj|pron|art|int|interj|aux|det|num)\\.\\s*", re.I
+)
+
+# dedupe_gloss: 괄호형/문두/중간 삽입형 품사 태그
+_DEDUPE_POS_EN = r"(?:adj|adv|n|v|vt|vi|prep|pron|conj|art|interj|int|aux|det|num|modal|phr(?:asal)?\s*verb|phr\.?\s*v)"
+_DEDUPE_POS_KO = r"(?:명사|동사|타동사|자동사|형용사|형용동사|부사|전치사|대명사|관사|수사|접속사|조사|감탄사)"
+_DEDUPE_SEP = r"[:\-–—·\.]"
+_DEDUPE_PAREN_POS_RE = re.compile(
+    rf"[\(\[\（]\s*(?:{_DEDUPE_POS_EN}|{_DEDUPE_POS_KO})\.?\s*[\)\]\）]\s*", re.IGNORECASE
+)
+_DEDUPE_START_POS_RE = re.compile(
+    rf"^(?:\s*(?:{_DEDUPE_POS_EN}|{_DEDUPE_POS_KO})\.?\s*(?:{_DEDUPE_SEP})?\s*)+", re.IGNORECASE
+)
+_DEDUPE_MID_POS_RE = re.compile(
+    rf"(\s|,|;)\s*(?:{_DEDUPE_POS_EN}|{_DEDUPE_POS_KO})\.?\s*(\s|,|;)", re.IGNORECASE
+)
+
+
+# ===== 기본 연산 =====
+def squash_spaces(s: str) -> str:
+    """연속 공백 → 한 칸, 양끝 제거 (normalize_spaces와 동일)"""
+    return " ".join((s or "").split())
+
+
+# ===== 프로필 =====
+def _jlpt_gloss(text: str) -> str:
+    if not text:
+        return ""
+    s = squash_spaces(text)
+    s = s.replace("~", "무엇무엇")
+    s = PAREN_RE.sub("", s)
+    s = _JLPT_POS_EN_RE.sub("", s)
+    s = _JLPT_POS_KO_RE.sub("", s)
+    s = s.translate(_SPECIAL_TO_SPACE)
+    return squash_spaces(s).strip(" ;,·")
+
+
+def _word_gloss(text: str) -> str:
+    if not text:
+        return ""
+    s = text.strip()
+    # 리터럴 백슬래시가 없으면 원본의 정규식 3개는 모두 no-op
+    has_bs = "\\" in s
+    if has_bs:
+        s = _WORD_LITERAL_SPACE_RE.sub(" ", s)
+    s = s.replace("~", "무엇무엇")
+    if has_bs:
+        s = _WORD_POS_RE.sub("", s)
+        s = _WORD_LITERAL_SPACE_RE.sub(" ", s.strip())
+    else:
+        s = s.strip()
+    return s.strip(" ;,·")
+
+
+def _dedupe_gloss(text: str) -> str:
+    if not text:
+        return ""
+    s = squash_spaces(text.strip().replace("~", "무엇무엇"))
+    s = _DEDUPE_PAREN_POS_RE.sub(" ", s)
+    s = _DEDUPE_START_POS_RE.sub("", s)
+    s = _DEDUPE_MID_POS_RE.sub(r"\1 \2", s)
+    return squash_spaces(s).strip(" ;,·-–—.")
+
+
+def _ja_text(text: str) -> str:
+    if not text:
+        return ""
+    s = PAREN_RE.sub("", squash_spaces(text))
+    return squash_spaces(s.translate(_SPECIAL_TO_SPACE))
+
+
+def _listening(text: str) -> str:
+    if not text:
+        return text
+    s = PAREN_RE.sub("", text).translate(_BRACKET_DROP)
+    return squash_spaces(s)
+
+
+def _ja_only(text: str) -> str:
+    if not text:
+        return text
+    s = PAREN_RE.sub("", text).translate(_BRACKET_DROP)
+    return squash_spaces(HANGUL_RE.sub("", s))
+
+
+_PROFILE_FUNCS: Dict[str, Callable[[str], str]] = {
+    "jlpt_gloss": _jlpt_gloss,
+    "word_gloss": _word_gloss,
+    "dedupe_gloss": _dedupe_gloss,
+    "ja_text": _ja_text,
+    "listening": _listening,
+    "ja_only": _ja_only,
+}
+
+
+def _memoize(func: Callable[[str], str]) -> Callable[[str], str]:
+    if TEXT_NORMALIZE_CACHE_SIZE <= 0:
+        return func
+    return lru_cache(maxsize=TEXT_NORMALIZE_CACHE_SIZE)(func)
+
+
+PROFILES: Dict[str, Callable[[str], str]] = {
+    name: _memoize(func) for name, func in _PROFILE_FUNCS.items()
+}
+
+
+def get_profile(name: str) -> Callable[[str], str]:
+    """프로필 이름 → (메모 적용된) 정규화 함수"""
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"unknown normalize profile: {name} (available: {', '.join(PROFILES)})")
+
+
+def normalize(profile: str, text: Optional[str]) -> str:
+    """프로필로 text 정규화"""
+    return get_profile(profile)(text)
+
+
+def cache_info() -> Dict[str, Optional[tuple]]:
+    """프로필별 LRU 메모 통계 (hits, misses, maxsize, currsize)"""
+    return {
+        name: (func.cache_info() if hasattr(func, "cache_info") else None)
+        for name, func in PROFILES.items()
+    }
+
+
+def cache_clear() -> None:
+    for func in PROFILES.values():
+        if hasattr(func, "cache_clear"):
+            func.cache_clear()
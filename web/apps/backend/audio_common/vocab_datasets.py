@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+어휘 데이터셋 로더 / 필드 어댑터
+
+CEFR(cefr_vocabs_updated.json, total_vocabs.json), IELTS 레벨 파일(A1~C1/*/ielts_*.json),
+JLPT(jlpt/N1~N5.json), 숙어(idiom.json)는 스키마가 조금씩 다릅니다.
+분석 스크립트(find_near_dups.py, analyze_vocabs.py)는 이 모듈로 항목을 한 번씩 순회하고
+field(item, "koGloss")처럼 같은 이름으로 값을 꺼냅니다.
+
+  for ref, item in iter_items(resolve_sources(["cefr", "jlpt"])):
+      ref.dataset, ref.index  → "jlpt/N5", 12
+      field(item, "lemma")    → idiom 파일이면 "idiom" 키, JLPT면 "lemma"
+"""
+
+import fnmatch
+import glob
+import json
+import os
+import re
+import unicodedata
+from typing import Any, Dict, Iterator, List, NamedTuple, Sequence, Tuple
+
+from .voice_assign import TABLE_SUFFIX
+
+# 이름 → glob 패턴 (backend 루트 기준)
+DATASET_GROUPS: Dict[str, List[str]] = {
+    "cefr": ["cefr_vocabs_updated.json"],
+    "total": ["total_vocabs.json"],
+    "ielts": ["A1/*/ielts_*.json", "A2/*/ielts_*.json", "B1/*/ielts_*.json",
+              "B2/*/ielts_*.json", "C1/*/ielts_*.json"],
+    "jlpt": ["jlpt/N1.json", "jlpt/N2.json", "jlpt/N3.json", "jlpt/N4.json", "jlpt/N5.json"],
+    "idiom": ["idiom.json"],
+}
+DEFAULT_GROUPS = ["cefr", "total", "ielts", "jlpt", "idiom"]
+
+# 표준 필드명 → 데이터셋별 후보 키 (앞에서부터 처음 비어 있지 않은 값)
+FIELD_KEYS: Dict[str, Tuple[str, ...]] = {
+    "lemma": ("lemma", "idiom", "word"),
+    "pos": ("pos",),
+    "romaji": ("romaji",),
+    "kana": ("kana",),
+    "koGloss": ("koGloss", "korean_meaning"),
+    "koExample": ("koExample",),
+    "definition": ("definition", "usage_context_korean"),
+    "example": ("example",),
+    "koChirpScript": ("koChirpScript",),
+    "level": ("levelCEFR", "categories", "category"),
+}
+
+
+class ItemRef(NamedTuple):
+    dataset: str   # 파일 경로에서 .json을 뺀 이름 (예: "jlpt/N5", "A1/A1_1/ielts_a1_1")
+    index: int     # 파일 안의 순번
+
+    @property
+    def id(self) -> str:
+        return f"{self.dataset}#{self.index}"
+
+
+def resolve_sources(specs: Sequence[str], root: str = ".") -> List[str]:
+    """그룹 이름(cefr, jlpt …) / glob / 파일 경로 → 존재하는 JSON 파일 목록 (중복 제거, 순서 유지, 보이스 표 제외)"""
+    out: Dict[str, None] = {}
+    for spec in specs or DEFAULT_GROUPS:
+        patterns = DATASET_GROUPS.get(spec, [spec])
+        for pat in patterns:
+            for path in sorted(glob.glob(os.path.join(root, pat))):
+                if path.endswith(TABLE_SUFFIX):
+                    continue
+                out[os.path.normpath(path)] = None
+    return list(out)
+
+
+def dataset_group(path: str, root: str = ".") -> str:
+    """파일 → 그룹 이름 (cefr/total/ielts/jlpt/idiom, 그룹 밖이면 파일 이름)"""
+    rel = os.path.relpath(path, root).replace(os.sep, "/")
+    for name, patterns in DATASET_GROUPS.items():
+        if any(fnmatch.fnmatch(rel, pat) for pat in patterns):
+            return name
+    return dataset_name(path, root)
+
+
+def dataset_name(path: str, root: str = ".") -> str:
+    rel = os.path.relpath(path, root)
+    return os.path.splitext(rel)[0].replace(os.sep, "/")
+
+
+def load_items(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        # {"items": [...]} 또는 {키: 항목} 형태도 허용
+        data = data.get("items") or data.get("data") or list(data.values())
+    return [it for it in data if isinstance(it, dict)]
+
+
+def iter_items(paths: Sequence[str], root: str = ".") -> Iterator[Tuple[ItemRef, Dict[str, Any]]]:
+    """파일별로 한 번만 읽으면서 (ItemRef, item) 순회"""
+    for path in paths:
+        name = dataset_name(path, root)
+        try:
+            items = load_items(path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ {path} 읽기 실패: {e}")
+            continue
+        for i, it in enumerate(items):
+            yield ItemRef(name, i), it
+
+
+def field(item: Dict[str, Any], name: str) -> str:
+    for key in FIELD_KEYS.get(name, (name,)):
+        v = item.get(key)
+        if isinstance(v, list):
+            v = ", ".join(map(str, v))
+        if isinstance(v, str) and v.strip():
+            return v.strip()
+    return ""
+
+
+# ===== 정규화 (analyze_vocabs.py와 같은 규칙) =====
+_POS_MAP = {
+    "n": "noun", "n.": "noun", "noun": "noun", "v": "verb", "v.": "verb", "verb": "verb",
+    "a": "adjective", "adj": "adjective", "adj.": "adjective", "adjective": "adjective",
+    "adv": "adverb", "adv.": "adverb", "adverb": "adverb",
+}
+_PUNCT_RE = re.compile(r"[^\w\s가-힣·]")
+_WS_RE = re.compile(r"\s+")
+
+
+def squash(s: str) -> str:
+    return _WS_RE.sub(" ", s).strip()
+
+
+def nfkc(s: Any) -> str:
+    return unicodedata.normalize("NFKC", s) if isinstance(s, str) else ""
+
+
+def norm_lemma(s: str) -> str:
+    return squash(nfkc(s).lower())
+
+
+def norm_pos(s: str) -> str:
+    x = squash(nfkc(s).lower())
+    return _POS_MAP.get(x, x)
+
+
+def norm_text(s: str) -> str:
+    """문장 필드(koExample, koGloss, definition …): NFKC + 소문자 + 구두점 제거"""
+    return squash(_PUNCT_RE.sub(" ", nfkc(s).lower()))
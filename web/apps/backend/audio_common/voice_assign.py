@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+항목 → 남/여 보이스 배정 (삽입·삭제·순서 변경에 안정적인 모드)
+
+생성기는 항목 순번의 홀짝으로 남/여를 번갈아 고릅니다(voices_for_index(i)).
+N2.json이나 IELTS 파일에 항목 하나를 넣거나 빼면 그 뒤 모든 항목의 보이스가
+바뀌므로, 유효 입력 키(audio_reuse.py)도 바뀌어 나머지 데이터셋을 전부 다시
+합성해야 합니다. VOICE_ASSIGN으로 배정 방식을 고릅니다.
+
+  index  순번 홀짝 (기본, 기존 동작)
+  hash   항목 키(lemma 등) sha1의 홀짝 - 상태 없음, 남/여 비율은 평균적으로 반반
+  table  데이터셋 옆 <데이터셋>.voices.json 에 키 → male/female 을 저장 (N2.json → N2.voices.json)
+         - 표가 없을 때 처음 만들면 현재 순번 홀짝으로 채움 (기존 오디오 그대로 유효)
+         - 새 항목은 현재 데이터셋에서 적은 쪽 성별로 배정 (동률이면 hash) → 비율 유지
+         - 삭제된 항목의 배정은 남겨 둠 (다시 추가되면 같은 보이스)
+         - 데이터셋 안에서 같은 키가 반복되면 두 번째부터 키#2, 키#3 … 으로 따로 배정
+           (romaji_slugs.item_identities와 같은 규칙 - 처음 만든 표가 index 배정과 같음)
+         표 파일은 데이터셋과 함께 커밋합니다.
+
+  males = assign_males([item_key(lemma, kana) for ...], table_path=voice_table_path(json_path))
+  v = voices_for_index(i, male=males[i])
+
+생성기만 표를 저장하고(save=True), 계획/정리 도구(corpus_artifacts 등)는 같은 규칙으로
+계산만 합니다(save=False) - 그래서 도구가 보는 보이스 = 다음 생성 실행의 보이스.
+
+환경변수(옵션):
+  VOICE_ASSIGN=index       # index / hash / table
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+VOICE_ASSIGN = os.getenv("VOICE_ASSIGN", "index").strip().lower() or "index"
+MODES = ("index", "hash", "table")
+TABLE_SUFFIX = ".voices.json"  # 데이터셋 glob(ielts_*.json 등)에서 제외 - vocab_datasets.resolve_sources
+
+TABLE_VERSION = 1
+
+
+def item_key(*parts: object) -> str:
+    """항목 식별 텍스트 (공백 정리 + 소문자, '|' 연결) - 보이스 배정·표 키"""
+    return "|".join(" ".join(str(p or "").split()).lower() for p in parts)
+
+
+def unique_keys(keys: Sequence[str]) -> List[str]:
+    """반복되는 키는 두 번째부터 '키#2', '키#3' … (파일 순서 기준)"""
+    seen: Dict[str, int] = {}
+    out = []
+    for k in keys:
+        seen[k] = seen.get(k, 0) + 1
+        out.append(k if seen[k] == 1 else f"{k}#{seen[k]}")
+    return out
+
+
+def hash_male(key: str) -> bool:
+    return hashlib.sha1(key.encode("utf-8")).digest()[0] % 2 == 0
+
+
+def voice_table_path(dataset_path: str) -> str:
+    return os.path.splitext(dataset_path)[0] + TABLE_SUFFIX
+
+
+def load_table(path: str) -> Optional[Dict[str, str]]:
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return dict(data.get("voices", {}))
+
+
+def save_table(path: str, table: Dict[str, str]) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"  # 샤드들이 같은 표를 동시에 저장해도 안전 (내용은 같음)
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"v": TABLE_VERSION, "voices": dict(sorted(table.items()))}, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+
+def assign_males(
+    keys: Sequence[str],
+    mode: str = VOICE_ASSIGN,
+    table_path: Optional[str] = None,
+    start_male: bool = True,
+    save: bool = True,
+) -> List[bool]:
+    """
+    항목 키(데이터셋 순서) → 항목별 남성 여부
+    start_male: index 모드 / 표 처음 생성 시 0번 항목이 남성인지 (A2_1.py START_GENDER)
+    """
+    if mode not in MODES:
+        raise ValueError(f"unknown VOICE_ASSIGN: {mode} ({', '.join(MODES)})")
+    parity = [(i % 2 == 0) == start_male for i in range(len(keys))]
+    if mode == "index":
+        return parity
+    keys = unique_keys(keys)
+    if mode == "hash":
+        return [hash_male(k) for k in keys]
+
+    table = load_table(table_path or "")
+    if table is None:
+        # 첫 생성: 지금 순번 배정을 고정 → 기존 산출물 키가 바뀌지 않음
+        table = {k: "male" if male else "female" for k, male in zip(keys, parity)}
+        if save and table_path:
+            save_table(table_path, table)
+        return [table[k] == "male" for k in keys]
+
+    counts = {"male": 0, "female": 0}
+    for k in keys:
+        if k in table:
+            counts[table[k]] += 1
+    added = False
+    for k in keys:
+        if k in table:
+            continue
+        if counts["male"] != counts["female"]:
+            g = "male" if counts["male"] < counts["female"] else "female"
+        else:
+            g = "male" if hash_male(k) else "female"
+        table[k] = g
+        counts[g] += 1
+        added = True
+    if added and save and table_path:
+        save_table(table_path, table)
+    return [table[k] == "male" for k in keys]
@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+"""
+임대(lease) 기반 작업 큐 - 워커를 실행 중에 늘리고 줄이기 (--queue)
+
+--shard i/N(sharding.py)은 머신 수가 정해져 있을 때 쓰는 고정 분할입니다. 작업 큐는 항목마다
+작업 1개(키 = 샤드 분할과 같은 항목 키: lemma, lemma|kana|pos, 리스닝 id)를 저장하고,
+아무 때나 시작한 워커들이 작업을 하나씩 임대해 처리합니다.
+  - 임대(claim): 대기 중이거나 임대가 만료된 작업 중 예상 비용이 가장 큰 것 1개
+                 (비용 순 임대 = 동적 LPT → 먼저 끝난 워커가 남은 작업을 가져감)
+  - 하트비트: 워커가 WORK_LEASE_SEC/3마다 들고 있는 임대를 연장 (긴 리스닝 항목도 안전)
+  - 만료: 워커가 죽으면(kill, 전원, 네트워크) 하트비트가 멈추고 WORK_LEASE_SEC 뒤 다른 워커가 다시 임대
+  - 완료: 항목 처리 중 실패 목록(fails)이 늘지 않았으면 done, 늘었으면 failed (사유 = 새 실패 행)
+  - 예외/Ctrl-C로 끝나면 들고 있던 작업은 바로 대기로 되돌림(atexit). 같은 작업이 WORK_MAX_ATTEMPTS번
+    임대되고도 끝나지 않으면 failed (워커를 계속 죽이는 항목이 큐를 막지 않도록)
+  - 작업 키는 데이터셋 전체로 한 번에 등록(INSERT OR IGNORE)하므로 워커가 몇 개든, 언제 합류하든 같음
+  - 분할 지문(sharding.fingerprint)이 다른 데이터셋으로 합류하면 거부.
+    살아 있는 임대가 없을 때 데이터셋이 바뀌었으면 큐를 새 버전으로 다시 채움
+
+출력은 샤드 모드와 같습니다: 워커마다 샤드 매니페스트(audio_manifest.shard-<실행>.w-<워커>.json)와
+보고서(_shards/<생성기>.<데이터셋>/w-<워커>.json) → 큐가 비면 python merge_shards.py
+(병합 때 큐에 대기/임대 작업이 남아 있으면 미완료로 보고).
+
+저장소는 교체 가능합니다 (WORK_QUEUE=<scheme>:<위치>, register_backend로 추가).
+  sqlite:<경로>   기본. 같은 머신의 여러 프로세스, 또는 파일 잠금이 확실한 공유 디스크
+                  (NFS처럼 잠금이 불안정하면 다른 백엔드를 등록)
+
+  run = QueueRun(WORK_QUEUE, "make_jlpt_audio", json_path, keys, costs)
+  manifest = AudioManifest(level_depth=2, shard=run.tag)
+  for i in run.indices(fails): ...         # 임대한 항목(0부터), 다음 항목을 요청할 때 앞 항목 완료
+  run.finish(fails, manifest.close())
+
+환경변수(옵션):
+  WORK_QUEUE=sqlite:_shards/work_queue.sqlite   # --queue 만 주면 쓰는 큐 (--queue=<url>로 지정 가능)
+  WORK_LEASE_SEC=300                            # 임대 시간 (하트비트가 없으면 이 시간 뒤 재임대)
+  WORK_MAX_ATTEMPTS=3                           # 작업별 최대 임대 횟수
+  WORK_WORKER=<호스트>-<pid>                    # 워커 이름 (보고서/매니페스트 이름)
+"""
+
+import abc
+import atexit
+import os
+import re
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .sharding import SHARD_DIR, ShardRun, fingerprint, run_dir, unique_keys
+
+WORK_QUEUE = os.getenv("WORK_QUEUE", "sqlite:" + os.path.join(SHARD_DIR, "work_queue.sqlite"))
+WORK_LEASE_SEC = float(os.getenv("WORK_LEASE_SEC", "300"))
+WORK_MAX_ATTEMPTS = int(os.getenv("WORK_MAX_ATTEMPTS", "3"))
+
+STATES = ("pending", "leased", "done", "failed")
+
+
+def worker_name() -> str:
+    name = os.getenv("WORK_WORKER") or f"{socket.gethostname()}-{os.getpid()}"
+    return re.sub(r"[^\w.-]+", "_", name)
+
+
+def pop_queue(argv: Sequence[str]) -> Tuple[Optional[str], List[str]]:
+    """sys.argv에서 --queue (WORK_QUEUE) 또는 --queue=<url>을 꺼냄 → (큐 url, 나머지 인자)"""
+    url, rest = None, []
+    for a in argv:
+        if a == "--queue":
+            url = WORK_QUEUE
+        elif a.startswith("--queue="):
+            url = a.split("=", 1)[1] or WORK_QUEUE
+        else:
+            rest.append(a)
+    return url, rest
+
+
+# ===== 저장소 =====
+class QueueBackend(abc.ABC):
+    """
+    큐 저장소 인터페이스 - 모든 메서드는 원자적이어야 함 (여러 프로세스가 동시에 호출)
+    queue: 실행 이름(<생성기>.<데이터셋>), key: 항목 키
+    """
+
+    @abc.abstractmethod
+    def seed(self, queue: str, fingerprint: str, jobs: Sequence[Tuple[str, float]]) -> int:
+        """작업 등록 (이미 있으면 그대로) → 새로 등록한 수. 살아 있는 임대가 있는데 지문이 다르면 ValueError"""
+
+    @abc.abstractmethod
+    def claim(self, queue: str, worker: str, lease_sec: float, max_attempts: int) -> Optional[str]:
+        """작업 1개 임대 → 키 (남은 작업이 없으면 None)"""
+
+    @abc.abstractmethod
+    def renew(self, queue: str, worker: str, keys: Sequence[str], lease_sec: float) -> List[str]:
+        """임대 연장 → 아직 이 워커가 들고 있는 키"""
+
+    @abc.abstractmethod
+    def complete(self, queue: str, worker: str, key: str, ok: bool, error: str = "") -> bool:
+        """done/failed 기록 → 이 워커의 임대였는지 (만료 후 다른 워커가 가져갔으면 False)"""
+
+    @abc.abstractmethod
+    def release(self, queue: str, worker: str, keys: Sequence[str]) -> None:
+        """임대 반납 (대기로 되돌림, 임대 횟수는 유지)"""
+
+    @abc.abstractmethod
+    def counts(self, queue: str) -> Dict[str, int]:
+        """상태별 작업 수 (만료된 임대는 "expired"로 따로)"""
+
+    @abc.abstractmethod
+    def failures(self, queue: str) -> List[Tuple[str, str]]:
+        """failed 작업 → [(키, 사유)]"""
+
+    @abc.abstractmethod
+    def requeue(self, queue: str, states: Sequence[str] = ("failed",)) -> int:
+        """해당 상태 작업을 대기로 (임대 횟수 초기화) → 작업 수"""
+
+    @abc.abstractmethod
+    def drop(self, queue: str) -> int:
+        """큐 삭제 → 지운 작업 수"""
+
+    @abc.abstractmethod
+    def queues(self) -> List[str]:
+        """등록된 큐 이름"""
+
+
+class SQLiteBackend(QueueBackend):
+    """SQLite 1개 파일 (WAL, BEGIN IMMEDIATE로 임대를 직렬화)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with self._tx() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS queues (name TEXT PRIMARY KEY, fingerprint TEXT, updated REAL)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " queue TEXT, key TEXT, cost REAL, state TEXT, worker TEXT, lease_until REAL,"
+                " attempts INTEGER DEFAULT 0, error TEXT, updated REAL, PRIMARY KEY (queue, key))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (queue, state, cost)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # 호출마다 연결 (하트비트 스레드와 생성 루프가 각자 사용)
+        conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=60000")
+        return conn
+
+    class _Tx:
+        def __init__(self, conn: sqlite3.Connection):
+            self.conn = conn
+
+        def __enter__(self) -> sqlite3.Connection:
+            self.conn.execute("BEGIN IMMEDIATE")
+            return self.conn
+
+        def __exit__(self, exc_type, exc, tb) -> None:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+            self.conn.close()
+
+    def _tx(self) -> "SQLiteBackend._Tx":
+        return SQLiteBackend._Tx(self._connect())
+
+    def seed(self, queue: str, fingerprint: str, jobs: Sequence[Tuple[str, float]]) -> int:
+        now = time.time()
+        with self._tx() as conn:
+            row = conn.execute("SELECT fingerprint FROM queues WHERE name = ?", (queue,)).fetchone()
+            if row and row[0] != fingerprint:
+                live = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE queue = ? AND state = 'leased' AND lease_until >= ?",
+                    (queue, now),
+                ).fetchone()[0]
+                if live:
+                    raise ValueError(
+                        f"큐 {queue}: 다른 데이터셋 버전(지문 {row[0]})으로 임대 중인 작업 {live}개 "
+                        f"- 그 워커들이 끝난 뒤 다시 실행"
+                    )
+                print(f"♻️ 큐 {queue}: 데이터셋이 바뀜(지문 {row[0]} → {fingerprint}) → 작업 다시 등록")
+                conn.execute("DELETE FROM jobs WHERE queue = ?", (queue,))
+            conn.execute(
+                "INSERT INTO queues (name, fingerprint, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET fingerprint = excluded.fingerprint, updated = excluded.updated",
+                (queue, fingerprint, now),
+            )
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (queue, key, cost, state, updated) VALUES (?, ?, ?, 'pending', ?)",
+                [(queue, k, c, now) for k, c in jobs],
+            )
+            return conn.total_changes - before
+
+    def claim(self, queue: str, worker: str, lease_sec: float, max_attempts: int) -> Optional[str]:
+        now = time.time()
+        with self._tx() as conn:
+            # 임대 횟수를 다 쓴 작업(만료됐거나 예외로 반납됨) → failed
+            conn.execute(
+                "UPDATE jobs SET state = 'failed', worker = NULL, updated = ?,"
+                " error = 'lease expired/released ' || attempts || 'x without completion' "
+                "WHERE queue = ? AND attempts >= ? AND (state = 'pending' OR (state = 'leased' AND lease_until < ?))",
+                (now, queue, max_attempts, now),
+            )
+            row = conn.execute(
+                "SELECT key FROM jobs WHERE queue = ? AND (state = 'pending' OR (state = 'leased' AND lease_until < ?)) "
+                "ORDER BY cost DESC, key LIMIT 1",
+                (queue, now),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET state = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1, updated = ? "
+                "WHERE queue = ? AND key = ?",
+                (worker, now + lease_sec, now, queue, row[0]),
+            )
+            return row[0]
+
+    def renew(self, queue: str, worker: str, keys: Sequence[str], lease_sec: float) -> List[str]:
+        now = time.time()
+        held = []
+        with self._tx() as conn:
+            for k in keys:
+                cur = conn.execute(
+                    "UPDATE jobs SET lease_until = ?, updated = ? "
+                    "WHERE queue = ? AND key = ? AND state = 'leased' AND worker = ?",
+                    (now + lease_sec, now, queue, k, worker),
+                )
+                if cur.rowcount:
+                    held.append(k)
+        return held
+
+    def complete(self, queue: str, worker: str, key: str, ok: bool, error: str = "") -> bool:
+        with self._tx() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET state = ?, error = ?, lease_until = NULL, updated = ? "
+                "WHERE queue = ? AND key = ? AND state = 'leased' AND worker = ?",
+                ("done" if ok else "failed", error or None, time.time(), queue, key, worker),
+            )
+            return bool(cur.rowcount)
+
+    def release(self, queue: str, worker: str, keys: Sequence[str]) -> None:
+        with self._tx() as conn:
+            conn.executemany(
+                "UPDATE jobs SET state = 'pending', worker = NULL, lease_until = NULL, updated = ? "
+                "WHERE queue = ? AND key = ? AND state = 'leased' AND worker = ?",
+                [(time.time(), queue, k, worker) for k in keys],
+            )
+
+    def counts(self, queue: str) -> Dict[str, int]:
+        out = {s: 0 for s in STATES}
+        out["expired"] = 0
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT CASE WHEN state = 'leased' AND lease_until < ? THEN 'expired' ELSE state END, COUNT(*) "
+                "FROM jobs WHERE queue = ? GROUP BY 1",
+                (time.time(), queue),
+            ).fetchall()
+        finally:
+            conn.close()
+        out.update({s: n for s, n in rows})
+        return out
+
+    def failures(self, queue: str) -> List[Tuple[str, str]]:
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT key, COALESCE(error, '') FROM jobs WHERE queue = ? AND state = 'failed' ORDER BY key", (queue,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+    def requeue(self, queue: str, states: Sequence[str] = ("failed",)) -> int:
+        with self._tx() as conn:
+            cur = conn.execute(
+                f"UPDATE jobs SET state = 'pending', worker = NULL, lease_until = NULL, attempts = 0, error = NULL, "
+                f"updated = ? WHERE queue = ? AND state IN ({','.join('?' * len(states))})",
+                (time.time(), queue, *states),
+            )
+            return cur.rowcount
+
+    def drop(self, queue: str) -> int:
+        with self._tx() as conn:
+            n = conn.execute("DELETE FROM jobs WHERE queue = ?", (queue,)).rowcount
+            conn.execute("DELETE FROM queues WHERE name = ?", (queue,))
+            return n
+
+    def queues(self) -> List[str]:
+        conn = self._connect()
+        try:
+            return [r[0] for r in conn.execute("SELECT name FROM queues ORDER BY name")]
+        finally:
+            conn.close()
+
+
+BACKENDS: Dict[str, Callable[[str], QueueBackend]] = {"sqlite": SQLiteBackend}
+
+
+def register_backend(scheme: str, factory: Callable[[str], QueueBackend]) -> None:
+    """저장소 추가 (WORK_QUEUE=<scheme>:<위치> → factory(<위치>))"""
+    BACKENDS[scheme] = factory
+
+
+def open_backend(url: str) -> QueueBackend:
+    """"sqlite:_shards/work_queue.sqlite" → 저장소 (scheme이 없으면 sqlite 경로로 간주)"""
+    scheme, sep, location = str(url).partition(":")
+    if not sep or scheme not in BACKENDS:
+        scheme, location = "sqlite", url
+    return BACKENDS[scheme](location)
+
+
+# ===== 워커 =====
+class QueueRun(ShardRun):
+    """큐 워커 1개 실행 기록 - ShardRun과 같은 인터페이스(tag/local_name/count/finish)에 임대 루프"""
+
+    def __init__(self, url: str, recipe: str, dataset: str, keys: Sequence[str], costs: Sequence[float],
+                 worker: Optional[str] = None, lease_sec: float = WORK_LEASE_SEC,
+                 max_attempts: int = WORK_MAX_ATTEMPTS):
+        super().__init__(None, recipe, dataset, keys, costs)
+        self.url = url
+        self.backend = open_backend(url)
+        self.worker = worker or worker_name()
+        self.lease_sec = lease_sec
+        self.max_attempts = max_attempts
+        self.label = f"w-{self.worker}"
+        self.queue = os.path.basename(run_dir(recipe, dataset))
+        self.fingerprint = fingerprint(keys, costs)
+        self.report_extra = {"queue": url, "worker": self.worker}
+        self._keys = unique_keys(keys)
+        self._index = {k: i for i, k in enumerate(self._keys)}
+        self._costs = list(costs)
+        self.mask = [False] * len(self._keys)  # 이 워커가 처리한 항목
+        self.items, self.cost = 0, 0.0
+        self.lost = 0
+        self.seeded = self.backend.seed(self.queue, self.fingerprint, list(zip(self._keys, self._costs)))
+        self._held: List[str] = []
+        self._current: Optional[Tuple[str, Optional[List[str]], int]] = None  # (키, fails, 임대 시점 실패 수)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._beat = threading.Thread(target=self._heartbeat, daemon=True)
+        self._beat.start()
+        atexit.register(self.abort)
+
+    def _heartbeat(self) -> None:
+        while not self._stop.wait(max(self.lease_sec / 3, 1.0)):
+            with self._lock:
+                held = list(self._held)
+            if not held:
+                continue
+            try:
+                kept = self.backend.renew(self.queue, self.worker, held, self.lease_sec)
+            except Exception as e:
+                print(f"  ⚠️ 임대 연장 실패: {e}")
+                continue
+            if len(kept) < len(held):
+                print(f"  ⚠️ 임대 만료로 다른 워커에 넘어간 작업: {', '.join(sorted(set(held) - set(kept)))}")
+
+    def _settle(self) -> None:
+        """지금 항목 완료 기록 - 처리하는 동안 fails가 늘었으면 failed"""
+        if self._current is None:
+            return
+        key, fails, before = self._current
+        self._current = None
+        new = fails[before:] if fails is not None else []
+        ok = not new
+        if not self.backend.complete(self.queue, self.worker, key, ok, "\n".join(new)[:2000]):
+            self.lost += 1  # 만료 후 재임대됨 - 출력은 같은 입력이라 그대로 둠
+        with self._lock:
+            self._held.remove(key)
+        self.count("done" if ok else "failed")
+
+    def indices(self, fails: Optional[List[str]] = None) -> Iterator[int]:
+        """작업을 하나씩 임대 → 항목 번호. 다음 번호를 요청하면 앞 항목 완료(fails가 늘었으면 failed)"""
+        while True:
+            self._settle()
+            claimed = self.backend.claim(self.queue, self.worker, self.lease_sec, self.max_attempts)
+            if claimed is None:
+                return
+            with self._lock:
+                self._held.append(claimed)
+            idx = self._index.get(claimed)
+            if idx is None:  # 지문이 같으면 생기지 않음
+                self.backend.complete(self.queue, self.worker, claimed, False, "unknown key")
+                with self._lock:
+                    self._held.remove(claimed)
+                continue
+            self._current = (claimed, fails, len(fails) if fails is not None else 0)
+            self.mask[idx] = True
+            self.items += 1
+            self.cost = round(self.cost + self._costs[idx], 1)
+            yield idx
+
+    def banner(self) -> str:
+        c = self.backend.counts(self.queue)
+        return (f"queue {self.queue} (worker={self.worker}, lease={self.lease_sec:.0f}s) → "
+                f"대기 {c['pending'] + c['expired']}, 임대 {c['leased']}, 완료 {c['done']}, 실패 {c['failed']}"
+                + (f", 새로 등록 {self.seeded}" if self.seeded else ""))
+
+    def abort(self) -> None:
+        """들고 있던 작업을 대기로 되돌림 (임대 횟수는 남음) - 예외/Ctrl-C로 끝날 때 atexit"""
+        self._stop.set()
+        with self._lock:
+            held, self._held = list(self._held), []
+        if held:
+            self.backend.release(self.queue, self.worker, held)
+            print(f"↩️ 큐 {self.queue}: 처리 중이던 작업 {len(held)}개 반납")
+
+    def finish(self, fails: Sequence[str] = (), manifests: Sequence[str] = ()) -> Optional[str]:
+        # 생성기가 루프 도중 return해도(예: 레벨 태그 미검출) 마지막 항목은 같은 규칙으로 판정
+        self._settle()
+        self.abort()
+        atexit.unregister(self.abort)
+        if self.lost:
+            print(f"  ⚠️ 완료 기록 전에 임대가 만료된 작업 {self.lost}개 (다른 워커가 다시 처리)")
+        self.report_extra["queue_counts"] = self.backend.counts(self.queue)
+        return super().finish(fails, manifests)
+
+
+def open_run(recipe: str, dataset: str, keys: Sequence[str], costs: Sequence[float],
+             shard: Any = None, queue: Optional[str] = None) -> ShardRun:
+    """--shard / --queue / 없음 → 실행 기록 (둘 다 주면 ValueError)"""
+    if shard is not None and queue:
+        raise ValueError("--shard와 --queue는 함께 쓸 수 없습니다")
+    if queue:
+        return QueueRun(queue, recipe, dataset, keys, costs)
+    return ShardRun(shard, recipe, dataset, keys, costs)
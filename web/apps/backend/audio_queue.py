@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+오디오 생성 작업 큐 관리 (--queue, audio_common/work_queue.py)
+
+생성기를 --queue 로 원하는 만큼 띄우면 큐에서 항목을 하나씩 임대해 처리합니다.
+이 스크립트는 큐 상태를 보고, 실패한 작업을 다시 대기로 돌리거나 큐를 비웁니다.
+
+  python audio_queue.py status                         # 모든 큐: 대기/임대/만료/완료/실패, 진행률
+  python audio_queue.py status make_jlpt_audio.N2 -v   # 실패 작업과 사유까지
+  python audio_queue.py retry make_jlpt_audio.N2       # failed → 대기 (임대 횟수 초기화)
+  python audio_queue.py reset make_jlpt_audio.N2       # 완료 포함 전부 대기 (데이터셋 전체 재생성)
+  python audio_queue.py drop make_jlpt_audio.N2        # 큐 삭제 (다음 워커가 다시 등록)
+
+큐 이름 = <생성기>.<데이터셋 파일 이름> (_shards/ 아래 보고서 폴더 이름과 같음).
+큐가 비면 python merge_shards.py 로 워커별 매니페스트/보고서를 병합합니다.
+"""
+
+import argparse
+import sys
+
+from audio_common.work_queue import WORK_QUEUE, open_backend
+
+
+def status(backend, names, verbose: bool) -> None:
+    for name in names:
+        c = backend.counts(name)
+        total = sum(c.values())
+        finished = c["done"] + c["failed"]
+        pct = 100.0 * finished / total if total else 0.0
+        print(f"📋 {name}: {finished}/{total} ({pct:.1f}%)  대기 {c['pending']}, 임대 {c['leased']}, "
+              f"만료 {c['expired']}, 완료 {c['done']}, 실패 {c['failed']}")
+        if verbose:
+            for key, err in backend.failures(name):
+                first = err.splitlines()[0] if err else ""
+                print(f"   ❌ {key}  {first}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="오디오 생성 작업 큐 관리")
+    parser.add_argument("command", choices=("status", "retry", "reset", "drop"))
+    parser.add_argument("names", nargs="*", help="큐 이름 (status는 생략하면 전부)")
+    parser.add_argument("--queue", default=WORK_QUEUE, help=f"큐 저장소 (기본 {WORK_QUEUE})")
+    parser.add_argument("-v", "--verbose", action="store_true", help="status: 실패 작업과 사유 출력")
+    args = parser.parse_args()
+
+    backend = open_backend(args.queue)
+    names = args.names or (backend.queues() if args.command == "status" else [])
+    if not names:
+        print("큐가 없습니다." if args.command == "status" else f"❌ {args.command}: 큐 이름을 지정하세요.")
+        return 0 if args.command == "status" else 2
+
+    if args.command == "status":
+        status(backend, names, args.verbose)
+        return 0
+    for name in names:
+        if args.command == "retry":
+            print(f"🔁 {name}: 실패 작업 {backend.requeue(name, ('failed',))}개 → 대기")
+        elif args.command == "reset":
+            print(f"🔁 {name}: 작업 {backend.requeue(name, ('done', 'failed', 'pending'))}개 → 대기 "
+                  f"(임대 중인 작업은 그대로)")
+        else:
+            print(f"🗑️ {name}: 작업 {backend.drop(name)}개 삭제")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+audio_common.script_segment 검증/벤치마크
+
+- 원본 문자 단위 분할 루프(아래 LEGACY_*, 원본 그대로 복사)와 엔진 프로필의 출력 비교
+- koChirpScript / 리스닝 script 등 데이터셋 문자열 + 긴 합성 문자열로 호출당 시간 비교
+
+사용:
+  python bench_script_segment.py
+  python bench_script_segment.py jlpt/N1.json N1/N1_Listening/N1_Listening.json
+"""
+
+import os
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from audio_common import script_segment
+from bench_text_normalize import DEFAULT_DATASETS, load_corpus
+
+
+# ===== 원본 구현 (비교 기준) =====
+def _legacy_is_japanese_char(char: str) -> bool:
+    code = ord(char)
+    return (
+        0x3040 <= code <= 0x309F
+        or 0x30A0 <= code <= 0x30FF
+        or 0x4E00 <= code <= 0x9FAF
+        or 0x3400 <= code <= 0x4DBF
+    )
+
+
+def LEGACY_split_mixed_text(text: str) -> List[tuple]:
+    # 괄호 제거 단계는 양쪽 공통(text_normalize.PAREN_RE)이므로 생략
+    if not text:
+        return []
+    segments = []
+    current_text = ""
+    current_lang = None
+    for char in text:
+        if char.strip():
+            lang = "ja" if _legacy_is_japanese_char(char) else "ko"
+            if current_lang is None:
+                current_lang = lang
+                current_text = char
+            elif current_lang == lang:
+                current_text += char
+            else:
+                if current_text.strip():
+                    segments.append((current_lang, current_text.strip()))
+                current_lang = lang
+                current_text = char
+        else:
+            current_text += char
+    if current_text.strip():
+        segments.append((current_lang, current_text.strip()))
+    return segments
+
+
+def LEGACY_split_english_korean(script_text: str) -> Tuple[str, str]:
+    if not script_text:
+        return "", ""
+
+    def is_hangul(ch: str) -> bool:
+        code = ord(ch)
+        return (
+            0xAC00 <= code <= 0xD7AF or
+            0x1100 <= code <= 0x11FF or
+            0x3130 <= code <= 0x318F
+        )
+
+    def is_english_letter(ch: str) -> bool:
+        return "a" <= ch.lower() <= "z"
+
+    segments: List[Tuple[str, str]] = []
+    current_lang: Optional[str] = None
+    buf: List[str] = []
+
+    def flush():
+        nonlocal buf, current_lang
+        if buf and current_lang:
+            segments.append((current_lang, "".join(buf)))
+        buf = []
+
+    for ch in script_text:
+        if is_hangul(ch):
+            lang = "ko"
+        elif is_english_letter(ch):
+            lang = "en"
+        else:
+            lang = current_lang
+        if lang != current_lang and buf:
+            flush()
+        buf.append(ch)
+        current_lang = lang or current_lang
+    flush()
+
+    english_text = " ".join(t for lang, t in segments if lang == "en")
+    korean_text = " ".join(t for lang, t in segments if lang == "ko")
+
+    def normalize_spaces(s: str) -> str:
+        return re.sub(r"\s+", " ", s or "").strip()
+
+    return normalize_spaces(english_text), normalize_spaces(korean_text)
+
+
+def _legacy_split_script_by_language(hangul_lang: str) -> Callable[[str], list]:
+    def split_script_by_language(script_text):
+        segments = []
+        current_lang, buf = None, ""
+        for ch in script_text:
+            if '\uac00' <= ch <= '\ud7af':
+                lang = hangul_lang
+            elif 'a' <= ch.lower() <= 'z':
+                lang = 'en-US'
+            else:
+                lang = current_lang
+            if lang != current_lang and buf:
+                segments.append((current_lang, buf))
+                buf = ""
+            buf += ch
+            current_lang = lang
+        if buf:
+            segments.append((current_lang, buf))
+        return segments
+    return split_script_by_language
+
+
+def _engine_split_english_korean(text: str) -> Tuple[str, str]:
+    if not text:
+        return "", ""
+    joined = script_segment.join_by_label("en_ko", text)
+    return joined.get("en", ""), joined.get("ko", "")
+
+
+CASES: Dict[str, Tuple[Callable, Callable]] = {
+    "ja_ko": (LEGACY_split_mixed_text, lambda t: script_segment.segment("ja_ko", t)),
+    "en_ko": (LEGACY_split_english_korean, _engine_split_english_korean),
+    "en_ko_voice": (_legacy_split_script_by_language("ko-KR"), lambda t: script_segment.segment("en_ko_voice", t)),
+    "en_voice": (_legacy_split_script_by_language("en-US"), lambda t: script_segment.segment("en_voice", t)),
+}
+
+
+def _timeit(func: Callable, strings: List[str], repeat: int = 1) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for s in strings:
+            func(s)
+    return (time.perf_counter() - t0) / max(1, len(strings) * repeat) * 1e6
+
+
+def main() -> int:
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    strings = [s for s in load_corpus(sys.argv[1:] or DEFAULT_DATASETS) if s.strip()]
+    edge = ["", "  ", "123 abc", "!!", "今日は。 学校へ行く (학교) 간다.", "İK 가나 abc", "ㄱㄴ ᄀ abc ..."]
+    strings += edge
+
+    # 긴 리스닝/koChirpScript 대역 (수 KB)
+    long_texts = [s for s in strings if len(s) >= 400]
+    long_texts.append(" ".join(strings[:2000])[:50000])
+
+    mismatches = 0
+    print(f"\n{'profile':<13}{'short legacy µs':>17}{'engine µs':>11}{'long legacy µs':>16}{'engine µs':>11}{'speedup':>9}")
+    for name, (legacy, engine) in CASES.items():
+        bad = [s for s in strings if legacy(s) != engine(s)]
+        if bad:
+            mismatches += len(bad)
+            print(f"  ❌ {name}: 불일치 {len(bad)}건 (예: {bad[0][:60]!r})")
+        t_ls = _timeit(legacy, strings)
+        t_es = _timeit(engine, strings)
+        t_ll = _timeit(legacy, long_texts)
+        t_el = _timeit(engine, long_texts)
+        print(f"{name:<13}{t_ls:>17.2f}{t_es:>11.2f}{t_ll:>16.1f}{t_el:>11.1f}{t_ll / max(t_el, 1e-9):>8.1f}x")
+
+    if mismatches:
+        print(f"\n❌ 총 불일치 {mismatches}건")
+        return 1
+    print(f"\n✅ 모든 프로필 출력 동일 (문자열 {len(strings)}개, 긴 문자열 {len(long_texts)}개)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
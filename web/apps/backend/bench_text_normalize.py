@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+audio_common.text_normalize 검증/벤치마크
+
+- 원본 전처리 함수(아래 LEGACY_*, 원본 그대로 복사)와 엔진 프로필의 출력을
+  데이터셋의 모든 문자열 값에 대해 비교
+- 호출당 평균 시간(원본 / 엔진 첫 호출 / 엔진 메모 적중) 비교
+
+사용:
+  python bench_text_normalize.py                 # 기본 데이터셋 전체
+  python bench_text_normalize.py jlpt/N1.json idiom.json
+"""
+
+import os
+import re
+import sys
+import json
+import glob
+import time
+from typing import Any, Callable, Dict, List
+
+from audio_common import text_normalize
+
+
+# ===== 원본 구현 (비교 기준) =====
+def _legacy_normalize_spaces(s: str) -> str:
+    return re.sub(r"\s+", " ", (s or "").strip())
+
+
+def LEGACY_jlpt_clean_ko_gloss(text: str) -> str:
+    if not text:
+        return ""
+    s = _legacy_normalize_spaces(text)
+    s = s.replace("~", "무엇무엇")
+    s = re.sub(r"[（(][^）)]*[）)]", "", s)
+    s = re.sub(
+        r"\b(?:pron|n|v|adj|adv|prep|conj|int|interj|aux|det|num)\.\s*",
+        "",
+        s,
+        flags=re.I,
+    )
+    s = re.sub(
+        r"\b(?:명사|동사|형용사|부사|감탄사|대명사|전치사|접속사|조동사|관사|수사)\.\s*",
+        "",
+        s,
+    )
+    s = re.sub(r"[/\\|<>\"']", " ", s)
+    s = _legacy_normalize_spaces(s).strip(" ;,·")
+    return s
+
+
+def _legacy_word_normalize_spaces(s: str) -> str:
+    return re.sub(r"\\s+", " ", (s or "").strip())
+
+
+def LEGACY_word_clean_ko_gloss(text: str) -> str:
+    if not text:
+        return ""
+    s = _legacy_word_normalize_spaces(text)
+    s = s.replace("~", "무엇무엇")
+    s = re.sub(r"\\b(?:adj|adv|n|v|vt|vi|prep|conj|pron|art|int|interj|aux|det|num)\\.\\s*", "", s, flags=re.I)
+    s = _legacy_word_normalize_spaces(s).strip(" ;,·")
+    return s
+
+
+def LEGACY_dedupe_clean_ko_gloss(text: str) -> str:
+    if not text:
+        return ""
+    s = (text or "").strip().replace("~", "무엇무엇")
+    s = _legacy_normalize_spaces(s)
+
+    POS_EN = r"(?:adj|adv|n|v|vt|vi|prep|pron|conj|art|interj|int|aux|det|num|modal|phr(?:asal)?\s*verb|phr\.?\s*v)"
+    POS_KO = r"(?:명사|동사|타동사|자동사|형용사|형용동사|부사|전치사|대명사|관사|수사|접속사|조사|감탄사)"
+    SEP    = r"[:\-–—·\.]"
+
+    s = re.sub(rf"[\(\[\（]\s*(?:{POS_EN}|{POS_KO})\.?\s*[\)\]\）]\s*", " ", s, flags=re.IGNORECASE)
+    start_tag = re.compile(rf"^(?:\s*(?:{POS_EN}|{POS_KO})\.?\s*(?:{SEP})?\s*)+", flags=re.IGNORECASE)
+    s = start_tag.sub("", s)
+    s = re.sub(rf"(\s|,|;)\s*(?:{POS_EN}|{POS_KO})\.?\s*(\s|,|;)", r"\1 \2", s, flags=re.IGNORECASE)
+
+    return _legacy_normalize_spaces(s).strip(" ;,·-–—.")
+
+
+def LEGACY_clean_japanese_text(text: str) -> str:
+    if not text:
+        return ""
+    s = _legacy_normalize_spaces(text)
+    s = re.sub(r"[（(][^）)]*[）)]", "", s)
+    s = re.sub(r"[/\\|<>\"']", " ", s)
+    return _legacy_normalize_spaces(s)
+
+
+def LEGACY_remove_parentheses(text: str) -> str:
+    if not text:
+        return text
+    result = re.sub(r'[（(][^）)]*[）)]', '', text)
+    result = re.sub(r'[［\[]', '', result)
+    result = re.sub(r'[］\]]', '', result)
+    result = re.sub(r'[｛\{]', '', result)
+    result = re.sub(r'[｝\}]', '', result)
+    result = re.sub(r'\s+', ' ', result)
+    return result.strip()
+
+
+def LEGACY_remove_korean_translation(text: str) -> str:
+    if not text:
+        return text
+    result = re.sub(r'[（(][^）)]*[）)]', '', text)
+    result = re.sub(r'[［\[]', '', result)
+    result = re.sub(r'[］\]]', '', result)
+    result = re.sub(r'[｛\{]', '', result)
+    result = re.sub(r'[｝\}]', '', result)
+    result = re.sub(r'[가-힣ㄱ-ㅎㅏ-ㅣ]', '', result)
+    result = re.sub(r'\s+', ' ', result)
+    result = result.strip()
+    return result
+
+
+LEGACY: Dict[str, Callable[[str], str]] = {
+    "jlpt_gloss": LEGACY_jlpt_clean_ko_gloss,
+    "word_gloss": LEGACY_word_clean_ko_gloss,
+    "dedupe_gloss": LEGACY_dedupe_clean_ko_gloss,
+    "ja_text": LEGACY_clean_japanese_text,
+    "listening": LEGACY_remove_parentheses,
+    "ja_only": LEGACY_remove_korean_translation,
+}
+
+DEFAULT_DATASETS = [
+    "jlpt/N*.json",
+    "cefr_vocabs_updated.json",
+    "total_vocabs.json",
+    "idiom.json",
+    "jlpt_n5_vocabs.json",
+    "[ABC][12]/*/*.json",
+    "N[1-5]/*/*.json",
+]
+
+
+# ===== 데이터 수집 =====
+def collect_strings(obj: Any, out: List[str]) -> None:
+    if isinstance(obj, str):
+        out.append(obj)
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            collect_strings(v, out)
+    elif isinstance(obj, list):
+        for v in obj:
+            collect_strings(v, out)
+
+
+def load_corpus(patterns: List[str]) -> List[str]:
+    strings: List[str] = []
+    files = sorted({p for pat in patterns for p in glob.glob(pat)})
+    for path in files:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                collect_strings(json.load(f), strings)
+        except Exception as e:
+            print(f"  ⚠️ 로드 실패: {path} ({e})")
+    print(f"📂 파일 {len(files)}개, 문자열 {len(strings)}개")
+    return strings
+
+
+def _timeit(func: Callable[[str], str], strings: List[str]) -> float:
+    t0 = time.perf_counter()
+    for s in strings:
+        func(s)
+    return (time.perf_counter() - t0) / max(1, len(strings)) * 1e6
+
+
+def main() -> int:
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    patterns = sys.argv[1:] or DEFAULT_DATASETS
+    strings = load_corpus(patterns)
+    if not strings:
+        print("❌ 비교할 문자열이 없습니다.")
+        return 1
+
+    # 추가 경계 케이스 (빈 값, 리터럴 백슬래시, 품사 태그 등)
+    strings += ["", " ", "n. 사과, v. 먹다", "(명사) 집", "a\\sb\\b n\\.c", "［テスト］ ｛日本語｝ (번역)"]
+
+    mismatches = 0
+    print(f"\n{'profile':<14}{'legacy µs':>12}{'engine µs':>12}{'memo µs':>12}{'speedup':>10}")
+    for name, legacy in LEGACY.items():
+        engine = text_normalize.get_profile(name)
+        bad = [s for s in strings if legacy(s) != engine(s)]
+        if bad:
+            mismatches += len(bad)
+            print(f"  ❌ {name}: 불일치 {len(bad)}건 (예: {bad[0][:60]!r})")
+
+        text_normalize.cache_clear()
+        t_legacy = _timeit(legacy, strings)
+        t_cold = _timeit(engine, strings)
+        # 메모 적중: 캐시에 들어가는 크기의 부분집합을 다시 호출
+        hot = strings[: max(1, text_normalize.TEXT_NORMALIZE_CACHE_SIZE // 2)]
+        _timeit(engine, hot)
+        t_warm = _timeit(engine, hot)
+        print(f"{name:<14}{t_legacy:>12.2f}{t_cold:>12.2f}{t_warm:>12.2f}{t_legacy / max(t_cold, 1e-9):>9.1f}x")
+
+    if mismatches:
+        print(f"\n❌ 총 불일치 {mismatches}건")
+        return 1
+    print(f"\n✅ 모든 프로필 출력 동일 (문자열 {len(strings)}개 × 프로필 {len(LEGACY)}개)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+audio_common.work_queue 검증/벤치마크
+
+- 임대 만료 → 다른 워커 재임대, 늦게 온 완료 기록 거부, 하트비트 연장, 반납, 임대 횟수 초과 → failed
+- QueueRun 2개가 같은 큐를 나눠 처리할 때 항목이 빠지거나 겹치지 않는지
+- 저장소 claim/complete 왕복 시간 (작업 수별)
+
+사용:
+  python bench_work_queue.py
+  python bench_work_queue.py sqlite:/mnt/shared/work_queue.sqlite   # 다른 저장소 위치로
+"""
+
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+from audio_common.work_queue import QueueBackend, QueueRun, open_backend
+
+LEASE = 0.3  # 초 - 만료 검증용 짧은 임대
+
+
+def _check(results: List[Tuple[str, bool]], name: str, ok: bool) -> None:
+    results.append((name, ok))
+    print(f"  {'✅' if ok else '❌'} {name}")
+
+
+def check_abstract(results: List[Tuple[str, bool]]) -> None:
+    try:
+        QueueBackend()
+        ok = False
+    except TypeError:
+        ok = True
+    _check(results, "QueueBackend는 직접 만들 수 없음 (추상 메서드)", ok)
+
+
+def check_lease(url: str, results: List[Tuple[str, bool]]) -> None:
+    b = open_backend(url)
+    q = "bench.lease"
+    b.drop(q)
+    b.seed(q, "fp", [("a", 3.0), ("b", 2.0), ("c", 1.0)])
+
+    k1 = b.claim(q, "w1", LEASE, 3)
+    _check(results, "비용이 큰 작업부터 임대", k1 == "a")
+    k2 = b.claim(q, "w2", LEASE, 3)
+    _check(results, "임대 중인 작업은 다른 워커에 안 줌", k2 == "b")
+
+    time.sleep(LEASE * 0.6)
+    _check(results, "하트비트로 임대 연장", b.renew(q, "w2", ["b"], LEASE) == ["b"])
+    time.sleep(LEASE * 0.6)
+
+    c = b.counts(q)
+    _check(results, "만료된 임대는 expired로 집계", c["expired"] == 1 and c["leased"] == 1)
+    k3 = b.claim(q, "w3", LEASE, 3)
+    _check(results, "만료된 작업을 다른 워커가 재임대", k3 == "a")
+    _check(results, "늦게 온 원래 워커의 완료 기록 거부", b.complete(q, "w1", "a", True) is False)
+    _check(results, "원래 워커의 임대 연장 거부", b.renew(q, "w1", ["a"], LEASE) == [])
+    _check(results, "재임대한 워커의 완료 기록", b.complete(q, "w3", "a", True) is True)
+
+    b.release(q, "w2", ["b"])
+    _check(results, "반납한 작업은 바로 대기로", b.claim(q, "w4", LEASE, 3) == "b")
+    b.complete(q, "w4", "b", False, "synth error")
+    _check(results, "실패 사유 기록", b.failures(q) == [("b", "synth error")])
+    _check(results, "failed 작업 다시 대기로", b.requeue(q) == 1)
+
+    # 임대 횟수 초과: 만료만 반복되면 failed
+    for w in ("x1", "x2"):
+        b.claim(q, w, LEASE, 2)
+        b.claim(q, w, LEASE, 2)
+        time.sleep(LEASE * 1.2)
+    left = b.claim(q, "x3", LEASE, 2)
+    fails = dict(b.failures(q))
+    _check(results, "임대 횟수 초과 작업은 failed", left is None and set(fails) == {"b", "c"})
+    b.drop(q)
+
+
+def check_workers(url: str, results: List[Tuple[str, bool]]) -> None:
+    keys = [f"item{i}" for i in range(40)]
+    costs = [float(i % 7 + 1) for i in range(40)]
+    dataset = os.path.join(tempfile.gettempdir(), "bench_work_queue.json")
+    w1 = QueueRun(url, "bench", dataset, keys, costs, worker="w1", lease_sec=LEASE * 10)
+    w2 = QueueRun(url, "bench", dataset, keys, costs, worker="w2", lease_sec=LEASE * 10)
+    w1.backend.requeue(w1.queue, ("done", "failed", "leased"))
+    seen: List[int] = []
+    it1, it2 = w1.indices([]), w2.indices([])
+    live = [it1, it2]
+    while live:  # 두 워커가 번갈아 임대
+        for it in list(live):
+            idx = next(it, None)
+            if idx is None:
+                live.remove(it)
+            else:
+                seen.append(idx)
+    w1.abort()
+    w2.abort()
+    c = w1.backend.counts(w1.queue)
+    _check(results, f"워커 2개가 {len(keys)}개 항목을 빠짐/중복 없이 처리",
+           sorted(seen) == list(range(len(keys))) and c["done"] == len(keys))
+    w1.backend.drop(w1.queue)
+
+
+def _time(func: Callable[[], None]) -> float:
+    t0 = time.perf_counter()
+    func()
+    return time.perf_counter() - t0
+
+
+def bench(url: str) -> None:
+    b = open_backend(url)
+    print(f"\n{'jobs':>7}{'seed ms':>10}{'claim+complete µs':>20}")
+    for n in (100, 1000, 5000):
+        q = f"bench.speed{n}"
+        b.drop(q)
+        jobs = [(f"k{i}", float(i % 50)) for i in range(n)]
+        t_seed = _time(lambda: b.seed(q, "fp", jobs))
+        rounds = min(n, 300)
+
+        def loop() -> None:
+            for _ in range(rounds):
+                k = b.claim(q, "w", 60, 3)
+                b.complete(q, "w", k, True)
+
+        t_loop = _time(loop)
+        print(f"{n:>7}{t_seed * 1e3:>10.1f}{t_loop / rounds * 1e6:>20.0f}")
+        b.drop(q)
+
+
+def main() -> int:
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as tmp:
+        url = sys.argv[1] if len(sys.argv) > 1 else "sqlite:" + os.path.join(tmp, "work_queue.sqlite")
+        print(f"🧪 작업 큐: {url}")
+        results: List[Tuple[str, bool]] = []
+        check_abstract(results)
+        check_lease(url, results)
+        check_workers(url, results)
+        bench(url)
+
+    bad = [name for name, ok in results if not ok]
+    if bad:
+        print(f"\n❌ 실패 {len(bad)}건")
+        return 1
+    print(f"\n✅ 검증 {len(results)}건 통과")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+오디오 산출물 카탈로그 구축/조회 (SQLite - audio_common/artifact_catalog.py)
+
+build: 레벨 폴더를 병렬 os.scandir로 걷고 카탈로그와 size/mtime을 비교해
+       새 파일/바뀐 파일만 프로세스 풀에서 측정(MP3 헤더 → 길이/샘플레이트,
+       ffmpeg PCM → RMS/피크 dBFS)합니다. 지워진 파일의 행은 삭제합니다.
+       voice/input_key는 audio_manifest.json에서 가져옵니다(파일과 일치할 때만).
+       생성기는 저장할 때마다 카탈로그를 직접 갱신하므로 build는 처음 한 번과
+       생성기 밖에서 파일이 바뀌었을 때만 필요합니다.
+
+조회 (인덱스 사용 - 전체 코퍼스에서도 밀리초 단위):
+  python catalog_audio.py build                         # 기본 레벨 폴더 전부
+  python catalog_audio.py build jlpt/n3 starter --no-pcm --workers 8
+  python catalog_audio.py missing n3 example            # N3에서 example.mp3가 없는 항목
+  python catalog_audio.py short --ms 300                # 300ms 미만 파일
+  python catalog_audio.py loud --dbfs -14 --kind gloss  # -14 dBFS보다 큰 gloss
+  python catalog_audio.py stats
+  python catalog_audio.py sql "SELECT voice, COUNT(*) FROM artifacts GROUP BY voice"
+
+환경변수(옵션):
+  AUDIO_CATALOG=audio_catalog.sqlite
+  CATALOG_WORKERS=8          # 측정 프로세스 수 (기본 CPU 수)
+"""
+
+import os
+import re
+import sys
+import shutil
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from audio_common.artifact_catalog import (
+    AUDIO_CATALOG,
+    COLUMNS,
+    DEFAULT_LEVELS,
+    connect,
+    delete_paths,
+    probe_file,
+    stat_index,
+    upsert,
+    walk_mp3,
+)
+from audio_common.audio_manifest import is_fresh, load_manifest
+from audio_common.output_ladder import FFMPEG_BIN
+
+CATALOG_WORKERS = int(os.getenv("CATALOG_WORKERS", str(os.cpu_count() or 2)))
+
+BATCH = 500
+
+
+# ===== build =====
+def build_level(conn: Any, pool: ProcessPoolExecutor, level: str, pcm: bool, full: bool) -> Dict[str, int]:
+    known = stat_index(conn, level)
+    need_pcm = set()
+    if pcm and not full:
+        cur = conn.execute("SELECT path FROM artifacts WHERE level = ? AND dbfs IS NULL", (level,))
+        need_pcm = {r["path"] for r in cur}
+
+    seen, todo = set(), []
+    for path, size, mtime in walk_mp3(level):
+        rel = os.path.normpath(path).replace(os.sep, "/")
+        seen.add(rel)
+        old = known.get(rel)
+        if full or old is None or old[0] != size or abs((old[1] or 0) - mtime) >= 1e-3 or rel in need_pcm:
+            todo.append(path)
+    removed = [p for p in known if p not in seen]
+
+    manifest = load_manifest(level)
+    rows, failed = [], 0
+    futures = [pool.submit(probe_file, p, level, pcm) for p in todo]
+    for path, fut in zip(todo, futures):
+        try:
+            row = fut.result()
+        except Exception as e:
+            failed += 1
+            print(f"  ⚠️ 측정 실패: {path} ({e})")
+            continue
+        entry = manifest.get(os.path.relpath(path, level).replace(os.sep, "/"))
+        if is_fresh(entry, path):
+            row["voice"], row["input_key"] = entry.get("voice"), entry.get("key")
+        rows.append(row)
+        if len(rows) >= BATCH:
+            upsert(conn, rows)
+            rows = []
+    upsert(conn, rows)
+    delete_paths(conn, removed)
+    return {"files": len(seen), "probed": len(todo) - failed, "failed": failed, "removed": len(removed)}
+
+
+def cmd_build(conn: Any, args: argparse.Namespace) -> int:
+    levels = [os.path.normpath(x).replace(os.sep, "/") for x in args.levels] or \
+        [x for x in DEFAULT_LEVELS if os.path.isdir(x)]
+    if not levels:
+        print("⚠️ 레벨 폴더가 없습니다 (backend 폴더에서 실행하거나 폴더를 지정하세요)")
+        return 1
+    pcm = not args.no_pcm
+    if pcm and shutil.which(FFMPEG_BIN) is None:
+        print(f"⚠️ {FFMPEG_BIN} 없음 → MP3 헤더만 측정 (음량은 비워 둠)")
+        pcm = False
+    t0 = time.time()
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for level in levels:
+            if not os.path.isdir(level):
+                print(f"⚠️ 폴더 없음: {level}")
+                continue
+            st = build_level(conn, pool, level, pcm=pcm, full=args.full)
+            print(f"🗂️ {level}: 파일 {st['files']}개, 측정 {st['probed']}개, 실패 {st['failed']}개, 삭제 {st['removed']}행")
+    total = conn.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0]
+    print(f"✅ 카탈로그 {args.db}: {total}행 ({time.time() - t0:.1f}s)")
+    return 0
+
+
+# ===== 조회 =====
+def level_arg(name: str) -> str:
+    """n3/N3 → jlpt/n3, 그 외는 폴더 경로 그대로"""
+    name = name.strip().strip("/").replace(os.sep, "/")
+    return f"jlpt/{name.lower()}" if re.fullmatch(r"[nN][1-5]", name) else name
+
+
+def run_query(conn: Any, sql: str, params: Tuple = (), limit: int = 0) -> int:
+    t0 = time.perf_counter()
+    cur = conn.execute(sql + (f" LIMIT {int(limit)}" if limit else ""), params)
+    names = [d[0] for d in cur.description or []]
+    rows = cur.fetchall()
+    ms = (time.perf_counter() - t0) * 1000
+    if names:
+        print("\t".join(names))
+    for r in rows:
+        print("\t".join("" if v is None else str(round(v, 1) if isinstance(v, float) else v) for v in r))
+    print(f"-- {len(rows)}행, {ms:.1f}ms", file=sys.stderr)
+    return 0
+
+
+def _filters(args: argparse.Namespace) -> Tuple[str, List[Any]]:
+    where, params = [], []
+    if args.level:
+        where.append("level = ?")
+        params.append(level_arg(args.level))
+    if args.kind:
+        where.append("kind = ?")
+        params.append(args.kind)
+    return "".join(f" AND {w}" for w in where), params
+
+
+def cmd_missing(conn: Any, args: argparse.Namespace) -> int:
+    return run_query(conn,
+                     "SELECT item, GROUP_CONCAT(kind) AS present FROM artifacts WHERE level = ? "
+                     "GROUP BY item HAVING SUM(kind = ?) = 0 ORDER BY item",
+                     (level_arg(args.level), args.kind), args.limit)
+
+
+def cmd_short(conn: Any, args: argparse.Namespace) -> int:
+    extra, params = _filters(args)
+    return run_query(conn,
+                     f"SELECT path, duration_ms, voice FROM artifacts WHERE duration_ms < ?{extra} "
+                     "ORDER BY duration_ms",
+                     (args.ms, *params), args.limit)
+
+
+def cmd_loud(conn: Any, args: argparse.Namespace) -> int:
+    extra, params = _filters(args)
+    return run_query(conn,
+                     f"SELECT path, dbfs, peak_dbfs, voice FROM artifacts WHERE dbfs > ?{extra} "
+                     "ORDER BY dbfs DESC",
+                     (args.dbfs, *params), args.limit)
+
+
+def cmd_stats(conn: Any, args: argparse.Namespace) -> int:
+    return run_query(conn,
+                     "SELECT level, kind, COUNT(*) AS files, COUNT(DISTINCT item) AS items, "
+                     "ROUND(SUM(duration_ms) / 60000.0, 1) AS minutes, ROUND(SUM(size) / 1048576.0, 1) AS mb, "
+                     "ROUND(AVG(dbfs), 1) AS avg_dbfs, SUM(dbfs IS NULL) AS unmeasured "
+                     "FROM artifacts GROUP BY level, kind ORDER BY level, kind")
+
+
+def cmd_sql(conn: Any, args: argparse.Namespace) -> int:
+    return run_query(conn, args.query, limit=args.limit)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="오디오 산출물 SQLite 카탈로그")
+    parser.add_argument("--db", default=AUDIO_CATALOG or "audio_catalog.sqlite", help="카탈로그 파일")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("build", help="레벨 폴더 스캔 → 카탈로그 증분 갱신")
+    p.add_argument("levels", nargs="*", help="레벨 폴더 (기본: " + ", ".join(DEFAULT_LEVELS) + ")")
+    p.add_argument("--workers", type=int, default=CATALOG_WORKERS, help="측정 프로세스 수")
+    p.add_argument("--no-pcm", action="store_true", help="MP3 헤더만 측정 (음량 생략, ffmpeg 불필요)")
+    p.add_argument("--full", action="store_true", help="변경 여부와 관계없이 전부 다시 측정")
+    p.set_defaults(func=cmd_build)
+
+    p = sub.add_parser("missing", help="레벨에서 특정 파일이 없는 항목")
+    p.add_argument("level", help="레벨 (n3, jlpt/n3, starter …)")
+    p.add_argument("kind", help="파일 종류 (word, gloss, example)")
+    p.set_defaults(func=cmd_missing)
+
+    p = sub.add_parser("short", help="길이가 짧은 파일")
+    p.add_argument("--ms", type=float, default=300.0)
+    p.set_defaults(func=cmd_short)
+
+    p = sub.add_parser("loud", help="RMS 음량이 큰 파일")
+    p.add_argument("--dbfs", type=float, default=-14.0)
+    p.set_defaults(func=cmd_loud)
+
+    p = sub.add_parser("stats", help="레벨/종류별 요약")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("sql", help="임의 SQL (테이블: artifacts - " + ", ".join(COLUMNS) + ")")
+    p.add_argument("query")
+    p.set_defaults(func=cmd_sql)
+
+    for name in ("missing", "short", "loud", "sql"):
+        sub.choices[name].add_argument("--limit", type=int, default=0, help="최대 행 수 (0=전부)")
+    for name in ("short", "loud"):
+        sub.choices[name].add_argument("--level", help="레벨 제한")
+        sub.choices[name].add_argument("--kind", help="종류 제한 (word, gloss, example)")
+
+    args = parser.parse_args()
+    if args.cmd != "build" and not os.path.exists(args.db):
+        print(f"⚠️ 카탈로그 없음: {args.db} (먼저 python catalog_audio.py build)")
+        return 1
+    conn = connect(args.db)
+    try:
+        return args.func(conn, args)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
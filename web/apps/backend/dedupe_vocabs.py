@@ -14,17 +14,26 @@ JSON(배열/단일)로부터 <level>/<lemma>/{word,gloss}.mp3 생성(항상 덮
   - 남성: en-US-Chirp3-HD-Charon
   - 여성: en-US-Chirp3-HD-Laomedeia
   - 항목별 순환: 남 → 여 → 남 → 여 ...
+    (VOICE_ASSIGN=hash|table이면 lemma 기준 배정 - audio_common/voice_assign.py)
 - word.mp3: lemma(영문) 합성
 - gloss.mp3: word.mp3 + GLOSS_GAP_MS 무음 + koGloss(한국어 Neural2) 합성
   - Charon(영문 남성) → 한국어 남성(기본: ko-KR-Neural2-C)
   - Laomedeia(영문 여성) → 한국어 여성(기본: ko-KR-Neural2-B)
   - koGloss 내 '~' → '무엇무엇'
   - koGloss 내 쉼표(,)마다 COMMA_GAP_MS 무음 삽입
+    (SSML 지원 보이스는 <break time>으로 이어 요청 1회, 미지원/실패 시 파트별 합성)
 - 레벨 폴더: '입문'→starter, '기초'→elementary, '중급'→intermediate, '중상급'→upper, '고급'→advanced
 - 기존 파일은 항상 덮어쓰기.
+  (단, 유효 입력(텍스트·보이스·간격)이 같은 파일이 다른 레벨/데이터셋에 이미 있으면
+   합성하지 않고 하드링크 - audio_common/audio_reuse.py, AUDIO_REUSE=0이면 끔)
 
 필수: pip install google-cloud-texttospeech pydub, FFmpeg, GCP ADC
+
+여러 머신에 나눠 생성: python dedupe_vocabs.py cefr_vocabs.json --shard 2/4
+  (audio_common/sharding.py, 모든 샤드가 끝나면 python merge_shards.py)
+작업 큐로 워커 수를 실행 중에 조절: python dedupe_vocabs.py cefr_vocabs.json --queue (audio_common/work_queue.py)
 """
+from __future__ import annotations
 
 import os
 os.environ["GRPC_DNS_RESOLVER"] = "native"
@@ -33,8 +42,27 @@ import sys, re, json, time
 from io import BytesIO
 from typing import Any, Dict, List, Optional
 
-from google.cloud import texttospeech
-from pydub import AudioSegment
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from audio_common.text_normalize import normalize
+from audio_common.audio_manifest import AudioManifest
+from audio_common.audio_reuse import AUDIO_REUSE, ReuseIndex, gloss_key, word_key
+from audio_common.output_ladder import OutputLadder
+from audio_common.sharding import Shard, ShardRun, item_cost, pop_shard
+from audio_common.work_queue import open_run, pop_queue
+from audio_common.ssml import GLOSS_SSML, is_ssml_rejection, synthesize_comma_parts
+from audio_common.voice_assign import VOICE_ASSIGN, assign_males, item_key, voice_table_path
+
+# TTS/pydub는 합성을 시작할 때 import (load_tts_modules) - --help는 패키지 없이 실행
+texttospeech = None
+AudioSegment = None
+
+
+def load_tts_modules() -> None:
+    global texttospeech, AudioSegment
+    if texttospeech is None:
+        from google.cloud import texttospeech as _texttospeech
+        from pydub import AudioSegment as _AudioSegment
+        texttospeech, AudioSegment = _texttospeech, _AudioSegment
 
 # ===== 파라미터 =====
 TARGET_DBFS = float(os.getenv("TARGET_DBFS", "-16.0"))
@@ -152,25 +180,9 @@ def clean_ko_gloss(text: str) -> str:
     koGloss 전처리:
       - '~' → '무엇무엇'
       - 품사 태그 제거 (영문/국문, 괄호·문두·중간 삽입형 모두)
+    (text_normalize 'dedupe_gloss' 프로필)
     """
-    if not text:
-        return ""
-    s = (text or "").strip().replace("~", "무엇무엇")
-    s = normalize_spaces(s)
-
-    POS_EN = r"(?:adj|adv|n|v|vt|vi|prep|pron|conj|art|interj|int|aux|det|num|modal|phr(?:asal)?\s*verb|phr\.?\s*v)"
-    POS_KO = r"(?:명사|동사|타동사|자동사|형용사|형용동사|부사|전치사|대명사|관사|수사|접속사|조사|감탄사)"
-    SEP    = r"[:\-–—·\.]"
-
-    # 괄호 안 품사 제거
-    s = re.sub(rf"[\(\[\（]\s*(?:{POS_EN}|{POS_KO})\.?\s*[\)\]\）]\s*", " ", s, flags=re.IGNORECASE)
-    # 문두 품사 제거
-    start_tag = re.compile(rf"^(?:\s*(?:{POS_EN}|{POS_KO})\.?\s*(?:{SEP})?\s*)+", flags=re.IGNORECASE)
-    s = start_tag.sub("", s)
-    # 중간 삽입형 제거 (영문/국문 모두)
-    s = re.sub(rf"(\s|,|;)\s*(?:{POS_EN}|{POS_KO})\.?\s*(\s|,|;)", r"\1 \2", s, flags=re.IGNORECASE)
-
-    return normalize_spaces(s).strip(" ;,·-–—.")
+    return normalize("dedupe_gloss", text)
 
 # ===== 스키마 추출기 =====
 def get_lemma_like(it: Dict[str, Any]) -> str:
@@ -211,12 +223,26 @@ def ensure_parent_dir(path: str) -> None:
 def is_male(index_zero_based: int) -> bool:
     return (index_zero_based % 2 == 0)  # 0,2,4,... 남성 / 1,3,5,... 여성
 
-def voices_for_index(idx0: int) -> Dict[str, str]:
+def item_males(items: List[Dict[str, Any]], json_path: str, save: bool = True) -> List[bool]:
+    """항목별 남성 여부 (make_word_gloss.py::item_males와 같은 규칙)"""
+    keys = [item_key(get_lemma_like(it)) for it in items]
+    return assign_males(keys, table_path=voice_table_path(json_path), save=save)
+
+def shard_run(items: List[Dict[str, Any]], json_path: str, shard: Optional[Shard],
+              queue: Optional[str] = None) -> ShardRun:
+    """--shard 분할 / --queue 작업 (make_word_gloss.py::shard_run과 같은 규칙)"""
+    keys = [item_key(get_lemma_like(it)) for it in items]
+    costs = [item_cost(len(get_lemma_like(it)) + len(get_kogloss_like(it)), 2) for it in items]
+    return open_run("dedupe_vocabs", json_path, keys, costs, shard=shard, queue=queue)
+
+def voices_for_index(idx0: int, male: Optional[bool] = None) -> Dict[str, str]:
     """
-    1) en 보이스는 기존 순환 규칙(남/여)
+    1) en 보이스는 기존 순환 규칙(남/여) - male을 주면(item_males) 순번 대신 그 값
     2) ko 보이스는 en 보이스명(Charon/Laomedeia)에 '강제 매핑' 우선 적용
     """
-    if is_male(idx0):
+    if male is None:
+        male = is_male(idx0)
+    if male:
         en = EN_MALE
     else:
         en = EN_FEMALE
@@ -228,31 +254,35 @@ def voices_for_index(idx0: int) -> Dict[str, str]:
         ko = KO_NEURAL_FOR_LAOMEDEIA
         gender = "female"
     else:
-        gender = "male" if is_male(idx0) else "female"
+        gender = "male" if male else "female"
         ko = KO_MALE_NEURAL if gender == "male" else KO_FEMALE_NEURAL
 
     return {"en": en, "ko": ko, "gender": gender}
 
 # ===== TTS =====
 def tts_client() -> texttospeech.TextToSpeechClient:
+    load_tts_modules()
     return texttospeech.TextToSpeechClient()
 
 def synthesize_lang(tts: texttospeech.TextToSpeechClient,
                     text: str,
                     voice_name: str,
-                    language_code: str) -> Optional[AudioSegment]:
+                    language_code: str,
+                    ssml: bool = False) -> Optional[AudioSegment]:
     text = normalize_spaces(text)
     if not text:
         return AudioSegment.silent(duration=0)
     voice = texttospeech.VoiceSelectionParams(language_code=language_code, name=voice_name)
     cfg = texttospeech.AudioConfig(audio_encoding=texttospeech.AudioEncoding.MP3)
-    inp = texttospeech.SynthesisInput(text=text)
+    inp = texttospeech.SynthesisInput(ssml=text) if ssml else texttospeech.SynthesisInput(text=text)
     for attempt in range(1, MAX_RETRY + 2):
         try:
             resp = tts.synthesize_speech(input=inp, voice=voice, audio_config=cfg)
             seg = AudioSegment.from_file(BytesIO(resp.audio_content), format="mp3")
             return loudness_normalize(seg, TARGET_DBFS)
         except Exception as e:
+            if ssml and is_ssml_rejection(e):
+                raise  # 재시도해도 같은 결과 - 호출 쪽에서 보이스를 기록하고 파트별 합성
             if attempt <= MAX_RETRY:
                 time.sleep(RETRY_BACKOFF_SEC * attempt)
             else:
@@ -281,30 +311,19 @@ def synthesize_with_commas_try_voices(tts: texttospeech.TextToSpeechClient,
                                       language_code: str,
                                       comma_gap_ms: int,
                                       voices: List[str]) -> Optional[AudioSegment]:
-    text = normalize_spaces(text)
-    if not text:
-        return AudioSegment.silent(duration=0)
-
-    # 풀와이드 콤마(U+FF0C) 포함해 분할
-    parts = [p.strip() for p in re.split(r"[,\uFF0C]", text) if p.strip()]
-    for idx_voice, vname in enumerate([v for v in voices if v]):
-        silence = AudioSegment.silent(duration=comma_gap_ms)
-        merged = AudioSegment.empty()
-        ok = True
-        for idx, part in enumerate(parts):
-            seg = synthesize_lang(tts, part, vname, language_code)
-            if seg is None or len(seg) == 0:
-                ok = False
-                break
-            merged += seg
-            if idx != len(parts) - 1:
-                merged += silence
-        if ok:
-            if idx_voice > 0:
-                print(f"  ↪︎ ko 보이스 대체: {vname}")
-            return loudness_normalize(merged, TARGET_DBFS)
-    print(f"  ❌ koGloss 합성 실패(ko candidates tried: {', '.join(voices)})")
-    return None
+    """쉼표 분할 합성: 보이스 후보 순서대로 (audio_common.ssml.synthesize_comma_parts)"""
+    seg = synthesize_comma_parts(
+        normalize_spaces(text),
+        voices,
+        lambda t, vname, ssml: synthesize_lang(tts, t, vname, language_code, ssml=ssml),
+        lambda ms: AudioSegment.silent(duration=ms),
+        comma_gap_ms,
+        finish=lambda merged: loudness_normalize(merged, TARGET_DBFS),
+        switch_note="ko 보이스 대체",
+    )
+    if seg is None:
+        print(f"  ❌ koGloss 합성 실패(ko candidates tried: {', '.join(voices)})")
+    return seg
 
 # ===== IO =====
 def load_items(json_path: str) -> List[Dict[str, Any]]:
@@ -313,7 +332,7 @@ def load_items(json_path: str) -> List[Dict[str, Any]]:
     return data if isinstance(data, list) else [data]
 
 # ===== 메인 파이프라인 =====
-def process(json_path: str) -> None:
+def process(json_path: str, shard: Optional[Shard] = None, queue: Optional[str] = None) -> None:
     try:
         items = load_items(json_path)
     except Exception as e:
@@ -326,18 +345,45 @@ def process(json_path: str) -> None:
         print("Google Cloud 인증 실패 또는 클라이언트 생성 실패:", e)
         return
 
+    # 해시-온-라이트 매니페스트 (레벨별 audio_manifest.json → sync_audio.py 차등 업로드)
+    try:
+        run = shard_run(items, json_path, shard, queue)
+    except Exception as e:
+        print(f"작업 큐/샤드 준비 실패: {e}")
+        return
+    manifest = AudioManifest(level_depth=2, shard=run.tag)
+    # 데이터셋 간 재사용: 유효 입력 키가 같은 기존 파일이 있으면 하드링크 (합성 생략)
+    reuse = ReuseIndex.scan([folder for _, folder in LEVEL_MAP]) if AUDIO_REUSE and manifest.enabled else None
+
+    try:
+        males = item_males(items, json_path)
+    except Exception as e:
+        print(f"보이스 배정 실패(VOICE_ASSIGN={VOICE_ASSIGN}): {e}")
+        return
+
+    # 멀티 코덱 래더 (AUDIO_LADDER 설정 시 PCM 마스터 → Opus/AAC/저비트레이트 MP3)
+    # - 준비 단계의 조기 반환이 모두 끝난 뒤 생성 (close 안 된 프로세스 풀이 남지 않게)
+    ladder = OutputLadder(level_depth=2)
+
     total = len(items)
     print(f"🎧 Start (items={total})")
     print(f"    EN: male={EN_MALE}, female={EN_FEMALE}")
     print(f"    KO defaults: male={KO_MALE_NEURAL}, female={KO_FEMALE_NEURAL}")
     print(f"    KO forced:   Charon→{KO_NEURAL_FOR_CHARON}, Laomedeia→{KO_NEURAL_FOR_LAOMEDEIA}")
-    print(f"    gaps: gloss={GLOSS_GAP_MS}ms, comma={COMMA_GAP_MS}ms")
+    print(f"    voice assign: {VOICE_ASSIGN}, shard: {run.banner()}")
+    print(f"    gaps: gloss={GLOSS_GAP_MS}ms, comma={COMMA_GAP_MS}ms, ssml={'on' if GLOSS_SSML else 'off'}")
+    print(f"    ladder: {','.join(ladder.variants) or 'off'}, manifest: {'on' if manifest.enabled else 'off'}, "
+          f"reuse: {'on (%d keys)' % len(reuse) if reuse is not None else 'off'}")
     print("📝 모드: word=en-US(Chirp3 HD), gloss=ko-KR(Neural2), 성별 순환(남→여→남…), 덮어쓰기\n")
 
     last_saved: Optional[str] = None
     fails: List[str] = []
 
-    for i, it in enumerate(items):
+    last_file = run.local_name("마지막 생성 단어.txt")
+    fail_file = run.local_name("생성 실패 목록.txt")
+
+    for i in run.indices(fails):
+        it = items[i]
         lemma = get_lemma_like(it)
         categories = get_categories_like(it)
         ko_gloss_raw = get_kogloss_like(it)
@@ -354,18 +400,34 @@ def process(json_path: str) -> None:
             if str(ve) == "LEVEL_TAG_MISSING":
                 print(f"[{i+1}/{total}] '{lemma}' ❌ 레벨 태그 미검출(category/categories) → 처리 중단")
                 try:
-                    with open("마지막 생성 단어.txt", "w", encoding="utf-8") as f:
+                    with open(last_file, "w", encoding="utf-8") as f:
                         f.write((last_saved or '').strip())
                 except Exception:
                     pass
+                ladder.close()
+                fails.append(f"{lemma}\tLEVEL_TAG_MISSING")
+                run.finish(fails, manifest.close())
                 return
             print(f"[{i+1}/{total}] '{lemma}' 경로 오류: {ve}")
             fails.append(f"{lemma}\tPATH_ERROR:{ve}")
             continue
 
-        v = voices_for_index(i)
+        v = voices_for_index(i, males[i])
         print(f"[{i+1}/{total}] '{lemma}' → dir='{paths['dir']}', en={v['en']}, ko={v['ko']} (gender={v['gender']})")
 
+        ko_gloss = clean_ko_gloss(ko_gloss_raw)
+        wkey = word_key("en-US", v["en"], lemma, TARGET_DBFS)
+        gkey = gloss_key(wkey, v["ko"], ko_gloss, GLOSS_GAP_MS, COMMA_GAP_MS, TARGET_DBFS) if ko_gloss else None
+        if reuse is not None and reuse.link_all(
+            manifest,
+            {paths["word"]: wkey, paths["gloss"]: gkey},
+            {os.path.normpath(a): k for a, k in ((audio_paths.get("word"), wkey), (audio_paths.get("gloss"), gkey)) if a},
+        ):
+            print("  🔗 같은 입력의 기존 파일 재사용(하드링크) → 합성 생략")
+            run.count("reused")
+            last_saved = lemma
+            continue
+
         # 1) word.mp3 (en-US)
         word_seg = synthesize_lang_try_voices(tts, lemma, "en-US", [v["en"]])
         if word_seg is None or len(word_seg) == 0:
@@ -373,7 +435,11 @@ def process(json_path: str) -> None:
             fails.append(f"{lemma}\tWORD_SYNTH_FAIL:{v['en']}")
             continue
         try:
-            word_seg.export(paths["word"], format="mp3")
+            entry = manifest.export(word_seg, paths["word"], key=wkey, voice=v["en"])
+            if reuse is not None:
+                reuse.add(wkey, paths["word"], entry)
+            ladder.add(word_seg, paths["word"])
+            run.count("word")
             print("  ✅ word.mp3 저장(덮어쓰기)")
             # 추가 저장: audio.word (옵션)
             if audio_paths.get("word"):
@@ -387,7 +453,6 @@ def process(json_path: str) -> None:
             continue
 
         # 2) gloss.mp3 = word + GLOSS_GAP_MS + koGloss(ko-KR), 콤마마다 COMMA_GAP_MS
-        ko_gloss = clean_ko_gloss(ko_gloss_raw)
         if not ko_gloss:
             print("  ⚠️ koGloss 비어있음(koChirpScript/korean_meaning/koGloss 모두 비어있음) → gloss 생략")
             last_saved = lemma
@@ -405,7 +470,11 @@ def process(json_path: str) -> None:
         gloss_seg = loudness_normalize(gloss_seg, TARGET_DBFS)
 
         try:
-            gloss_seg.export(paths["gloss"], format="mp3")
+            entry = manifest.export(gloss_seg, paths["gloss"], key=gkey, voice=f"{v['en']}+{v['ko']}")
+            if reuse is not None:
+                reuse.add(gkey, paths["gloss"], entry)
+            ladder.add(gloss_seg, paths["gloss"])
+            run.count("gloss")
             print("  ✅ gloss.mp3 저장(덮어쓰기)")
             # 추가 저장: audio.gloss (옵션)
             if audio_paths.get("gloss"):
@@ -419,20 +488,35 @@ def process(json_path: str) -> None:
             fails.append(f"{lemma}\tGLOSS_SAVE_FAIL:{e}")
             continue
 
+    ladder.close()
+    manifests = manifest.close()
+    if reuse is not None and reuse.links:
+        print(f"🔗 재사용(하드링크) {reuse.links}개")
+
     # 마무리
     try:
-        with open("마지막 생성 단어.txt", "w", encoding="utf-8") as f:
+        with open(last_file, "w", encoding="utf-8") as f:
             f.write((last_saved or "").strip())
     except Exception:
         pass
 
     if fails:
-        with open("생성 실패 목록.txt", "w", encoding="utf-8") as f:
+        with open(fail_file, "w", encoding="utf-8") as f:
             f.write("\n".join(fails) + "\n")
-        print(f"\n⚠️ 실패 {len(fails)}건 → '생성 실패 목록.txt' 기록")
+        print(f"\n⚠️ 실패 {len(fails)}건 → '{fail_file}' 기록")
     else:
         print("\n✅ 모든 항목 처리 완료(실패 없음)")
+    run.finish(fails, manifests)
 
 if __name__ == "__main__":
-    json_file = sys.argv[1] if len(sys.argv) > 1 else "cefr_vocabs.json"
-    process(json_file)
+    if {"-h", "--help"} & set(sys.argv[1:]):
+        print(__doc__)  # 사용법은 모듈 docstring
+        sys.exit(0)
+    try:
+        shard, argv = pop_shard(sys.argv[1:])
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    queue, argv = pop_queue(argv)
+    json_file = argv[0] if argv else "cefr_vocabs.json"
+    process(json_file, shard, queue)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+출력 래더 재인코딩 (TTS 재합성 없음)
+
+레벨 폴더의 기본 MP3마다 PCM 마스터(AUDIO_MASTER_ROOT)가 있으면 마스터에서,
+없으면 --from-mp3 일 때 MP3에서 변형(Opus/AAC/저비트레이트 MP3)을 프로세스 풀로
+인코딩하고 레벨별 ladder_summary.json을 저장합니다.
+
+사용:
+  python encode_ladder.py jlpt/n5 jlpt/n4 --variants opus24,aac48
+  python encode_ladder.py starter elementary --from-mp3 --workers 8
+  python encode_ladder.py N5/N5_Listening/N5_Listening_mix --summary-only
+"""
+
+import os
+import sys
+import argparse
+
+from audio_common.output_ladder import (
+    AUDIO_LADDER,
+    AUDIO_LADDER_WORKERS,
+    AUDIO_MASTER_ROOT,
+    OutputLadder,
+    is_variant_file,
+    master_path,
+    parse_variants,
+    print_summary,
+    variant_path,
+    write_summary,
+)
+
+
+def iter_mp3(level_dir: str):
+    for root, _, files in os.walk(level_dir):
+        for fn in sorted(files):
+            if fn.endswith(".mp3") and not is_variant_file(fn):
+                yield os.path.join(root, fn)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="PCM 마스터 → 멀티 코덱 변형 재인코딩")
+    parser.add_argument("levels", nargs="+", help="레벨 폴더 (예: jlpt/n5, starter)")
+    parser.add_argument("--variants", default=AUDIO_LADDER or "opus24,aac48,mp3_48", help="쉼표 구분 변형 목록")
+    parser.add_argument("--workers", type=int, default=AUDIO_LADDER_WORKERS, help="인코딩 프로세스 수")
+    parser.add_argument("--master-root", default=AUDIO_MASTER_ROOT, help="PCM 마스터 루트")
+    parser.add_argument("--from-mp3", action="store_true", help="마스터가 없으면 MP3를 소스로 사용")
+    parser.add_argument("--force", action="store_true", help="이미 있는 변형도 다시 인코딩")
+    parser.add_argument("--summary-only", action="store_true", help="인코딩 없이 요약만 갱신")
+    args = parser.parse_args()
+
+    try:
+        variants = parse_variants(args.variants)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if args.summary_only:
+        for level in args.levels:
+            print_summary(write_summary(level, variants))
+        return 0
+
+    queued = skipped = no_source = 0
+    for level in args.levels:
+        if not os.path.isdir(level):
+            print(f"⚠️ 폴더 없음: {level}")
+            continue
+        ladder = OutputLadder(variants, workers=args.workers, master_root=args.master_root)
+        ladder.levels[level] = None
+        for mp3 in iter_mp3(level):
+            todo = [n for n in variants if args.force or not os.path.exists(variant_path(mp3, n))]
+            if not todo:
+                skipped += 1
+                continue
+            src = master_path(mp3, args.master_root)
+            if not os.path.exists(src):
+                if not args.from_mp3:
+                    no_source += 1
+                    continue
+                src = mp3
+            ladder.add_source(src, mp3, variants=todo, level=level)
+            queued += 1
+        ladder.close()
+
+    print(f"\n✅ 인코딩 예약 {queued}개, 이미 완료 {skipped}개, 소스 없음 {no_source}개")
+    if no_source:
+        print("   (마스터가 없는 항목은 --from-mp3 로 MP3에서 인코딩할 수 있습니다)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
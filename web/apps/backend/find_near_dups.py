@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+어휘 데이터셋 근접 중복 탐지 (MinHash + LSH)
+
+analyze_vocabs.py / finding_dup.py는 정규화한 값이 '완전히 같은' 중복만 찾습니다.
+조사나 구두점 하나만 다른 koExample, definition, koChirpScript는 그대로 통과해
+두 번 합성됩니다. 이 스크립트는 필드별로 문자 n-gram MinHash 서명을 만들고
+LSH 밴딩으로 후보만 비교해 근접 중복 클러스터를 크기 순으로 출력합니다.
+(쌍별 비교 없음 → 항목 수에 선형, 10만 항목도 수 초)
+
+사용:
+  python find_near_dups.py                                   # 기본: cefr, total, ielts, jlpt, idiom
+  python find_near_dups.py cefr ielts --fields koExample --threshold 0.8
+  python find_near_dups.py jlpt/N1.json jlpt/N2.json --skip-exact --top 20
+
+출력:
+  near_dups.jsonl  클러스터 1개 = 1줄 {"field", "size", "variants", "min_sim", "mean_sim", "exact", "items": [...]}
+  near_dups.csv    cluster, field, size, min_sim, dataset, index, lemma, text
+"""
+
+import csv
+import json
+import sys
+import time
+import argparse
+from typing import Dict, List
+
+from audio_common.minhash import lsh_clusters, minhash_signatures
+from audio_common.vocab_datasets import DEFAULT_GROUPS, field, iter_items, norm_text, resolve_sources
+
+DEFAULT_FIELDS = ["koExample", "definition", "koChirpScript"]
+
+
+def collect(paths: List[str], fields: List[str], min_chars: int):
+    """필드별 {정규화 텍스트: [(ref, lemma, 원문)]} (완전히 같은 텍스트는 문서 1개로 합침)"""
+    docs: Dict[str, Dict[str, list]] = {f: {} for f in fields}
+    total = 0
+    for ref, item in iter_items(paths):
+        total += 1
+        lemma = field(item, "lemma")
+        for f in fields:
+            raw = field(item, f)
+            key = norm_text(raw)
+            if len(key) >= min_chars:
+                docs[f].setdefault(key, []).append((ref, lemma, raw))
+    return docs, total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="MinHash/LSH 근접 중복 탐지")
+    parser.add_argument("sources", nargs="*", default=DEFAULT_GROUPS, help="그룹(cefr/total/ielts/jlpt/idiom), glob, 파일")
+    parser.add_argument("--fields", nargs="+", default=DEFAULT_FIELDS, help="비교할 필드")
+    parser.add_argument("--k", type=int, default=3, help="문자 n-gram 크기")
+    parser.add_argument("--perms", type=int, default=64, help="MinHash 순열 수")
+    parser.add_argument("--bands", type=int, default=16, help="LSH 밴드 수 (perms의 약수)")
+    parser.add_argument("--threshold", type=float, default=0.7, help="추정 자카드 유사도 하한")
+    parser.add_argument("--min-chars", type=int, default=8, help="이보다 짧은 텍스트는 제외")
+    parser.add_argument("--skip-exact", action="store_true", help="완전히 같은 텍스트끼리만 모인 클러스터 제외")
+    parser.add_argument("--top", type=int, default=10, help="콘솔에 출력할 상위 클러스터 수")
+    parser.add_argument("--out", default="near_dups.jsonl", help="JSONL 출력")
+    parser.add_argument("--csv", default="near_dups.csv", help="CSV 출력 (빈 문자열이면 생략)")
+    args = parser.parse_args()
+
+    paths = resolve_sources(args.sources)
+    if not paths:
+        print("❌ 데이터셋 파일이 없습니다.")
+        return 1
+
+    t0 = time.time()
+    docs, total = collect(paths, args.fields, args.min_chars)
+    print(f"📚 {len(paths)}개 파일, 항목 {total}개 ({time.time() - t0:.2f}s)")
+
+    clusters = []
+    for f in args.fields:
+        texts = list(docs[f])
+        t1 = time.time()
+        sig = minhash_signatures(texts, k=args.k, num_perm=args.perms)
+        found = lsh_clusters(sig, bands=args.bands, threshold=args.threshold)
+        # 클러스터에 들지 않은 문서 중 같은 텍스트가 여러 항목에 있는 경우 = 완전 중복
+        in_cluster = {int(i) for ids, _, _ in found for i in ids}
+        groups = [([int(i) for i in ids], lo, avg) for ids, lo, avg in found]
+        groups += [([i], 1.0, 1.0) for i, t in enumerate(texts) if i not in in_cluster and len(docs[f][t]) > 1]
+        n_items = sum(len(v) for v in docs[f].values())
+        print(f"  {f}: 항목 {n_items}개 → 고유 텍스트 {len(texts)}개, 클러스터 {len(groups)}개 ({time.time() - t1:.2f}s)")
+
+        for ids, lo, avg in groups:
+            if args.skip_exact and len(ids) == 1:
+                continue
+            items = [
+                {"id": ref.id, "dataset": ref.dataset, "index": ref.index, "lemma": lemma, "text": raw}
+                for i in ids for ref, lemma, raw in docs[f][texts[i]]
+            ]
+            clusters.append({
+                "field": f,
+                "size": len(items),
+                "variants": len(ids),
+                "min_sim": round(lo, 3),
+                "mean_sim": round(avg, 3),
+                "exact": len(ids) == 1,
+                "items": items,
+            })
+
+    # 순위: 근접(변형 2개 이상) 우선 → 항목 수 → 평균 유사도
+    clusters.sort(key=lambda c: (c["exact"], -c["size"], -c["mean_sim"]))
+
+    with open(args.out, "w", encoding="utf-8") as fo:
+        for c in clusters:
+            fo.write(json.dumps(c, ensure_ascii=False) + "\n")
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as fc:
+            w = csv.writer(fc)
+            w.writerow(["cluster", "field", "size", "min_sim", "dataset", "index", "lemma", "text"])
+            for n, c in enumerate(clusters, 1):
+                for it in c["items"]:
+                    w.writerow([n, c["field"], c["size"], c["min_sim"], it["dataset"], it["index"], it["lemma"], it["text"][:200]])
+
+    near = sum(1 for c in clusters if not c["exact"])
+    print(f"\n✅ 클러스터 {len(clusters)}개 (근접 {near}, 완전 {len(clusters) - near}), 전체 {time.time() - t0:.2f}s")
+    print(f"   → {args.out}" + (f", {args.csv}" if args.csv else ""))
+    for c in clusters[: args.top]:
+        kind = "완전" if c["exact"] else f"min_sim={c['min_sim']:.2f}"
+        print(f"\n[{c['field']}] ×{c['size']} ({kind})")
+        for it in c["items"][:4]:
+            print(f"   - {it['id']} {it['lemma']}: {it['text'][:80]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JLPT romaji 중복 정리 - 기존 오디오 이동 (재합성 없이)
+
+fix_n1_duplicates.py / fix_n2_duplicates.py는 JSON의 중복 romaji를 romaji2, romaji3…으로
+바꾸고 audio 경로만 고칩니다. 디스크의 jlpt/<레벨>/<romaji>/ 폴더는 예전 배치(동음이의어가
+같은 폴더를 공유)로 남아 있어서, 그동안은 mja_n1.py로 레벨 전체를 다시 합성했습니다.
+
+이 스크립트는
+  1) 원본 JSON(N1.json) ↔ 정리된 JSON(N1_fixed.json) 항목을 내용 해시(lemma, kana, koGloss,
+     koChirpScript)로 짝지어 항목별 '예전 폴더 → 새 폴더' 매핑을 만들고
+  2) 바뀌는 폴더의 기존 파일마다 어느 항목의 오디오인지 확인한 뒤
+       - audio_manifest.json에 유효 입력 키(audio_reuse.py)가 있으면 키로 확인
+       - 키가 없으면: 폴더를 쓰는 항목이 하나뿐이거나, word.mp3처럼 후보들의 입력(kana)이
+         모두 같을 때만 인정 (--legacy-owner first|last로 공유 폴더의 주인을 지정 가능)
+  3) 확인된 파일은 새 폴더로 이동(여러 항목이 쓸 수 있으면 하드링크)하고
+  4) 출처가 없는 산출물만 합성 대기열(<레벨>_missing_folders.txt)에 남깁니다.
+     → python make_jlpt_audio.py N1_fixed.json --missing-only
+새 폴더는 make_jlpt_audio.py와 같은 romaji 폴더 등록부(jlpt/<레벨>_romaji_slugs.json,
+audio_common/romaji_slugs.py)에서 읽습니다 (등록부는 바꾸지 않음).
+
+이동은 2단계로 합니다. 저널(.disambig_journal.json)을 먼저 쓰고, 옮길 파일을 모두
+스테이징 폴더로 옮긴 뒤(os.replace) 최종 위치로 옮깁니다. 그래서 ishi ↔ ishi2처럼 서로
+자리를 바꾸는 경우도 안전합니다. 스테이징 도중 멈추면 다음 실행이 원위치로 되돌리고,
+그 뒤에 멈추면 저널대로 마저 옮깁니다. 쓰이지 않는 파일은 지우지 않고
+_orphans/<예전 폴더>/로 옮깁니다.
+
+사용 (backend 폴더에서, make_jlpt_audio.py와 같은 출력 경로 jlpt/<레벨>):
+  python jlpt/disambiguate_romaji.py n1                  # 계획만 (dry-run)
+  python jlpt/disambiguate_romaji.py n1 --apply
+  python jlpt/disambiguate_romaji.py n2 --old jlpt/N2.json --new jlpt/N2_fixed.json --audio-dir jlpt/n2
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+# 공용 모듈(audio_common) 경로 등록
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from audio_common.audio_manifest import is_fresh, load_manifest, save_manifest
+from audio_common.audio_reuse import jlpt_keys, link_file
+from audio_common.generator_config import COMMA_GAP_MS, GLOSS_GAP_MS, TARGET_DBFS, jlpt_voices
+from audio_common.hash_cache import text_key
+from audio_common.romaji_slugs import assign_slugs, registry_path
+from audio_common.text_normalize import normalize
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+KINDS = ("word", "gloss", "example")
+JOURNAL_FILE = ".disambig_journal.json"
+STAGING_DIR = ".disambig_staging"
+ORPHAN_DIR = "_orphans"
+
+
+def sanitize_filename(name: str) -> str:
+    name = re.sub(r'[\\/*?:"<>|]', "", str(name or ""))
+    return name.strip().lower() or "unnamed"
+
+
+def item_hash(item: Dict[str, Any]) -> str:
+    """항목 내용 해시 (romaji/audio 경로 제외 - 중복 정리 전후에 같은 값)"""
+    return text_key(*(str(item.get(k) or "").strip() for k in ("lemma", "kana", "koGloss", "koChirpScript")))
+
+
+def artifact_inputs(item: Dict[str, Any]) -> Dict[str, Any]:
+    """산출물별 입력 (키가 없는 파일을 후보끼리 비교할 때)"""
+    kana = item.get("kana", "")
+    ko_gloss = normalize("jlpt_gloss", item.get("koGloss", "") or item.get("koChirpScript", ""))
+    script = item.get("koChirpScript", "")
+    return {
+        "word": kana,
+        "gloss": (kana, ko_gloss) if ko_gloss else None,
+        "example": script or None,
+    }
+
+
+def expected_keys(item: Dict[str, Any]) -> Dict[str, set]:
+    """산출물별 가능한 키 (보이스 순환은 생성기/순번에 따라 달라서 남/여 둘 다)"""
+    kana = item.get("kana", "")
+    ko_gloss = normalize("jlpt_gloss", item.get("koGloss", "") or item.get("koChirpScript", ""))
+    script = item.get("koChirpScript", "")
+    out: Dict[str, set] = {k: set() for k in KINDS}
+    for parity in (0, 1):
+        keys = jlpt_keys(jlpt_voices(parity), kana, ko_gloss, script, TARGET_DBFS, GLOSS_GAP_MS, COMMA_GAP_MS)
+        for k, v in keys.items():
+            if v:
+                out[k].add(v)
+    return out
+
+
+def old_folder(item: Dict[str, Any], level: str) -> str:
+    """원본 JSON에서 항목의 오디오가 있던 폴더 (audio 경로 우선, 없으면 romaji)"""
+    audio = item.get("audio") or {}
+    prefix = f"jlpt/{level}/"
+    for k in KINDS:
+        p = audio.get(k) if isinstance(audio, dict) else None
+        if isinstance(p, str) and p.startswith(prefix):
+            return p[len(prefix):].split("/")[0]
+    return sanitize_filename(item.get("romaji", ""))
+
+
+def new_folders(items: List[Dict[str, Any]], registry: Optional[str] = None) -> List[str]:
+    """정리된 JSON의 폴더 (make_jlpt_audio.py와 같은 등록부/규칙 - 남은 중복은 접미사)"""
+    slugs = assign_slugs(items, registry, save=False)
+    return [slug or sanitize_filename(it.get("romaji", "")) for slug, it in zip(slugs, items)]
+
+
+# ===== 계획 =====
+class Entry:
+    def __init__(self, idx: int, item: Dict[str, Any], old: str, new: str):
+        self.idx = idx
+        self.item = item
+        self.old = old
+        self.new = new
+        self.inputs = artifact_inputs(item)
+        self._keys: Optional[Dict[str, set]] = None
+
+    @property
+    def keys(self) -> Dict[str, set]:
+        if self._keys is None:
+            self._keys = expected_keys(self.item)
+        return self._keys
+
+    def label(self) -> str:
+        return f"#{self.idx} {self.item.get('lemma', '')}({self.item.get('kana', '')})"
+
+
+def pair_entries(old_items: List[Dict[str, Any]], new_items: List[Dict[str, Any]], level: str,
+                 registry: Optional[str] = None):
+    """정리된 JSON 항목마다 원본 항목을 내용 해시로 찾음 (같은 해시는 순서대로) → (entries, unmatched)"""
+    pool: Dict[str, List[int]] = defaultdict(list)
+    for i, it in enumerate(old_items):
+        pool[item_hash(it)].append(i)
+    folders = new_folders(new_items, registry)
+    entries, unmatched = [], []
+    for j, it in enumerate(new_items):
+        cands = pool.get(item_hash(it))
+        if not cands:
+            unmatched.append(j)
+            entries.append(Entry(j, it, "", folders[j]))
+            continue
+        entries.append(Entry(j, it, old_folder(old_items[cands.pop(0)], level), folders[j]))
+    return entries, unmatched
+
+
+def owners_of(kind: str, entry_meta: Optional[Dict[str, Any]], path: str, cands: List[Entry],
+              legacy_owner: str) -> Tuple[List[Entry], str]:
+    """파일 하나의 주인 후보 → (주인 목록, 근거)"""
+    cands = [e for e in cands if e.inputs[kind] is not None]
+    if not cands:
+        return [], "no-candidate"
+    if entry_meta and entry_meta.get("key") and is_fresh(entry_meta, path):
+        return [e for e in cands if entry_meta["key"] in e.keys[kind]], "key"
+    if len({repr(e.inputs[kind]) for e in cands}) == 1:
+        return cands, "same-input" if len(cands) > 1 else "single"
+    if legacy_owner == "first":
+        return [min(cands, key=lambda e: e.idx)], "legacy-first"
+    if legacy_owner == "last":
+        return [max(cands, key=lambda e: e.idx)], "legacy-last"
+    return [], "ambiguous"
+
+
+def build_plan(entries: List[Entry], audio_dir: str, legacy_owner: str) -> Dict[str, Any]:
+    affected = [e for e in entries if e.old != e.new]
+    shared = defaultdict(list)
+    for e in entries:
+        if e.old:
+            shared[e.old].append(e)
+    affected += [e for e in entries if e.old == e.new and len(shared[e.old]) > 1]
+    affected_ids = {e.idx for e in affected}
+
+    folders = sorted({f for e in affected for f in (e.old, e.new) if f})
+    by_folder: Dict[str, List[Entry]] = defaultdict(list)
+    for e in affected:
+        if not e.old:
+            continue  # 원본에 없는 내용 → 기존 파일을 쓸 수 없음
+        for f in {e.old, e.new}:
+            by_folder[f].append(e)
+
+    manifest = load_manifest(audio_dir)
+    # (폴더/종류) → 이 파일을 쓸 수 있는 항목
+    sources: Dict[str, List[Entry]] = {}
+    evidence: Dict[str, str] = {}
+    for f in folders:
+        for kind in KINDS:
+            rel = f"{f}/{kind}.mp3"
+            path = os.path.join(audio_dir, f, f"{kind}.mp3")
+            if not os.path.isfile(path):
+                continue
+            owners, why = owners_of(kind, manifest.get(rel), path, by_folder[f], legacy_owner)
+            sources[rel] = owners
+            evidence[rel] = why
+
+    # 대상(새 폴더/종류)별 출처 선택: 제자리 파일 우선
+    assign: Dict[str, str] = {}
+    missing: List[Dict[str, Any]] = []
+    for e in sorted(affected, key=lambda e: e.idx):
+        for kind in KINDS:
+            if e.inputs[kind] is None:
+                continue
+            dst = f"{e.new}/{kind}.mp3"
+            usable = [rel for rel, owners in sources.items() if rel.endswith(f"/{kind}.mp3") and e in owners]
+            if not usable:
+                missing.append({"folder": e.new, "kind": kind, "entry": e.label()})
+                continue
+            assign[dst] = dst if dst in usable else sorted(usable, key=lambda r: r.split("/")[0] != e.old)[0]
+
+    # 출처 파일별 대상 목록 → 이동(첫 대상) + 링크(나머지), 제자리면 링크만
+    targets: Dict[str, List[str]] = defaultdict(list)
+    for dst, src in assign.items():
+        targets[src].append(dst)
+    moves = []
+    for src, dsts in sorted(targets.items()):
+        dsts = sorted(dsts, key=lambda d: d != src)
+        if dsts == [src]:
+            continue
+        moves.append({"src": src, "dst": dsts})
+    used = set(targets)
+    orphans = sorted(rel for rel in sources if rel not in used)
+    return {
+        "entries": len(entries),
+        "affected": len(affected_ids),
+        "folders": folders,
+        "moves": moves,
+        "missing": missing,
+        "orphans": orphans,
+        "evidence": evidence,
+    }
+
+
+# ===== 실행 (저널 + 2단계 이동) =====
+def _write_journal(path: str, journal: Dict[str, Any]) -> None:
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(journal, f, ensure_ascii=False, indent=1)
+    os.replace(path + ".tmp", path)
+
+
+def rollback_staging(audio_dir: str, journal: Dict[str, Any]) -> int:
+    """1단계(스테이징) 도중 멈춘 경우: 스테이징된 파일을 원래 자리로"""
+    n = 0
+    for step in journal["moves"]:
+        staged = os.path.join(audio_dir, step["stage"])
+        if os.path.exists(staged):
+            os.replace(staged, os.path.join(audio_dir, step["src"]))
+            n += 1
+    return n
+
+
+def finish_journal(audio_dir: str, journal: Dict[str, Any], journal_path: str) -> Dict[str, int]:
+    """2단계: 안 쓰는 파일 보관 → 스테이징 파일을 최종 위치로 (재실행 시에도 같은 함수로 마무리)"""
+    stats = {"moved": 0, "linked": 0, "orphaned": 0}
+    manifest = load_manifest(audio_dir)
+    if journal["phase"] == "staged":
+        for rel in journal["orphans"]:
+            src = os.path.join(audio_dir, rel)
+            if not os.path.exists(src):
+                continue
+            dst = os.path.join(audio_dir, ORPHAN_DIR, rel)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            os.replace(src, dst)
+            manifest.pop(rel, None)
+            stats["orphaned"] += 1
+        save_manifest(audio_dir, manifest)
+        journal["phase"] = "orphaned"
+        _write_journal(journal_path, journal)
+
+    for step in journal["moves"]:
+        staged = os.path.join(audio_dir, step["stage"])
+        if not os.path.exists(staged):
+            continue  # 이미 처리됨
+        meta = step.get("meta")
+        first, rest = step["dst"][0], step["dst"][1:]
+        for rel in rest:
+            link_file(staged, os.path.join(audio_dir, rel))
+            if meta:
+                manifest[rel] = dict(meta)
+            stats["linked"] += 1
+        dst = os.path.join(audio_dir, first)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        os.replace(staged, dst)
+        if step["src"] not in step["dst"]:
+            manifest.pop(step["src"], None)
+        if meta:
+            manifest[first] = dict(meta)
+        stats["moved"] += 1
+    save_manifest(audio_dir, manifest)
+    os.remove(journal_path)
+    stage_dir = os.path.join(audio_dir, STAGING_DIR)
+    if os.path.isdir(stage_dir) and not os.listdir(stage_dir):
+        os.rmdir(stage_dir)
+    return stats
+
+
+def apply_plan(audio_dir: str, plan: Dict[str, Any]) -> Dict[str, int]:
+    manifest = load_manifest(audio_dir)
+    journal = {
+        "phase": "staging",
+        "moves": [dict(m, stage=f"{STAGING_DIR}/{n}.mp3", meta=manifest.get(m["src"]))
+                  for n, m in enumerate(plan["moves"])],
+        "orphans": plan["orphans"],
+    }
+    journal_path = os.path.join(audio_dir, JOURNAL_FILE)
+    os.makedirs(os.path.join(audio_dir, STAGING_DIR), exist_ok=True)
+    _write_journal(journal_path, journal)
+
+    # 1단계: 옮길 파일을 모두 스테이징으로 (자리 바꾸기에서 덮어쓰기 방지)
+    for step in journal["moves"]:
+        os.replace(os.path.join(audio_dir, step["src"]), os.path.join(audio_dir, step["stage"]))
+    journal["phase"] = "staged"
+    _write_journal(journal_path, journal)
+    return finish_journal(audio_dir, journal, journal_path)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="JLPT romaji 중복 정리 - 기존 오디오 이동")
+    parser.add_argument("level", help="n1 / n2 / ...")
+    parser.add_argument("--old", default=None, help="원본 JSON (기본: jlpt/<레벨>.json)")
+    parser.add_argument("--new", default=None, help="정리된 JSON (기본: jlpt/<레벨>_fixed.json)")
+    parser.add_argument("--audio-dir", default=None, help="오디오 레벨 폴더 (기본: jlpt/<레벨>)")
+    parser.add_argument("--legacy-owner", choices=["none", "first", "last"], default="none",
+                        help="키 없는 공유 폴더 파일의 주인 (none: 인정 안 함 → 합성 대기열)")
+    parser.add_argument("--apply", action="store_true", help="실제로 이동 (기본은 계획만)")
+    parser.add_argument("--report", default=None, help="계획 JSON (기본: <레벨>_disambiguation.json)")
+    args = parser.parse_args()
+
+    level = args.level.lower()
+    old_path = args.old or os.path.join(SCRIPT_DIR, f"{level.upper()}.json")
+    new_path = args.new or os.path.join(SCRIPT_DIR, f"{level.upper()}_fixed.json")
+    audio_dir = args.audio_dir or os.path.join("jlpt", level)
+
+    journal_path = os.path.join(audio_dir, JOURNAL_FILE)
+    if os.path.exists(journal_path):
+        with open(journal_path, "r", encoding="utf-8") as f:
+            journal = json.load(f)
+        if journal["phase"] == "staging":
+            n = rollback_staging(audio_dir, journal)
+            os.remove(journal_path)
+            print(f"↪︎ 스테이징 도중 멈춘 저널 → {n}개 원위치 후 다시 계획: {journal_path}")
+        else:
+            print(f"↪︎ 중단된 이동 저널 발견 → 마저 처리: {journal_path}")
+            stats = finish_journal(audio_dir, journal, journal_path)
+            print(f"  ✅ 이동 {stats['moved']}, 링크 {stats['linked']}, 보관 {stats['orphaned']}")
+
+    with open(old_path, "r", encoding="utf-8") as f:
+        old_items = json.load(f)
+    with open(new_path, "r", encoding="utf-8") as f:
+        new_items = json.load(f)
+
+    entries, unmatched = pair_entries(old_items, new_items, level, registry_path(new_path, level))
+    plan = build_plan(entries, audio_dir, args.legacy_owner)
+
+    reasons = defaultdict(int)
+    for why in plan["evidence"].values():
+        reasons[why] += 1
+    n_links = sum(len(m["dst"]) - 1 for m in plan["moves"])
+    print(f"🎯 {level}: 항목 {plan['entries']}개 중 영향 {plan['affected']}개, 폴더 {len(plan['folders'])}개"
+          + (f", 원본과 짝 없음 {len(unmatched)}개" if unmatched else ""))
+    print(f"🔎 기존 파일 {len(plan['evidence'])}개 확인"
+          + (": " + ", ".join(f"{k}={v}" for k, v in sorted(reasons.items())) if reasons else ""))
+    print(f"📦 이동 {len(plan['moves'])}개 (+링크 {n_links}), 보관(_orphans) {len(plan['orphans'])}개, "
+          f"합성 필요 {len(plan['missing'])}개")
+    for m in plan["moves"][:8]:
+        print(f"   {m['src']} → {', '.join(m['dst'])}")
+
+    report = args.report or f"{level}_disambiguation.json"
+    with open(report, "w", encoding="utf-8") as f:
+        json.dump(plan, f, ensure_ascii=False, indent=1)
+    missing_folders = sorted({m["folder"] for m in plan["missing"]})
+    missing_file = f"{level}_missing_folders.txt"
+    with open(missing_file, "w", encoding="utf-8") as f:
+        f.write("".join(x + "\n" for x in missing_folders))
+    print(f"   → {report}, {missing_file} ({len(missing_folders)}개 폴더)")
+
+    if not args.apply:
+        print("ℹ️ 계획만 출력했습니다. 실제 이동은 --apply")
+        return 0
+    stats = apply_plan(audio_dir, plan)
+    print(f"✅ 이동 {stats['moved']}, 링크 {stats['linked']}, 보관 {stats['orphaned']}")
+    if missing_folders:
+        print(f"👉 남은 합성: python jlpt/make_jlpt_audio.py {os.path.relpath(new_path)} --missing-only")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,18 @@
 """
 N1.json 파일의 중복된 romaji를 처리하여 N1_fixed.json을 생성하는 스크립트
 N2, N3, N4, N5와 동일한 방식으로 처리
+접미사는 romaji 폴더 등록부(n1_romaji_slugs.json, audio_common/romaji_slugs.py)에서 가져오므로
+항목 순서를 바꾸거나 동음이의어를 추가해도 기존 항목의 romaji/오디오 경로는 그대로입니다.
 """
 
 import json
+import os
 from collections import defaultdict
 import sys
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from audio_common.romaji_slugs import assign_slugs, registry_path
+
 def fix_duplicates_in_json(input_file, output_file):
     """JSON 파일의 중복된 romaji를 수정하여 새 파일로 저장"""
 
@@ -46,32 +52,34 @@ def fix_duplicates_in_json(input_file, output_file):
 
         print(f"📈 Total duplicated items: {total_duplicates}")
         print(f"📉 Unique items after fixing: {len(data)}")
-
-        # 중복 해결: 순차적 접미사 추가
-        for romaji, indices in duplicate_groups.items():
-            for i, idx in enumerate(indices):
-                if i == 0:
-                    # 첫 번째는 원본 유지
-                    continue
-                else:
-                    # 두 번째부터 접미사 추가
-                    new_romaji = f"{romaji}{i+1}"
-                    data[idx]['romaji'] = new_romaji
-
-                    # audio 경로도 수정
-                    if 'audio' in data[idx]:
-                        audio = data[idx]['audio']
-                        old_path_prefix = f"jlpt/n1/{romaji}/"
-                        new_path_prefix = f"jlpt/n1/{new_romaji}/"
-
-                        for key in ['word', 'gloss', 'example']:
-                            if key in audio and audio[key].startswith(old_path_prefix):
-                                audio[key] = audio[key].replace(old_path_prefix, new_path_prefix)
-
-        print("✅ Duplicates fixed!")
     else:
         print("✅ No duplicates found!")
 
+    # 중복 해결: 등록부 폴더(처음 만들 때는 순차적 접미사, 이후 새 항목만 빈 접미사)
+    # 지금은 중복이 아니어도 예전에 접미사를 받은 항목은 그 폴더를 유지하므로 전체 항목에 적용
+    slugs = assign_slugs(data, registry_path(input_file, "n1"))
+    renamed = 0
+    for idx, new_romaji in enumerate(slugs):
+        romaji = data[idx].get('romaji', '')
+        if not new_romaji or new_romaji == romaji.strip().lower():
+            # 원본 romaji 폴더를 쓰는 항목은 그대로
+            continue
+        data[idx]['romaji'] = new_romaji
+        renamed += 1
+
+        # audio 경로도 수정
+        if 'audio' in data[idx]:
+            audio = data[idx]['audio']
+            old_path_prefix = f"jlpt/n1/{romaji}/"
+            new_path_prefix = f"jlpt/n1/{new_romaji}/"
+
+            for key in ['word', 'gloss', 'example']:
+                if key in audio and audio[key].startswith(old_path_prefix):
+                    audio[key] = audio[key].replace(old_path_prefix, new_path_prefix)
+
+    if renamed:
+        print(f"✅ Duplicates fixed! ({renamed} items → suffixed folders)")
+
     # 수정된 데이터 저장
     print(f"💾 Writing {output_file}...")
     try:
@@ -3,10 +3,14 @@
 
 import json
 import os
+import sys
 from collections import defaultdict
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from audio_common.romaji_slugs import assign_slugs, registry_path
+
 def fix_n2_duplicates():
-    """N2.json의 중복 romaji를 처리하여 N2_fixed.json을 생성"""
+    """N2.json의 중복 romaji를 처리하여 N2_fixed.json을 생성 (접미사는 n2_romaji_slugs.json 등록부)"""
 
     input_file = "N2.json"
     output_file = "N2_fixed.json"
@@ -57,25 +61,23 @@ def fix_n2_duplicates():
             f.write("\n")
 
     # 중복 처리 및 수정된 데이터 생성
+    # 폴더는 등록부(lemma+kana+pos → 폴더)에서 가져옴: 처음 만들 때는 파일 순서 접미사,
+    # 이후에는 새 항목만 빈 접미사를 받고 기존 항목은 순서가 바뀌어도 그대로
     fixed_data = []
-    romaji_counters = defaultdict(int)
+    slugs = assign_slugs(data, registry_path(input_file, "n2"))
 
-    for item in data:
+    for item, slug in zip(data, slugs):
         original_romaji = item.get('romaji', '').strip()
         if not original_romaji:
             fixed_data.append(item)
             continue
 
-        # 카운터 증가
-        romaji_counters[original_romaji] += 1
-        current_count = romaji_counters[original_romaji]
-
         # 새 항목 생성 (딥카피)
         new_item = json.loads(json.dumps(item))
 
-        # 첫 번째 항목이 아니면 접미사 추가
-        if current_count > 1:
-            new_romaji = f"{original_romaji}{current_count}"
+        # 등록부 폴더가 원본 romaji와 다르면(동음이의어 접미사) 반영
+        if slug and slug != original_romaji.lower():
+            new_romaji = slug
             new_item['romaji'] = new_romaji
 
             # audio 경로도 수정
@@ -14,14 +14,37 @@ jlpt/n5/{romaji}/
 ├── word.mp3     (kana 읽기)
 ├── gloss.mp3    (kana + 한국어 뜻)
 └── example.mp3  (예문)
+동음이의어 폴더(romaji2, romaji3 …)는 등록부 jlpt/<레벨>_romaji_slugs.json (lemma+kana+pos → 폴더)
+에서 가져옴 → 항목 순서를 바꾸거나 새 항목을 넣어도 기존 항목의 폴더는 그대로
+(audio_common/romaji_slugs.py, ROMAJI_REGISTRY=0이면 예전 파일 순서 규칙)
 
 보이스:
 - 일본어: ja-JP-Chirp3-HD-Orus (남성), ja-JP-Chirp3-HD-Achernar (여성) 순환
 - 한국어 (gloss): ko-KR-Neural2-C (남성), ko-KR-Neural2-B (여성) 순환
+  (koGloss 쉼표 분할은 SSML <break> 요청 1회, GLOSS_SSML=0 이면 파트별 합성)
 - 한국어 (example): ko-KR-Chirp3-HD-Orus (남성), ko-KR-Chirp3-HD-Achernar (여성) 순환
+- 남/여 배정: VOICE_ASSIGN=index(순번 홀짝, 기본) / hash / table(<json>.voices.json)
+  hash/table은 lemma+kana 기준이라 N2.json에 항목을 넣고 빼도 다른 항목 보이스·키가 그대로
+  (audio_common/voice_assign.py)
+
+재사용:
+- 생성한 파일의 유효 입력 키(kana·보이스·뜻·간격)를 audio_manifest.json에 기록
+- 같은 키의 파일이 다른 레벨에 이미 있으면 합성하지 않고 하드링크 (AUDIO_REUSE=0이면 끔)
+  (audio_common/audio_reuse.py, 전체 계획/일괄 링크: python plan_audio_reuse.py)
+
+계획 모드(합성 없음, TTS/pydub import·인증 불필요):
+  python make_jlpt_audio.py N5.json --plan [--missing-only]
+  → (재)생성될 word/gloss/example 경로, 보이스 등급별 글자 수, 예상 시간 (audio_common/generation_plan.py)
+
+여러 머신에 나눠 생성 (audio_common/sharding.py, lemma+kana+pos 키 해시로 분할, SHARD_BALANCE=1이면 예상 글자 수 균형):
+  python make_jlpt_audio.py N2.json --shard 2/4 [--missing-only] [--plan]
+  → 모든 샤드가 끝나면 backend 폴더에서 python merge_shards.py
+워커 수를 실행 중에 바꾸려면 작업 큐 (audio_common/work_queue.py, 임대·하트비트·만료 재임대):
+  python jlpt/make_jlpt_audio.py jlpt/N2.json --queue   # 원하는 만큼 띄우고 아무 때나 종료 (python audio_queue.py status)
 
 필수: pip install google-cloud-texttospeech pydub, FFmpeg, GCP ADC 설정
 """
+from __future__ import annotations
 
 import os
 
@@ -31,8 +54,34 @@ import sys, re, json, time
 from io import BytesIO
 from typing import Any, Dict, List, Optional
 
-from google.cloud import texttospeech
-from pydub import AudioSegment
+# 공용 모듈(audio_common) 경로 등록
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from audio_common.text_normalize import PAREN_RE, normalize
+from audio_common.script_segment import segment
+from audio_common.audio_manifest import AUDIO_MANIFEST, AudioManifest
+from audio_common.audio_reuse import AUDIO_REUSE, ReuseIndex, jlpt_keys
+from audio_common.corpus_artifacts import Artifact, comma_calls, comma_parts
+from audio_common.generation_plan import GenerationPlan
+from audio_common.output_ladder import OutputLadder
+from audio_common.romaji_slugs import ROMAJI_REGISTRY, assign_slugs, item_identities, registry_path
+from audio_common.sharding import Shard, ShardRun, item_cost, pop_shard
+from audio_common.work_queue import open_run, pop_queue
+from audio_common.ssml import GLOSS_SSML, is_ssml_rejection, synthesize_comma_parts
+from audio_common.voice_assign import VOICE_ASSIGN, assign_males, item_key, voice_table_path
+
+# TTS/pydub는 합성을 시작할 때 import (load_tts_modules) - --plan은 네트워크·인증 없이 실행
+texttospeech = None
+AudioSegment = None
+
+
+def load_tts_modules() -> None:
+    global texttospeech, AudioSegment
+    if texttospeech is None:
+        from google.cloud import texttospeech as _texttospeech
+        from pydub import AudioSegment as _AudioSegment
+
+        texttospeech, AudioSegment = _texttospeech, _AudioSegment
+
 
 # ===== 파라미터 =====
 TARGET_DBFS = float(os.getenv("TARGET_DBFS", "-16.0"))
@@ -117,13 +166,10 @@ def loudness_normalize(seg: AudioSegment, target_dbfs: float) -> AudioSegment:
     return seg.apply_gain(target_dbfs - seg.dBFS)
 
 
-def build_output_paths(romaji: str, level: str = "n5", suffix: str = "") -> Dict[str, str]:
-    """JLPT 출력 경로 생성 (중복 처리 포함)"""
-    word_folder = sanitize_filename(romaji)
-    if suffix:
-        word_folder = f"{word_folder}{suffix}"
+def output_paths(folder: str, level: str = "n5") -> Dict[str, str]:
+    """JLPT 출력 경로 계산 (folder: 등록부의 romaji 폴더 - 동음이의어 접미사 포함, 폴더 생성 없음 - --plan 용)"""
+    word_folder = sanitize_filename(folder)
     out_dir = os.path.normpath(os.path.join("jlpt", level, word_folder))
-    os.makedirs(out_dir, exist_ok=True)
     return {
         "dir": out_dir,
         "word": os.path.join(out_dir, "word.mp3"),
@@ -132,52 +178,21 @@ def build_output_paths(romaji: str, level: str = "n5", suffix: str = "") -> Dict
     }
 
 
-def clean_ko_gloss(text: str) -> str:
-    """한국어 뜻 전처리 - 괄호 및 괄호 내용 완전 제거"""
-    if not text:
-        return ""
-    s = normalize_spaces(text)
-
-    # 물결 표시(~)를 '무엇무엇'으로 치환
-    s = s.replace("~", "무엇무엇")
-
-    # 괄호 및 괄호 안의 내용 완전히 제거
-    s = re.sub(r"[（(][^）)]*[）)]", "", s)
-
-    # 품사 약어 제거 (영어, 한국어 품사 표시 모두)
-    s = re.sub(
-        r"\b(?:pron|n|v|adj|adv|prep|conj|int|interj|aux|det|num)\.\s*",
-        "",
-        s,
-        flags=re.I,
-    )
-    # 한국어 품사 표시 제거 (명사, 동사, 형용사, 부사, 감탄사 등)
-    s = re.sub(
-        r"\b(?:명사|동사|형용사|부사|감탄사|대명사|전치사|접속사|조동사|관사|수사)\.\s*",
-        "",
-        s,
-    )
+def build_output_paths(folder: str, level: str = "n5") -> Dict[str, str]:
+    """JLPT 출력 경로 생성 (중복 처리 포함)"""
+    paths = output_paths(folder, level)
+    os.makedirs(paths["dir"], exist_ok=True)
+    return paths
 
-    # 특수문자 제거 (슬래시 등)
-    s = re.sub(r"[/\\|<>\"']", " ", s)
 
-    s = normalize_spaces(s).strip(" ;,·")
-    return s
+def clean_ko_gloss(text: str) -> str:
+    """한국어 뜻 전처리 - 괄호 및 괄호 내용 완전 제거 (text_normalize 'jlpt_gloss' 프로필)"""
+    return normalize("jlpt_gloss", text)
 
 
 def clean_japanese_text(text: str) -> str:
-    """일본어 텍스트 정리 - 특수문자 및 괄호 처리"""
-    if not text:
-        return ""
-    s = normalize_spaces(text)
-
-    # 괄호와 괄호 안의 내용 제거 (일본어 포함)
-    s = re.sub(r"[（(][^）)]*[）)]", "", s)
-
-    # 특수문자 제거 (슬래시 등)
-    s = re.sub(r"[/\\|<>\"']", " ", s)
-
-    return normalize_spaces(s)
+    """일본어 텍스트 정리 - 특수문자 및 괄호 처리 (text_normalize 'ja_text' 프로필)"""
+    return normalize("ja_text", text)
 
 
 # ===== 성별 순환 =====
@@ -185,9 +200,15 @@ def is_male(index_zero_based: int) -> bool:
     return index_zero_based % 2 == 0  # 0,2,4,... 남성 / 1,3,5,... 여성
 
 
-def voices_for_index(idx0: int) -> Dict[str, str]:
-    """인덱스별 보이스 선택"""
-    if is_male(idx0):
+def item_males(items: List[Dict[str, Any]], json_path: str, save: bool = True) -> List[bool]:
+    """항목별 남성 여부 (VOICE_ASSIGN: index=순번 홀짝, hash/table=lemma+kana 기준 - 삽입·삭제에 안정)"""
+    keys = [item_key(it.get("lemma", ""), it.get("kana", "")) for it in items]
+    return assign_males(keys, table_path=voice_table_path(json_path), save=save)
+
+
+def voices_for_index(idx0: int, male: Optional[bool] = None) -> Dict[str, str]:
+    """인덱스별 보이스 선택 (male을 주면 순번 대신 그 값 - item_males)"""
+    if is_male(idx0) if male is None else male:
         return {
             "ja": JA_MALE,
             "ko_neural": KO_NEURAL_MALE,  # gloss용
@@ -205,11 +226,16 @@ def voices_for_index(idx0: int) -> Dict[str, str]:
 
 # ===== TTS =====
 def tts_client() -> texttospeech.TextToSpeechClient:
+    load_tts_modules()
     return texttospeech.TextToSpeechClient()
 
 
 def synthesize_lang(
-    tts: texttospeech.TextToSpeechClient, text: str, voice_name: str, language_code: str
+    tts: texttospeech.TextToSpeechClient,
+    text: str,
+    voice_name: str,
+    language_code: str,
+    ssml: bool = False,
 ) -> Optional[AudioSegment]:
     """단일 언어 TTS 합성"""
     text = normalize_spaces(text)
@@ -220,7 +246,7 @@ def synthesize_lang(
         language_code=language_code, name=voice_name
     )
     cfg = texttospeech.AudioConfig(audio_encoding=texttospeech.AudioEncoding.MP3)
-    inp = texttospeech.SynthesisInput(text=text)
+    inp = texttospeech.SynthesisInput(ssml=text) if ssml else texttospeech.SynthesisInput(text=text)
 
     for attempt in range(1, MAX_RETRY + 2):
         try:
@@ -228,6 +254,8 @@ def synthesize_lang(
             seg = AudioSegment.from_file(BytesIO(resp.audio_content), format="mp3")
             return loudness_normalize(seg, TARGET_DBFS)
         except Exception as e:
+            if ssml and is_ssml_rejection(e):
+                raise  # 재시도해도 같은 결과 - 호출 쪽에서 보이스를 기록하고 파트별 합성
             if attempt <= MAX_RETRY:
                 time.sleep(RETRY_BACKOFF_SEC * attempt)
             else:
@@ -260,34 +288,19 @@ def synthesize_with_commas_try_voices(
     comma_gap_ms: int,
     voices: List[str],
 ) -> Optional[AudioSegment]:
-    """쉼표 분할 합성"""
-    text = normalize_spaces(text)
-    if not text:
-        return AudioSegment.silent(duration=0)
-
-    parts = [p.strip() for p in re.split(r"[,\uFF0C]", text) if p.strip()]
-
-    for idx_voice, vname in enumerate([v for v in voices if v]):
-        silence = AudioSegment.silent(duration=comma_gap_ms)
-        merged = AudioSegment.empty()
-        ok = True
-
-        for idx, part in enumerate(parts):
-            seg = synthesize_lang(tts, part, vname, language_code)
-            if seg is None or len(seg) == 0:
-                ok = False
-                break
-            merged += seg
-            if idx != len(parts) - 1:
-                merged += silence
-
-        if ok:
-            if idx_voice > 0:
-                print(f"  ↪︎ 대체 보이스 사용: {vname}")
-            return loudness_normalize(merged, TARGET_DBFS)
+    """쉼표 분할 합성: 보이스 후보 순서대로 (audio_common.ssml.synthesize_comma_parts)"""
+    seg = synthesize_comma_parts(
+        normalize_spaces(text),
+        voices,
+        lambda t, vname, ssml: synthesize_lang(tts, t, vname, language_code, ssml=ssml),
+        lambda ms: AudioSegment.silent(duration=ms),
+        comma_gap_ms,
+        finish=lambda merged: loudness_normalize(merged, TARGET_DBFS),
+    )
+    if seg is None:
+        print(f"  ❌ 쉼표 분할 합성 실패: {', '.join(voices)}")
+    return seg
 
-    print(f"  ❌ 쉼표 분할 합성 실패: {', '.join(voices)}")
-    return None
 
 
 # ===== IO =====
@@ -303,53 +316,14 @@ def ensure_parent_dir(path: str) -> None:
         os.makedirs(d, exist_ok=True)
 
 
-def is_japanese_char(char: str) -> bool:
-    """일본어 문자인지 판별 (히라가나, 가타카나, 한자)"""
-    code = ord(char)
-    return (
-        0x3040 <= code <= 0x309F  # 히라가나
-        or 0x30A0 <= code <= 0x30FF  # 가타카나
-        or 0x4E00 <= code <= 0x9FAF  # CJK 한자
-        or 0x3400 <= code <= 0x4DBF
-    )  # CJK 확장 A
-
-
 def split_mixed_text(text: str) -> List[tuple]:
-    """일본어/한국어 혼합 텍스트를 분리하여 (언어, 텍스트) 튜플 리스트로 반환"""
+    """일본어/한국어 혼합 텍스트를 분리하여 (언어, 텍스트) 튜플 리스트로 반환 (script_segment 'ja_ko' 프로필)"""
     if not text:
         return []
 
     # 모든 괄호와 괄호 안의 내용을 완전히 제거
-    processed_text = re.sub(r"[（(][^）)]*[）)]", "", text)
-
-    segments = []
-    current_text = ""
-    current_lang = None
-
-    for char in processed_text:
-        if char.strip():  # 공백이 아닌 경우만
-            is_ja = is_japanese_char(char)
-            lang = "ja" if is_ja else "ko"
-
-            if current_lang is None:
-                current_lang = lang
-                current_text = char
-            elif current_lang == lang:
-                current_text += char
-            else:
-                # 언어가 바뀜 - 이전 세그먼트 저장
-                if current_text.strip():
-                    segments.append((current_lang, current_text.strip()))
-                current_lang = lang
-                current_text = char
-        else:
-            current_text += char  # 공백은 그대로 추가
-
-    # 마지막 세그먼트 저장
-    if current_text.strip():
-        segments.append((current_lang, current_text.strip()))
-
-    return segments
+    processed_text = PAREN_RE.sub("", text)
+    return segment("ja_ko", processed_text)
 
 
 def synthesize_mixed_script(
@@ -400,7 +374,105 @@ def extract_level_from_filename(json_path: str) -> str:
     match = re.search(r'(?:jlpt_?)?([nN][1-5])', filename, re.IGNORECASE)
     return match.group(1).lower() if match else "n5"
 
-def process(json_path: str, missing_only: bool = False) -> None:
+def load_missing_romajis(level: str) -> set:
+    """{level}_missing_folders.txt → 처리할 폴더명 집합 (없으면 빈 집합)"""
+    missing_file = f"{level}_missing_folders.txt"
+    if not os.path.exists(missing_file):
+        return set()
+    with open(missing_file, "r", encoding="utf-8") as f:
+        return set(line.strip().lower() for line in f if line.strip())
+
+
+def shard_run(items: List[Dict[str, Any]], json_path: str, shard: Optional[Shard],
+              queue: Optional[str] = None) -> ShardRun:
+    """--shard 분할 / --queue 작업 (키=등록부 식별자 lemma|kana|pos, 비용=kana+뜻+예문 글자 수와 요청 수)"""
+    costs = []
+    for it in items:
+        gloss = it.get("koGloss", "") or it.get("koChirpScript", "")
+        script = it.get("koChirpScript", "")
+        costs.append(item_cost(len(it.get("kana", "")) + len(gloss) + len(script), 1 + bool(gloss) + bool(script)))
+    return open_run("make_jlpt_audio", json_path, item_identities(items), costs, shard=shard, queue=queue)
+
+
+def example_artifact(path: str, key: str, script: str, v: Dict[str, str], ref: str) -> Artifact:
+    """example.mp3 합성 단위 (synthesize_mixed_script와 같은 분할/정리)"""
+    calls, parts = 0, []
+    for lang, text in split_mixed_text(script):
+        if lang == "ja":
+            calls += 1
+            parts.append((v["ja"], "ja", clean_japanese_text(text)))
+        else:
+            cleaned = clean_ko_gloss(text)
+            calls += comma_calls(cleaned, v["ko_chirp"])
+            parts += [(v["ko_chirp"], "ko", p) for p in comma_parts(cleaned)]
+    return Artifact(path, key, max(calls, 1), ref, tuple(parts))
+
+
+# ===== 계획 모드 =====
+def plan(json_path: str, missing_only: bool = False, shard: Optional[Shard] = None) -> None:
+    """합성 없이 process()와 같은 규칙(중복 romaji 접미사, 건너뛰기)으로 산출물을 만들고 기존 출력과 비교"""
+    started = time.time()
+    try:
+        items = load_items(json_path)
+    except Exception as e:
+        print(f"JSON 로드 실패: {e}")
+        return
+    level = extract_level_from_filename(json_path)
+    missing_romajis = load_missing_romajis(level) if missing_only else set()
+    reuse = (
+        ReuseIndex.scan([os.path.join("jlpt", f"n{n}") for n in range(1, 6)])
+        if AUDIO_REUSE and AUDIO_MANIFEST else None
+    )
+    gp = GenerationPlan(reuse)
+    try:
+        males = item_males(items, json_path, save=False)
+        slugs = assign_slugs(items, registry_path(json_path, level), save=False)
+    except ValueError as e:
+        print(f"보이스 배정 실패(VOICE_ASSIGN={VOICE_ASSIGN}): {e}")
+        return
+    run = shard_run(items, json_path, shard)
+    print(f"📋 계획 모드 (items={len(items)}, level={level}{', missing-only' if missing_only else ''}, "
+          f"shard: {run.banner()})")
+
+    for i, item in enumerate(items):
+        if i not in run:
+            continue
+        lemma, kana, romaji = item.get("lemma", ""), item.get("kana", ""), item.get("romaji", "")
+        ref = f"{i+1}/{romaji}"
+        if not lemma or not kana or not romaji:
+            gp.skip(ref, "필수 필드 누락")
+            continue
+        paths = output_paths(slugs[i], level)
+        ko_gloss_raw = item.get("koGloss", "") or item.get("koChirpScript", "")
+        if missing_only:
+            if slugs[i] not in missing_romajis:
+                gp.skip(ref, "누락 목록에 없음")
+                continue
+        elif os.path.exists(paths["dir"]):
+            has_word = os.path.exists(paths["word"])
+            has_gloss = os.path.exists(paths["gloss"]) if ko_gloss_raw else True
+            has_example = os.path.exists(paths["example"]) if item.get("koChirpScript", "") else True
+            if has_word and has_gloss and has_example:
+                gp.skip(ref, f"현재 {level} 폴더에 이미 존재")
+                continue
+
+        v = voices_for_index(i, males[i])
+        ko_gloss = clean_ko_gloss(ko_gloss_raw)
+        script = item.get("koChirpScript", "")
+        keys = jlpt_keys(v, kana, ko_gloss, script, TARGET_DBFS, GLOSS_GAP_MS, COMMA_GAP_MS)
+        word = ((v["ja"], "ja", normalize_spaces(kana)),)
+        arts = [Artifact(paths["word"], keys["word"], 1, ref, word)]
+        if ko_gloss:
+            ko = tuple((v["ko_neural"], "ko", p) for p in comma_parts(ko_gloss))
+            arts.append(Artifact(paths["gloss"], keys["gloss"], comma_calls(ko_gloss, v["ko_neural"]), ref, word + ko))
+        if script:
+            arts.append(example_artifact(paths["example"], keys["example"], script, v, ref))
+        gp.add(ref, arts)
+    gp.report(started)
+
+
+def process(json_path: str, missing_only: bool = False, shard: Optional[Shard] = None,
+            queue: Optional[str] = None) -> None:
     try:
         items = load_items(json_path)
     except Exception as e:
@@ -413,8 +485,7 @@ def process(json_path: str, missing_only: bool = False) -> None:
     missing_romajis = set()
     missing_file = f"{level}_missing_folders.txt"
     if missing_only and os.path.exists(missing_file):
-        with open(missing_file, "r", encoding="utf-8") as f:
-            missing_romajis = set(line.strip().lower() for line in f if line.strip())
+        missing_romajis = load_missing_romajis(level)
         print(f"📌 누락된 항목 {len(missing_romajis)}개만 처리 모드 ({missing_file})")
 
     try:
@@ -423,12 +494,46 @@ def process(json_path: str, missing_only: bool = False) -> None:
         print("Google Cloud 인증 실패 또는 클라이언트 생성 실패:", e)
         return
 
+    # 해시-온-라이트 매니페스트 (레벨별 audio_manifest.json → sync_audio.py 차등 업로드)
+    try:
+        run = shard_run(items, json_path, shard, queue)
+    except Exception as e:
+        print(f"작업 큐/샤드 준비 실패: {e}")
+        return
+    manifest = AudioManifest(level_depth=2, shard=run.tag)
+    # 레벨 간 재사용: 같은 kana/보이스/뜻의 기존 파일(다른 레벨 포함)이 있으면 하드링크 (합성 생략)
+    reuse = (
+        ReuseIndex.scan([os.path.join("jlpt", f"n{n}") for n in range(1, 6)])
+        if AUDIO_REUSE and manifest.enabled else None
+    )
+
+    try:
+        males = item_males(items, json_path)
+    except Exception as e:
+        print(f"보이스 배정 실패(VOICE_ASSIGN={VOICE_ASSIGN}): {e}")
+        return
+    # 동음이의어 폴더: 등록부(항목 식별자 → 폴더)에서 가져오고 새 항목만 추가 기록
+    try:
+        slugs = assign_slugs(items, registry_path(json_path, level))
+    except Exception as e:
+        print(f"romaji 폴더 등록부 읽기/쓰기 실패({registry_path(json_path, level)}): {e}")
+        return
+
+    # 멀티 코덱 래더 (AUDIO_LADDER 설정 시 PCM 마스터 → Opus/AAC/저비트레이트 MP3)
+    # - 준비 단계의 조기 반환이 모두 끝난 뒤 생성 (close 안 된 프로세스 풀이 남지 않게)
+    ladder = OutputLadder(level_depth=2)
+
     total = len(items)
     print(f"🎧 JLPT 오디오 생성 시작 (items={total}, level={level})")
     print(f"    JA: male={JA_MALE}, female={JA_FEMALE}")
     print(f"    KO(gloss): male={KO_NEURAL_MALE}, female={KO_NEURAL_FEMALE}")
     print(f"    KO(example): male={KO_CHIRP_MALE}, female={KO_CHIRP_FEMALE}")
-    print(f"    gaps: gloss={GLOSS_GAP_MS}ms, comma={COMMA_GAP_MS}ms")
+    print(f"    voice assign: {VOICE_ASSIGN}, "
+          f"folders: {'registry ' + registry_path(json_path, level) if ROMAJI_REGISTRY else 'file order'}, "
+          f"shard: {run.banner()}")
+    print(f"    gaps: gloss={GLOSS_GAP_MS}ms, comma={COMMA_GAP_MS}ms, ssml={'on' if GLOSS_SSML else 'off'}")
+    print(f"    ladder: {','.join(ladder.variants) or 'off'}, manifest: {'on' if manifest.enabled else 'off'}, "
+          f"reuse: {'on (%d keys)' % len(reuse) if reuse is not None else 'off'}")
     print(
         "📝 모드: word=ja-JP(Chirp3 HD), gloss=ja-JP(Chirp3)+ko-KR(Neural2), example=ja-JP(Chirp3)+ko-KR(Chirp3), 성별 순환(남→여→남…)\n"
     )
@@ -436,10 +541,8 @@ def process(json_path: str, missing_only: bool = False) -> None:
     last_saved: Optional[str] = None
     fails: List[str] = []
 
-    # 중복 romaji 처리를 위한 카운터
-    romaji_counter = {}
-
-    for i, item in enumerate(items):
+    for i in run.indices(fails):
+        item = items[i]
         lemma = item.get("lemma", "")
         kana = item.get("kana", "")
         romaji = item.get("romaji", "")
@@ -453,18 +556,9 @@ def process(json_path: str, missing_only: bool = False) -> None:
             )
             continue
 
-        # 중복 romaji 처리 - 순서대로 접미사 추가
-        romaji_base = romaji.lower().strip()
-        if romaji_base in romaji_counter:
-            romaji_counter[romaji_base] += 1
-            suffix = str(romaji_counter[romaji_base])
-        else:
-            romaji_counter[romaji_base] = 1
-            suffix = ""
-
-        # 출력 경로 생성 (중복 시 접미사 포함)
+        # 출력 경로 생성 (등록부 폴더 - 동음이의어는 접미사 포함)
         try:
-            paths = build_output_paths(romaji, level, suffix)
+            paths = build_output_paths(slugs[i], level)
         except Exception as e:
             print(f"[{i+1}/{total}] '{romaji}' 경로 오류: {e}")
             fails.append(f"{romaji}\tPATH_ERROR:{e}")
@@ -472,9 +566,8 @@ def process(json_path: str, missing_only: bool = False) -> None:
 
         # 누락된 항목만 처리 모드인 경우
         if missing_only:
-            # suffix가 포함된 폴더명으로 확인
-            folder_name = sanitize_filename(romaji) + suffix if suffix else sanitize_filename(romaji)
-            if folder_name not in missing_romajis:
+            # 접미사가 포함된 폴더명으로 확인
+            if slugs[i] not in missing_romajis:
                 continue  # 누락 목록에 없으면 건너뛰기
 
         # 일반 모드: 현재 처리 중인 레벨 폴더 내에만 있는 경우 건너뛰기
@@ -485,14 +578,30 @@ def process(json_path: str, missing_only: bool = False) -> None:
 
             if has_word and has_gloss and has_example:
                 print(f"[{i+1}/{total}] '{lemma}({kana})' → 현재 {level} 폴더에 이미 존재, 건너뜀")
+                run.count("exists")
                 continue
 
-        v = voices_for_index(i)
+        v = voices_for_index(i, males[i])
         print(
             f"[{i+1}/{total}] '{lemma}({kana})' → dir='{paths['dir']}', "
             f"ja={v['ja']}, ko_gloss={v['ko_neural']}, ko_example={v['ko_chirp']} (gender={v['gender']})"
         )
 
+        ko_gloss = clean_ko_gloss(ko_gloss_raw)
+        ko_chirp_script = item.get("koChirpScript", "")
+        keys = jlpt_keys(v, kana, ko_gloss, ko_chirp_script, TARGET_DBFS, GLOSS_GAP_MS, COMMA_GAP_MS)
+        wkey, gkey, ekey = keys["word"], keys["gloss"], keys["example"]
+        if reuse is not None and reuse.link_all(
+            manifest,
+            {paths["word"]: wkey, paths["gloss"]: gkey, paths["example"]: ekey},
+            {os.path.normpath(audio_paths[k]): key for k, key in (("word", wkey), ("gloss", gkey), ("example", ekey))
+             if audio_paths.get(k)},
+        ):
+            print("  🔗 같은 입력의 기존 파일 재사용(하드링크) → 합성 생략")
+            run.count("reused")
+            last_saved = romaji
+            continue
+
         # 1) word.mp3 (일본어 kana - Chirp3)
         ja_candidates = [v["ja"]] + (
             JA_MALE_FALLBACKS if v["gender"] == "male" else JA_FEMALE_FALLBACKS
@@ -505,7 +614,11 @@ def process(json_path: str, missing_only: bool = False) -> None:
             continue
 
         try:
-            word_seg.export(paths["word"], format="mp3")
+            entry = manifest.export(word_seg, paths["word"], key=wkey, voice=v["ja"])
+            if reuse is not None:
+                reuse.add(wkey, paths["word"], entry)
+            ladder.add(word_seg, paths["word"])
+            run.count("word")
             print("  ✅ word.mp3 저장")
 
             # 추가 저장: audio.word (옵션)
@@ -520,7 +633,6 @@ def process(json_path: str, missing_only: bool = False) -> None:
             continue
 
         # 2) gloss.mp3 = kana(Chirp3) + 무음 + koGloss(Neural2)
-        ko_gloss = clean_ko_gloss(ko_gloss_raw)
         if ko_gloss:
             # gloss용 Neural2 보이스 사용
             ko_neural_candidates = [v["ko_neural"]] + (
@@ -537,7 +649,12 @@ def process(json_path: str, missing_only: bool = False) -> None:
                 gloss_seg = loudness_normalize(gloss_seg, TARGET_DBFS)
 
                 try:
-                    gloss_seg.export(paths["gloss"], format="mp3")
+                    entry = manifest.export(gloss_seg, paths["gloss"], key=gkey,
+                                            voice=f"{v['ja']}+{v['ko_neural']}")
+                    if reuse is not None:
+                        reuse.add(gkey, paths["gloss"], entry)
+                    ladder.add(gloss_seg, paths["gloss"])
+                    run.count("gloss")
                     print("  ✅ gloss.mp3 저장 (Neural2)")
 
                     # 추가 저장: audio.gloss (옵션)
@@ -556,7 +673,6 @@ def process(json_path: str, missing_only: bool = False) -> None:
             print("  ⚠️ koGloss 비어있음 → gloss 생략")
 
         # 3) example.mp3 (koChirpScript - 일본어 Chirp3 / 한국어 Chirp3 분리 합성)
-        ko_chirp_script = item.get("koChirpScript", "")
         if ko_chirp_script:
             # example용 Chirp3 보이스 사용
             ko_chirp_candidates = [v["ko_chirp"]] + (
@@ -568,7 +684,12 @@ def process(json_path: str, missing_only: bool = False) -> None:
 
             if example_seg is not None and len(example_seg) > 0:
                 try:
-                    example_seg.export(paths["example"], format="mp3")
+                    entry = manifest.export(example_seg, paths["example"], key=ekey,
+                                            voice=f"{v['ja']}+{v['ko_chirp']}")
+                    if reuse is not None:
+                        reuse.add(ekey, paths["example"], entry)
+                    ladder.add(example_seg, paths["example"])
+                    run.count("example")
                     print("  ✅ example.mp3 저장 (koChirpScript - Chirp3 혼합)")
 
                     # 추가 저장: audio.example (옵션)
@@ -588,22 +709,42 @@ def process(json_path: str, missing_only: bool = False) -> None:
 
         last_saved = romaji
 
+    ladder.close()
+    manifests = manifest.close()
+    if reuse is not None and reuse.links:
+        print(f"🔗 재사용(하드링크) {reuse.links}개")
+
     # 마무리
     try:
-        with open("마지막 생성 단어.txt", "w", encoding="utf-8") as f:
+        with open(run.local_name("마지막 생성 단어.txt"), "w", encoding="utf-8") as f:
             f.write((last_saved or "").strip())
     except Exception:
         pass
 
     if fails:
-        with open("생성 실패 목록.txt", "w", encoding="utf-8") as f:
+        fail_file = run.local_name("생성 실패 목록.txt")
+        with open(fail_file, "w", encoding="utf-8") as f:
             f.write("\n".join(fails) + "\n")
-        print(f"\n⚠️ 실패 {len(fails)}건 → '생성 실패 목록.txt' 기록")
+        print(f"\n⚠️ 실패 {len(fails)}건 → '{fail_file}' 기록")
     else:
         print("\n✅ 모든 항목 처리 완료(실패 없음)")
+    run.finish(fails, manifests)
 
 
 if __name__ == "__main__":
-    json_file = sys.argv[1] if len(sys.argv) > 1 else "N4.json"
-    missing_only = "--missing-only" in sys.argv
-    process(json_file, missing_only=missing_only)
\ No newline at end of file
+    if {"-h", "--help"} & set(sys.argv[1:]):
+        print(__doc__)  # 사용법은 모듈 docstring
+        sys.exit(0)
+    try:
+        shard, argv = pop_shard(sys.argv[1:])
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    queue, argv = pop_queue(argv)
+    args = [a for a in argv if not a.startswith("--")]
+    json_file = args[0] if args else "N4.json"
+    missing_only = "--missing-only" in argv
+    if "--plan" in argv:
+        plan(json_file, missing_only=missing_only, shard=shard)
+    else:
+        process(json_file, missing_only=missing_only, shard=shard, queue=queue)
\ No newline at end of file
@@ -23,6 +23,7 @@ from pathlib import Path
 
 # make_jlpt_audio.py 모듈 import
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import make_jlpt_audio
 from make_jlpt_audio import (
     tts_client,
     voices_for_index,
@@ -32,7 +33,6 @@ from make_jlpt_audio import (
     clean_ko_gloss,
     clean_japanese_text,
     loudness_normalize,
-    AudioSegment,
     TARGET_DBFS,
     GLOSS_GAP_MS,
     COMMA_GAP_MS,
@@ -150,7 +150,9 @@ def generate_audio_for_folder(folder_name: str, item: dict, index: int, tts, for
         )
 
         if ko_seg and len(ko_seg) > 0:
-            gloss_seg = word_seg + AudioSegment.silent(duration=GLOSS_GAP_MS) + ko_seg
+            # AudioSegment는 load_tts_modules()가 make_jlpt_audio 모듈 전역에만 바인딩한다
+            gap = make_jlpt_audio.AudioSegment.silent(duration=GLOSS_GAP_MS)
+            gloss_seg = word_seg + gap + ko_seg
             gloss_seg = loudness_normalize(gloss_seg, TARGET_DBFS)
 
             try:
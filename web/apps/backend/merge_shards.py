@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+샤드 실행 결과 병합 (--shard i/N, audio_common/sharding.py)
+
+여러 머신에서 같은 생성기를 --shard 1/N … N/N 으로 돌린 뒤, 각 머신의 _shards/ 와 출력 폴더를
+한 작업 트리로 모으고 실행합니다 (출력 경로는 샤드끼리 겹치지 않으므로 그대로 합치면 됨).
+
+실행(_shards/<생성기>.<데이터셋>/)마다
+  1) 샤드 보고서 <i>of<N>.json 확인: 1..N 모두 있는지, 같은 분할 지문(같은 데이터셋 버전)인지
+  2) 각 레벨 폴더의 샤드 매니페스트(audio_manifest.shard-*.json)를 audio_manifest.json에 병합
+     - 같은 파일이 두 샤드에 서로 다른 내용으로 기록돼 있으면 충돌로 보고 (분할이 맞으면 없음)
+     - 병합한 샤드 매니페스트는 삭제 (--keep이면 남김)
+  3) 실패 목록을 하나로(failures.txt), 지표를 합산해 report.json 으로 저장
+     - 샤드별 항목 수/예상 비용/경과 시간과 불균형(최대/평균)을 출력
+
+카탈로그(audio_catalog.sqlite)와 래더 요약(ladder_summary.json)은 머신별이므로 병합 뒤
+python catalog_audio.py build / python encode_ladder.py 로 다시 맞춥니다.
+
+작업 큐(--queue, audio_common/work_queue.py) 워커 보고서(w-<워커>.json)도 같은 방식으로 병합하며,
+이때는 샤드 번호 대신 큐 상태로 완료를 확인합니다 (대기/임대 작업이 남았으면 미완료).
+
+샤드가 빠졌거나 지문이 다르면 그 실행의 매니페스트는 병합하지 않습니다 (--partial이면 있는 것만 병합).
+
+사용 (backend 폴더에서):
+  python merge_shards.py                                  # _shards/ 아래 모든 실행
+  python merge_shards.py _shards/make_jlpt_audio.N1 --keep
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Tuple
+
+from audio_common.audio_manifest import load_manifest, same_content, save_manifest
+from audio_common.sharding import SHARD_DIR, load_reports
+from audio_common.work_queue import open_backend
+
+
+def merge_manifests(reports: List[Dict[str, Any]], keep: bool) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+    """샤드 매니페스트 → 레벨별 audio_manifest.json → (레벨별 병합 항목 수, 충돌)"""
+    by_level: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+    for r in reports:
+        for path in r.get("manifests", []):
+            by_level[os.path.dirname(path) or "."].append((r["shard"], path))
+
+    merged: Dict[str, int] = {}
+    conflicts: List[Dict[str, Any]] = []
+    for level, shard_files in sorted(by_level.items()):
+        files = load_manifest(level)
+        owner: Dict[str, str] = {}
+        n = 0
+        for shard, path in shard_files:
+            if not os.path.exists(path):
+                print(f"  ⚠️ 샤드 매니페스트 없음: {path} (출력 폴더를 모았는지 확인)")
+                continue
+            for rel, entry in load_manifest(level, os.path.basename(path)).items():
+                if rel in owner and not same_content(files.get(rel), entry):
+                    conflicts.append({"level": level, "path": rel, "shards": [owner[rel], shard]})
+                owner[rel] = shard
+                files[rel] = entry
+                n += 1
+        save_manifest(level, files)
+        merged[level] = n
+        if not keep:
+            for _, path in shard_files:
+                if os.path.exists(path):
+                    os.remove(path)
+    return merged, conflicts
+
+
+def check_reports(reports: List[Dict[str, Any]], name: str) -> List[str]:
+    problems = []
+    shards = [r for r in reports if r.get("count")]
+    counts = {r["count"] for r in shards}
+    if len(counts) > 1:
+        problems.append(f"샤드 수가 다른 보고서가 섞여 있음: {sorted(counts)}")
+    if shards:
+        n = max(counts)
+        missing = sorted(set(range(1, n + 1)) - {r["index"] for r in shards})
+        if missing:
+            problems.append(f"빠진 샤드: {', '.join(f'{i}/{n}' for i in missing)}")
+    for url in sorted({r["queue"] for r in reports if r.get("queue")}):
+        try:
+            c = open_backend(url).counts(name)
+        except Exception as e:
+            problems.append(f"작업 큐 확인 실패({url}): {e}")
+            continue
+        left = c["pending"] + c["leased"] + c["expired"]
+        if left:
+            problems.append(f"작업 큐에 남은 작업 {left}개 (대기 {c['pending']}, 임대 {c['leased']}, "
+                            f"만료 {c['expired']}) - {url}")
+    modes = {r.get("partition") or "balance" for r in shards}
+    if len(modes) > 1:
+        problems.append(f"분할 방식이 다른 샤드가 섞여 있음(SHARD_BALANCE): {sorted(modes)}")
+    prints = {r["fingerprint"] for r in reports}
+    if len(prints) > 1:
+        problems.append(f"분할 지문이 다름(데이터셋 버전이 다른 샤드): {sorted(prints)}")
+    return problems
+
+
+def lost_jobs(reports: List[Dict[str, Any]], name: str) -> List[str]:
+    """작업 큐에서 워커가 끝내지 못하고 failed가 된 작업 (임대 횟수 초과 - 워커 보고서의 실패 목록에 없음)"""
+    out = []
+    urls = sorted({r["queue"] for r in reports if r.get("queue")})
+    finished = 0
+    for url in urls:
+        try:
+            backend = open_backend(url)
+            c = backend.counts(name)
+            out += [f"{key}\tQUEUE_{err}" for key, err in backend.failures(name)
+                    if err.startswith("lease expired")]
+        except Exception:
+            continue  # check_reports에서 보고
+        finished += c["done"] + c["failed"]
+    unreported = finished - len(out) - sum(r["items"] for r in reports if r.get("queue"))
+    if urls and unreported > 0:
+        # 보고서를 남기기 전에 죽은 워커가 끝낸 작업 - 파일은 있고 매니페스트 항목만 없음
+        print(f"  ℹ️ 보고서 없이 끝난 워커의 완료 작업 {unreported}개 → 매니페스트 항목은 sync_audio.py가 다시 해시")
+    return out
+
+
+def merge_run(directory: str, keep: bool, partial: bool) -> Dict[str, Any]:
+    reports = load_reports(directory)
+    if not reports:
+        return {}
+    name = os.path.basename(os.path.normpath(directory))
+    problems = check_reports(reports, name)
+    n_shards = max((r["count"] for r in reports if r.get("count")), default=0)
+    print(f"🧩 {name}: " + (f"샤드 {len(reports)}/{n_shards}개" if n_shards else f"큐 워커 {len(reports)}개"))
+    for p in problems:
+        print(f"  ⚠️ {p}")
+
+    for r in reports:
+        print(f"   {r['shard']:>5}  항목 {r['items']:>6}  예상 {r['cost']:>12,.0f}  "
+              f"{r['elapsed_sec']:>8.1f}s  실패 {len(r['fails'])}")
+    costs = [r["cost"] for r in reports]
+    elapsed = [r["elapsed_sec"] for r in reports]
+    balance = {
+        "cost_max_over_mean": round(max(costs) / (sum(costs) / len(costs)), 3) if sum(costs) else None,
+        "elapsed_max_over_mean": round(max(elapsed) / (sum(elapsed) / len(elapsed)), 3) if sum(elapsed) else None,
+    }
+    print(f"   불균형(최대/평균): 예상 비용 {balance['cost_max_over_mean']}, 경과 시간 {balance['elapsed_max_over_mean']}")
+
+    merged, conflicts = {}, []
+    if problems and not partial:
+        print("  ⏭️ 매니페스트 병합 건너뜀 (모든 샤드가 같은 지문으로 끝난 뒤 다시 실행, 또는 --partial)")
+    else:
+        merged, conflicts = merge_manifests(reports, keep)
+        for level, n in merged.items():
+            print(f"  🧾 {level}: 샤드 매니페스트 {n}개 항목 병합")
+        for c in conflicts[:5]:
+            print(f"  ⚠️ 충돌 {c['level']}/{c['path']}: {', '.join(c['shards'])}")
+
+    metrics: Counter = Counter()
+    for r in reports:
+        metrics.update(r.get("metrics", {}))
+    fails = [f for r in reports for f in r.get("fails", [])] + lost_jobs(reports, name)
+    report = {
+        "run": name,
+        "recipe": reports[0]["recipe"],
+        "dataset": reports[0]["dataset"],
+        "shards": [{k: r[k] for k in ("shard", "items", "cost", "elapsed_sec", "finished")} | {"fails": len(r["fails"])}
+                   for r in reports],
+        "complete": not problems,
+        "problems": problems,
+        "items": sum(r["items"] for r in reports),
+        "items_total": reports[0]["items_total"],
+        "metrics": dict(metrics),
+        "fails": len(fails),
+        "wall_sec": max(elapsed),
+        "machine_sec": round(sum(elapsed), 1),
+        "balance": balance,
+        "manifests_merged": merged,
+        "conflicts": conflicts,
+    }
+    with open(os.path.join(directory, "report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    with open(os.path.join(directory, "failures.txt"), "w", encoding="utf-8") as f:
+        f.write("".join(x + "\n" for x in fails))
+    shown = ", ".join(f"{k}={v}" for k, v in sorted(metrics.items()))
+    print(f"  📊 항목 {report['items']}/{report['items_total']}, 실패 {len(fails)}건"
+          + (f", {shown}" if shown else "") + f" → {os.path.join(directory, 'report.json')}\n")
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="샤드 실행 결과(매니페스트/실패 목록/지표) 병합")
+    parser.add_argument("runs", nargs="*", help=f"실행 폴더 (기본: {SHARD_DIR}/ 아래 전부)")
+    parser.add_argument("--keep", action="store_true", help="병합한 샤드 매니페스트를 지우지 않음")
+    parser.add_argument("--partial", action="store_true", help="샤드가 빠졌거나 지문이 달라도 있는 것만 병합")
+    args = parser.parse_args()
+
+    runs = args.runs
+    if not runs:
+        if not os.path.isdir(SHARD_DIR):
+            print(f"❌ {SHARD_DIR}/ 가 없습니다 (--shard 실행 결과를 먼저 모으세요).")
+            return 1
+        runs = [os.path.join(SHARD_DIR, d) for d in sorted(os.listdir(SHARD_DIR))
+                if os.path.isdir(os.path.join(SHARD_DIR, d))]
+    incomplete = 0
+    for d in runs:
+        if not os.path.isdir(d):
+            print(f"⚠️ 실행 폴더 없음: {d}")
+            incomplete += 1
+            continue
+        report = merge_run(d, args.keep, args.partial)
+        if report and not report["complete"]:
+            incomplete += 1
+    return 1 if incomplete else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+레벨/학습 세트 단위 오디오 스프라이트 패킹
+
+jlpt/{level}/{romaji}/word.mp3, {level}/{lemma}/gloss.mp3 같은 작은 클립 수천 개를
+MP3 프레임 경계 그대로 이어 붙인 스프라이트 파일 몇 개로 묶고, 키(폴더명)로
+이진 탐색 가능한 오프셋 인덱스를 만듭니다. 퀴즈 세션은 클립마다 요청하는 대신
+스프라이트 1~2개에 Range 요청으로 구간만 가져올 수 있습니다.
+
+- 클립은 ID3/Xing(Info) 헤더를 빼고 오디오 프레임만 연결 (프레임 정렬, 재인코딩 없음)
+- 샘플레이트/채널이 바뀌거나 --max-mb를 넘으면 다음 파트 파일로 분할
+- LAME 태그의 인코더 지연/패딩 샘플을 함께 기록 (갭리스 트리밍용)
+
+출력:
+  {out}/{name}-000.mp3, {name}-001.mp3 ...
+  {out}/{name}.index.json
+    {"v": 1, "name": ..., "clip": "word", "sample_rate": 24000, "samples_per_frame": 576,
+     "parts": [{"file": "n5_word-000.mp3", "bytes": ..., "ms": ...}, ...],
+     "fields": ["part", "byte_start", "byte_end", "ms_start", "ms_end", "delay", "padding"],
+     "keys":    ["aisatsu", "aka", ...],            # 정렬됨 → 이진 탐색
+     "entries": [[0, 0, 4032, 0, 1344, 1105, 911], ...]}   # keys와 같은 순서
+    byte_end는 Range 헤더용 포함 끝(inclusive)이 아니라 배타적 끝입니다.
+
+사용:
+  python pack_sprites.py jlpt/n5 --clip word
+  python pack_sprites.py starter --clip gloss --max-mb 4
+  python pack_sprites.py jlpt/n3 --clip word --keys my_deck.txt --name deck_0412
+  python pack_sprites.py jlpt/n5 --clip word --verify       # 패킹 후 바이트 구간 검증
+  python pack_sprites.py --lookup sprites/jlpt/n5/n5_word.index.json aisatsu
+"""
+
+import os
+import sys
+import json
+import argparse
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+
+from audio_common.mp3_frames import scan
+
+INDEX_VERSION = 1
+FIELDS = ["part", "byte_start", "byte_end", "ms_start", "ms_end", "delay", "padding"]
+
+
+# ===== 인덱스 조회 =====
+def lookup(index: Dict[str, Any], key: str) -> Optional[Dict[str, Any]]:
+    """정렬된 keys에서 이진 탐색 → {"file", "byte_start", ...} 또는 None"""
+    keys = index["keys"]
+    i = bisect_left(keys, key)
+    if i == len(keys) or keys[i] != key:
+        return None
+    entry = dict(zip(index["fields"], index["entries"][i]))
+    entry["file"] = index["parts"][entry["part"]]["file"]
+    entry["key"] = key
+    return entry
+
+
+# ===== 소스 수집 =====
+def collect_clips(level_dir: str, clip: str, keys_file: Optional[str]) -> List[tuple]:
+    if keys_file:
+        with open(keys_file, "r", encoding="utf-8") as f:
+            keys = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    else:
+        keys = sorted(
+            d for d in os.listdir(level_dir) if os.path.isdir(os.path.join(level_dir, d))
+        )
+    clips, missing = [], 0
+    for key in keys:
+        path = os.path.join(level_dir, key, f"{clip}.mp3")
+        if os.path.isfile(path):
+            clips.append((key, path))
+        else:
+            missing += 1
+    if missing:
+        print(f"  ⚠️ {clip}.mp3 없음: {missing}개 (건너뜀)")
+    return clips
+
+
+# ===== 패킹 =====
+class _Part:
+    def __init__(self, path: str, fmt: tuple):
+        self.path = path
+        self.fmt = fmt
+        self.f = open(path, "wb")
+        self.bytes = 0
+        self.frames = 0
+
+    def close(self) -> None:
+        self.f.close()
+
+
+def pack(clips: List[tuple], out_dir: str, name: str, clip: str, max_bytes: int) -> Dict[str, Any]:
+    os.makedirs(out_dir, exist_ok=True)
+    parts: List[_Part] = []
+    rows: Dict[str, List[float]] = {}
+    skipped = 0
+
+    for key, path in clips:
+        with open(path, "rb") as f:
+            data = f.read()
+        try:
+            info = scan(data)
+        except ValueError as e:
+            print(f"  ⚠️ {key}: {e} → 건너뜀")
+            skipped += 1
+            continue
+        if info.frames == 0:
+            skipped += 1
+            continue
+        if key in rows:
+            print(f"  ⚠️ 중복 키: {key} → 첫 번째만 사용")
+            continue
+
+        audio = data[info.audio_start:info.audio_end]
+        part = parts[-1] if parts else None
+        if part is None or part.fmt != info.format_key or (part.bytes and part.bytes + len(audio) > max_bytes):
+            part = _Part(os.path.join(out_dir, f"{name}-{len(parts):03d}.mp3"), info.format_key)
+            parts.append(part)
+
+        sr, _, spf = info.format_key
+        ms_start = part.frames * spf * 1000.0 / sr
+        part.f.write(audio)
+        rows[key] = [
+            len(parts) - 1,
+            part.bytes,
+            part.bytes + len(audio),
+            int(round(ms_start)),
+            int(round(ms_start + info.duration_ms)),
+            info.enc_delay,
+            info.enc_padding,
+        ]
+        part.bytes += len(audio)
+        part.frames += info.frames
+
+    for p in parts:
+        p.close()
+
+    keys = sorted(rows)
+    first_fmt = parts[0].fmt if parts else (0, 0, 0)
+    index = {
+        "v": INDEX_VERSION,
+        "name": name,
+        "clip": clip,
+        "sample_rate": first_fmt[0],
+        "samples_per_frame": first_fmt[2],
+        "parts": [
+            {
+                "file": os.path.basename(p.path),
+                "bytes": p.bytes,
+                "ms": int(round(p.frames * p.fmt[2] * 1000.0 / p.fmt[0])),
+                "sample_rate": p.fmt[0],
+                "channels": p.fmt[1],
+            }
+            for p in parts
+        ],
+        "fields": FIELDS,
+        "keys": keys,
+        "entries": [rows[k] for k in keys],
+    }
+    with open(os.path.join(out_dir, f"{name}.index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    if skipped:
+        print(f"  ⚠️ 프레임 파싱 실패/빈 클립 {skipped}개 제외")
+    return index
+
+
+def verify(index: Dict[str, Any], out_dir: str, clips: List[tuple]) -> int:
+    """인덱스의 바이트 구간이 원본 클립 오디오 프레임과 같은지 확인"""
+    bad = 0
+    src = dict(clips)
+    handles = {}
+    for key in index["keys"]:
+        e = lookup(index, key)
+        with open(src[key], "rb") as f:
+            data = f.read()
+        info = scan(data)
+        fh = handles.setdefault(e["file"], open(os.path.join(out_dir, e["file"]), "rb"))
+        fh.seek(e["byte_start"])
+        if fh.read(e["byte_end"] - e["byte_start"]) != data[info.audio_start:info.audio_end]:
+            bad += 1
+            print(f"  ❌ 불일치: {key}")
+    for fh in handles.values():
+        fh.close()
+    return bad
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="레벨/학습 세트 오디오 스프라이트 패킹")
+    parser.add_argument("level_dir", nargs="?", help="레벨 폴더 (예: jlpt/n5, starter)")
+    parser.add_argument("--clip", default="word", help="클립 파일명 (word / gloss / example)")
+    parser.add_argument("--keys", help="학습 세트 키(폴더명) 목록 파일 - 한 줄에 하나, 이 순서로 패킹")
+    parser.add_argument("--out", help="출력 폴더 (기본: sprites/<level_dir>)")
+    parser.add_argument("--name", help="스프라이트 이름 (기본: <레벨>_<clip>)")
+    parser.add_argument("--max-mb", type=float, default=8.0, help="파트 파일 최대 크기(MB)")
+    parser.add_argument("--verify", action="store_true", help="패킹 후 바이트 구간 검증")
+    parser.add_argument("--lookup", nargs=2, metavar=("INDEX", "KEY"), help="인덱스에서 키 조회")
+    args = parser.parse_args()
+
+    if args.lookup:
+        with open(args.lookup[0], "r", encoding="utf-8") as f:
+            entry = lookup(json.load(f), args.lookup[1])
+        print(json.dumps(entry, ensure_ascii=False) if entry else f"❌ 키 없음: {args.lookup[1]}")
+        return 0 if entry else 1
+
+    if not args.level_dir or not os.path.isdir(args.level_dir):
+        parser.error(f"레벨 폴더가 없습니다: {args.level_dir}")
+
+    level_dir = os.path.normpath(args.level_dir)
+    out_dir = args.out or os.path.join("sprites", level_dir)
+    name = args.name or f"{os.path.basename(level_dir)}_{args.clip}"
+
+    clips = collect_clips(level_dir, args.clip, args.keys)
+    print(f"🎞️ 스프라이트 패킹: {level_dir} ({args.clip}.mp3 {len(clips)}개) → {out_dir}/{name}-*.mp3")
+    index = pack(clips, out_dir, name, args.clip, int(args.max_mb * 1024 * 1024))
+
+    total_bytes = sum(p["bytes"] for p in index["parts"])
+    print(f"✅ 파트 {len(index['parts'])}개, 클립 {len(index['keys'])}개, {total_bytes / (1024 * 1024):.2f} MB")
+    for p in index["parts"]:
+        print(f"    {p['file']}: {p['bytes'] / 1024:.0f} KB, {p['ms'] / 1000:.1f}s")
+
+    if args.verify:
+        bad = verify(index, out_dir, clips)
+        print("✅ 검증 통과" if not bad else f"❌ 검증 실패 {bad}건")
+        return 1 if bad else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+데이터셋 간 오디오 재사용 계획 (같은 유효 입력 = 합성 1회)
+
+CEFR/IELTS 레벨 파일(A1_*, B1_* …)에는 같은 영어 lemma가, JLPT N1~N5에는 같은
+kana가 여러 번 나오고 생성기는 파일마다 word/gloss(/example)를 따로 합성합니다.
+이 스크립트는 설정된 모든 데이터셋에서 생성기와 같은 규칙(정리된 텍스트, 보이스
+순환, 간격/음량)으로 산출물별 유효 입력 키(audio_common/audio_reuse.py)를 계산하고
+
+  - 키가 같은 산출물 묶음 → 합성 1회 + 나머지는 하드링크
+  - 이미 매니페스트(audio_manifest.json)에 같은 키로 기록된 파일이 있으면 합성 0회
+  - 같은 출력 경로에 서로 다른 키가 쓰이는 충돌(나중 항목이 덮어씀)
+
+을 계산해 절약되는 TTS 호출 수/바이트를 보고합니다. --apply는 출처가 있는 묶음을
+실제로 하드링크하고 매니페스트에 기록합니다. 생성기도 실행 중에 같은 키를 찾아
+링크하므로(AUDIO_REUSE=1), 남은 '합성 필요' 묶음은 생성기를 돌리면 1회씩만 합성됩니다.
+
+사용:
+  python plan_audio_reuse.py                         # 기본: cefr, total, ielts, idiom, jlpt
+  python plan_audio_reuse.py jlpt --apply            # JLPT 레벨 간 기존 파일 하드링크
+  python plan_audio_reuse.py ielts --gloss-profile dedupe_gloss --out ielts_reuse.json
+
+규칙(생성기와 같은 환경변수/기본값 - audio_common/corpus_artifacts.py):
+  CEFR/IELTS/숙어  make_word_gloss.py  <레벨>/<lemma>/{word,gloss}.mp3
+                   레벨 태그(입문/기초/중급/중상급/고급)가 없으면 levelCEFR(A1→starter …)
+  JLPT            jlpt/make_jlpt_audio.py  jlpt/<nX>/<romaji>[2,3…]/{word,gloss,example}.mp3
+  보이스 남/여는 생성기와 같은 VOICE_ASSIGN 규칙 (기본: 파일 안의 항목 순번, voice_assign.py)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+from audio_common.audio_manifest import AudioManifest
+from audio_common.audio_reuse import ReuseIndex
+from audio_common.corpus_artifacts import Artifact, dataset_artifacts
+from audio_common.vocab_datasets import dataset_group, dataset_name, load_items, resolve_sources
+
+DEFAULT_SOURCES = ["cefr", "total", "ielts", "idiom", "jlpt"]
+
+
+# ===== 계획 =====
+def build_plan(artifacts: List[Artifact], reuse: ReuseIndex) -> Dict[str, Any]:
+    by_key: Dict[str, List[Artifact]] = {}
+    keys_at: Dict[str, Dict[str, str]] = {}
+    for a in artifacts:
+        by_key.setdefault(a.key, []).append(a)
+        keys_at.setdefault(a.path, {})[a.key] = a.source
+
+    naive_calls = sum(a.calls for a in artifacts)
+    planned_calls = 0
+    saved_bytes = 0
+    links: List[Dict[str, Any]] = []
+    synth: List[Dict[str, Any]] = []
+    for key, group in by_key.items():
+        paths = list(dict.fromkeys(os.path.normpath(a.path) for a in group))
+        src = reuse.find(key)
+        if src is None:
+            # 아직 출처 없음 → 첫 경로에서 1회 합성, 나머지는 그 파일을 링크
+            planned_calls += group[0].calls
+            synth.append({"key": key, "path": paths[0], "calls": group[0].calls, "also": paths[1:],
+                          "sources": [a.source for a in group]})
+            continue
+        src_path, entry = src
+        for p in paths:
+            if os.path.exists(p) and os.path.samefile(p, src_path):
+                continue
+            links.append({"key": key, "src": src_path, "dst": p, "size": entry.get("size", 0)})
+        saved_bytes += entry.get("size", 0) * (len(paths) - 1)
+
+    conflicts = [{"path": p, "sources": sorted(ks.values())} for p, ks in keys_at.items() if len(ks) > 1]
+    return {
+        "summary": {
+            "artifacts": len(artifacts),
+            "unique": len(by_key),
+            "tts_calls_naive": naive_calls,
+            "tts_calls_planned": planned_calls,
+            "tts_calls_saved": naive_calls - planned_calls,
+            "bytes_saved_known": saved_bytes,
+            "links": len(links),
+            "synth": len(synth),
+            "path_conflicts": len(conflicts),
+        },
+        "links": links,
+        "synth": synth,
+        "conflicts": conflicts,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="데이터셋 간 오디오 재사용 계획/하드링크")
+    parser.add_argument("sources", nargs="*", default=DEFAULT_SOURCES, help="그룹(cefr/total/ielts/idiom/jlpt), glob, 파일")
+    parser.add_argument("--gloss-profile", default="word_gloss", choices=["word_gloss", "dedupe_gloss"],
+                        help="CEFR gloss 정리 규칙 (make_word_gloss.py / dedupe_vocabs.py)")
+    parser.add_argument("--apply", action="store_true", help="출처가 있는 묶음을 하드링크하고 매니페스트에 기록")
+    parser.add_argument("--out", default="audio_reuse_plan.json", help="계획 JSON (빈 문자열이면 생략)")
+    args = parser.parse_args()
+
+    paths = resolve_sources(args.sources)
+    if not paths:
+        print("❌ 데이터셋 파일이 없습니다.")
+        return 1
+
+    t0 = time.time()
+    artifacts: List[Artifact] = []
+    for path in paths:
+        name = dataset_name(path)
+        try:
+            items = load_items(path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ {path} 읽기 실패: {e}")
+            continue
+        artifacts += dataset_artifacts(path, name, items, args.gloss_profile, dataset_group(path))
+
+    level_dirs = sorted({os.path.dirname(os.path.dirname(a.path)) for a in artifacts})
+    reuse = ReuseIndex.scan(level_dirs)
+    plan = build_plan(artifacts, reuse)
+    s = plan["summary"]
+    print(f"📚 {len(paths)}개 파일 → 산출물 {s['artifacts']}개, 고유 키 {s['unique']}개 "
+          f"(매니페스트 키 {len(reuse)}개, {time.time() - t0:.2f}s)")
+    print(f"🎙️ TTS 요청: 파일별 생성 {s['tts_calls_naive']}회 → 계획 {s['tts_calls_planned']}회 "
+          f"(절약 {s['tts_calls_saved']}회)")
+    print(f"🔗 링크 {s['links']}개 (확인된 절약 {s['bytes_saved_known'] / 1e6:.1f}MB), 합성 필요 {s['synth']}개")
+    if plan["conflicts"]:
+        print(f"⚠️ 같은 경로에 다른 입력 {len(plan['conflicts'])}건 (생성 순서상 마지막 항목이 덮어씀)")
+        for c in plan["conflicts"][:5]:
+            print(f"   - {c['path']}: {', '.join(c['sources'][:4])}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(plan, f, ensure_ascii=False, indent=1)
+        print(f"   → {args.out}")
+
+    if args.apply and plan["links"]:
+        manifest = AudioManifest(level_depth=2, enabled=True)
+        done = {"link": 0, "copy": 0, "same": 0}
+        for ln in plan["links"]:
+            src = reuse.find(ln["key"])
+            if src is None:
+                continue
+            done[reuse.link(manifest, src, ln["dst"], ln["key"])] += 1
+        manifest.close()
+        print(f"✅ 하드링크 {done['link']}개, 복사 {done['copy']}개, 이미 같은 파일 {done['same']}개")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+코퍼스 오디오 QA 스캔 (무음/잘림/클리핑 - TTS·Whisper 호출 없음)
+
+생성기는 길이가 0이 아닌 세그먼트면 그대로 저장하므로, 거의 무음이거나 끝이
+잘렸거나 클리핑된 파일도 배포됩니다. 이 스크립트는 레벨 폴더의 MP3를 프로세스
+풀에서 PCM으로 디코드하고(audio_common/pcm_probe.py - ffmpeg + numpy) 파일마다
+
+  RMS/피크 dBFS, 앞·뒤 무음, 내부 최장 무음, 클리핑 비율, 마지막 10ms 음량, 길이
+
+를 계산합니다. 고정 기준(무음, 너무 짧음, 잘린 끝, 클리핑, 긴 무음)과 함께
+(레벨, 보이스, 종류) 그룹 안의 중앙값/MAD 기준 이상치(음량, 길이)를 표시하고
+점수순 보고서를 저장합니다. 보이스는 audio_manifest.json의 "voice"에서 가져옵니다.
+
+사용:
+  python qa_scan_audio.py                          # 기본 레벨 폴더 전부 (artifact_catalog.DEFAULT_LEVELS)
+  python qa_scan_audio.py jlpt/n5 starter --workers 8 --top 50
+  python qa_scan_audio.py N5/N5_Listening/N5_Listening_mix --out n5_listening_qa.json
+
+환경변수(옵션, 기준값):
+  QA_SILENCE_DB=-50      # 무음 판정 창 음량
+  QA_MIN_DBFS=-45        # 파일 RMS가 이보다 작으면 silent
+  QA_MIN_MS=250          # 이보다 짧으면 too_short
+  QA_CLIP_RATIO=0.001    # 클리핑 샘플 비율이 이보다 크면 clipped
+  QA_MAX_LEAD_MS=1000    # 앞 무음
+  QA_MAX_GAP_MS=2000     # 내부 무음 (gloss 간격 1000ms + 쉼표 500ms보다 길게)
+  QA_CUT_END_DB=-30      # 뒤 무음 없이 마지막 창이 이보다 크면 cut_end (끝 잘림)
+  QA_Z=4.0               # 그룹 내 robust z-score 이상치 기준
+  QA_WORKERS=8           # 디코드 프로세스 수 (기본 CPU 수)
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Dict, List
+
+import numpy as np
+
+from audio_common.artifact_catalog import DEFAULT_LEVELS, split_path, walk_mp3
+from audio_common.audio_manifest import is_fresh, load_manifest
+from audio_common.output_ladder import FFMPEG_BIN
+from audio_common.pcm_probe import qa_file
+
+QA_SILENCE_DB = float(os.getenv("QA_SILENCE_DB", "-50"))
+QA_MIN_DBFS = float(os.getenv("QA_MIN_DBFS", "-45"))
+QA_MIN_MS = float(os.getenv("QA_MIN_MS", "250"))
+QA_CLIP_RATIO = float(os.getenv("QA_CLIP_RATIO", "0.001"))
+QA_MAX_LEAD_MS = float(os.getenv("QA_MAX_LEAD_MS", "1000"))
+QA_MAX_GAP_MS = float(os.getenv("QA_MAX_GAP_MS", "2000"))
+QA_CUT_END_DB = float(os.getenv("QA_CUT_END_DB", "-30"))
+QA_Z = float(os.getenv("QA_Z", "4.0"))
+QA_WORKERS = int(os.getenv("QA_WORKERS", str(os.cpu_count() or 2)))
+
+MIN_GROUP = 8  # 이상치 통계를 낼 최소 그룹 크기
+# 고정 기준 → 점수
+SEVERITY = {"decode_error": 5, "silent": 5, "too_short": 4, "cut_end": 3, "clipped": 3, "long_gap": 2, "long_lead": 1}
+
+
+def fixed_flags(m: Dict[str, Any]) -> List[str]:
+    if "error" in m:
+        return ["decode_error"]
+    flags = []
+    if m["dbfs"] < QA_MIN_DBFS:
+        flags.append("silent")
+    if m["duration_ms"] < QA_MIN_MS:
+        flags.append("too_short")
+    if m["trail_ms"] == 0 and m["end_dbfs"] > QA_CUT_END_DB:
+        flags.append("cut_end")
+    if m["clip_ratio"] > QA_CLIP_RATIO:
+        flags.append("clipped")
+    if m["max_gap_ms"] > QA_MAX_GAP_MS:
+        flags.append("long_gap")
+    if m["lead_ms"] > QA_MAX_LEAD_MS:
+        flags.append("long_lead")
+    return flags
+
+
+def robust_z(values: np.ndarray) -> np.ndarray:
+    """중앙값/MAD 기준 z (MAD=0이면 0)"""
+    med = np.median(values)
+    mad = np.median(np.abs(values - med)) * 1.4826
+    if mad <= 0:
+        return np.zeros_like(values)
+    return (values - med) / mad
+
+
+def group_outliers(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """(레벨, 보이스, 종류) 그룹별 음량/길이 이상치 표시 → 그룹 요약"""
+    groups: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for r in rows:
+        if "error" not in r["metrics"] and np.isfinite(r["metrics"]["dbfs"]):
+            groups[f"{r['level']}|{r['voice'] or '-'}|{r['kind']}"].append(r)
+    summary = {}
+    for name, members in sorted(groups.items()):
+        dbfs = np.array([r["metrics"]["dbfs"] for r in members])
+        dur = np.array([r["metrics"]["duration_ms"] for r in members])
+        summary[name] = {"files": len(members), "median_dbfs": round(float(np.median(dbfs)), 1),
+                         "median_duration_ms": round(float(np.median(dur)), 1)}
+        if len(members) < MIN_GROUP:
+            continue
+        for metric, z in (("dbfs", robust_z(dbfs)), ("duration", robust_z(np.log(np.maximum(dur, 1.0))))):
+            for r, zi in zip(members, z):
+                if abs(zi) > QA_Z:
+                    r["flags"].append(f"{metric}_{'high' if zi > 0 else 'low'}")
+                    r["score"] += round(min(abs(zi) / QA_Z, 3.0), 2)
+                    r["z"][metric] = round(float(zi), 1)
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="오디오 코퍼스 QA 스캔 (무음/잘림/클리핑/이상치)")
+    parser.add_argument("levels", nargs="*", help="레벨 폴더 (기본: " + ", ".join(DEFAULT_LEVELS) + ")")
+    parser.add_argument("--workers", type=int, default=QA_WORKERS, help="디코드 프로세스 수")
+    parser.add_argument("--out", default="audio_qa_report.json", help="보고서 JSON")
+    parser.add_argument("--top", type=int, default=20, help="출력할 상위 항목 수")
+    args = parser.parse_args()
+
+    if shutil.which(FFMPEG_BIN) is None:
+        print(f"❌ {FFMPEG_BIN} 없음 (PCM 디코드에 필요)")
+        return 1
+    levels = [os.path.normpath(x) for x in args.levels] or [x for x in DEFAULT_LEVELS if os.path.isdir(x)]
+    if not levels:
+        print("⚠️ 레벨 폴더가 없습니다 (backend 폴더에서 실행하거나 폴더를 지정하세요)")
+        return 1
+
+    t0 = time.time()
+    rows: List[Dict[str, Any]] = []
+    for level in levels:
+        if not os.path.isdir(level):
+            print(f"⚠️ 폴더 없음: {level}")
+            continue
+        manifest = load_manifest(level)
+        for path, _, _ in walk_mp3(level):
+            entry = manifest.get(os.path.relpath(path, level).replace(os.sep, "/"))
+            rows.append(dict(split_path(path, level), voice=entry.get("voice") if is_fresh(entry, path) else None))
+    print(f"🔎 {len(rows)}개 파일 디코드 (workers={args.workers})")
+
+    measure = partial(qa_file, silence_db=QA_SILENCE_DB)
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for i, m in enumerate(pool.map(measure, [r["path"] for r in rows], chunksize=16)):
+            r = rows[i]
+            r["metrics"] = m
+            r["flags"] = fixed_flags(m)
+            r["score"] = sum(SEVERITY[f] for f in r["flags"])
+            r["z"] = {}
+            if (i + 1) % 2000 == 0:
+                print(f"  … {i + 1}/{len(rows)} ({time.time() - t0:.0f}s)")
+
+    groups = group_outliers(rows)
+    flagged = sorted((r for r in rows if r["flags"]), key=lambda r: (-r["score"], r["path"]))
+    counts = Counter(f for r in flagged for f in r["flags"])
+    elapsed = time.time() - t0
+
+    def _json(v: Any) -> Any:
+        return None if isinstance(v, float) and not np.isfinite(v) else v
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "levels": levels,
+        "params": {"silence_db": QA_SILENCE_DB, "min_dbfs": QA_MIN_DBFS, "min_ms": QA_MIN_MS,
+                   "clip_ratio": QA_CLIP_RATIO, "max_lead_ms": QA_MAX_LEAD_MS, "max_gap_ms": QA_MAX_GAP_MS,
+                   "cut_end_db": QA_CUT_END_DB, "z": QA_Z},
+        "summary": {"files": len(rows), "flagged": len(flagged), "by_flag": dict(counts.most_common()),
+                    "seconds": round(elapsed, 1)},
+        "groups": groups,
+        "flagged": [
+            {"path": r["path"], "score": r["score"], "flags": r["flags"], "voice": r["voice"], "z": r["z"],
+             **{k: _json(round(v, 4) if isinstance(v, float) else v) for k, v in r["metrics"].items()}}
+            for r in flagged
+        ],
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"\n✅ {len(rows)}개 중 {len(flagged)}개 표시 ({elapsed:.1f}s) → {args.out}")
+    for name, n in counts.most_common():
+        print(f"   {name}: {n}")
+    for r in flagged[: args.top]:
+        m = r["metrics"]
+        detail = m["error"] if "error" in m else (
+            f"{m['duration_ms']:.0f}ms, {m['dbfs']:.1f}dBFS, lead {m['lead_ms']:.0f} / trail {m['trail_ms']:.0f}ms, "
+            f"gap {m['max_gap_ms']:.0f}ms, clip {m['clip_ratio']:.2%}")
+        print(f"  [{r['score']:.1f}] {r['path']}  {','.join(r['flags'])}  ({detail})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+매니페스트 기반 차등 업로드 (체크섬 비교)
+
+레벨 폴더의 audio_manifest.json(생성기가 저장 시 계산한 MD5/CRC32C)과
+버킷 객체 목록(캐시)을 비교해 새 파일/내용이 바뀐 파일만 병렬 업로드합니다.
+다시 생성했지만 바이트가 같은 파일은 건너뜁니다. 파일을 다시 읽는 경우는
+매니페스트에 없거나 생성기 밖에서 수정된 파일(size/mtime 불일치)뿐입니다.
+
+대상:
+  gs://버킷[/접두사]      Google Cloud Storage (STORAGE_EMULATOR_HOST 설정 시 에뮬레이터)
+  /로컬/폴더              로컬 폴더를 버킷 대신 사용 (테스트/드라이런)
+
+객체 이름: [접두사/]<레벨 폴더 경로>/<상대 경로>
+  python sync_audio.py jlpt/n5 --dest gs://language-learner-audio
+    → gs://language-learner-audio/jlpt/n5/aisatsu/word.mp3
+
+사용:
+  python sync_audio.py jlpt/n5 jlpt/n4 --dest gs://language-learner-audio
+  python sync_audio.py starter elementary --dest /tmp/fake-bucket --workers 32
+  python sync_audio.py jlpt/n5 --dest gs://language-learner-audio --dry-run
+  python sync_audio.py jlpt/n5 --dest gs://language-learner-audio --refresh-listing
+
+환경변수(옵션):
+  SYNC_WORKERS=16           # 업로드 스레드 수
+  SYNC_RETRIES=4            # 업로드 재시도 횟수
+  SYNC_CACHE_DIR=.sync_cache
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Tuple
+
+from audio_common.audio_manifest import (
+    MANIFEST_FILE,
+    digest_file,
+    is_fresh,
+    is_manifest_file,
+    load_manifest,
+    same_content,
+    save_manifest,
+)
+from audio_common.output_ladder import SUMMARY_FILE
+
+SYNC_WORKERS = int(os.getenv("SYNC_WORKERS", "16"))
+SYNC_RETRIES = int(os.getenv("SYNC_RETRIES", "4"))
+SYNC_CACHE_DIR = os.getenv("SYNC_CACHE_DIR", ".sync_cache")
+
+SKIP_FILES = {MANIFEST_FILE, SUMMARY_FILE}
+CONTENT_TYPES = {
+    ".mp3": "audio/mpeg",
+    ".opus": "audio/ogg",
+    ".m4a": "audio/mp4",
+    ".json": "application/json",
+    ".vtt": "text/vtt",
+}
+
+
+# ===== 대상 버킷 =====
+class LocalBucket:
+    """로컬 폴더를 버킷처럼 사용 (테스트용 - 목록 조회 시 해시 계산)"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.label = os.path.abspath(root)
+
+    def list(self, prefix: str) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        base = os.path.join(self.root, prefix)
+        for root, _, files in os.walk(base):
+            for fn in files:
+                path = os.path.join(root, fn)
+                name = os.path.relpath(path, self.root).replace(os.sep, "/")
+                out[name] = digest_file(path)
+        return out
+
+    def upload(self, src: str, name: str, entry: Dict[str, Any]) -> None:
+        dst = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        tmp = dst + ".part"
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+
+
+class GcsBucket:
+    """Google Cloud Storage (google-cloud-storage 필요, 사용할 때만 import)"""
+
+    def __init__(self, bucket: str):
+        from google.cloud import storage  # 지연 import
+
+        self.client = storage.Client()
+        self.bucket = self.client.bucket(bucket)
+        self.label = f"gs://{bucket}"
+
+    def list(self, prefix: str) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        for blob in self.client.list_blobs(self.bucket, prefix=prefix):
+            out[blob.name] = {"size": blob.size, "md5": blob.md5_hash, "crc32c": blob.crc32c}
+        return out
+
+    def upload(self, src: str, name: str, entry: Dict[str, Any]) -> None:
+        blob = self.bucket.blob(name)
+        ext = os.path.splitext(src)[1].lower()
+        # crc32c 체크섬 검증 업로드 (전송 중 손상 시 예외 → 재시도)
+        blob.upload_from_filename(src, content_type=CONTENT_TYPES.get(ext), checksum="crc32c")
+
+
+def open_bucket(dest: str) -> Tuple[Any, str]:
+    """--dest → (버킷 객체, 객체 이름 접두사)"""
+    if dest.startswith("gs://"):
+        bucket, _, prefix = dest[5:].partition("/")
+        return GcsBucket(bucket), prefix.strip("/")
+    return LocalBucket(dest), ""
+
+
+# ===== 목록 캐시 =====
+def _cache_path(bucket: Any, prefix: str) -> str:
+    key = f"{bucket.label}/{prefix}".replace("://", "_").replace("/", "_").replace(os.sep, "_").strip("_")
+    return os.path.join(SYNC_CACHE_DIR, f"{key}.json")
+
+
+def load_listing(bucket: Any, prefix: str, refresh: bool, max_age_h: float) -> Tuple[Dict[str, Any], bool]:
+    path = _cache_path(bucket, prefix)
+    if not refresh and os.path.exists(path) and time.time() - os.path.getmtime(path) < max_age_h * 3600:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f), True
+    listing = bucket.list(prefix)
+    save_listing(bucket, prefix, listing)
+    return listing, False
+
+
+def save_listing(bucket: Any, prefix: str, listing: Dict[str, Any]) -> None:
+    os.makedirs(SYNC_CACHE_DIR, exist_ok=True)
+    path = _cache_path(bucket, prefix)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(listing, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(path + ".tmp", path)
+
+
+# ===== 로컬 상태 =====
+def local_entries(level_dir: str) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    """
+    레벨 폴더 파일 → 다이제스트 (매니페스트 우선, 없거나 오래된 항목만 해시 보충)
+    매니페스트에는 오래된 기존 항목만 새 다이제스트로 고쳐 저장 (key/voice 등 다른 필드 유지)
+    - 매니페스트에 없는 파일(사이드카, 래더 변형 등)은 이번 동기화에만 쓰고 추가하지 않음
+    """
+    manifest = load_manifest(level_dir)
+    out: Dict[str, Dict[str, Any]] = {}
+    rehashed = updated = 0
+    shard_files = [fn for fn in os.listdir(level_dir) if is_manifest_file(fn) and fn != MANIFEST_FILE]
+    if shard_files:
+        print(f"⚠️ {level_dir}: 병합 전 샤드 매니페스트 {len(shard_files)}개 → python merge_shards.py 먼저 "
+              f"(지금은 매니페스트에 없는 파일을 다시 해시)")
+    for root, _, files in os.walk(level_dir):
+        for fn in files:
+            if fn in SKIP_FILES or is_manifest_file(fn) or fn.endswith((".part", ".tmp", ".link")):
+                continue
+            path = os.path.join(root, fn)
+            rel = os.path.relpath(path, level_dir).replace(os.sep, "/")
+            entry = manifest.get(rel)
+            if not is_fresh(entry, path):
+                fresh = digest_file(path)
+                fresh["mtime"] = os.stat(path).st_mtime
+                rehashed += 1
+                if entry is not None:
+                    entry = manifest[rel] = {**entry, **fresh}
+                    updated += 1
+                else:
+                    entry = fresh
+            out[rel] = entry
+    if updated:
+        save_manifest(level_dir, manifest)
+    return out, rehashed
+
+
+def upload_with_retry(bucket: Any, src: str, name: str, entry: Dict[str, Any], retries: int) -> int:
+    for attempt in range(retries + 1):
+        try:
+            bucket.upload(src, name, entry)
+            return attempt
+        except Exception:
+            if attempt >= retries:
+                raise
+            time.sleep(min(30.0, 0.5 * (2 ** attempt)) * (0.5 + random.random()))
+    return retries
+
+
+def sync_level(bucket: Any, base_prefix: str, level_dir: str, args: argparse.Namespace) -> Dict[str, int]:
+    level_key = os.path.normpath(level_dir).replace(os.sep, "/").strip("/")
+    level_key = "" if level_key == "." else level_key
+    prefix = "/".join(p for p in (base_prefix, level_key) if p)
+
+    t0 = time.time()
+    local, rehashed = local_entries(level_dir)
+    listing, cached = load_listing(bucket, prefix + "/", args.refresh_listing, args.listing_max_age)
+
+    todo: List[Tuple[str, str, Dict[str, Any], str]] = []
+    for rel, entry in sorted(local.items()):
+        name = f"{prefix}/{rel}"
+        remote = listing.get(name)
+        if remote is None:
+            todo.append((rel, name, entry, "new"))
+        elif not same_content(entry, remote):
+            todo.append((rel, name, entry, "changed"))
+
+    stats = {"local": len(local), "rehashed": rehashed, "unchanged": len(local) - len(todo),
+             "new": sum(1 for t in todo if t[3] == "new"),
+             "changed": sum(1 for t in todo if t[3] == "changed"),
+             "uploaded": 0, "retried": 0, "failed": 0}
+    print(f"📂 {level_dir} → {bucket.label}/{prefix}/  "
+          f"(로컬 {stats['local']}개, 목록 {'캐시' if cached else '조회'} {len(listing)}개, 해시 보충 {rehashed}개)")
+    print(f"    신규 {stats['new']} / 변경 {stats['changed']} / 동일 {stats['unchanged']}")
+
+    if args.dry_run or not todo:
+        for rel, _, _, kind in todo[:20]:
+            print(f"    {'+' if kind == 'new' else '~'} {rel}")
+        if len(todo) > 20:
+            print(f"    ... 외 {len(todo) - 20}개")
+        return stats
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {
+            pool.submit(upload_with_retry, bucket, os.path.join(level_dir, rel), name, entry, args.retries): (rel, name, entry)
+            for rel, name, entry, _ in todo
+        }
+        for fut in as_completed(futures):
+            rel, name, entry = futures[fut]
+            try:
+                attempts = fut.result()
+            except Exception as e:
+                stats["failed"] += 1
+                print(f"    ❌ 업로드 실패: {rel} ({e})")
+                continue
+            stats["uploaded"] += 1
+            stats["retried"] += 1 if attempts else 0
+            listing[name] = {k: entry[k] for k in ("size", "md5", "crc32c")}
+
+    save_listing(bucket, prefix + "/", listing)
+    print(f"    ✅ 업로드 {stats['uploaded']}개 (재시도 {stats['retried']}, 실패 {stats['failed']}), {time.time() - t0:.1f}s")
+    return stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="매니페스트 체크섬 비교 → 변경분만 업로드")
+    parser.add_argument("levels", nargs="+", help="레벨 폴더 (예: jlpt/n5, starter)")
+    parser.add_argument("--dest", required=True, help="gs://버킷[/접두사] 또는 로컬 폴더")
+    parser.add_argument("--workers", type=int, default=SYNC_WORKERS, help="업로드 스레드 수")
+    parser.add_argument("--retries", type=int, default=SYNC_RETRIES, help="파일당 재시도 횟수")
+    parser.add_argument("--refresh-listing", action="store_true", help="캐시 무시하고 버킷 목록 다시 조회")
+    parser.add_argument("--listing-max-age", type=float, default=24.0, help="목록 캐시 유효 시간(시간)")
+    parser.add_argument("--dry-run", action="store_true", help="업로드 없이 차이만 출력")
+    args = parser.parse_args()
+
+    bucket, base_prefix = open_bucket(args.dest)
+    totals: Dict[str, int] = {}
+    for level in args.levels:
+        if not os.path.isdir(level):
+            print(f"⚠️ 폴더 없음: {level}")
+            continue
+        for k, v in sync_level(bucket, base_prefix, level, args).items():
+            totals[k] = totals.get(k, 0) + v
+
+    if totals:
+        print(f"\n🎉 완료: 신규 {totals['new']}, 변경 {totals['changed']}, 동일 {totals['unchanged']}, "
+              f"업로드 {totals['uploaded']}, 실패 {totals['failed']}")
+    return 1 if totals.get("failed") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+길이 기반 오디오 분류 → 이상한 파일만 비싼 검증(Whisper+LLM, STT)으로
+
+데이터셋에서 생성기 규칙대로 산출물마다 '말하는 부분'(보이스, 텍스트)과 고정 무음을
+재현하고(audio_common/corpus_artifacts.py), 실제 길이(카탈로그 또는 MP3 헤더)와
+비교합니다. 보이스·문자 체계별 단위당 ms는 코퍼스 자체에서 학습합니다
+(audio_common/duration_model.py - 모라/음절 단위, 이상치 제외 재적합).
+
+기대 길이에서 크게 벗어난 파일, 학습에 없던 보이스, 파일이 없는 산출물만
+audio_triage_paths.txt에 적으므로 검증 비용은 코퍼스 크기가 아니라 문제 수에 비례합니다.
+
+  python triage_audio.py                               # 학습 + 점수 (기본 데이터셋 전부)
+  python triage_audio.py jlpt --model duration_model.json --no-fit
+  python validate-audio-with-claude.py --only audio_triage_paths.txt
+  DURATION_MODEL=duration_model.json python A2/A2_1/A2_1.py   # STT 게이트도 이상치만
+
+실제 길이: 카탈로그(AUDIO_CATALOG, catalog_audio.py build)가 있으면 그 값, 없으면
+MP3 헤더를 직접 읽습니다(디코드 없음).
+
+환경변수(옵션):
+  TRIAGE_Z=3.5           # 종류별 잔차 분포 기준 z
+  TRIAGE_MIN_RATIO=0.5   # 실제/기대 비율 하한
+  TRIAGE_MAX_RATIO=2.0   # 상한
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from audio_common.artifact_catalog import AUDIO_CATALOG, connect
+from audio_common.corpus_artifacts import Artifact, dataset_artifacts
+from audio_common.duration_model import DurationModel
+from audio_common.mp3_frames import scan as scan_mp3
+from audio_common.vocab_datasets import dataset_group, dataset_name, load_items, resolve_sources
+
+DEFAULT_SOURCES = ["cefr", "total", "ielts", "idiom", "jlpt"]
+
+TRIAGE_Z = float(os.getenv("TRIAGE_Z", "3.5"))
+TRIAGE_MIN_RATIO = float(os.getenv("TRIAGE_MIN_RATIO", "0.5"))
+TRIAGE_MAX_RATIO = float(os.getenv("TRIAGE_MAX_RATIO", "2.0"))
+
+
+def _posix(path: str) -> str:
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+def kind_of(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+# ===== 실제 길이 =====
+def header_duration(path: str) -> Optional[float]:
+    try:
+        with open(path, "rb") as f:
+            return scan_mp3(f.read()).duration_ms
+    except (OSError, ValueError):
+        return None
+
+
+def actual_durations(paths: List[str], catalog: str) -> Dict[str, Optional[float]]:
+    """경로 → 길이(ms) (카탈로그 우선, 나머지는 있는 파일만 헤더 스캔)"""
+    out: Dict[str, Optional[float]] = {}
+    if catalog and os.path.exists(catalog):
+        conn = connect(catalog)
+        try:
+            for r in conn.execute("SELECT path, size, mtime, duration_ms FROM artifacts"):
+                out[r["path"]] = (r["duration_ms"], r["size"], r["mtime"])
+        finally:
+            conn.close()
+        fresh: Dict[str, Optional[float]] = {}
+        for p in paths:
+            row = out.get(p)
+            if row is None:
+                continue
+            try:
+                st = os.stat(p)
+            except OSError:
+                continue
+            if st.st_size == row[1] and abs(st.st_mtime - (row[2] or 0)) < 1e-3:
+                fresh[p] = row[0]
+        out = fresh
+    todo = [p for p in paths if p not in out and os.path.exists(p)]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        for p, ms in zip(todo, pool.map(header_duration, todo)):
+            out[p] = ms
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="길이 기반 오디오 분류 (이상치만 검증으로)")
+    parser.add_argument("sources", nargs="*", default=DEFAULT_SOURCES, help="그룹(cefr/total/ielts/idiom/jlpt), glob, 파일")
+    parser.add_argument("--gloss-profile", default="word_gloss", choices=["word_gloss", "dedupe_gloss"],
+                        help="CEFR gloss 정리 규칙 (make_word_gloss.py / dedupe_vocabs.py)")
+    parser.add_argument("--catalog", default=AUDIO_CATALOG, help="카탈로그 (없으면 MP3 헤더 스캔)")
+    parser.add_argument("--model", default="duration_model.json", help="모델 JSON (학습 시 저장, --no-fit이면 읽기)")
+    parser.add_argument("--no-fit", action="store_true", help="학습하지 않고 --model 사용")
+    parser.add_argument("--out", default="audio_triage.json", help="분류 결과 JSON")
+    parser.add_argument("--paths-out", default="audio_triage_paths.txt", help="검증할 파일 목록")
+    parser.add_argument("--include-missing", action="store_true", help="파일이 없는 산출물도 결과에 포함")
+    args = parser.parse_args()
+
+    paths = resolve_sources(args.sources)
+    if not paths:
+        print("❌ 데이터셋 파일이 없습니다.")
+        return 1
+
+    t0 = time.time()
+    # 같은 경로는 생성 순서상 마지막 항목이 덮어씀 → 마지막 산출물 기준
+    by_path: Dict[str, Artifact] = {}
+    for path in paths:
+        try:
+            items = load_items(path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ {path} 읽기 실패: {e}")
+            continue
+        for a in dataset_artifacts(path, dataset_name(path), items, args.gloss_profile, dataset_group(path)):
+            by_path[_posix(a.path)] = a
+    durations = actual_durations(list(by_path), args.catalog)
+    present = {p: ms for p, ms in durations.items() if ms}
+    print(f"📚 산출물 {len(by_path)}개, 실제 파일 {len(present)}개 ({time.time() - t0:.1f}s)")
+
+    limits = {"z_limit": TRIAGE_Z, "min_ratio": TRIAGE_MIN_RATIO, "max_ratio": TRIAGE_MAX_RATIO}
+    if args.no_fit:
+        model = DurationModel.load(args.model, **limits)
+    else:
+        rows = [(a.parts, a.fixed_ms, present[p], kind_of(p)) for p, a in by_path.items() if p in present]
+        if not rows:
+            print("⚠️ 길이를 읽을 수 있는 파일이 없습니다 (backend 폴더에서 실행하거나 --no-fit으로 기존 모델 사용)")
+            return 1
+        model = DurationModel.fit(rows, **limits)
+        model.save(args.model)
+        m = model.meta
+        print(f"📐 학습: {m['fitted']}/{m['rows']}행 적합 (특징 {len(model.coef)}개) → {args.model}")
+        for k, v in sorted(model.coef.items()):
+            print(f"   {k}: {v:.1f}ms")
+
+    results = []
+    for p, a in sorted(by_path.items()):
+        ms = durations.get(p)
+        if not ms and not args.include_missing:
+            continue
+        r = model.score(a.parts, a.fixed_ms, ms, kind_of(p))
+        r.update({"path": p, "actual_ms": round(ms, 1) if ms else None, "source": a.source})
+        results.append(r)
+    anomalies = sorted((r for r in results if r["anomaly"]), key=lambda r: -abs(r["z"] or 99))
+    reasons = Counter(r["reason"] for r in anomalies)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"summary": {"scored": len(results), "anomalies": len(anomalies), "by_reason": dict(reasons),
+                               "model": model.meta, "spread": model.spread},
+                   "anomalies": anomalies}, f, ensure_ascii=False, indent=1)
+    with open(args.paths_out, "w", encoding="utf-8") as f:
+        f.write("".join(r["path"] + "\n" for r in anomalies if r["actual_ms"]))
+
+    share = len(anomalies) / len(results) if results else 0.0
+    print(f"\n✅ {len(results)}개 중 검증 대상 {len(anomalies)}개 ({share:.1%}) → {args.out}, {args.paths_out}")
+    for name, n in reasons.most_common():
+        print(f"   {name}: {n}")
+    for r in anomalies[:10]:
+        exp = f"{r['expected_ms']:.0f}ms" if r["expected_ms"] else "?"
+        print(f"   {r['path']}: 실제 {r['actual_ms']}ms / 기대 {exp} (z={r['z']}, {r['reason']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
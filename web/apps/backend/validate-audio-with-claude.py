@@ -1,100 +1,362 @@
 #!/usr/bin/env python3
 """
 Audio validation script using Whisper for transcription and Claude for validation
+
+Transcription runs in a worker-process pool (each worker loads the Whisper model
+once). Files are sorted by duration (longest first) and sent to workers in
+batches; transcripts are cached by audio content hash, so unchanged files are
+never re-transcribed. Every result is appended to a JSONL report as soon as it
+is ready, and a rerun resumes from that report.
+
+Judgments: exact / normalized matches are accepted locally without an API call,
+the rest are sent to Claude in batches (many (word, transcript) pairs per
+request, mapped back by id) and cached by (word, transcript) hash. The judge
+client is swappable; --judge local answers offline for throughput benchmarks.
+
+--only restricts the run to a file list, typically audio_triage_paths.txt from
+triage_audio.py (duration-vs-expected anomalies), so spend scales with the
+number of suspicious files rather than corpus size.
 """
 
 import os
+import re
 import json
+import time
+import difflib
+import unicodedata
 import whisper
-import anthropic
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from tqdm import tqdm
-import time
+
+from audio_common.hash_cache import HashCache, content_key, text_key
+from audio_common.mp3_frames import scan
+
+# ===== Whisper worker process =====
+_WORKER_MODEL = None
+_WORKER_MODEL_NAME = None
+
+
+def _init_worker(model_name: str, torch_threads: int) -> None:
+    """Load the Whisper model once per worker process"""
+    global _WORKER_MODEL, _WORKER_MODEL_NAME
+    try:
+        import torch
+        torch.set_num_threads(max(1, torch_threads))
+    except Exception:
+        pass
+    _WORKER_MODEL = whisper.load_model(model_name)
+    _WORKER_MODEL_NAME = model_name
+
+
+def _transcribe_batch(batch: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """[(audio_path, cache_key)] -> [(cache_key, transcription)] using this worker's model"""
+    out = []
+    for audio_path, key in batch:
+        try:
+            result = _WORKER_MODEL.transcribe(audio_path, fp16=False)
+            out.append((key, result["text"].strip()))
+        except Exception as e:
+            out.append((key, f"Error transcribing: {str(e)}"))
+    return out
+
+
+def audio_duration_ms(data: bytes) -> float:
+    """MP3 duration from frame headers (no decoding); falls back to byte size"""
+    try:
+        return scan(data).duration_ms
+    except ValueError:
+        return float(len(data))
+
+
+def make_batches(jobs: List[Tuple[str, str, float]], batch_size: int) -> List[List[Tuple[str, str]]]:
+    """Sort by duration (longest first) so batches have similar lengths and stragglers run first"""
+    jobs = sorted(jobs, key=lambda j: -j[2])
+    return [[(p, k) for p, k, _ in jobs[i:i + batch_size]] for i in range(0, len(jobs), batch_size)]
+
+
+# ===== Judgment clients (swappable) =====
+JUDGE_MODEL = "claude-3-haiku-20240307"  # Using Haiku for cost efficiency
+
+BATCH_PROMPT = """
+You are validating English pronunciation audio files.
+For each item, compare the expected word with the Whisper transcription of its audio.
+
+Consider:
+- Exact matches or very close pronunciations are acceptable
+- Minor variations in pronunciation are OK
+- Completely different words or gibberish are not acceptable
+- Background noise or poor quality that obscures the word is not acceptable
+
+Items (JSON):
+{items}
+
+Respond with only a JSON array containing one object per item, using the same ids:
+[{{"id": <id>, "accuracy": <0-100>, "acceptable": <boolean>, "reason": "<brief explanation>", "severity": "good|minor_issue|major_issue|unusable"}}]
+"""
+
+
+class ClaudeJudgeClient:
+    """Anthropic Messages API: prompt -> response text"""
+
+    def __init__(self, api_key: str, model: str = JUDGE_MODEL):
+        import anthropic
+
+        self.client = anthropic.Anthropic(api_key=api_key)
+        self.model = model
+
+    def complete(self, prompt: str, max_tokens: int) -> str:
+        response = self.client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=0,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        return response.content[0].text
+
+
+class LocalJudgeClient:
+    """Offline stand-in that answers BATCH_PROMPT with a string-similarity score (benchmarks/tests)"""
+
+    model = "local-similarity"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def complete(self, prompt: str, max_tokens: int) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        block = prompt.split("Items (JSON):", 1)[1].split("Respond with", 1)[0]
+        out = []
+        for item in json.loads(block):
+            ratio = difflib.SequenceMatcher(
+                None, normalize_for_match(item["word"]), normalize_for_match(item["transcription"])
+            ).ratio()
+            accuracy = int(round(ratio * 100))
+            severity = "good" if accuracy >= 85 else "minor_issue" if accuracy >= 70 else \
+                "major_issue" if accuracy >= 40 else "unusable"
+            out.append({"id": item["id"], "accuracy": accuracy, "acceptable": accuracy >= 70,
+                        "reason": f"similarity {ratio:.2f}", "severity": severity})
+        return json.dumps(out)
+
+
+def normalize_for_match(text: str) -> str:
+    """NFKC, lowercase, punctuation -> space, collapsed whitespace"""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def prefilter(word: str, transcription: str, contains: bool = False) -> Optional[Dict]:
+    """
+    Cheap local accept for exact / normalized matches (never rejects)
+    contains: also accept when the expected word appears inside a longer transcription
+    (off by default - extra or wrong speech around the word would go unjudged)
+    """
+    w, t = normalize_for_match(word), normalize_for_match(transcription)
+    if not w or not t:
+        return None
+    if t == w:
+        reason = "exact match"
+    elif t.replace(" ", "") == w.replace(" ", ""):
+        reason = "normalized match"
+    elif contains and f" {w} " in f" {t} ":
+        reason = "expected word found in transcription"
+    else:
+        return None
+    return {"accuracy": 100, "acceptable": True, "reason": f"{reason} (local prefilter)",
+            "severity": "good", "source": "prefilter"}
+
+
+def parse_judgments(content: str) -> Dict[int, Dict]:
+    """Batch response text -> {id: judgment}; tolerates prose around the JSON array"""
+    try:
+        data = json.loads(content)
+    except ValueError:
+        start, end = content.find("["), content.rfind("]")
+        if start < 0 or end <= start:
+            return {}
+        try:
+            data = json.loads(content[start:end + 1])
+        except ValueError:
+            return {}
+    if isinstance(data, dict):
+        data = data.get("results") or data.get("items") or [data]
+    out: Dict[int, Dict] = {}
+    for row in data if isinstance(data, list) else []:
+        if isinstance(row, dict) and "id" in row:
+            try:
+                out[int(row.pop("id"))] = row
+            except (TypeError, ValueError):
+                continue
+    return out
+
+
+def failed_judgment(reason: str) -> Dict:
+    return {"accuracy": 0, "acceptable": False, "reason": reason, "severity": "unusable"}
+
+
+def load_stream(stream_path: str) -> Dict[str, Dict]:
+    """Read a (possibly truncated) JSONL results file -> {file: last result}"""
+    done: Dict[str, Dict] = {}
+    if not os.path.exists(stream_path):
+        return done
+    with open(stream_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            done[row["file"]] = row
+    return done
+
+
+def is_failed(result: Dict) -> bool:
+    """Transcription/API failures are retried on resume instead of being reused"""
+    reason = str(result.get("validation", {}).get("reason", ""))
+    return (result.get("transcription", "").startswith("Error transcribing:")
+            or reason.startswith(("API error", "Failed to parse response")))
+
 
 class AudioValidator:
-    def __init__(self, claude_api_key: str):
-        """Initialize the validator with Claude API"""
-        self.whisper_model = whisper.load_model("base")
-        self.claude = anthropic.Anthropic(api_key=claude_api_key)
+    def __init__(
+        self,
+        claude_api_key: str,
+        model_name: str = "base",
+        workers: int = 0,
+        batch_size: int = 8,
+        cache_path: Optional[str] = ".whisper_cache.jsonl",
+        judge=None,
+        judge_batch: int = 20,
+        judgment_cache_path: Optional[str] = ".claude_judgments.jsonl",
+        use_prefilter: bool = True,
+        prefilter_contains: bool = False,
+    ):
+        """Initialize the validator with Claude API (or any client with complete(prompt, max_tokens))"""
+        self.model_name = model_name
+        self.workers = workers or max(1, (os.cpu_count() or 2) // 2)
+        self.batch_size = max(1, batch_size)
+        self.whisper_model = None  # loaded lazily for single-file use; the pool loads its own
+        self.transcripts = HashCache(cache_path)
+        self.judge = judge if judge is not None else ClaudeJudgeClient(claude_api_key)
+        self.judge_batch = max(1, judge_batch)
+        self.judgments = HashCache(judgment_cache_path)
+        self.use_prefilter = use_prefilter
+        self.prefilter_contains = prefilter_contains
+        self.judge_stats = {"prefiltered": 0, "cached": 0, "judged": 0, "calls": 0, "failed": 0}
         self.results = []
         
     def transcribe_audio(self, audio_path: str) -> str:
-        """Transcribe audio file using Whisper"""
+        """Transcribe audio file using Whisper (cached by content hash)"""
+        with open(audio_path, "rb") as f:
+            key = content_key(f.read(), "whisper", self.model_name)
+        cached = self.transcripts.get(key)
+        if cached is not None:
+            return cached
         try:
-            result = self.whisper_model.transcribe(audio_path)
-            return result["text"].strip()
+            if self.whisper_model is None:
+                self.whisper_model = whisper.load_model(self.model_name)
+            result = self.whisper_model.transcribe(audio_path, fp16=False)
+            text = result["text"].strip()
         except Exception as e:
             return f"Error transcribing: {str(e)}"
+        self.transcripts.put(key, text)
+        return text
+
+    def transcribe_many(self, jobs: List[Tuple[str, str, float]]) -> Iterator[Tuple[str, str]]:
+        """
+        jobs: [(audio_path, cache_key, duration_ms)] not in cache
+        Yields (cache_key, transcription) as worker batches finish; failures are not cached.
+        """
+        if not jobs:
+            return
+        batches = make_batches(jobs, self.batch_size)
+        workers = min(self.workers, len(batches))
+        torch_threads = max(1, (os.cpu_count() or 1) // workers)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.model_name, torch_threads),
+        ) as pool:
+            futures = [pool.submit(_transcribe_batch, b) for b in batches]
+            for fut in as_completed(futures):
+                for key, text in fut.result():
+                    if not text.startswith("Error transcribing:"):
+                        self.transcripts.put(key, text)
+                    yield key, text
     
     def validate_with_claude(self, word: str, transcription: str, audio_path: str) -> Dict:
         """Validate transcription using Claude API"""
-        prompt = f"""
-        You are validating an English pronunciation audio file.
-        
-        Expected word: "{word}"
-        Transcribed audio: "{transcription}"
-        
-        Please analyze and provide:
-        1. Match accuracy (0-100): How well does the transcription match the expected word?
-        2. Is this audio file acceptable? (yes/no)
-        3. Brief reason for your decision
-        
-        Respond in JSON format:
-        {{
-            "accuracy": <number>,
-            "acceptable": <boolean>,
-            "reason": "<brief explanation>",
-            "severity": "good|minor_issue|major_issue|unusable"
-        }}
-        
-        Consider:
-        - Exact matches or very close pronunciations are acceptable
-        - Minor variations in pronunciation are OK
-        - Completely different words or gibberish are not acceptable
-        - Background noise or poor quality that obscures the word is not acceptable
+        return self.judge_pairs([(word, transcription)])[0]
+
+    def judge_pairs(self, pairs: List[Tuple[str, str]]) -> List[Dict]:
         """
-        
+        [(expected word, transcription)] -> judgments in the same order
+        prefilter -> judgment cache -> batched requests (judge_batch pairs per call)
+        """
+        out: List[Optional[Dict]] = [None] * len(pairs)
+        todo: Dict[str, List[int]] = {}
+        for i, (word, transcription) in enumerate(pairs):
+            if transcription.startswith("Error transcribing:"):
+                out[i] = failed_judgment("No transcription")
+                continue
+            if self.use_prefilter:
+                accepted = prefilter(word, transcription, self.prefilter_contains)
+                if accepted:
+                    out[i] = accepted
+                    self.judge_stats["prefiltered"] += 1
+                    continue
+            key = text_key(self.judge.model, word, transcription)
+            cached = self.judgments.get(key)
+            if cached is not None:
+                out[i] = dict(cached, source="cache")
+                self.judge_stats["cached"] += 1
+                continue
+            todo.setdefault(key, []).append(i)
+
+        keys = list(todo)
+        for n in range(0, len(keys), self.judge_batch):
+            chunk = keys[n:n + self.judge_batch]
+            items = [
+                {"id": j, "word": pairs[todo[k][0]][0], "transcription": pairs[todo[k][0]][1]}
+                for j, k in enumerate(chunk)
+            ]
+            results, error = self._judge_chunk(items)
+            for j, key in enumerate(chunk):
+                judgment = results.get(j)
+                if isinstance(judgment, dict) and "severity" in judgment:
+                    # only judgments parsed from a model reply are cached / counted as judged
+                    self.judgments.put(key, judgment)
+                    judgment = dict(judgment, source="claude")
+                    self.judge_stats["judged"] += 1
+                else:
+                    # not cached: is_failed() picks these up again on resume
+                    judgment = failed_judgment(error or "Failed to parse response")
+                    self.judge_stats["failed"] += 1
+                for i in todo[key]:
+                    out[i] = judgment
+        return out
+
+    def _judge_chunk(self, items: List[Dict]) -> Tuple[Dict[int, Dict], Optional[str]]:
+        """-> ({id: parsed judgment}, API error message or None)"""
+        prompt = BATCH_PROMPT.format(items=json.dumps(items, ensure_ascii=False, indent=0))
+        self.judge_stats["calls"] += 1
         try:
-            response = self.claude.messages.create(
-                model="claude-3-haiku-20240307",  # Using Haiku for cost efficiency
-                max_tokens=200,
-                temperature=0,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            # Parse Claude's response
-            content = response.content[0].text
-            # Extract JSON from response
-            import re
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            else:
-                return {
-                    "accuracy": 0,
-                    "acceptable": False,
-                    "reason": "Failed to parse response",
-                    "severity": "unusable"
-                }
-                
+            content = self.judge.complete(prompt, max_tokens=80 + 70 * len(items))
         except Exception as e:
-            return {
-                "accuracy": 0,
-                "acceptable": False,
-                "reason": f"API error: {str(e)}",
-                "severity": "unusable"
-            }
+            return {}, f"API error: {str(e)}"
+        return parse_judgments(content), None
     
     def validate_file(self, audio_path: str, word: str) -> Dict:
         """Validate a single audio file"""
         # Transcribe audio
         transcription = self.transcribe_audio(audio_path)
-        
-        # Validate with Claude
+        return self.validate_transcription(audio_path, word, transcription)
+
+    def validate_transcription(self, audio_path: str, word: str, transcription: str) -> Dict:
+        """Validate an existing transcription with Claude"""
         validation = self.validate_with_claude(word, transcription, audio_path)
         
         return {
@@ -104,14 +366,19 @@ class AudioValidator:
             "validation": validation
         }
     
-    def validate_directory(self, directory: str, limit: int = None) -> List[Dict]:
-        """Validate all example.mp3 files in directory structure"""
+    def validate_directory(
+        self, directory: str, limit: int = None, stream_path: str = "audio_validation_results.jsonl",
+        only: Optional[Set[str]] = None,
+    ) -> List[Dict]:
+        """Validate all example.mp3 files in directory structure (only: restrict to these absolute paths)"""
         audio_files = []
         
         # Collect all example.mp3 files
         for root, dirs, files in os.walk(directory):
             if "example.mp3" in files:
                 audio_path = os.path.join(root, "example.mp3")
+                if only is not None and os.path.abspath(audio_path) not in only:
+                    continue
                 # Extract word from directory name
                 word = os.path.basename(root)
                 audio_files.append((audio_path, word))
@@ -121,15 +388,79 @@ class AudioValidator:
             audio_files = audio_files[:limit]
         
         print(f"Found {len(audio_files)} audio files to validate")
-        
-        # Process files with progress bar
-        for audio_path, word in tqdm(audio_files, desc="Validating audio files"):
-            result = self.validate_file(audio_path, word)
-            self.results.append(result)
-            
-            # Rate limiting for API
-            time.sleep(0.5)  # Adjust based on your API limits
-        
+
+        # Resume: results already streamed for the same file content are reused
+        done = load_stream(stream_path)
+
+        # Hash + duration from one read; split into resumed / cached / to transcribe
+        pending: Dict[str, List[Tuple[str, str, str]]] = {}
+        jobs: List[Tuple[str, str, float]] = []
+        ready: List[Tuple[str, str, str, str]] = []
+        resumed = 0
+        for audio_path, word in audio_files:
+            with open(audio_path, "rb") as f:
+                data = f.read()
+            key = content_key(data, "whisper", self.model_name)
+            prev = done.get(audio_path)
+            if prev and prev.get("audio_hash") == key and not is_failed(prev):
+                self.results.append(prev)
+                resumed += 1
+                continue
+            cached = self.transcripts.get(key)
+            if cached is not None:
+                ready.append((audio_path, word, key, cached))
+                continue
+            if key not in pending:
+                jobs.append((audio_path, key, audio_duration_ms(data)))
+            pending.setdefault(key, []).append((audio_path, word, key))
+
+        print(
+            f"  resumed={resumed}, cached transcripts={len(ready)}, "
+            f"to transcribe={len(jobs)} (workers={min(self.workers, max(1, len(jobs)))}, batch={self.batch_size})"
+        )
+
+        with open(stream_path, "a", encoding="utf-8") as stream, \
+                tqdm(total=len(audio_files) - resumed, desc="Validating audio files") as bar:
+            buffer: List[Tuple[str, str, str, str]] = []
+
+            def flush() -> None:
+                # One batched judgment call per judge_batch transcripts
+                judgments = self.judge_pairs([(word, text) for _, word, _, text in buffer])
+                for (audio_path, word, key, text), validation in zip(buffer, judgments):
+                    result = {
+                        "file": audio_path,
+                        "word": word,
+                        "transcription": text,
+                        "validation": validation,
+                        "audio_hash": key,
+                    }
+                    self.results.append(result)
+                    stream.write(json.dumps(result, ensure_ascii=False) + "\n")
+                stream.flush()
+                bar.update(len(buffer))
+                buffer.clear()
+
+            def emit(audio_path: str, word: str, key: str, transcription: str) -> None:
+                buffer.append((audio_path, word, key, transcription))
+                if len(buffer) >= self.judge_batch:
+                    flush()
+
+            for item in ready:
+                emit(*item)
+            for key, text in self.transcribe_many(jobs):
+                for audio_path, word, _ in pending.pop(key, []):
+                    emit(audio_path, word, key, text)
+            if buffer:
+                flush()
+
+        st = self.judge_stats
+        print(f"  transcript cache: {self.transcripts.hits} hits, {len(self.transcripts)} entries")
+        print(
+            f"  judgments: prefiltered={st['prefiltered']}, cached={st['cached']}, "
+            f"judged={st['judged']} in {st['calls']} calls, failed={st['failed']}"
+        )
+        self.transcripts.close()
+        self.judgments.close()
         return self.results
     
     def generate_report(self, output_file: str = "audio_validation_report.json"):
@@ -194,18 +525,51 @@ class AudioValidator:
 
 def main():
     parser = argparse.ArgumentParser(description="Validate audio files using Whisper and Claude")
-    parser.add_argument("--api-key", required=True, help="Claude API key")
+    parser.add_argument("--api-key", default=os.getenv("ANTHROPIC_API_KEY"), help="Claude API key")
     parser.add_argument("--directory", default=".", help="Directory to scan for audio files")
     parser.add_argument("--limit", type=int, help="Limit number of files to validate (for testing)")
     parser.add_argument("--output", default="audio_validation_report.json", help="Output report file")
+    parser.add_argument("--stream", default="audio_validation_results.jsonl", help="Streaming JSONL results (resumable)")
+    parser.add_argument("--model", default="base", help="Whisper model name")
+    parser.add_argument("--workers", type=int, default=0, help="Transcription processes (default: half the CPUs)")
+    parser.add_argument("--batch-size", type=int, default=8, help="Files per worker batch")
+    parser.add_argument("--cache", default=".whisper_cache.jsonl", help="Transcript cache file (content hash)")
+    parser.add_argument("--judge", choices=["claude", "local"], default="claude", help="Judgment client (local = offline stand-in)")
+    parser.add_argument("--judge-batch", type=int, default=20, help="(word, transcript) pairs per judgment request")
+    parser.add_argument("--judgment-cache", default=".claude_judgments.jsonl", help="Judgment cache file")
+    parser.add_argument("--no-prefilter", action="store_true", help="Send exact/normalized matches to the judge too")
+    parser.add_argument("--prefilter-contains", action="store_true",
+                        help="Also accept locally when the expected word appears inside the transcription")
+    parser.add_argument("--local-latency", type=float, default=0.0, help="Simulated seconds per local judge call")
+    parser.add_argument("--only", help="Validate only files listed here, one path per line (e.g. audio_triage_paths.txt)")
     
     args = parser.parse_args()
+    if args.judge == "claude" and not args.api_key:
+        parser.error("--api-key (or ANTHROPIC_API_KEY) is required for --judge claude")
     
     # Create validator
-    validator = AudioValidator(args.api_key)
+    validator = AudioValidator(
+        args.api_key,
+        model_name=args.model,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        cache_path=args.cache,
+        judge=LocalJudgeClient(args.local_latency) if args.judge == "local" else None,
+        judge_batch=args.judge_batch,
+        judgment_cache_path=args.judgment_cache,
+        use_prefilter=not args.no_prefilter,
+        prefilter_contains=args.prefilter_contains,
+    )
     
+    # Restrict to triaged files (triage_audio.py) instead of the whole corpus
+    only = None
+    if args.only:
+        with open(args.only, "r", encoding="utf-8") as f:
+            only = {os.path.abspath(line.strip()) for line in f if line.strip()}
+        print(f"Restricting to {len(only)} triaged files from {args.only}")
+
     # Validate files
-    validator.validate_directory(args.directory, args.limit)
+    validator.validate_directory(args.directory, args.limit, stream_path=args.stream, only=only)
     
     # Generate report
     validator.generate_report(args.output)
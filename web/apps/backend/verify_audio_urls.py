@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+오디오 URL 일괄 검증 (목록/매니페스트 비교 → 남은 것만 비동기 HEAD)
+
+N1~N5(jlpt/N*.json)와 CEFR(cefr_vocabs_updated.json) 항목에서 기대 객체 경로
+(jlpt/n5/<romaji>/word.mp3, starter/<lemma>/gloss.mp3 ...)를 만든 뒤:
+
+  1) --listing(버킷 객체 목록 1회) 또는 --manifest(생성기 audio_manifest.json)와
+     집합 비교 → 목록에 있는 경로는 HTTP 요청 없이 통과
+  2) 목록에 없는 경로(또는 --head-all / --sample)만 HEAD 요청
+     - asyncio 스트림 기반 keep-alive 커넥션 풀 (호스트당 --concurrency개 재사용)
+     - 요청 사이 sleep 없음, 동시 요청 수는 세마포어로 제한
+
+결과: audio_url_report_<timestamp>.json (레벨별 통계 + 누락 목록)
+
+사용:
+  python verify_audio_urls.py --listing gs://language-learner-audio
+  python verify_audio_urls.py --listing .sync_cache/gs_language-learner-audio_jlpt_n5.json --levels N5
+  python verify_audio_urls.py --manifest jlpt/n5 --manifest starter
+  python verify_audio_urls.py --head-all --concurrency 128
+  python verify_audio_urls.py --base-url http://127.0.0.1:8000 --head-all     # 로컬 정적 서버로 테스트
+    (python -m http.server 8000 --directory <오디오 루트>)
+
+환경변수(옵션):
+  AUDIO_BASE_URL=https://storage.googleapis.com/language-learner-audio
+  CEFR_AUDIO_PREFIX=          # CEFR 경로 앞에 붙일 접두사 (예: cefr)
+"""
+
+import os
+import re
+import sys
+import ssl
+import json
+import time
+import random
+import asyncio
+import argparse
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import quote, urlsplit
+
+from audio_common.audio_manifest import MANIFEST_FILE, load_manifest
+from audio_common.romaji_slugs import assign_slugs, registry_path
+
+AUDIO_BASE_URL = os.getenv("AUDIO_BASE_URL", "https://storage.googleapis.com/language-learner-audio")
+CEFR_AUDIO_PREFIX = os.getenv("CEFR_AUDIO_PREFIX", "").strip("/")
+
+JLPT_LEVELS = ["N1", "N2", "N3", "N4", "N5"]
+CEFR_FILE = "cefr_vocabs_updated.json"
+# CEFR 레벨 → 생성기 폴더 (make_word_gloss.py LEVEL_MAP과 같은 폴더명)
+CEFR_FOLDERS = {"A1": "starter", "A2": "elementary", "B1": "intermediate", "B2": "upper", "C1": "advanced"}
+
+
+def sanitize_filename(name: str) -> str:
+    name = re.sub(r'[\\/*?:"<>|]', "", str(name or ""))
+    return name.strip().lower() or "unnamed"
+
+
+# ===== 기대 객체 목록 =====
+def jlpt_expected(level: str, base_dir: str = "jlpt") -> List[Tuple[str, str]]:
+    """jlpt/N5.json → [(group, 객체 경로)] (audio 필드 우선, 없으면 생성기 규칙으로 추정)"""
+    path = os.path.join(base_dir, f"{level}.json")
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        items = json.load(f)
+    # 폴더 이름은 생성기와 같은 등록부(jlpt/n5_romaji_slugs.json, 없으면 파일 순서 규칙)에서 - 저장하지 않음
+    slugs = assign_slugs(items, registry_path(path, level.lower()), save=False)
+    out: List[Tuple[str, str]] = []
+    for it, slug in zip(items, slugs):
+        if slug is None:
+            continue  # lemma/kana/romaji가 빠진 항목은 생성기도 건너뜀
+        audio = it.get("audio") or {}
+        if audio:
+            out.extend((level, p.lstrip("/")) for p in audio.values() if p)
+            continue
+        folder = f"jlpt/{level.lower()}/{slug}"
+        out.append((level, f"{folder}/word.mp3"))
+        if it.get("koGloss") or it.get("koChirpScript"):
+            out.append((level, f"{folder}/gloss.mp3"))
+        if it.get("koChirpScript"):
+            out.append((level, f"{folder}/example.mp3"))
+    return out
+
+
+def cefr_expected(path: str = CEFR_FILE, prefix: str = CEFR_AUDIO_PREFIX) -> List[Tuple[str, str]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        items = json.load(f)
+    out: List[Tuple[str, str]] = []
+    for it in items:
+        lemma = it.get("lemma")
+        level = str(it.get("levelCEFR") or "").split(",")[0].strip().upper()
+        folder = CEFR_FOLDERS.get(level)
+        if not lemma or not folder:
+            continue
+        base = "/".join(p for p in (prefix, folder, sanitize_filename(lemma)) if p)
+        out.append((level, f"{base}/word.mp3"))
+        if it.get("koGloss"):
+            out.append((level, f"{base}/gloss.mp3"))
+    return out
+
+
+# ===== 이미 알려진 객체 (HTTP 없이) =====
+def load_listing(spec: str) -> Set[str]:
+    """gs://버킷[/접두사] / 로컬 폴더 / sync_audio 목록 캐시(.json) → 객체 이름 집합"""
+    if spec.endswith(".json") and os.path.isfile(spec):
+        with open(spec, "r", encoding="utf-8") as f:
+            return set(json.load(f))
+    if spec.startswith("gs://"):
+        from sync_audio import GcsBucket  # google-cloud-storage는 이 경우에만 필요
+
+        bucket, _, prefix = spec[5:].partition("/")
+        prefix = prefix.strip("/")
+        names = GcsBucket(bucket).client.list_blobs(bucket, prefix=prefix + "/" if prefix else None)
+        return {b.name[len(prefix) + 1:] if prefix else b.name for b in names}
+    known: Set[str] = set()
+    for root, _, files in os.walk(spec):
+        for fn in files:
+            known.add(os.path.relpath(os.path.join(root, fn), spec).replace(os.sep, "/"))
+    return known
+
+
+def load_manifests(level_dirs: List[str]) -> Set[str]:
+    """레벨 폴더 audio_manifest.json → 객체 이름 집합 (레벨 폴더 경로 = 객체 접두사)"""
+    known: Set[str] = set()
+    for level in level_dirs:
+        files = load_manifest(level)
+        if not files:
+            print(f"⚠️ {os.path.join(level, MANIFEST_FILE)} 없음/비어 있음")
+        key = os.path.normpath(level).replace(os.sep, "/").strip("/")
+        known.update(f"{key}/{rel}" for rel in files)
+    return known
+
+
+# ===== 비동기 HEAD (keep-alive 커넥션 풀) =====
+class HeadPool:
+    """호스트당 최대 size개 커넥션을 재사용하는 HTTP/1.1 HEAD 클라이언트 (표준 라이브러리만 사용)"""
+
+    def __init__(self, base_url: str, size: int = 64, timeout: float = 10.0, retries: int = 2):
+        u = urlsplit(base_url.rstrip("/"))
+        self.https = u.scheme == "https"
+        self.host = u.hostname or ""
+        self.port = u.port or (443 if self.https else 80)
+        self.base_path = u.path
+        self.host_header = u.netloc
+        self.timeout = timeout
+        self.retries = retries
+        self._sem = asyncio.Semaphore(size)
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._ssl = ssl.create_default_context() if self.https else None
+        self.opened = 0
+
+    async def _conn(self):
+        if self._idle:
+            return self._idle.pop()
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=self._ssl)
+
+    async def _head_once(self, path: str) -> int:
+        reader, writer = await self._conn()
+        try:
+            req = (
+                f"HEAD {path} HTTP/1.1\r\nHost: {self.host_header}\r\n"
+                f"User-Agent: verify-audio-urls\r\nConnection: keep-alive\r\n\r\n"
+            )
+            writer.write(req.encode("ascii"))
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+        except BaseException:
+            writer.close()
+            raise
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ", 2)[1])
+        headers = {k.strip().lower(): v.strip() for k, _, v in (ln.partition(":") for ln in lines[1:] if ln)}
+        if headers.get("connection", "").lower() == "close" or lines[0].startswith("HTTP/1.0"):
+            writer.close()
+        else:
+            self._idle.append((reader, writer))
+        return status
+
+    async def head(self, key: str) -> Any:
+        """객체 경로 → HTTP 상태 코드 / "timeout" / "error:<메시지>" """
+        path = self.base_path + "/" + quote(key, safe="/")
+        async with self._sem:
+            for attempt in range(self.retries + 1):
+                try:
+                    return await asyncio.wait_for(self._head_once(path), self.timeout)
+                except asyncio.TimeoutError:
+                    result: Any = "timeout"
+                except (OSError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+                    # 서버가 닫은 keep-alive 커넥션 재사용 등 → 새 커넥션으로 재시도
+                    result = f"error:{type(e).__name__}"
+                if attempt < self.retries:
+                    await asyncio.sleep(0.2 * (2 ** attempt) * (0.5 + random.random()))
+            return result
+
+    def close(self) -> None:
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+
+async def head_all(base_url: str, keys: List[str], concurrency: int, timeout: float) -> Dict[str, Any]:
+    pool = HeadPool(base_url, size=concurrency, timeout=timeout)
+    results: Dict[str, Any] = {}
+    done = 0
+    t0 = time.time()
+
+    async def one(key: str) -> None:
+        nonlocal done
+        results[key] = await pool.head(key)
+        done += 1
+        if done % 1000 == 0:
+            print(f"    ... {done}/{len(keys)} ({done / (time.time() - t0):.0f} req/s)")
+
+    await asyncio.gather(*(one(k) for k in keys))
+    pool.close()
+    print(f"    HEAD {len(keys)}개 완료: {time.time() - t0:.1f}s, 커넥션 {pool.opened}개 사용")
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="오디오 URL 일괄 검증 (목록 비교 + 비동기 HEAD)")
+    parser.add_argument("--levels", nargs="*", default=JLPT_LEVELS, help="JLPT 레벨 (기본 N1~N5)")
+    parser.add_argument("--no-cefr", action="store_true", help="CEFR 항목 제외")
+    parser.add_argument("--base-url", default=AUDIO_BASE_URL, help="오디오 기본 URL")
+    parser.add_argument("--listing", help="객체 목록: gs://버킷[/접두사], 로컬 폴더, 목록 캐시 .json")
+    parser.add_argument("--manifest", action="append", default=[], help="생성기 매니페스트가 있는 레벨 폴더 (반복 가능)")
+    parser.add_argument("--head-all", action="store_true", help="목록에 있어도 전부 HEAD 확인")
+    parser.add_argument("--sample", type=int, default=0, help="목록에 있는 것 중 N개를 무작위로 HEAD 확인")
+    parser.add_argument("--concurrency", type=int, default=64, help="동시 HEAD 요청 수 (= 최대 커넥션 수)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="요청 타임아웃(초)")
+    parser.add_argument("--out", help="리포트 파일 (기본 audio_url_report_<timestamp>.json)")
+    args = parser.parse_args()
+
+    print("=== 오디오 URL 검증 시작 ===")
+    expected: List[Tuple[str, str]] = []
+    for level in args.levels:
+        expected.extend(jlpt_expected(level.upper()))
+    if not args.no_cefr:
+        expected.extend(cefr_expected())
+    groups: Dict[str, str] = {}
+    for group, key in expected:
+        groups.setdefault(key, group)
+    print(f"📋 기대 객체: {len(groups)}개 (JLPT {','.join(args.levels) or '-'}, CEFR {'off' if args.no_cefr else 'on'})")
+
+    # 1) 목록/매니페스트 비교
+    known: Optional[Set[str]] = None
+    if args.listing:
+        known = load_listing(args.listing)
+        print(f"🗂️ 객체 목록: {len(known)}개 ({args.listing})")
+    if args.manifest:
+        from_manifest = load_manifests(args.manifest)
+        print(f"🧾 매니페스트: {len(from_manifest)}개")
+        known = from_manifest if known is None else known | from_manifest
+
+    status: Dict[str, Any] = {}
+    to_head: List[str] = []
+    for key in groups:
+        if known is not None and key in known and not args.head_all:
+            status[key] = "listed"
+        else:
+            to_head.append(key)
+    if args.sample and known is not None:
+        listed = [k for k, v in status.items() if v == "listed"]
+        to_head.extend(random.sample(listed, min(args.sample, len(listed))))
+    print(f"    목록 일치 {sum(1 for v in status.values() if v == 'listed')}개, HEAD 대상 {len(to_head)}개")
+
+    # 2) 남은 것만 HTTP
+    if to_head:
+        print(f"🌐 HEAD 확인: {args.base_url} (concurrency={args.concurrency})")
+        status.update(asyncio.run(head_all(args.base_url, to_head, args.concurrency, args.timeout)))
+
+    # 3) 집계
+    per_group: Dict[str, Dict[str, int]] = {}
+    missing: List[Dict[str, Any]] = []
+    for key, group in groups.items():
+        st = status[key]
+        ok = st == "listed" or st == 200
+        g = per_group.setdefault(group, {"total": 0, "ok": 0, "missing": 0, "error": 0})
+        g["total"] += 1
+        if ok:
+            g["ok"] += 1
+        elif isinstance(st, int):
+            g["missing"] += 1
+            missing.append({"key": key, "group": group, "status": st})
+        else:
+            g["error"] += 1
+            missing.append({"key": key, "group": group, "status": st})
+
+    print("\n=== 결과 ===")
+    for group in sorted(per_group):
+        g = per_group[group]
+        mark = "✅" if g["ok"] == g["total"] else "❌"
+        print(f"{mark} {group:<4} {g['ok']}/{g['total']}  누락 {g['missing']}  오류 {g['error']}")
+
+    out = args.out or f"audio_url_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump({"base_url": args.base_url, "checked_at": datetime.now().isoformat(),
+                   "groups": per_group, "missing": missing}, f, ensure_ascii=False, indent=2)
+    print(f"📝 리포트: {out} (누락/오류 {len(missing)}개)")
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())